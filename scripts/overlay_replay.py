@@ -7,7 +7,8 @@ What it does
     tp, avg_tp, tp_mean, tp_ema, avg_tp_mean, avg_tp_ema (all labeled by index, expiry_tag, offset)
 - Iterates a weekday master CSV (<weekday>/<index>_<expiry_tag>_<offset>.csv) and updates metrics row-by-row.
 - Optionally, if a live CSV for a specific trade date is provided, uses its tp/avg_tp for the live series;
-    otherwise, mirrors mean to live for UI testing.
+    otherwise, mirrors mean to live for UI testing. With ``--live-source parquet`` the live series is read
+    as a column projection from a ParquetSink dataset (<live-root>/<INDEX>/<YYYY-MM-DD>/part-*.parquet).
 
 Usage examples
     python scripts/overlay_replay.py --weekday-root data/weekday_master \
@@ -17,6 +18,10 @@ Usage examples
     python scripts/overlay_replay.py --weekday-root data/weekday_master --weekday Monday \
         --live-root data/g6_data --live-date 2025-09-12 --index NIFTY --expiry-tag this_week --offset 0
 
+    # Same, from the Parquet dataset (G6_PARQUET_SINK=1)
+    python scripts/overlay_replay.py --weekday-root data/weekday_master --weekday Monday --live-source parquet \
+        --live-root data/g6_parquet --live-date 2025-09-12 --index NIFTY --expiry-tag this_week --offset 0
+
 Notes
 - This is a dev-only helper. It produces synthetic time progression. Prometheus will sample the ever-changing Gauges.
 - Speed controls how quickly you move across rows.
@@ -37,6 +42,15 @@ except Exception as e:  # noqa: BLE001
         f"Missing dependencies (pandas/prometheus-client): {e}"
     ) from e
 
+# Ensure repository root is on sys.path when invoked as a script (for --live-source parquet)
+import sys  # isort: skip
+try:
+    repo_root = Path(__file__).resolve().parents[1]
+    if str(repo_root) not in sys.path:
+        sys.path.insert(0, str(repo_root))
+except Exception:
+    pass
+
 WEEKDAYS = ["Monday","Tuesday","Wednesday","Thursday","Friday","Saturday","Sunday"]
 
 
@@ -71,6 +85,28 @@ def _load_live_csv(root: Path, index: str, expiry_tag: str, offset: str, date_st
     return df[['timestamp','tp','avg_tp']]
 
 
+def _load_live_parquet(root: Path, index: str, expiry_tag: str, offset: str, date_str: str) -> pd.DataFrame | None:
+    """Parquet counterpart of _load_live_csv: reads only the columns the live series needs."""
+    from src.storage import parquet_sink as _pq
+    if not _pq.AVAILABLE:
+        raise SystemExit("--live-source parquet requires pyarrow")
+    table = _pq.read_columns(str(root), index, date_str, ['timestamp', 'expiry_tag', 'offset', 'ce', 'pe', 'avg_ce', 'avg_pe'])
+    if table is None or table.num_rows == 0:
+        return None
+    df = table.to_pandas()
+    try:
+        off = int(offset)
+    except ValueError:
+        return None
+    df = df[(df['expiry_tag'].astype(str) == expiry_tag) & (df['offset'] == off)]
+    if df.empty:
+        return None
+    df = df.assign(timestamp=pd.to_datetime(df['timestamp'].astype(str)))
+    df['tp'] = df['ce'].fillna(0) + df['pe'].fillna(0)
+    df['avg_tp'] = df['avg_ce'].fillna(0) + df['avg_pe'].fillna(0)
+    return df[['timestamp','tp','avg_tp']].reset_index(drop=True)
+
+
 def _align_live_to_overlay(live: pd.DataFrame | None, overlay: pd.DataFrame) -> pd.DataFrame:
     if live is None or live.empty:
         out = overlay.copy()
@@ -126,13 +162,20 @@ def main(argv: list[str]) -> int:
     p.add_argument(
         '--live-date', help='Date of live CSV (YYYY-MM-DD) to align (optional)'
     )
+    p.add_argument(
+        '--live-source',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Live input format: per-offset CSV tree (default) or ParquetSink dataset (use --live-root data/g6_parquet)',
+    )
     args = p.parse_args(argv)
 
     wk = args.weekday or WEEKDAYS[datetime.now().weekday()]  # local-ok
     overlay = _load_overlay_csv(Path(args.weekday_root), wk, args.index, args.expiry_tag, args.offset)
     live_df = None
     if args.live_root and args.live_date:
-        live_df = _load_live_csv(Path(args.live_root), args.index, args.expiry_tag, args.offset, args.live_date)
+        load_live = _load_live_parquet if args.live_source == 'parquet' else _load_live_csv
+        live_df = load_live(Path(args.live_root), args.index, args.expiry_tag, args.offset, args.live_date)
     merged = _align_live_to_overlay(live_df, overlay)
     if merged.empty:
         raise SystemExit("Nothing to replay (empty merged frame)")
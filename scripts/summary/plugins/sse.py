@@ -15,7 +15,7 @@ from __future__ import annotations
 import logging
 import os
 import time
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
 from typing import Any
 
 try:
@@ -44,6 +44,8 @@ class SSEPublisher(OutputPlugin):
         self._structured = os.getenv("G6_SSE_STRUCTURED", "0").lower() in {"1","true","yes","on"}
         self._last_hashes: dict[str,str] | None = None
         self._events: list[dict[str, Any]] = []  # captured events (MVP, for inspection/tests)
+        # Push listeners (e.g. the event-loop SSE fan-out server) called on every emit
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
         self._cycle = 0
         self._heartbeat_cycles = int(os.getenv("G6_SSE_HEARTBEAT_CYCLES", "5") or 5)
         self._since_change = 0
@@ -82,6 +84,16 @@ class SSEPublisher(OutputPlugin):
     def events(self) -> list[dict[str, Any]]:
         return list(self._events)
 
+    def add_listener(self, fn: Callable[[dict[str, Any]], None]) -> None:
+        if fn not in self._listeners:
+            self._listeners.append(fn)
+
+    def remove_listener(self, fn: Callable[[dict[str, Any]], None]) -> None:
+        try:
+            self._listeners.remove(fn)
+        except ValueError:
+            pass
+
     def setup(self, context: Mapping[str, Any]) -> None:  # pragma: no cover - trivial
         if not self._enabled:
             logger.debug("[sse] disabled via env")
@@ -205,6 +217,11 @@ class SSEPublisher(OutputPlugin):
             pass
         self._events.append(evt)
         self._m_events_total += 1
+        for fn in tuple(self._listeners):
+            try:
+                fn(evt)
+            except Exception:
+                logger.debug("[sse] listener failed", exc_info=True)
         if self._perf_enabled and self._h_emit_latency is not None:
             try:
                 self._h_emit_latency.observe(
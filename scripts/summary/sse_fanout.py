@@ -0,0 +1,406 @@
+"""Event-loop SSE fan-out server for /summary/events.
+
+Alternative to the thread-per-client ``sse_http`` server for large audiences
+(hundreds to thousands of dashboards / terminals):
+
+  * One asyncio loop (on a daemon thread) owns every connection.
+  * The ``SSEPublisher`` pushes events through a listener; on the loop thread
+    each event is framed into wire bytes exactly once (payload JSON via
+    ``src.utils.serialization_cache``) and the same ``bytes`` object is
+    queued to every subscriber, so per-client cost is a reference append.
+  * Each client has a bounded send queue. A client whose queue overflows, or
+    whose socket does not drain within the write timeout, is evicted instead
+    of buffering without bound.
+
+Security/governance parity with ``sse_http`` comes from ``sse_shared``
+(token, IP/UA allow lists, per-IP connect rate, per-connection event rate)
+plus the ``G6_SSE_MAX_CONNECTIONS`` cap.
+
+Enable with ``G6_SSE_FANOUT=1`` (``serve_sse_http`` then starts this server).
+Tuning: ``G6_SSE_FANOUT_QUEUE_MAX`` (frames per client, default 256) and
+``G6_SSE_FANOUT_WRITE_TIMEOUT`` (seconds, default 5).
+"""
+from __future__ import annotations
+
+import asyncio
+import http.client
+import io
+import json
+import logging
+import os
+import threading
+from collections import deque
+from typing import Any
+
+from src.utils.serialization_cache import serialize_event
+
+from .sse_shared import (
+    allow_event_token_bucket,
+    enforce_auth_and_rate,
+    load_security_config,
+)
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {200: 'OK', 401: 'Unauthorized', 403: 'Forbidden', 404: 'Not Found', 429: 'Too Many Requests'}
+_ACTIVE: SSEFanoutServer | None = None
+
+
+def encode_frame(evt: dict[str, Any]) -> bytes:
+    """Frame one publisher event as SSE wire bytes (same rules as ``write_sse_event``)."""
+    etype_raw = (evt.get('event') if isinstance(evt, dict) else 'message') or 'message'
+    etype = ''.join(ch for ch in str(etype_raw) if ch.isalnum() or ch in ('_', '-'))[:40] or 'message'
+    data = evt.get('data') if isinstance(evt, dict) else None
+    try:
+        max_bytes = int(os.getenv('G6_SSE_MAX_EVENT_BYTES', '65536') or 65536)
+    except Exception:
+        max_bytes = 65536
+    if data is None:
+        payload = b''
+    elif isinstance(data, dict):
+        payload = serialize_event(etype, data)
+    else:
+        try:
+            payload = json.dumps(data, separators=(',', ':')).encode('utf-8')
+        except Exception:
+            payload = b'{}'
+    if len(payload) > max_bytes:
+        payload = b'{}'
+        etype = 'truncated'
+    head = b'event: ' + etype.encode('ascii') + b'\n'
+    return head + (b'data: ' + payload + b'\n\n' if payload else b'\n')
+
+
+class _RequestShim:
+    """Minimal BaseHTTPRequestHandler stand-in so ``sse_shared`` checks can run unchanged."""
+
+    def __init__(self, headers: http.client.HTTPMessage, client_address: tuple[str, int]) -> None:
+        self.headers = headers
+        self.client_address = client_address
+        self._out: list[bytes] = []
+        self.wfile = self
+
+    def send_response(self, code: int) -> None:
+        self._out.append(f"HTTP/1.1 {code} {_REASONS.get(code, '')}\r\n".encode('latin-1'))
+
+    def send_header(self, key: str, value: str) -> None:
+        self._out.append(f"{key}: {value}\r\n".encode('latin-1'))
+
+    def end_headers(self) -> None:
+        self._out.append(b'Connection: close\r\n\r\n')
+
+    def write(self, data: bytes) -> None:
+        self._out.append(data)
+
+    def getvalue(self) -> bytes:
+        return b''.join(self._out)
+
+
+class _Client:
+    __slots__ = ('writer', 'client_address', 'queue', 'wake', 'closed', 'replayed', '_rl')
+
+    def __init__(self, writer: asyncio.StreamWriter, client_address: tuple[str, int]) -> None:
+        self.writer = writer
+        self.client_address = client_address
+        self.queue: deque[bytes] = deque()
+        self.wake = asyncio.Event()
+        self.closed = False
+        self.replayed = 0  # publisher backlog entries already queued at connect
+
+
+class SSEFanoutServer:
+    """Single-loop SSE broadcaster with per-client bounded queues."""
+
+    def __init__(self, bind: str = '127.0.0.1', port: int = 9320, *, publisher: Any = None,
+                 queue_max: int | None = None, write_timeout: float | None = None) -> None:
+        self.bind = bind
+        self.port = port
+        if queue_max is None:
+            queue_max = int(os.getenv('G6_SSE_FANOUT_QUEUE_MAX', '256') or 256)
+        if write_timeout is None:
+            write_timeout = float(os.getenv('G6_SSE_FANOUT_WRITE_TIMEOUT', '5') or 5)
+        self.queue_max = max(1, int(queue_max))
+        self.write_timeout = max(0.05, float(write_timeout))
+        self._publisher: Any = None
+        self._clients: set[_Client] = set()
+        self._ip_conn_window: dict[str, list] = {}
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server: asyncio.base_events.Server | None = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+        self.frames_encoded = 0
+        self.frames_sent = 0
+        self.evictions = 0
+        self.dropped = 0
+        if publisher is not None:
+            self.attach(publisher)
+
+    # ---------------- Lifecycle ----------------
+    def start(self) -> SSEFanoutServer:
+        self._thread = threading.Thread(target=self._run, name='g6-sse-fanout', daemon=True)
+        self._thread.start()
+        if not self._ready.wait(5.0):
+            raise RuntimeError('SSE fan-out server failed to start')
+        if self._server is None:
+            raise OSError(f'SSE fan-out server could not bind {self.bind}:{self.port}')
+        return self
+
+    def _run(self) -> None:
+        loop = asyncio.new_event_loop()
+        self._loop = loop
+        asyncio.set_event_loop(loop)
+        try:
+            self._server = loop.run_until_complete(
+                asyncio.start_server(self._on_connect, self.bind, self.port, limit=16384)
+            )
+            sock = self._server.sockets[0] if self._server.sockets else None
+            if sock is not None and not self.port:
+                self.port = sock.getsockname()[1]
+        except Exception:
+            logger.exception('SSE fan-out server failed to bind %s:%s', self.bind, self.port)
+            self._server = None
+        finally:
+            self._ready.set()
+        if self._server is None:
+            loop.close()
+            return
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    def shutdown(self, reason: str = 'shutdown') -> None:
+        """Send ``bye`` to every client, close them and stop the loop."""
+        global _ACTIVE
+        loop = self._loop
+        self._detach()
+        if loop is None or loop.is_closed():
+            return
+        try:
+            fut = asyncio.run_coroutine_threadsafe(self._close_all(reason), loop)
+            fut.result(timeout=5.0)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join(5.0)
+        if _ACTIVE is self:
+            _ACTIVE = None
+
+    def server_close(self) -> None:  # HTTPServer API parity
+        return None
+
+    async def _close_all(self, reason: str) -> None:
+        if self._server is not None:
+            self._server.close()
+        bye = encode_frame({'event': 'bye', 'data': {'reason': reason}})
+        for c in list(self._clients):
+            try:
+                c.writer.write(bye)
+            except Exception:
+                pass
+            self._evict(c, count=False)
+
+    # ---------------- Publishing ----------------
+    def attach(self, publisher: Any) -> None:
+        if self._publisher is not publisher:
+            self._detach()
+        self._publisher = publisher
+        add = getattr(publisher, 'add_listener', None)
+        if callable(add):
+            add(self.broadcast)
+
+    def _detach(self) -> None:
+        remove = getattr(self._publisher, 'remove_listener', None)
+        if callable(remove):
+            remove(self.broadcast)
+
+    def broadcast(self, evt: dict[str, Any]) -> None:
+        """Publisher listener: hand ``evt`` to the loop thread (thread-safe, non-blocking)."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        # Position in the publisher backlog; lets clients that replayed the backlog skip it
+        pub = self._publisher
+        idx = len(getattr(pub, '_events', ())) - 1 if pub is not None else -1
+        try:
+            loop.call_soon_threadsafe(self._fanout, evt, idx)
+        except RuntimeError:  # loop stopped between checks
+            pass
+
+    def _fanout(self, evt: dict[str, Any], idx: int) -> None:
+        if not self._clients:
+            return
+        frame = encode_frame(evt)  # once per event, shared by every client
+        self.frames_encoded += 1
+        for c in list(self._clients):
+            if idx < c.replayed:
+                continue
+            if not allow_event_token_bucket(c):
+                self.dropped += 1
+                continue
+            if len(c.queue) >= self.queue_max:
+                logger.info('sse_fanout evict ip=%s reason=queue_full', c.client_address[0])
+                self._evict(c)
+                continue
+            c.queue.append(frame)
+            c.wake.set()
+
+    def _evict(self, c: _Client, *, count: bool = True) -> None:
+        if c.closed:
+            return
+        c.closed = True
+        c.queue.clear()
+        c.wake.set()
+        self._clients.discard(c)
+        if count:
+            self.evictions += 1
+        try:
+            c.writer.close()
+        except Exception:
+            pass
+        _set_active_gauge(len(self._clients))
+
+    # ---------------- Connections ----------------
+    async def _on_connect(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        peer = writer.get_extra_info('peername') or ('', 0)
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5.0)
+        except Exception:
+            writer.close()
+            return
+        request_line, _, rest = head.partition(b'\r\n')
+        parts = request_line.decode('latin-1').split()
+        path = parts[1].split('?', 1)[0].rstrip('/') if len(parts) >= 2 else ''
+        headers = http.client.parse_headers(io.BytesIO(rest))
+        shim = _RequestShim(headers, (peer[0], peer[1]))
+        if len(parts) < 2 or parts[0] != 'GET' or path != '/summary/events' or '..' in parts[1]:
+            shim.send_response(404)
+            shim.end_headers()
+            await self._reject(writer, shim)
+            return
+        cfg = load_security_config()
+        if enforce_auth_and_rate(shim, cfg, ip_conn_window=self._ip_conn_window, handlers_ref=self._clients) is not None:
+            await self._reject(writer, shim)
+            return
+        max_conn = int(os.getenv('G6_SSE_MAX_CONNECTIONS', '50') or 50)
+        if len(self._clients) >= max_conn:
+            shim.send_response(429)
+            shim.send_header('Retry-After', '5')
+            shim.end_headers()
+            shim.write(b'too many connections')
+            await self._reject(writer, shim)
+            return
+        hdr = [b'HTTP/1.1 200 OK\r\n', b'Content-Type: text/event-stream\r\n',
+               b'Cache-Control: no-cache\r\n', b'Connection: keep-alive\r\n']
+        req_id = headers.get('X-Request-ID')
+        if req_id:
+            safe_id = ''.join(ch for ch in req_id if ch.isalnum() or ch in ('-', '_'))[:120]
+            hdr.append(f'X-Request-ID: {safe_id}\r\n'.encode('latin-1'))
+        if cfg.allow_origin:
+            hdr.append(f'Access-Control-Allow-Origin: {cfg.allow_origin}\r\n'.encode('latin-1'))
+        hdr.append(b'\r\n:ok\n\n')
+        writer.writelines(hdr)
+        transport = writer.transport
+        try:
+            transport.set_write_buffer_limits(high=65536)  # type: ignore[union-attr]
+        except Exception:
+            pass
+        client = _Client(writer, (peer[0], peer[1]))
+        # Replay the publisher backlog (hello / full snapshot) to this client only
+        pub = self._publisher
+        if pub is not None:
+            backlog = list(getattr(pub, '_events', ()))
+            client.replayed = len(backlog)
+            for evt in backlog:
+                client.queue.append(encode_frame(evt))
+        self._clients.add(client)
+        _set_active_gauge(len(self._clients))
+        client.wake.set()
+        logger.info('sse_fanout accept ip=%s clients=%s', peer[0], len(self._clients))
+        watcher = asyncio.ensure_future(self._watch_eof(reader, client))
+        try:
+            await self._pump(client)
+        finally:
+            watcher.cancel()
+            self._evict(client, count=False)
+
+    async def _reject(self, writer: asyncio.StreamWriter, shim: _RequestShim) -> None:
+        try:
+            writer.write(shim.getvalue())
+            await asyncio.wait_for(writer.drain(), 1.0)
+        except Exception:
+            pass
+        writer.close()
+
+    async def _watch_eof(self, reader: asyncio.StreamReader, client: _Client) -> None:
+        try:
+            while await reader.read(1024):
+                pass
+        except Exception:
+            pass
+        self._evict(client, count=False)
+
+    async def _pump(self, client: _Client) -> None:
+        writer = client.writer
+        while not client.closed:
+            if not client.queue:
+                client.wake.clear()
+                await client.wake.wait()
+                continue
+            batch = list(client.queue)
+            client.queue.clear()
+            try:
+                # write() per frame (not writelines) so the transport pauses at its high-water mark
+                for frame in batch:
+                    writer.write(frame)
+                await asyncio.wait_for(writer.drain(), self.write_timeout)
+            except TimeoutError:
+                logger.info('sse_fanout evict ip=%s reason=write_timeout', client.client_address[0])
+                self._evict(client)
+                return
+            except Exception:
+                return
+            self.frames_sent += len(batch)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'clients': len(self._clients),
+            'frames_encoded': self.frames_encoded,
+            'frames_sent': self.frames_sent,
+            'evictions': self.evictions,
+            'dropped': self.dropped,
+        }
+
+
+def _set_active_gauge(n: int) -> None:
+    try:
+        from . import sse_http as _sseh
+        if _sseh._m_active is not None:
+            _sseh._m_active.set(n)  # type: ignore[attr-defined]
+    except Exception:
+        pass
+
+
+def serve_sse_fanout(port: int = 9320, bind: str = '127.0.0.1', publisher: Any = None) -> SSEFanoutServer:
+    """Start the fan-out server, attached to ``publisher`` (defaults to the registered one)."""
+    global _ACTIVE
+    if publisher is None:
+        try:
+            from .sse_http import get_publisher
+            publisher = get_publisher()
+        except Exception:
+            publisher = None
+    srv = SSEFanoutServer(bind, port, publisher=publisher).start()
+    _ACTIVE = srv
+    return srv
+
+
+def on_publisher_changed(publisher: Any) -> None:
+    """Re-attach the running fan-out server (if any) to a newly registered publisher."""
+    srv = _ACTIVE
+    if srv is not None and publisher is not None:
+        srv.attach(publisher)
+
+
+__all__ = ['SSEFanoutServer', 'encode_frame', 'serve_sse_fanout', 'on_publisher_changed']
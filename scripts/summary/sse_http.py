@@ -59,6 +59,11 @@ def set_publisher(publisher: Any) -> None:  # duck-typed SSEPublisher
         global _publisher_ref
         _publisher_ref = publisher
         _maybe_register_metrics()
+    try:
+        from .sse_fanout import on_publisher_changed
+        on_publisher_changed(publisher)
+    except Exception:
+        pass
 
 
 def get_publisher() -> Any:
@@ -681,7 +686,14 @@ def serve_sse_http(port: int = 9320, bind: str = '127.0.0.1', background: bool =
     blocked behind a long‑lived streaming handler. This fixes test scenarios
     where the second connection previously timed out waiting for the first
     (single-threaded) handler to finish.
+
+    With G6_SSE_FANOUT=1 the event-loop fan-out server (``sse_fanout``) is
+    started instead; it exposes the same ``shutdown()`` / ``server_close()``.
     """
+    if os.getenv('G6_SSE_FANOUT', '').lower() in ('1', 'true', 'yes', 'on'):
+        from .sse_fanout import serve_sse_fanout
+        _maybe_register_metrics()
+        return serve_sse_fanout(port=port, bind=bind)  # type: ignore[return-value]
     try:
         # Python 3.7+ provides ThreadingHTTPServer directly; fall back to
         # single-threaded only if import fails (should not happen in CI).
@@ -753,6 +765,12 @@ def initiate_sse_shutdown(reason: str = "requested") -> None:
     # Signal handlers to break early after emitting bye
     global _force_bye_close
     _force_bye_close = True
+    try:
+        from . import sse_fanout as _fanout
+        if _fanout._ACTIVE is not None:
+            _fanout._ACTIVE.shutdown(reason)
+    except Exception:
+        pass
     logger.debug("SSE shutdown programmatic trigger: %s (force_bye_close=1)", reason)
 
 # Compatibility helpers for unified_http: provide module-level _allow_event and
@@ -18,6 +18,8 @@ Where:
 
 Daily inputs (from collectors via CsvSink):
     data/g6_data/<INDEX>/<EXPIRY_TAG>/<OFFSET>/<YYYY-MM-DD>.csv
+or, with ``--source parquet`` (ParquetSink, G6_PARQUET_SINK=1):
+    data/g6_parquet/<INDEX>/<YYYY-MM-DD>/part-*.parquet  (only needed columns are read)
 
 CSV schema for masters (per row):
     timestamp, tp_mean, tp_ema, avg_tp_mean, avg_tp_ema, counter, index, expiry_tag, offset
@@ -33,6 +35,15 @@ Notes
 -----
 - Timestamps are treated verbatim (use upstream rounding if needed).
 - The updater is idempotent for the same inputs.
+
+Parallel builder (``--parallel``)
+---------------------------------
+Discovers every (index, expiry_tag, offset) series and updates them on a
+process pool. Each master is kept as slot-keyed binary arrays
+(``<WEEKDAY>.npz`` beside the CSV, see ``src/utils/overlay_master_store.py``)
+and updated with vectorized mean/EMA math; the CSV master is regenerated from
+the arrays unless ``--no-csv-mirror`` is given. An existing CSV master newer
+than its ``.npz`` (e.g. after a serial run) is re-imported first.
 """
 
 from __future__ import annotations
@@ -166,6 +177,41 @@ def iter_daily_rows(
                 print(f"[WARN] read fail {daily_file}: {e}")
 
 
+def _offset_dir_name(offset: Any) -> str:
+    try:
+        o = int(offset)
+    except Exception:
+        return str(offset)
+    return f"+{o}" if o > 0 else f"{o}"
+
+
+def iter_daily_rows_parquet(
+    parquet_dir: str,
+    index: str,
+    trade_date: date,
+    issues: list[dict] | None = None,
+) -> Generator[tuple[str, str, dict[str, Any]], None, None]:
+    """Parquet counterpart of iter_daily_rows: one column projection per (index, day)."""
+    from src.storage import parquet_sink as _pq
+    date_str = trade_date.strftime('%Y-%m-%d')
+    if not _pq.AVAILABLE:
+        if issues is not None:
+            issues.append({'type': 'read_error', 'index': index, 'path': parquet_dir, 'error': 'pyarrow not installed'})
+        return
+    columns = ['timestamp', 'expiry_tag', 'offset', 'ce', 'pe', 'avg_ce', 'avg_pe', *METRIC_FIELDS]
+    try:
+        rows = list(_pq.iter_rows(parquet_dir, index, date_str, columns))
+    except Exception as e:
+        if issues is not None:
+            issues.append({'type': 'read_error', 'index': index, 'path': parquet_dir, 'error': str(e)})
+        print(f"[WARN] parquet read fail {index} {date_str}: {e}")
+        return
+    if not rows and issues is not None:
+        issues.append({'type': 'missing_index_root', 'index': index, 'path': str(Path(parquet_dir) / index / date_str)})
+    for row in rows:
+        yield str(row.get('expiry_tag') or ''), _offset_dir_name(row.get('offset')), row
+
+
 def _normalize_indices(indices: list[str] | None) -> list[str]:
     """Normalize user-provided indices.
 
@@ -373,10 +419,12 @@ def update_weekday_master(
     backup: bool = False,
     market_open: str = "09:15:30",
     market_close: str = "15:30:00",
+    source: str = "csv",
 ) -> int:
     """Update weekday masters for a given index on the given trade_date.
 
     - Reads inputs from base_dir/<index>/<expiry>/<offset>/<YYYY-MM-DD>.csv
+      (or, with source='parquet', base_dir/<index>/<YYYY-MM-DD>/part-*.parquet)
     - Writes outputs to out_root/<index>/<expiry>/<offset>/<WEEKDAY>.csv (NEW schema)
     - Also writes legacy flat file at out_root/<Weekday>/<index>_<expiry>_<offset>.csv for compatibility.
     Returns: number of timestamps updated across all (expiry, offset).
@@ -390,7 +438,8 @@ def update_weekday_master(
     close_s = _hhmmss_to_seconds(market_close)
     if open_s < 0 or close_s < 0 or open_s >= close_s:
         raise ValueError(f"Invalid market window: {market_open} .. {market_close}")
-    for expiry_tag, offset, row in iter_daily_rows(base_dir, index, trade_date, issues):
+    row_iter = iter_daily_rows_parquet if source == 'parquet' else iter_daily_rows
+    for expiry_tag, offset, row in row_iter(base_dir, index, trade_date, issues):
         ts = _parse_time_key(row.get('timestamp', ''))
         if not ts:
             continue
@@ -490,6 +539,201 @@ def update_weekday_master(
 
     return count_updates
 
+# ---------------- Parallel builder (binary slot-keyed masters) -----------------
+
+MASTER_FIELDS = ['tp', 'avg_tp', *METRIC_FIELDS]
+
+
+def discover_series(
+    base_dir: str,
+    indices: list[str],
+    trade_date: date,
+    issues: list[dict] | None = None,
+) -> list[tuple[str, str, str]]:
+    """All (index, expiry_tag, offset) with a daily CSV for ``trade_date`` under ``base_dir``."""
+    date_str = trade_date.strftime('%Y-%m-%d')
+    out: list[tuple[str, str, str]] = []
+    for index in indices:
+        index_root = Path(base_dir) / index
+        if not index_root.exists():
+            if issues is not None:
+                issues.append({'type': 'missing_index_root', 'index': index, 'path': str(index_root)})
+            continue
+        for expiry_tag_dir in sorted(p for p in index_root.iterdir() if p.is_dir() and p.name != 'overview'):
+            for offset_dir in sorted(p for p in expiry_tag_dir.iterdir() if p.is_dir()):
+                if (offset_dir / f"{date_str}.csv").exists():
+                    out.append((index, expiry_tag_dir.name, offset_dir.name))
+                elif issues is not None:
+                    issues.append({
+                        'type': 'missing_daily_csv', 'index': index, 'expiry_tag': expiry_tag_dir.name,
+                        'offset': offset_dir.name, 'path': str(offset_dir / f"{date_str}.csv"),
+                    })
+    return out
+
+
+def _load_series_arrays(csv_path: Path, issues: list[dict]):
+    """Binary master for a series, bootstrapped from the CSV master when absent or older."""
+    from src.utils import overlay_master_store as _store
+    npz_path = _store.store_path(csv_path)
+    if npz_path.exists() and (not csv_path.exists() or npz_path.stat().st_mtime >= csv_path.stat().st_mtime):
+        try:
+            arr = _store.MasterArrays.load(npz_path, MASTER_FIELDS)
+            if arr is not None:
+                return arr
+        except Exception as e:
+            issues.append({'type': 'parse_master_error', 'path': str(npz_path), 'error': str(e)})
+    legacy = load_master_file(csv_path, issues)
+    if not legacy:
+        return _store.MasterArrays.empty(MASTER_FIELDS)
+    records: dict[int, dict[str, float | int]] = {}
+    counters: dict[int, int] = {}
+    for ts, rec in legacy.items():
+        slot = _hhmmss_to_seconds(ts)
+        if slot >= 0:
+            records[slot] = rec
+            counters[slot] = int(rec.get('counter', 0))
+    return _store.MasterArrays.from_records(records, counters, MASTER_FIELDS)
+
+
+def update_series_master(
+    out_root: str,
+    index: str,
+    expiry_tag: str,
+    offset: str,
+    rows: list[dict[str, Any]],
+    trade_date: date,
+    alpha: float,
+    open_s: int,
+    close_s: int,
+    *,
+    issues: list[dict],
+    backup: bool = False,
+    csv_mirror: bool = True,
+) -> int:
+    """Fold one day of rows for one series into its binary master (vectorized mean/EMA).
+
+    Same semantics as ``update_weekday_master``; with ``csv_mirror`` the CSV
+    master is regenerated from the arrays so existing readers keep working.
+    """
+    from src.utils import overlay_master_store as _store
+    np = _store.np
+    slots: list[int] = []
+    values: list[list[float]] = []
+    nan = float('nan')
+    for row in rows:
+        ts = _parse_time_key(row.get('timestamp', ''))
+        tsec = _hhmmss_to_seconds(ts) if ts else -1
+        if tsec < open_s or tsec > close_s:
+            continue
+        tp, avg_tp = compute_row_values(row)
+        vals = [tp, avg_tp]
+        for name in METRIC_FIELDS:
+            v = _parse_float(row.get(name))
+            vals.append(nan if v is None else v)
+        slots.append(tsec)
+        values.append(vals)
+    if not slots:
+        return 0
+    day_slots, day_values = _store.aggregate_day(slots, np.array(values))
+    csv_path = Path(out_root) / index / expiry_tag / offset / f"{WEEKDAY_NAMES_UPPER[trade_date.weekday()]}.csv"
+    master = _load_series_arrays(csv_path, issues)
+    updated = master.apply_day(day_slots, day_values, alpha)
+    if csv_mirror:
+        data: dict[str, dict[str, float | int]] = {}
+        for i, slot in enumerate(master.slots.tolist()):
+            rec: dict[str, float | int] = {'counter': int(master.counter[i])}
+            for j, name in enumerate(MASTER_FIELDS):
+                rec[f'{name}_mean'] = float(master.mean[i, j])
+                rec[f'{name}_ema'] = float(master.ema[i, j])
+            data[_store.hhmmss(slot)] = rec
+        write_master_file_new_schema(csv_path, index, expiry_tag, offset, data, backup=backup, issues=issues)
+    # Saved after the CSV so the binary master is never older than its mirror
+    master.save(_store.store_path(csv_path))
+    return updated
+
+
+def _series_task(task: dict[str, Any]) -> tuple[int, list[dict]]:
+    """Process-pool worker: one CSV series, or every series of one index for parquet input."""
+    issues: list[dict] = []
+    trade_date = date.fromisoformat(task['date'])
+    groups: dict[tuple[str, str], list[dict[str, Any]]] = {}
+    if task['source'] == 'parquet':
+        for expiry_tag, offset, row in iter_daily_rows_parquet(task['base_dir'], task['index'], trade_date, issues):
+            groups.setdefault((expiry_tag, offset), []).append(row)
+    else:
+        path = Path(task['base_dir']) / task['index'] / task['expiry_tag'] / task['offset'] / f"{task['date']}.csv"
+        try:
+            with open(path, newline='') as f:
+                groups[(task['expiry_tag'], task['offset'])] = list(csv.DictReader(f))
+        except Exception as e:
+            issues.append({
+                'type': 'read_error', 'index': task['index'], 'expiry_tag': task['expiry_tag'],
+                'offset': task['offset'], 'path': str(path), 'error': str(e),
+            })
+    total = 0
+    for (expiry_tag, offset), rows in groups.items():
+        total += update_series_master(
+            task['out_root'], task['index'], expiry_tag, offset, rows, trade_date, task['alpha'],
+            task['open_s'], task['close_s'], issues=issues, backup=task['backup'], csv_mirror=task['csv_mirror'],
+        )
+    return total, issues
+
+
+def build_weekday_masters(
+    base_dir: str,
+    out_root: str,
+    indices: list[str],
+    trade_date: date,
+    alpha: float,
+    *,
+    workers: int | None = None,
+    issues: list[dict] | None = None,
+    backup: bool = False,
+    market_open: str = "09:15:30",
+    market_close: str = "15:30:00",
+    source: str = "csv",
+    csv_mirror: bool = True,
+) -> int:
+    """Discover every (index, expiry_tag, offset) series and update their masters on a process pool.
+
+    Masters are kept as slot-keyed binary arrays (``src.utils.overlay_master_store``)
+    with the CSV master regenerated alongside unless ``csv_mirror`` is False.
+    Returns the number of timestamps updated across all series.
+    """
+    from src.utils import overlay_master_store as _store
+    if not _store.AVAILABLE:
+        raise RuntimeError("numpy is required for the parallel weekday master builder")
+    open_s = _hhmmss_to_seconds(market_open)
+    close_s = _hhmmss_to_seconds(market_close)
+    if open_s < 0 or close_s < 0 or open_s >= close_s:
+        raise ValueError(f"Invalid market window: {market_open} .. {market_close}")
+    run_issues = issues if issues is not None else []
+    common = {
+        'base_dir': base_dir, 'out_root': out_root, 'date': trade_date.isoformat(), 'alpha': alpha,
+        'open_s': open_s, 'close_s': close_s, 'backup': backup, 'source': source, 'csv_mirror': csv_mirror,
+    }
+    if source == 'parquet':
+        tasks = [{**common, 'index': idx} for idx in indices]
+    else:
+        tasks = [
+            {**common, 'index': idx, 'expiry_tag': tag, 'offset': off}
+            for idx, tag, off in discover_series(base_dir, indices, trade_date, run_issues)
+        ]
+    n_workers = max(1, min(workers or (os.cpu_count() or 1), len(tasks) or 1))
+    total = 0
+    if n_workers == 1:
+        results = map(_series_task, tasks)
+        for n, task_issues in results:
+            total += n
+            run_issues.extend(task_issues)
+        return total
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=n_workers) as pool:
+        for n, task_issues in pool.map(_series_task, tasks, chunksize=max(1, len(tasks) // (n_workers * 4))):
+            total += n
+            run_issues.extend(task_issues)
+    return total
+
 def main() -> None:
     ap = argparse.ArgumentParser(
         description="Build or update weekday master overlay averages (new layout).",
@@ -504,6 +748,12 @@ def main() -> None:
         default='data/weekday_master',
         help='Root directory for weekday master overlays (new layout root)',
     )
+    ap.add_argument(
+        '--source',
+        choices=['csv', 'parquet'],
+        default='csv',
+        help='Input format: per-offset CSV tree (default) or ParquetSink dataset (use --base-dir data/g6_parquet)',
+    )
     ap.add_argument('--date', help='Target trade date (YYYY-MM-DD), defaults today')
     ap.add_argument(
         '--index',
@@ -520,6 +770,17 @@ def main() -> None:
         type=float,
         help='EMA smoothing factor α (0<α<=1). Overrides config. Default 0.5',
     )
+    ap.add_argument(
+        '--parallel',
+        action='store_true',
+        help='Discover all (index, expiry, offset) series and update them on a process pool using binary slot-keyed masters',
+    )
+    ap.add_argument('--workers', type=int, help='Process pool size for --parallel (default: CPU count)')
+    ap.add_argument(
+        '--no-csv-mirror',
+        action='store_true',
+        help='With --parallel, keep only the binary <WEEKDAY>.npz masters (skip regenerating the CSV masters)',
+    )
     ap.add_argument(
         '--market-open',
         help='Override inclusive market open time HH:MM:SS; default comes from timeutils.get_market_session_bounds()',
@@ -621,7 +882,23 @@ def main() -> None:
     mo = args.market_open or os.environ.get('G6_MARKET_OPEN') or default_open
     mc = args.market_close or os.environ.get('G6_MARKET_CLOSE') or default_close
 
-    for idx in indices:
+    if args.parallel:
+        print(f"[INFO] Building weekday masters for {','.join(indices)} {trade_date} (parallel)...")
+        total = build_weekday_masters(
+            args.base_dir,
+            args.output_dir,
+            indices,
+            trade_date,
+            alpha,
+            workers=args.workers,
+            issues=run_issues,
+            backup=write_backup,
+            market_open=mo,
+            market_close=mc,
+            source=args.source,
+            csv_mirror=not args.no_csv_mirror,
+        )
+    for idx in ([] if args.parallel else indices):
         print(f"[INFO] Updating weekday master for {idx} {trade_date}...")
         updated = update_weekday_master(
             args.base_dir,
@@ -633,6 +910,7 @@ def main() -> None:
             backup=write_backup,
             market_open=mo,
             market_close=mc,
+            source=args.source,
         )
         print(f"[OK] {idx}: updated {updated} records")
         total += updated
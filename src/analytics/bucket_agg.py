@@ -0,0 +1,267 @@
+"""Shared moneyness-bucket aggregation engine (vol surface / risk aggregation).
+
+Both ``vol_surface.build_surface`` and ``risk_agg.build_risk`` reduce option
+rows to per (index, expiry, moneyness bucket) sums and counts. This module
+holds the common machinery:
+
+  * ``MoneynessBuckets`` - sorted edges searched with ``bisect`` (scalar) or
+    ``numpy.searchsorted`` (arrays) and interned bucket labels, built once per
+    edge set (``get_buckets``).
+  * ``BucketAggregator`` - keeps each option's last contribution and the group
+    sums. The first ``update`` (or any after ``reset``) is a full build using a
+    NumPy group-by (``bincount``) when NumPy is present. Later updates diff each
+    row against its previous contribution and only touch the sums of options
+    whose inputs changed; options missing from the cycle are removed. Sums are
+    re-derived from the stored contributions every ``resync_every`` updates to
+    bound floating point drift.
+
+Bucket semantics match the original linear scan: finite buckets are closed on
+both ends, a value on an interior edge lands in the lower bucket, and values
+outside the edges go to the open outer buckets ``<-inf,e0]`` / ``[eN,+inf)``.
+
+NumPy is optional; without it the same results come from the scalar path.
+"""
+from __future__ import annotations
+
+import bisect
+import math
+import sys
+from collections.abc import Callable, Iterable, Mapping
+from functools import lru_cache
+from typing import Any
+
+try:
+    import numpy as np
+    AVAILABLE = True
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore[assignment]
+    AVAILABLE = False
+
+__all__ = [
+    "AVAILABLE",
+    "MoneynessBuckets",
+    "BucketAggregator",
+    "get_buckets",
+    "moneyness_pct",
+]
+
+# (index, expiry, moneyness_pct, values)
+Parsed = tuple[str, str, float, tuple[float, ...]]
+GroupKey = tuple[str, str, int]
+
+
+def moneyness_pct(strike: float, underlying: float) -> float:
+    return ((strike / underlying) - 1.0) * 100.0
+
+
+class MoneynessBuckets:
+    """Moneyness bucket edges with interned labels.
+
+    Bucket ids: 0 -> ``<-inf,e0]``, i in 1..n-1 -> ``[e(i-1),e(i)]``,
+    n -> ``[e(n-1),+inf)``.
+    """
+
+    def __init__(self, edges: Iterable[float]):
+        self.edges: tuple[float, ...] = tuple(sorted({float(e) for e in edges}))
+        n = len(self.edges)
+        labels: list[str] = []
+        if n:
+            labels.append(f"<-inf,{self.edges[0]}]")
+            labels.extend(f"[{self.edges[i - 1]},{self.edges[i]}]" for i in range(1, n))
+            labels.append(f"[{self.edges[-1]},+inf)")
+        self.labels: tuple[str, ...] = tuple(sys.intern(lbl) for lbl in labels)
+        self._edge_arr = np.asarray(self.edges, dtype=float) if AVAILABLE else None
+
+    @property
+    def finite_labels(self) -> tuple[str, ...]:
+        return self.labels[1:-1]
+
+    def index_of(self, m: float) -> int | None:
+        """Bucket id for one moneyness value (None when no edges / NaN)."""
+        if not self.edges or m != m:
+            return None
+        j = bisect.bisect_left(self.edges, m)
+        if j == 0 and m == self.edges[0]:
+            return 1
+        return j
+
+    def indices(self, m: Any) -> Any:
+        """Vectorized ``index_of`` for a float array without NaNs."""
+        j = np.searchsorted(self._edge_arr, m, side="left")
+        j[(j == 0) & (m == self._edge_arr[0])] = 1
+        return j
+
+
+@lru_cache(maxsize=16)
+def get_buckets(edges: tuple[float, ...]) -> MoneynessBuckets:
+    return MoneynessBuckets(edges)
+
+
+def _option_key(row: Mapping[str, Any]) -> tuple[Any, ...]:
+    kind = row.get("type") or row.get("instrument_type") or row.get("option_type")
+    return (row.get("index"), row.get("expiry"), row.get("strike"), kind, row.get("symbol"))
+
+
+class BucketAggregator:
+    """Incremental (index, expiry, bucket) sums and counts over option rows.
+
+    ``parse(row)`` validates a row and returns ``(index, expiry, moneyness_pct,
+    values)`` or None to skip it; ``n_fields`` is ``len(values)``.
+    """
+
+    def __init__(
+        self,
+        buckets: MoneynessBuckets,
+        n_fields: int,
+        parse: Callable[[Mapping[str, Any]], Parsed | None],
+        *,
+        resync_every: int = 100,
+    ):
+        self.buckets = buckets
+        self.n_fields = n_fields
+        self._parse = parse
+        self.resync_every = max(1, int(resync_every))
+        self._contrib: dict[tuple[Any, ...], tuple[Parsed, GroupKey]] = {}
+        # group -> [sum_0, ..., sum_{n-1}, count]
+        self._groups: dict[GroupKey, list[float]] = {}
+        self._updates = 0
+
+    def __len__(self) -> int:
+        return len(self._contrib)
+
+    def reset(self) -> None:
+        self._contrib.clear()
+        self._groups.clear()
+        self._updates = 0
+
+    # ---------------- updates -----------------
+    def update(self, rows: Iterable[Mapping[str, Any]], max_rows: int | None = None) -> tuple[int, int]:
+        """Apply this cycle's complete row set; returns ``(processed, changed)``.
+
+        ``processed`` counts rows read (capped by ``max_rows``), ``changed``
+        the contributions added, replaced or removed.
+        """
+        entries, processed = self._read(rows, max_rows)
+        if not self._contrib:
+            self._rebuild(entries)
+            return processed, len(self._contrib)
+        changed = 0
+        seen: set[tuple[Any, ...]] = set()
+        for key, parsed in entries:
+            seen.add(key)
+            prev = self._contrib.get(key)
+            if prev is not None and prev[0] == parsed:
+                continue
+            changed += 1
+            if prev is not None:
+                self._sub(prev)
+                del self._contrib[key]
+            g = self._group_of(parsed)
+            if g is None:
+                seen.discard(key)
+                continue
+            self._add(g, parsed[3])
+            self._contrib[key] = (parsed, g)
+        for key in [k for k in self._contrib if k not in seen]:
+            self._sub(self._contrib.pop(key))
+            changed += 1
+        self._updates += 1
+        if self._updates >= self.resync_every:
+            self._rebuild([(k, c[0]) for k, c in self._contrib.items()])
+        return processed, changed
+
+    def _read(self, rows: Iterable[Mapping[str, Any]], max_rows: int | None) -> tuple[list[tuple[tuple[Any, ...], Parsed]], int]:
+        entries: list[tuple[tuple[Any, ...], Parsed]] = []
+        occurrences: dict[tuple[Any, ...], int] = {}
+        processed = 0
+        for row in rows:
+            if max_rows is not None and processed >= max_rows:
+                break
+            processed += 1
+            try:
+                parsed = self._parse(row)
+            except Exception:
+                parsed = None
+            if parsed is None or not math.isfinite(parsed[2]):
+                continue
+            base = _option_key(row)
+            n = occurrences.get(base, 0)
+            occurrences[base] = n + 1
+            entries.append((base + (n,), parsed))
+        return entries, processed
+
+    def _group_of(self, parsed: Parsed) -> GroupKey | None:
+        b = self.buckets.index_of(parsed[2])
+        if b is None:
+            return None
+        return (parsed[0], parsed[1], b)
+
+    def _add(self, g: GroupKey, values: tuple[float, ...]) -> None:
+        slot = self._groups.get(g)
+        if slot is None:
+            slot = [0.0] * (self.n_fields + 1)
+            self._groups[g] = slot
+        for i, v in enumerate(values):
+            slot[i] += v
+        slot[-1] += 1
+
+    def _sub(self, contrib: tuple[Parsed, GroupKey]) -> None:
+        parsed, g = contrib
+        slot = self._groups.get(g)
+        if slot is None:
+            return
+        slot[-1] -= 1
+        if slot[-1] <= 0:
+            del self._groups[g]
+            return
+        for i, v in enumerate(parsed[3]):
+            slot[i] -= v
+
+    def _rebuild(self, entries: list[tuple[tuple[Any, ...], Parsed]]) -> None:
+        """Recompute contributions and group sums from scratch (NumPy group-by when available)."""
+        self._contrib.clear()
+        self._groups.clear()
+        self._updates = 0
+        if not entries or not self.buckets.edges:
+            return
+        if not AVAILABLE:
+            for key, parsed in entries:
+                g = self._group_of(parsed)
+                if g is not None:
+                    self._add(g, parsed[3])
+                    self._contrib[key] = (parsed, g)
+            return
+        nb = len(self.buckets.labels)
+        pair_codes: dict[tuple[str, str], int] = {}
+        pairs: list[tuple[str, str]] = []
+        codes = np.empty(len(entries), dtype=np.int64)
+        for i, (_, parsed) in enumerate(entries):
+            pair = (parsed[0], parsed[1])
+            c = pair_codes.get(pair)
+            if c is None:
+                c = pair_codes[pair] = len(pairs)
+                pairs.append(pair)
+            codes[i] = c
+        m = np.fromiter((p[2] for _, p in entries), dtype=float, count=len(entries))
+        values = np.array([p[3] for _, p in entries], dtype=float).reshape(len(entries), self.n_fields)
+        bucket_ids = self.buckets.indices(m)
+        gid = codes * nb + bucket_ids
+        uniq, first, inv = np.unique(gid, return_index=True, return_inverse=True)
+        counts = np.bincount(inv, minlength=uniq.size)
+        sums = [np.bincount(inv, weights=values[:, k], minlength=uniq.size) for k in range(self.n_fields)]
+        for u in np.argsort(first, kind="stable"):
+            pair = pairs[int(uniq[u]) // nb]
+            g = (pair[0], pair[1], int(uniq[u]) % nb)
+            self._groups[g] = [float(s[u]) for s in sums] + [float(counts[u])]
+        for (key, parsed), code, b in zip(entries, codes.tolist(), bucket_ids.tolist(), strict=True):
+            pair = pairs[code]
+            self._contrib[key] = (parsed, (pair[0], pair[1], b))
+
+    # ---------------- results -----------------
+    def groups(self) -> Iterable[tuple[str, str, str, tuple[float, ...], int]]:
+        """Yield ``(index, expiry, bucket_label, sums, count)`` per populated group."""
+        labels = self.buckets.labels
+        for (index, expiry, b), slot in self._groups.items():
+            count = int(round(slot[-1]))
+            if count > 0:
+                yield index, expiry, labels[b], tuple(slot[:-1]), count
@@ -0,0 +1,120 @@
+"""Per-contract implied volatility seed cache.
+
+Remembers the last converged IV for each (index, expiry, strike, type) so the
+next cycle's solver starts next to the answer instead of from a cold guess.
+Consecutive cycles (~60s apart) usually need 1-2 Newton steps when seeded.
+
+Bounded LRU (``G6_IV_SEED_CACHE_MAX``, default 20000 contracts) and cleared on
+day rollover so stale seeds never leak across sessions/expiry rolls.
+
+Activation:
+    G6_IV_SEED_CACHE=1 (default on); set 0 to always cold start.
+
+Usage:
+    cache = get_iv_seed_cache()
+    seeds = cache.get_many(keys) if cache else [None] * len(keys)
+    ...solve...
+    cache.put_many(converged_pairs)
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable, Sequence
+
+from src.utils.env_flags import is_truthy_env
+
+__all__ = ["IVSeedCache", "get_iv_seed_cache", "contract_key"]
+
+SeedKey = Hashable
+
+
+def contract_key(index: str, expiry: object, strike: float, opt_type: str) -> tuple[str, str, float, str]:
+    """Normalized cache key for one option contract."""
+    exp = expiry.isoformat() if hasattr(expiry, 'isoformat') else str(expiry)
+    return (str(index), exp, float(strike), str(opt_type).upper())
+
+
+class IVSeedCache:
+    """Thread-safe LRU of last converged IV per contract with day rollover."""
+
+    def __init__(self, max_entries: int = 20000, today: Callable[[], _dt.date] | None = None) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._today = today or _dt.date.today
+        self._day = self._today()
+        self._data: OrderedDict[SeedKey, float] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _roll_locked(self) -> None:
+        day = self._today()
+        if day != self._day:
+            self._data.clear()
+            self._day = day
+
+    def get(self, key: SeedKey) -> float | None:
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: Sequence[SeedKey]) -> list[float | None]:
+        out: list[float | None] = []
+        with self._lock:
+            self._roll_locked()
+            data = self._data
+            for key in keys:
+                val = data.get(key)
+                if val is None:
+                    self.misses += 1
+                else:
+                    self.hits += 1
+                    data.move_to_end(key)
+                out.append(val)
+        return out
+
+    def put(self, key: SeedKey, iv: float) -> None:
+        self.put_many([(key, iv)])
+
+    def put_many(self, items: Iterable[tuple[SeedKey, float]]) -> None:
+        with self._lock:
+            self._roll_locked()
+            data = self._data
+            for key, iv in items:
+                data[key] = float(iv)
+                data.move_to_end(key)
+            overflow = len(data) - self.max_entries
+            for _ in range(max(0, overflow)):
+                data.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict[str, int]:
+        return {'size': len(self._data), 'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions}
+
+
+_CACHE: IVSeedCache | None = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_iv_seed_cache() -> IVSeedCache | None:
+    """Process-wide seed cache, or None when disabled via ``G6_IV_SEED_CACHE=0``."""
+    global _CACHE
+    if not is_truthy_env('G6_IV_SEED_CACHE', '1'):
+        return None
+    if _CACHE is None:
+        with _CACHE_LOCK:
+            if _CACHE is None:
+                try:
+                    max_entries = int(os.environ.get('G6_IV_SEED_CACHE_MAX', '20000'))
+                except ValueError:
+                    max_entries = 20000
+                _CACHE = IVSeedCache(max_entries=max_entries)
+    return _CACHE
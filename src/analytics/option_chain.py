@@ -1,14 +1,23 @@
 """
 Option Chain Analytics for G6 Platform
 Provides advanced option chain metrics and analysis.
+
+Max pain, PCR and OI support/resistance are computed from ``ChainArrays``
+(strike-sorted NumPy arrays built once per fetched chain). Writer pain at
+every candidate strike comes from prefix sums of OI and OI*strike, so max
+pain is O(n log n) in the number of strikes instead of O(n^2) row loops.
+``analyze_expiries`` fetches each expiry once and derives all three.
 """
 
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Any
 
+import numpy as np
 import pandas as pd
 
 from src.error_handling import (
@@ -18,6 +27,119 @@ from src.error_handling import (
 
 logger = logging.getLogger(__name__)
 
+MAX_PAIN_WIDTH = 0.1  # fraction of ATM fetched for max pain / support-resistance
+PCR_WIDTH = 0.05
+
+
+@dataclass(frozen=True)
+class ChainArrays:
+    """Per-strike arrays of a merged option chain, sorted by strike.
+
+    OI / volume are 0.0 where a leg is missing; ``has_call`` / ``has_put``
+    record which strikes actually carry that leg.
+    """
+
+    strikes: np.ndarray
+    call_oi: np.ndarray
+    put_oi: np.ndarray
+    call_volume: np.ndarray
+    put_volume: np.ndarray
+    has_call: np.ndarray
+    has_put: np.ndarray
+
+    @property
+    def empty(self) -> bool:
+        return self.strikes.size == 0
+
+
+def _column(df: pd.DataFrame, name: str) -> np.ndarray:
+    if name in df.columns:
+        return pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=float)
+    return np.full(len(df), np.nan)
+
+
+def prepare_chain_arrays(option_chain: pd.DataFrame) -> ChainArrays:
+    """Collapse a merged chain (``fetch_option_chain`` output) to strike-sorted arrays."""
+    if option_chain is None or option_chain.empty or "strike" not in option_chain.columns:
+        e = np.empty(0)
+        return ChainArrays(e, e, e, e, e, e.astype(bool), e.astype(bool))
+    raw_strikes = pd.to_numeric(option_chain["strike"], errors="coerce").to_numpy(dtype=float)
+    valid = ~np.isnan(raw_strikes)
+    strikes, inv = np.unique(raw_strikes[valid], return_inverse=True)
+    n = strikes.size
+
+    def per_strike(col: str) -> tuple[np.ndarray, np.ndarray]:
+        vals = _column(option_chain, col)[valid]
+        present = ~np.isnan(vals)
+        out = np.zeros(n)
+        np.add.at(out, inv[present], vals[present])
+        seen = np.zeros(n, dtype=bool)
+        seen[inv[present]] = True
+        return out, seen
+
+    call_oi, has_call = per_strike("oi_call")
+    put_oi, has_put = per_strike("oi_put")
+    call_volume, _ = per_strike("volume_call")
+    put_volume, _ = per_strike("volume_put")
+    return ChainArrays(strikes, call_oi, put_oi, call_volume, put_volume, has_call, has_put)
+
+
+def writer_pain(arrays: ChainArrays) -> np.ndarray:
+    """Total option-writer pain if expiry settles at each strike in ``arrays.strikes``.
+
+    call_pain[j] = sum_{i<=j} call_oi[i] * (K[j] - K[i])
+    put_pain[j]  = sum_{i>=j} put_oi[i]  * (K[i] - K[j])
+    evaluated with prefix / suffix sums of OI and OI*K.
+    """
+    k = arrays.strikes
+    if k.size == 0:
+        return np.empty(0)
+    c_cum = np.cumsum(arrays.call_oi)
+    ck_cum = np.cumsum(arrays.call_oi * k)
+    p_suf = np.cumsum(arrays.put_oi[::-1])[::-1]
+    pk_suf = np.cumsum((arrays.put_oi * k)[::-1])[::-1]
+    return (k * c_cum - ck_cum) + (pk_suf - k * p_suf)
+
+
+def max_pain_from_arrays(arrays: ChainArrays, default: float = 0.0) -> float:
+    """Strike with minimum writer pain (lowest strike on ties); ``default`` when empty."""
+    if arrays.empty:
+        return default
+    return float(arrays.strikes[int(np.argmin(writer_pain(arrays)))])
+
+
+def pcr_from_arrays(arrays: ChainArrays, lo: float | None = None, hi: float | None = None) -> dict[str, float]:
+    """OI and volume put-call ratios, optionally restricted to strikes in ``[lo, hi]``."""
+    mask = np.ones(arrays.strikes.size, dtype=bool)
+    if lo is not None:
+        mask &= arrays.strikes >= lo
+    if hi is not None:
+        mask &= arrays.strikes <= hi
+    call_oi = float(arrays.call_oi[mask].sum())
+    put_oi = float(arrays.put_oi[mask].sum())
+    call_vol = float(arrays.call_volume[mask].sum())
+    put_vol = float(arrays.put_volume[mask].sum())
+    return {
+        "oi_pcr": put_oi / call_oi if call_oi > 0 else 0,
+        "volume_pcr": put_vol / call_vol if call_vol > 0 else 0,
+    }
+
+
+def support_resistance_from_arrays(arrays: ChainArrays, current_price: float, top: int = 3) -> dict[str, list[float]]:
+    """Top-``top`` put OI strikes below and call OI strikes above ``current_price``."""
+    def top_strikes(oi: np.ndarray, present: np.ndarray) -> np.ndarray:
+        idx = np.flatnonzero(present)
+        order = np.argsort(-oi[idx], kind="stable")[:top]
+        return arrays.strikes[idx[order]]
+
+    puts = top_strikes(arrays.put_oi, arrays.has_put)
+    calls = top_strikes(arrays.call_oi, arrays.has_call)
+    return {
+        "support": sorted(float(k) for k in puts if k < current_price),
+        "resistance": sorted(float(k) for k in calls if k > current_price),
+    }
+
+
 class OptionChainAnalytics:
     """Advanced analytics for option chains."""
 
@@ -156,11 +278,39 @@ class OptionChainAnalytics:
 
         return merged_df
 
+    def _atm_strike(self, index_symbol: str) -> float:
+        """ATM strike from the provider (LTP fallback); 0 when unavailable."""
+        if hasattr(self.provider, 'get_atm_strike'):
+            return self.provider.get_atm_strike(index_symbol)
+        try:  # Fallback to LTP rounding logic
+            return self.provider.get_ltp(index_symbol)
+        except Exception:
+            handle_api_error(
+                AttributeError("missing ATM strike capability"),
+                component="analytics.option_chain",
+                context={"index": index_symbol},
+            )
+            logger.error("Provider missing ATM strike capability; defaulting to 0")
+            return 0
+
+    def _chain_arrays(
+        self,
+        index_symbol: str,
+        expiry_date: date | datetime,
+        current_price: float,
+        width_percent: float,
+    ) -> ChainArrays:
+        range_width = current_price * width_percent
+        option_chain = self.fetch_option_chain(
+            index_symbol, expiry_date, (current_price - range_width, current_price + range_width)
+        )
+        return prepare_chain_arrays(option_chain)
+
     def calculate_pcr(
         self,
         index_symbol: str,
         expiry_date: date | datetime,
-        width_percent: float = 0.05
+        width_percent: float = PCR_WIDTH
     ) -> dict[str, float]:
         """
         Calculate Put-Call Ratio metrics.
@@ -173,50 +323,12 @@ class OptionChainAnalytics:
         Returns:
             Dict with various PCR metrics
         """
-        # Get ATM strike
-        if hasattr(self.provider, 'get_atm_strike'):
-            atm_strike = self.provider.get_atm_strike(index_symbol)
-        else:  # Fallback to LTP rounding logic
-            try:
-                atm_strike = self.provider.get_ltp(index_symbol)
-            except Exception:
-                handle_api_error(
-                    AttributeError("missing ATM strike capability"),
-                    component="analytics.option_chain",
-                    context={"index": index_symbol},
-                )
-                logger.error("Provider missing ATM strike capability; defaulting to 0")
-                atm_strike = 0
-
-        # Calculate strike range
-        current_price = float(atm_strike)
-        range_width = current_price * width_percent
-        min_strike = current_price - range_width
-        max_strike = current_price + range_width
-
-        # Get option chain
-        option_chain = self.fetch_option_chain(
-            index_symbol, expiry_date, (min_strike, max_strike)
-        )
-
-        if option_chain.empty:
+        current_price = float(self._atm_strike(index_symbol))
+        arrays = self._chain_arrays(index_symbol, expiry_date, current_price, width_percent)
+        if arrays.empty:
             logger.debug(f"Empty option chain for {index_symbol} {expiry_date}; PCR defaults to 0")
             return {"oi_pcr": 0.0, "volume_pcr": 0.0}
-
-        # Calculate PCR
-        total_call_oi = option_chain["oi_call"].sum()
-        total_put_oi = option_chain["oi_put"].sum()
-
-        total_call_volume = option_chain["volume_call"].sum()
-        total_put_volume = option_chain["volume_put"].sum()
-
-        oi_pcr = total_put_oi / total_call_oi if total_call_oi > 0 else 0
-        volume_pcr = total_put_volume / total_call_volume if total_call_volume > 0 else 0
-
-        return {
-            "oi_pcr": oi_pcr,
-            "volume_pcr": volume_pcr
-        }
+        return pcr_from_arrays(arrays)
 
     def calculate_max_pain(
         self,
@@ -228,71 +340,12 @@ class OptionChainAnalytics:
         
         Returns the strike price where max pain occurs.
         """
-        # Get ATM strike
-        if hasattr(self.provider, 'get_atm_strike'):
-            atm_strike = self.provider.get_atm_strike(index_symbol)
-        else:
-            try:
-                atm_strike = self.provider.get_ltp(index_symbol)
-            except Exception:
-                handle_api_error(
-                    AttributeError("missing ATM strike capability"),
-                    component="analytics.option_chain",
-                    context={"index": index_symbol},
-                )
-                logger.error("Provider missing ATM strike capability; defaulting to 0")
-                atm_strike = 0
-
-        # Calculate strike range (wide enough for max pain)
-        current_price = float(atm_strike)
-        range_width = current_price * 0.1  # 10% range
-        min_strike = current_price - range_width
-        max_strike = current_price + range_width
-
-        # Get option chain
-        option_chain = self.fetch_option_chain(
-            index_symbol, expiry_date, (min_strike, max_strike)
-        )
-
-        if option_chain.empty:
+        atm_strike = self._atm_strike(index_symbol)
+        arrays = self._chain_arrays(index_symbol, expiry_date, float(atm_strike), MAX_PAIN_WIDTH)
+        if arrays.empty:
             logger.debug(f"Empty option chain for max pain calculation {index_symbol} {expiry_date}; returning ATM {atm_strike}")
             return atm_strike
-
-        # Get unique strikes
-        strikes = sorted(option_chain["strike"].unique())
-
-        # Calculate pain at each potential expiry price
-        min_pain = float("inf")
-        max_pain_strike = atm_strike
-
-        for potential_price in strikes:
-            # Calculate pain for call options
-            call_pain = 0
-            for _, row in option_chain[option_chain["type_call"] == "CE"].iterrows():
-                strike = row["strike"]
-                oi = row["oi_call"]
-                if potential_price > strike:
-                    # Call ITM, pain to writers
-                    call_pain += oi * (potential_price - strike)
-
-            # Calculate pain for put options
-            put_pain = 0
-            for _, row in option_chain[option_chain["type_put"] == "PE"].iterrows():
-                strike = row["strike"]
-                oi = row["oi_put"]
-                if potential_price < strike:
-                    # Put ITM, pain to writers
-                    put_pain += oi * (strike - potential_price)
-
-            # Total pain at this price point
-            total_pain = call_pain + put_pain
-
-            # Update max pain if this is lower
-            if total_pain < min_pain:
-                min_pain = total_pain
-                max_pain_strike = potential_price
-
-        return max_pain_strike
+        return max_pain_from_arrays(arrays, default=atm_strike)
 
     def calculate_support_resistance(
         self,
@@ -304,55 +357,36 @@ class OptionChainAnalytics:
         
         Returns dict with "support" and "resistance" lists of levels.
         """
-        # Get ATM strike
-        if hasattr(self.provider, 'get_atm_strike'):
-            atm_strike = self.provider.get_atm_strike(index_symbol)
-        else:
-            try:
-                atm_strike = self.provider.get_ltp(index_symbol)
-            except Exception:
-                handle_api_error(
-                    AttributeError("missing ATM strike capability"),
-                    component="analytics.option_chain",
-                    context={"index": index_symbol},
-                )
-                logger.error("Provider missing ATM strike capability; defaulting to 0")
-                atm_strike = 0
-
-        # Calculate strike range
-        current_price = float(atm_strike)
-        range_width = current_price * 0.1  # 10% range
-        min_strike = current_price - range_width
-        max_strike = current_price + range_width
-
-        # Get option chain
-        option_chain = self.fetch_option_chain(
-            index_symbol, expiry_date, (min_strike, max_strike)
-        )
-
-        if option_chain.empty:
-            return {"support": [], "resistance": []}
+        current_price = float(self._atm_strike(index_symbol))
+        arrays = self._chain_arrays(index_symbol, expiry_date, current_price, MAX_PAIN_WIDTH)
+        return support_resistance_from_arrays(arrays, current_price)
 
-        # Find support levels (put OI clusters)
-        put_data = option_chain[["strike", "oi_put"]].dropna()
-        put_data = put_data.sort_values("oi_put", ascending=False)
-
-        # Find resistance levels (call OI clusters)
-        call_data = option_chain[["strike", "oi_call"]].dropna()
-        call_data = call_data.sort_values("oi_call", ascending=False)
-
-        # Get top levels
-        support_levels = []
-        for _, row in put_data.head(3).iterrows():
-            if row["strike"] < current_price:  # Only consider strikes below current price
-                support_levels.append(float(row["strike"]))
+    def analyze_expiries(
+        self,
+        index_symbol: str,
+        expiries: Iterable[date | datetime],
+        pcr_width_percent: float = PCR_WIDTH,
+    ) -> dict[Any, dict[str, Any]]:
+        """
+        Max pain, PCR and support/resistance for several expiries in one pass.
 
-        resistance_levels = []
-        for _, row in call_data.head(3).iterrows():
-            if row["strike"] > current_price:  # Only consider strikes above current price
-                resistance_levels.append(float(row["strike"]))
+        The ATM strike is resolved once and each expiry's chain is fetched once
+        (max-pain width); PCR is taken from the strikes within
+        ``pcr_width_percent`` of ATM in the same arrays.
 
-        return {
-            "support": sorted(support_levels),
-            "resistance": sorted(resistance_levels)
-        }
+        Returns {expiry: {"max_pain", "oi_pcr", "volume_pcr", "support", "resistance"}}.
+        """
+        atm_strike = self._atm_strike(index_symbol)
+        current_price = float(atm_strike)
+        pcr_range = current_price * pcr_width_percent
+        out: dict[Any, dict[str, Any]] = {}
+        for expiry in expiries:
+            arrays = self._chain_arrays(index_symbol, expiry, current_price, MAX_PAIN_WIDTH)
+            if arrays.empty:
+                logger.debug(f"Empty option chain for {index_symbol} {expiry}; analytics default to ATM/0")
+            out[expiry] = {
+                "max_pain": max_pain_from_arrays(arrays, default=atm_strike),
+                **pcr_from_arrays(arrays, current_price - pcr_range, current_price + pcr_range),
+                **support_resistance_from_arrays(arrays, current_price),
+            }
+        return out
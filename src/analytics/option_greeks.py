@@ -9,7 +9,9 @@ import logging
 import math
 from datetime import UTC, date, datetime
 from datetime import time as _time
+from typing import Any
 
+from src.analytics import option_greeks_batch as _batch
 from src.error_handling import handle_api_error
 
 try:  # Prefer scipy for accuracy
@@ -185,6 +187,26 @@ class OptionGreeks:
             "rho": 0.0
         }
 
+    @staticmethod
+    def rational_initial_guess(is_call: bool, S: float, K: float, T: float, market_price: float, r: float, q: float = 0.0) -> float | None:
+        """Corrado-Miller closed-form IV approximation (Brenner-Subrahmanyam at the money).
+
+        Returns None when the approximation is undefined for the inputs.
+        """
+        try:
+            fwd = S * math.exp(-q * T)
+            disc_k = K * math.exp(-r * T)
+            call_px = market_price if is_call else market_price + fwd - disc_k
+            spread = fwd - disc_k
+            a = call_px - 0.5 * spread
+            root = math.sqrt(max(a * a - spread * spread / math.pi, 0.0))
+            guess = math.sqrt(2.0 * math.pi) / (fwd + disc_k) * (a + root) / math.sqrt(T)
+        except (ValueError, ZeroDivisionError, OverflowError):
+            return None
+        if not math.isfinite(guess) or guess <= 0:
+            return None
+        return guess
+
     def implied_volatility(
         self,
         is_call: bool,
@@ -199,7 +221,8 @@ class OptionGreeks:
         max_iterations: int = 100,
         min_iv: float = 0.01,
         max_iv: float = 5.0,
-        return_iterations: bool = False
+        return_iterations: bool = False,
+        initial_sigma: float | None = None
     ) -> float | tuple[float, int]:
         """
         Calculate implied volatility using Newton-Raphson method.
@@ -211,6 +234,9 @@ class OptionGreeks:
             Hard bounds for solver (clamped each iteration).
         return_iterations : bool
             When True returns tuple (iv, iterations_used) for metrics instrumentation.
+        initial_sigma : float | None
+            Warm-start seed (e.g. last converged IV for the contract). When None the
+            Corrado-Miller rational approximation is used, falling back to 0.3.
         """
         # Handle date inputs for T
         if isinstance(T, (date, datetime)):
@@ -227,8 +253,10 @@ class OptionGreeks:
         if market_price <= 0.01:
             return (min_iv, 0) if return_iterations else min_iv  # Minimum IV to avoid division by zero issues
 
-        # Initial guess
-        sigma = 0.3  # 30% as starting point
+        # Initial guess: caller seed, else closed-form approximation, else 30%
+        sigma = initial_sigma if initial_sigma is not None and initial_sigma > 0 else None
+        if sigma is None:
+            sigma = self.rational_initial_guess(is_call, S, K, T, market_price, r, q) or 0.3
         if sigma < min_iv:
             sigma = min_iv
         if sigma > max_iv:
@@ -258,3 +286,67 @@ class OptionGreeks:
 
         # If we didn't converge, return our best guess
         return (sigma, iterations_used) if return_iterations else sigma
+
+    # ------------------------------------------------------------------
+    # Vectorized (whole-expiry) variants
+    # ------------------------------------------------------------------
+    @staticmethod
+    def batch_available() -> bool:
+        """True when the NumPy batch engine can be used."""
+        return _batch.AVAILABLE
+
+    def black_scholes_batch(
+        self,
+        is_call: Any,
+        S: Any,
+        K: Any,
+        T: Any,
+        r: float | None = None,
+        sigma: Any = 0.20,
+        q: float = 0.0,
+        current_date: date | datetime | None = None
+    ) -> dict[str, Any]:
+        """Array form of :meth:`black_scholes`.
+
+        ``is_call``, ``S``, ``K``, ``sigma`` may be scalars or arrays (broadcast).
+        ``T`` may be a single expiry date (converted once) or year fractions.
+        Returns a dict of NumPy arrays keyed like the scalar result.
+        """
+        if isinstance(T, (date, datetime)):
+            T = self._calculate_dte(T, current_date)
+        if r is None:
+            r = self.risk_free_rate
+        return _batch.black_scholes_arrays(is_call, S, K, T, r, sigma, q)
+
+    def implied_volatility_batch(
+        self,
+        is_call: Any,
+        S: Any,
+        K: Any,
+        T: Any,
+        market_price: Any,
+        r: float | None = None,
+        q: float = 0.0,
+        current_date: date | datetime | None = None,
+        precision: float = 0.00001,
+        max_iterations: int = 100,
+        min_iv: float = 0.01,
+        max_iv: float = 5.0,
+        return_iterations: bool = False,
+        initial_sigma: Any = None,
+    ) -> Any:
+        """Array form of :meth:`implied_volatility` (vectorized Newton/bisection).
+
+        ``initial_sigma`` optionally seeds elements (NaN = cold start). Returns an
+        IV array, or ``(iv, iterations)`` arrays when ``return_iterations`` is True.
+        """
+        if isinstance(T, (date, datetime)):
+            T = self._calculate_dte(T, current_date)
+        if r is None:
+            r = self.risk_free_rate
+        iv, iters = _batch.implied_volatility_arrays(
+            is_call, S, K, T, market_price, r, q,
+            precision=precision, max_iterations=max_iterations,
+            min_iv=min_iv, max_iv=max_iv, initial_sigma=initial_sigma,
+        )
+        return (iv, iters) if return_iterations else iv
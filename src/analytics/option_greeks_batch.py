@@ -0,0 +1,281 @@
+"""Vectorized Black-Scholes / implied volatility engine.
+
+Array counterpart of :class:`src.analytics.option_greeks.OptionGreeks` used to
+price a whole expiry (one strike ladder, both legs) per call instead of one
+option at a time.
+
+Functions:
+    black_scholes_arrays(is_call, S, K, T, r, sigma, q) -> dict[str, ndarray]
+    implied_volatility_arrays(is_call, S, K, T, market_price, r, q, ...) -> (iv, iterations)
+
+Solver:
+    Vectorized Newton/bisection hybrid (Brent-style safeguard). Each element
+    keeps its own bracket [lo, hi]; a Newton step that leaves the bracket (or a
+    vanishing vega) falls back to bisection. Per-element convergence masks shrink
+    the active set every iteration so converged strikes cost nothing further.
+    Price and vega are produced by the same evaluation (the scalar solver calls
+    ``black_scholes`` twice per iteration).
+
+Cold starts use the Corrado-Miller rational guess (Brenner-Subrahmanyam
+generalised away from the money); callers with a previously converged IV for
+the same contract pass it through ``initial_sigma`` (see
+``src.analytics.iv_seed_cache``).
+
+Semantics mirror the scalar implementation:
+    - T <= 0            -> iv 0.0, 0 iterations
+    - market_price <= 0.01 -> iv min_iv, 0 iterations
+    - no convergence    -> last iterate (best guess)
+    - T <= 0 or sigma <= 0 in pricing -> intrinsic value / step delta, zero greeks
+
+NumPy is optional at import time; ``AVAILABLE`` is False when it is missing and
+callers fall back to the scalar path.
+"""
+from __future__ import annotations
+
+import math
+from typing import Any
+
+try:
+    import numpy as np
+    AVAILABLE = True
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore[assignment]
+    AVAILABLE = False
+
+try:  # Prefer scipy special function when present (matches option_greeks preference)
+    from scipy.special import ndtr as _ndtr  # type: ignore
+except Exception:
+    _ndtr = None
+
+__all__ = [
+    "AVAILABLE",
+    "norm_cdf",
+    "norm_pdf",
+    "black_scholes_arrays",
+    "initial_guess_arrays",
+    "implied_volatility_arrays",
+]
+
+_INV_SQRT_2PI = 1.0 / math.sqrt(2.0 * math.pi)
+_BRACKET_EPS = 1e-12
+_SQRT_2PI = math.sqrt(2.0 * math.pi)
+_DEFAULT_SIGMA = 0.3
+
+
+def norm_pdf(x: Any) -> Any:
+    return _INV_SQRT_2PI * np.exp(-0.5 * x * x)
+
+
+def norm_cdf(x: Any) -> Any:
+    """Standard normal CDF (double precision).
+
+    Uses scipy's ``ndtr`` when installed, otherwise Hart's 1968 rational
+    approximation (West 2005 formulation), accurate to ~1e-14.
+    """
+    if _ndtr is not None:
+        return _ndtr(x)
+    x = np.asarray(x, dtype=float)
+    ax = np.abs(x)
+    e = np.exp(-0.5 * ax * ax)
+    num = 3.52624965998911e-02 * ax + 0.700383064443688
+    num = num * ax + 6.37396220353165
+    num = num * ax + 33.912866078383
+    num = num * ax + 112.079291497871
+    num = num * ax + 221.213596169931
+    num = num * ax + 220.206867912376
+    den = 8.83883476483184e-02 * ax + 1.75566716318264
+    den = den * ax + 16.064177579207
+    den = den * ax + 86.7807322029461
+    den = den * ax + 296.564248779674
+    den = den * ax + 637.333633378831
+    den = den * ax + 793.826512519948
+    den = den * ax + 440.413735824752
+    near = e * num / den
+    # Continued fraction for the far tail (|x| >= 7.07)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cf = ax + 0.65
+        cf = ax + 4.0 / cf
+        cf = ax + 3.0 / cf
+        cf = ax + 2.0 / cf
+        cf = ax + 1.0 / cf
+        far = e / cf / 2.506628274631
+    tail = np.where(ax < 7.07106781186547, near, far)
+    tail = np.where(ax > 37.0, 0.0, tail)
+    return np.where(x > 0, 1.0 - tail, tail)
+
+
+def _broadcast(*values: Any) -> list[Any]:
+    return [np.asarray(v, dtype=float) for v in np.broadcast_arrays(*values)]
+
+
+def black_scholes_arrays(
+    is_call: Any,
+    S: Any,
+    K: Any,
+    T: Any,
+    r: Any,
+    sigma: Any,
+    q: Any = 0.0,
+) -> dict[str, Any]:
+    """Price and greeks for arrays of options (broadcast over all inputs).
+
+    Output keys/units match ``OptionGreeks.black_scholes``: theta per day,
+    vega and rho per 1% move.
+    """
+    call = np.asarray(is_call, dtype=bool)
+    S, K, T, r, sigma, q = _broadcast(S, K, T, r, sigma, q)
+    call = np.broadcast_to(call, S.shape)
+    shape = S.shape
+
+    price = np.where(call, np.maximum(S - K, 0.0), np.maximum(K - S, 0.0))
+    delta = np.where(call, np.where(S > K, 1.0, 0.0), np.where(S < K, -1.0, 0.0))
+    out = {
+        "price": price,
+        "delta": delta,
+        "gamma": np.zeros(shape),
+        "theta": np.zeros(shape),
+        "vega": np.zeros(shape),
+        "rho": np.zeros(shape),
+    }
+    live = (T > 0) & (sigma > 0) & (S > 0) & (K > 0)
+    if not live.any():
+        return out
+
+    c = call[live]
+    s, k, t, rr, v, qq = S[live], K[live], T[live], r[live], sigma[live], q[live]
+    sqrt_t = np.sqrt(t)
+    vol_t = v * sqrt_t
+    d1 = (np.log(s / k) + (rr - qq + 0.5 * v * v) * t) / vol_t
+    d2 = d1 - vol_t
+    disc_q = np.exp(-qq * t)
+    disc_r = np.exp(-rr * t)
+    pdf_d1 = norm_pdf(d1)
+    nd1 = norm_cdf(d1)
+    nd2 = norm_cdf(d2)
+    n_md1 = 1.0 - nd1
+    n_md2 = 1.0 - nd2
+
+    call_px = s * disc_q * nd1 - k * disc_r * nd2
+    put_px = k * disc_r * n_md2 - s * disc_q * n_md1
+    theta_base = -(s * v * disc_q * pdf_d1) / (2.0 * sqrt_t)
+    call_theta = theta_base - (rr * k * disc_r * nd2 - qq * s * disc_q * nd1)
+    put_theta = theta_base - (rr * k * disc_r * n_md2 - qq * s * disc_q * n_md1)
+
+    out["price"][live] = np.where(c, call_px, put_px)
+    out["delta"][live] = np.where(c, disc_q * nd1, disc_q * (nd1 - 1.0))
+    out["gamma"][live] = disc_q * pdf_d1 / (s * vol_t)
+    out["theta"][live] = np.where(c, call_theta, put_theta) / 365.0
+    out["vega"][live] = s * disc_q * pdf_d1 * sqrt_t / 100.0
+    out["rho"][live] = np.where(c, k * t * disc_r * nd2, -k * t * disc_r * n_md2) / 100.0
+    return out
+
+
+def _price_and_vega(call: Any, s: Any, k: Any, t: Any, r: Any, v: Any, q: Any) -> tuple[Any, Any]:
+    """Single evaluation returning price and raw (per 1.0 vol) vega."""
+    sqrt_t = np.sqrt(t)
+    vol_t = v * sqrt_t
+    d1 = (np.log(s / k) + (r - q + 0.5 * v * v) * t) / vol_t
+    d2 = d1 - vol_t
+    disc_q = np.exp(-q * t)
+    disc_r = np.exp(-r * t)
+    nd1 = norm_cdf(d1)
+    nd2 = norm_cdf(d2)
+    call_px = s * disc_q * nd1 - k * disc_r * nd2
+    # put via parity keeps a single cdf evaluation pair
+    put_px = call_px - s * disc_q + k * disc_r
+    price = np.where(call, call_px, put_px)
+    vega = s * disc_q * norm_pdf(d1) * sqrt_t
+    return price, vega
+
+
+def initial_guess_arrays(is_call: Any, S: Any, K: Any, T: Any, market_price: Any, r: Any, q: Any = 0.0) -> Any:
+    """Corrado-Miller closed-form IV approximation (NaN where undefined)."""
+    call = np.asarray(is_call, dtype=bool)
+    S, K, T, price, r, q = _broadcast(S, K, T, market_price, r, q)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        fwd = S * np.exp(-q * T)
+        disc_k = K * np.exp(-r * T)
+        call_px = np.where(call, price, price + fwd - disc_k)
+        spread = fwd - disc_k
+        a = call_px - 0.5 * spread
+        root = np.sqrt(np.maximum(a * a - spread * spread / math.pi, 0.0))
+        guess = _SQRT_2PI / (fwd + disc_k) * (a + root) / np.sqrt(T)
+    return np.where(np.isfinite(guess) & (guess > 0), guess, np.nan)
+
+
+def implied_volatility_arrays(
+    is_call: Any,
+    S: Any,
+    K: Any,
+    T: Any,
+    market_price: Any,
+    r: Any,
+    q: Any = 0.0,
+    precision: float = 0.00001,
+    max_iterations: int = 100,
+    min_iv: float = 0.01,
+    max_iv: float = 5.0,
+    initial_sigma: Any = None,
+) -> tuple[Any, Any]:
+    """Solve implied volatility for arrays of options.
+
+    ``initial_sigma`` seeds individual elements (NaN / <=0 / None means cold
+    start from the rational guess). Returns ``(iv, iterations)`` arrays;
+    ``iterations`` counts pricing evaluations per element (same meaning as the
+    scalar ``return_iterations``).
+    """
+    if initial_sigma is None:
+        initial_sigma = np.nan
+    call = np.asarray(is_call, dtype=bool)
+    S, K, T, price, r, q, sigma0 = _broadcast(S, K, T, market_price, r, q, initial_sigma)
+    call = np.broadcast_to(call, S.shape).copy()
+    n = S.shape
+    iv = np.zeros(n)
+    iters = np.zeros(n, dtype=np.int64)
+
+    expired = T <= 0
+    cheap = ~expired & (price <= 0.01)
+    iv[cheap] = min_iv
+    invalid = ~expired & ~cheap & ((S <= 0) | (K <= 0))
+    active = ~(expired | cheap | invalid)
+
+    seeded = np.isfinite(sigma0) & (sigma0 > 0)
+    sigma = sigma0.copy()
+    cold = active & ~seeded
+    if cold.any():
+        guess = initial_guess_arrays(call[cold], S[cold], K[cold], T[cold], price[cold], r[cold], q[cold])
+        sigma[cold] = np.where(np.isnan(guess), _DEFAULT_SIGMA, guess)
+    sigma = np.clip(np.where(np.isfinite(sigma), sigma, _DEFAULT_SIGMA), min_iv, max_iv)
+    lo = np.full(n, float(min_iv))
+    hi = np.full(n, float(max_iv))
+    idx = np.flatnonzero(active.ravel())
+    sigma_f, lo_f, hi_f, iters_f = sigma.ravel(), lo.ravel(), hi.ravel(), iters.ravel()
+    call_f, S_f, K_f, T_f, r_f, q_f, p_f = (a.ravel() for a in (call, S, K, T, r, q, price))
+
+    for i in range(max_iterations):
+        if idx.size == 0:
+            break
+        s = sigma_f[idx]
+        model, vega = _price_and_vega(call_f[idx], S_f[idx], K_f[idx], T_f[idx], r_f[idx], s, q_f[idx])
+        diff = model - p_f[idx]
+        iters_f[idx] = i + 1
+        done = np.abs(diff) < precision
+        # price is increasing in sigma: shrink bracket around the root
+        lo_i = np.where(diff < 0, s, lo_f[idx])
+        hi_i = np.where(diff > 0, s, hi_f[idx])
+        lo_f[idx] = lo_i
+        hi_f[idx] = hi_i
+        flat = vega < 1e-10
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = s - diff / np.where(flat, 1.0, vega)
+        bisect = flat | ~np.isfinite(newton) | (newton <= lo_i) | (newton >= hi_i)
+        step = np.where(bisect, 0.5 * (lo_i + hi_i), newton)
+        sigma_f[idx] = np.where(done, s, step)
+        # bracket collapsed onto a bound: price unattainable in [min_iv, max_iv]
+        done |= (hi_i - lo_i) < _BRACKET_EPS
+        idx = idx[~done]
+
+    iv_f = iv.ravel()
+    act = active.ravel()
+    iv_f[act] = sigma_f[act]
+    return iv, iters
@@ -9,6 +9,9 @@ Environment (new):
     G6_RISK_AGG_BUCKETS   Comma separated moneyness bucket edges (percent). Default: -20,-10,-5,0,5,10,20
     G6_RISK_AGG_MAX_OPTIONS  Safety cap on processed option rows (default 25000)
 
+Bucketing and sums come from ``bucket_agg.BucketAggregator``; repeated builds
+only re-apply options whose greeks/underlying changed since the last build.
+
 Input Contract (duck-typed):
     Iterable of dicts with fields: index, expiry, strike, underlying, delta, gamma, vega, theta, rho
     or provider object exposing get_option_snapshots(). Missing fields skipped.
@@ -29,10 +32,13 @@ from __future__ import annotations
 import gzip
 import json
 import os
+import threading
 import time
 from collections.abc import Iterable, Mapping, Sequence
 from typing import Any, TypedDict, cast
 
+from .bucket_agg import BucketAggregator, Parsed, get_buckets, moneyness_pct
+
 
 # Lightweight metric interaction helpers (avoid repeated attr-defined ignores)
 def _set_metric(obj: Any, name: str, value: float | int) -> None:
@@ -100,6 +106,9 @@ class _RiskPayload(TypedDict):
 
 _risk_cache: _RiskPayload | dict[str, Any] | None = None  # may hold legacy dict shape
 _last_build_ts: float | None = None
+_agg: BucketAggregator | None = None
+_agg_lock = threading.Lock()  # serializes builds sharing _agg
+_GREEKS = ('delta', 'gamma', 'vega', 'theta', 'rho')
 
 
 def _emit_per_index_notionals(metrics: Any, rows: Sequence[Mapping[str, Any]]) -> None:
@@ -173,6 +182,37 @@ def _iter_options(snapshot_source) -> Iterable[dict[str, Any]]:
             return
 
 
+def _parse_option(opt: Mapping[str, Any]) -> Parsed | None:
+    index_v = opt.get('index')
+    expiry_v = opt.get('expiry')
+    strike_v = opt.get('strike')
+    underlying_v = opt.get('underlying')
+    if not (index_v and expiry_v and strike_v and underlying_v):
+        return None
+    greeks = tuple(opt.get(g) for g in _GREEKS)
+    # Type safety: all greeks present and numeric
+    if not all(isinstance(x, (int, float)) for x in greeks):
+        return None
+    underlying = float(underlying_v)
+    if underlying <= 0:
+        return None
+    return (str(index_v), str(expiry_v), moneyness_pct(float(strike_v), underlying), tuple(float(cast(float, x)) for x in greeks))
+
+
+def _aggregator(buckets: list[float]) -> BucketAggregator:
+    """Module aggregator for the current bucket edges (rebuilt when edges change or incremental is off).
+
+    Callers must hold ``_agg_lock`` while using the returned aggregator.
+    """
+    global _agg
+    edges = tuple(buckets)
+    if _agg is None or _agg.buckets.edges != edges:
+        _agg = BucketAggregator(get_buckets(edges), len(_GREEKS), _parse_option)
+    elif os.environ.get('G6_ANALYTICS_INCREMENTAL', '1').lower() in ('0', 'false', 'no', 'off'):
+        _agg.reset()
+    return _agg
+
+
 def _contract_multiplier(index: str) -> float:
     env_key = f'G6_CONTRACT_MULTIPLIER_{index.upper()}'
     try:
@@ -192,67 +232,14 @@ def build_risk(snapshot_source) -> _RiskPayload | None:
     persist = os.environ.get('G6_RISK_AGG_PERSIST','').lower() in ('1','true','yes','on')
     compress = os.environ.get('G6_ANALYTICS_COMPRESS','').lower() in ('1','true','yes','on')
     persist_dir = os.environ.get('G6_ANALYTICS_DIR', 'data/analytics')
-    acc: dict[tuple[str,str,str], dict[str, float]] = {}
-    counts: dict[tuple[str,str,str], int] = {}
-    processed = 0
-    for opt in _iter_options(snapshot_source):
-        if processed >= max_options:
-            break
-        processed += 1
-        try:
-            index_v = opt.get('index')
-            expiry_v = opt.get('expiry')
-            strike_v = opt.get('strike')
-            underlying_v = opt.get('underlying')
-            if not (index_v and expiry_v and strike_v and underlying_v):
-                continue
-            delta_v = opt.get('delta')
-            gamma_v = opt.get('gamma')
-            vega_v = opt.get('vega')
-            theta_v = opt.get('theta')
-            rho_v = opt.get('rho')
-            if any(x is None for x in (delta_v, gamma_v, vega_v, theta_v, rho_v)):
-                continue
-            # Type safety: ensure numeric
-            if not all(isinstance(x, (int,float)) for x in (delta_v, gamma_v, vega_v, theta_v, rho_v)):
-                continue
-            index = str(index_v)
-            expiry = str(expiry_v)
-            strike = float(strike_v)
-            underlying = float(underlying_v)
-            if underlying <= 0:
-                continue
-            moneyness_pct = ((strike / underlying) - 1.0) * 100.0
-            bucket_label = None
-            for i in range(len(buckets)-1):
-                if buckets[i] <= moneyness_pct <= buckets[i+1]:
-                    bucket_label = f"[{buckets[i]},{buckets[i+1]}]"
-                    break
-            if bucket_label is None:
-                if moneyness_pct < buckets[0]:
-                    bucket_label = f"<-inf,{buckets[0]}]"
-                else:
-                    bucket_label = f"[{buckets[-1]},+inf)"
-            key = (index, expiry, bucket_label)
-            slot = acc.setdefault(key, {'delta':0.0,'gamma':0.0,'vega':0.0,'theta':0.0,'rho':0.0})
-            # After numeric validation above, safe to cast to float
-            delta_f = float(cast(float | int, delta_v))
-            gamma_f = float(cast(float | int, gamma_v))
-            vega_f = float(cast(float | int, vega_v))
-            theta_f = float(cast(float | int, theta_v))
-            rho_f = float(cast(float | int, rho_v))
-            slot['delta'] += delta_f
-            slot['gamma'] += gamma_f
-            slot['vega'] += vega_f
-            slot['theta'] += theta_f
-            slot['rho'] += rho_f
-            counts[key] = counts.get(key,0) + 1
-        except Exception:
-            continue
+    with _agg_lock:
+        agg = _aggregator(buckets)
+        processed, changed = agg.update(_iter_options(snapshot_source), max_options)
+        groups = list(agg.groups())
 
     rows: list[_RiskRow] = []
-    for (index, expiry, bucket), greeks in acc.items():
-        c = counts.get((index, expiry, bucket),0)
+    for index, expiry, bucket, sums, c in groups:
+        greeks = dict(zip(_GREEKS, sums, strict=True))
         mult = _contract_multiplier(index)
         # notional approximations: delta_notional = |delta| * underlying placeholder (not available now) * multiplier
         # Since underlying per option may differ slightly, we approximate using aggregate delta * synthetic underlying = 1 for now.
@@ -275,7 +262,7 @@ def build_risk(snapshot_source) -> _RiskPayload | None:
             }
         })
 
-    risk: _RiskPayload = {'meta': {'version':1,'builder':'basic','buckets':buckets,'processed':processed,'persisted':False}, 'data': rows}
+    risk: _RiskPayload = {'meta': {'version':1,'builder':'basic','buckets':buckets,'processed':processed,'changed':changed,'persisted':False}, 'data': rows}
     global _risk_cache, _last_build_ts
     _risk_cache = risk
     _last_build_ts = time.time()
@@ -13,6 +13,10 @@ Environment (new):
                                                      Example: "-20,-10,-5,0,5,10,20" (default)
     G6_VOL_SURFACE_MAX_OPTIONS  Upper bound on options processed (safety) default 20000
 
+Aggregation runs on ``bucket_agg.BucketAggregator``: successive builds apply
+only options whose inputs changed since the previous build
+(G6_ANALYTICS_INCREMENTAL=0 rebuilds from scratch every time).
+
 Snapshot Source Contract (duck-typed):
     Expects either an iterable of option dicts each containing:
         index, expiry, strike, underlying (ltp), iv
@@ -36,14 +40,18 @@ from __future__ import annotations
 import gzip
 import json
 import os
+import threading
 import time
 from collections.abc import Iterable
 from collections.abc import Iterable as _IterableABC
-from statistics import mean
 from typing import Any, Protocol
 
+from .bucket_agg import BucketAggregator, Parsed, get_buckets, moneyness_pct
+
 _surface_cache: dict[str, Any] = {}
 _last_build_ts: float | None = None
+_agg: BucketAggregator | None = None
+_agg_lock = threading.Lock()  # serializes builds sharing _agg
 
 
 def _parse_buckets() -> list[float]:
@@ -60,6 +68,35 @@ def _parse_buckets() -> list[float]:
     return sorted(set(edges))
 
 
+def _parse_option(opt: dict[str, Any]) -> Parsed | None:
+    index_v = opt.get('index')
+    expiry_v = opt.get('expiry')
+    strike_v = opt.get('strike')
+    underlying_v = opt.get('underlying')
+    iv = opt.get('iv')
+    if index_v is None or expiry_v is None or strike_v is None or underlying_v is None or iv is None:
+        return None
+    strike = float(strike_v)
+    underlying = float(underlying_v)
+    if not (underlying and underlying > 0):
+        return None
+    return (str(index_v), str(expiry_v), moneyness_pct(strike, underlying), (float(iv),))
+
+
+def _aggregator(buckets: list[float]) -> BucketAggregator:
+    """Module aggregator for the current bucket edges (rebuilt when edges change or incremental is off).
+
+    Callers must hold ``_agg_lock`` while using the returned aggregator.
+    """
+    global _agg
+    edges = tuple(buckets)
+    if _agg is None or _agg.buckets.edges != edges:
+        _agg = BucketAggregator(get_buckets(edges), 1, _parse_option)
+    elif os.environ.get('G6_ANALYTICS_INCREMENTAL', '1').lower() in ('0', 'false', 'no', 'off'):
+        _agg.reset()
+    return _agg
+
+
 def _iter_options(snapshot_source: Any) -> Iterable[dict[str, Any]]:
     # Direct iterable
     if isinstance(snapshot_source, list):
@@ -176,54 +213,19 @@ def build_surface(snapshot_source: Any) -> dict[str, Any] | None:
     compress = os.environ.get('G6_ANALYTICS_COMPRESS','').lower() in ('1','true','yes','on')
     persist_dir = os.environ.get('G6_ANALYTICS_DIR', 'data/analytics')
 
-    # Accumulator: (index, expiry, bucket_label) -> list[iv]
-    acc: dict[tuple[str,str,str], list[float]] = {}
-    processed = 0
-    for opt in _iter_options(snapshot_source):
-        if processed >= max_options:
-            break
-        processed += 1
-        try:
-            index_v = opt.get('index')
-            expiry_v = opt.get('expiry')
-            strike_v = opt.get('strike')
-            underlying_v = opt.get('underlying')
-            iv = opt.get('iv')
-            if index_v is None or expiry_v is None or strike_v is None or underlying_v is None or iv is None:
-                continue
-            index = str(index_v)
-            expiry = str(expiry_v)
-            strike = float(strike_v)
-            underlying = float(underlying_v)
-            if underlying and underlying > 0 and iv is not None:
-                moneyness_pct = ((strike / underlying) - 1.0) * 100.0
-                # Find bucket (between edge_i and edge_{i+1})
-                bucket_label = None
-                for i in range(len(buckets)-1):
-                    if buckets[i] <= moneyness_pct <= buckets[i+1]:
-                        bucket_label = f"[{buckets[i]},{buckets[i+1]}]"
-                        break
-                if bucket_label is None:
-                    # Outside range, clamp to outer bucket
-                    if moneyness_pct < buckets[0]:
-                        bucket_label = f"<-inf,{buckets[0]}]"
-                    else:
-                        bucket_label = f"[{buckets[-1]},+inf)"
-                key = (index, expiry, bucket_label)
-                acc.setdefault(key, []).append(float(iv))
-        except Exception:
-            continue
+    with _agg_lock:
+        agg = _aggregator(buckets)
+        processed, changed = agg.update(_iter_options(snapshot_source), max_options)
+        groups = list(agg.groups())
 
     rows = []
-    for (index, expiry, bucket_label), ivs in acc.items():
-        if not ivs:
-            continue
+    for index, expiry, bucket_label, sums, count in groups:
         rows.append({
             'index': index,
             'expiry': expiry,
             'bucket': bucket_label,
-            'avg_iv': round(mean(ivs), 6),
-            'count': len(ivs),
+            'avg_iv': round(sums[0] / count, 6),
+            'count': count,
             'source': 'raw'
         })
 
@@ -242,7 +244,7 @@ def build_surface(snapshot_source: Any) -> dict[str, Any] | None:
         model_elapsed = time.time() - model_start
 
     surface = {
-        'meta': {'version': 1, 'builder': 'basic', 'buckets': buckets, 'processed': processed, 'interpolated': interpolate, 'persisted': False},
+        'meta': {'version': 1, 'builder': 'basic', 'buckets': buckets, 'processed': processed, 'changed': changed, 'interpolated': interpolate, 'persisted': False},
         'data': rows
     }
     global _surface_cache, _last_build_ts
@@ -0,0 +1,296 @@
+"""On-disk daily instrument snapshot (columnar, memory-mapped).
+
+Persists the parsed ``kite.instruments()`` universe once per trading day so a
+restarted process (orchestrator, dashboard, tools) can skip the download +
+CSV parse and map the columns straight from disk.
+
+File layout (little-endian, all sections 8-byte aligned)::
+
+    b'G6INSNP1' | u32 header_len | header JSON | pad | sections...
+
+The JSON header carries ``version``, ``exchange``, ``trading_day``,
+``created``, ``rows`` and a ``sections`` map ``name -> [offset, nbytes]``.
+Numeric columns are raw ``array`` buffers (``q`` int64, ``d`` float64,
+``i`` int32 expiry ordinals); string columns are a ``Q`` offsets
+section (rows + 1 entries) plus a UTF-8 blob.
+
+Writes go to a temp file in the same directory, are fsync'd and swapped in with
+``os.replace`` so concurrent readers always see a complete file (an mmap held
+on the previous file keeps the old inode alive).
+
+A snapshot is *fresh* when its ``trading_day`` equals today and, if
+``G6_INSTRUMENT_SNAPSHOT_MAX_AGE_SEC`` > 0, it is younger than that many
+seconds. Stale, truncated or foreign files are ignored (``load_snapshot``
+returns None) and the caller falls back to the live fetch.
+
+Env:
+    G6_INSTRUMENT_SNAPSHOT=1            enable read-on-start / write-after-fetch (default off)
+    G6_INSTRUMENT_SNAPSHOT_DIR          directory (default data/cache/instruments)
+    G6_INSTRUMENT_SNAPSHOT_MAX_AGE_SEC  optional max age in seconds (default 0 = same day only)
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Sequence
+from itertools import pairwise
+from typing import Any
+
+from src.collectors.env_adapter import get_bool, get_float, get_str
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b'G6INSNP1'
+VERSION = 1
+_ALIGN = 8
+
+INT_COLUMNS = ('instrument_token', 'lot_size')
+FLOAT_COLUMNS = ('strike', 'tick_size', 'last_price')
+STR_COLUMNS = ('tradingsymbol', 'name', 'instrument_type', 'segment', 'exchange', 'exchange_token')
+
+__all__ = [
+    "InstrumentSnapshot",
+    "snapshot_enabled",
+    "snapshot_path",
+    "write_snapshot",
+    "load_snapshot",
+]
+
+
+def snapshot_enabled() -> bool:
+    return get_bool('G6_INSTRUMENT_SNAPSHOT', False)
+
+
+def snapshot_path(exchange: str, base_dir: str | None = None) -> str:
+    base = base_dir or get_str('G6_INSTRUMENT_SNAPSHOT_DIR', os.path.join('data', 'cache', 'instruments'))
+    return os.path.join(base, f"instruments_{exchange.upper()}.g6snap")
+
+
+def _pad(n: int) -> int:
+    return (-n) % _ALIGN
+
+
+def _to_bytes(arr: array) -> bytes:
+    if sys.byteorder != 'little':  # pragma: no cover - big-endian hosts
+        arr = array(arr.typecode, arr)
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _expiry_ord(v: Any) -> int:
+    if isinstance(v, _dt.datetime):
+        return v.date().toordinal()
+    if isinstance(v, _dt.date):
+        return v.toordinal()
+    if v:
+        try:
+            return _dt.date.fromisoformat(str(v)[:10]).toordinal()
+        except Exception:
+            return 0
+    return 0
+
+
+def write_snapshot(path: str, rows: Sequence[dict[str, Any]], exchange: str, trading_day: _dt.date | None = None) -> int:
+    """Serialize ``rows`` to ``path`` atomically. Returns bytes written."""
+    day = (trading_day or _dt.date.today()).isoformat()
+    n = len(rows)
+    sections: list[tuple[str, bytes]] = []
+    for col in INT_COLUMNS:
+        a = array('q')
+        for r in rows:
+            try:
+                a.append(int(r.get(col) or 0))
+            except Exception:
+                a.append(0)
+        sections.append((col, _to_bytes(a)))
+    for col in FLOAT_COLUMNS:
+        a = array('d')
+        for r in rows:
+            try:
+                a.append(float(r.get(col) or 0.0))
+            except Exception:
+                a.append(0.0)
+        sections.append((col, _to_bytes(a)))
+    sections.append(('expiry', _to_bytes(array('i', (_expiry_ord(r.get('expiry')) for r in rows)))))
+    for col in STR_COLUMNS:
+        offs = array('Q', [0])
+        parts: list[bytes] = []
+        pos = 0
+        for r in rows:
+            v = r.get(col)
+            b = b'' if v is None else str(v).encode('utf-8')
+            parts.append(b)
+            pos += len(b)
+            offs.append(pos)
+        sections.append((col + '.off', _to_bytes(offs)))
+        sections.append((col + '.blob', b''.join(parts)))
+
+    layout: dict[str, list[int]] = {}
+    header = {
+        'version': VERSION, 'exchange': exchange.upper(), 'trading_day': day,
+        'created': time.time(), 'rows': n, 'sections': layout,
+    }
+    # Offsets depend on header size; iterate until stable (converges in <=2 passes)
+    hdr = b''
+    for _ in range(4):
+        base = len(MAGIC) + 4 + len(hdr)
+        base += _pad(base)
+        off = base
+        for name, data in sections:
+            layout[name] = [off, len(data)]
+            off += len(data) + _pad(len(data))
+        new_hdr = json.dumps(header, separators=(',', ':')).encode('utf-8')
+        stable = len(new_hdr) == len(hdr)
+        hdr = new_hdr
+        if stable:
+            break
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    tmp = f"{path}.tmp.{os.getpid()}"
+    try:
+        with open(tmp, 'wb') as fh:
+            head = MAGIC + struct.pack('<I', len(hdr)) + hdr
+            fh.write(head + b'\0' * _pad(len(head)))
+            for _name, data in sections:
+                fh.write(data)
+                fh.write(b'\0' * _pad(len(data)))
+            fh.flush()
+            os.fsync(fh.fileno())
+            size = fh.tell()
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+    return size
+
+
+class InstrumentSnapshot:
+    """Read-only mmap view of a snapshot file; columns are zero-copy memoryviews."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, 'rb') as fh:
+            self._mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            mv = memoryview(self._mm)
+            self._mv = mv
+            if mv[:len(MAGIC)] != MAGIC:
+                raise ValueError('bad_magic')
+            (hlen,) = struct.unpack_from('<I', mv, len(MAGIC))
+            start = len(MAGIC) + 4
+            self.header: dict[str, Any] = json.loads(bytes(mv[start:start + hlen]))
+            if self.header.get('version') != VERSION:
+                raise ValueError('unsupported_version')
+            self.rows_count = int(self.header['rows'])
+            self._cols: dict[str, memoryview] = {}
+            size = len(self._mm)
+            for name, (off, nbytes) in self.header['sections'].items():
+                if off + nbytes > size:
+                    raise ValueError('truncated')
+                self._cols[name] = mv[off:off + nbytes]
+            for col in INT_COLUMNS + FLOAT_COLUMNS + ('expiry',):
+                if col not in self._cols:
+                    raise ValueError(f'missing_column:{col}')
+        except Exception:
+            self.close()
+            raise
+        self._rows: list[dict[str, Any]] | None = None
+
+    # ------------------------------------------------------------------
+    @property
+    def trading_day(self) -> str:
+        return str(self.header.get('trading_day'))
+
+    @property
+    def created(self) -> float:
+        return float(self.header.get('created') or 0.0)
+
+    def is_fresh(self, today: _dt.date | None = None, max_age_sec: float = 0.0) -> bool:
+        if self.trading_day != (today or _dt.date.today()).isoformat():
+            return False
+        if max_age_sec > 0 and (time.time() - self.created) > max_age_sec:
+            return False
+        return True
+
+    def column(self, name: str) -> memoryview:
+        """Typed zero-copy view of a numeric column (int64/float64/int32 expiry ordinal)."""
+        mv = self._cols[name]
+        code = 'q' if name in INT_COLUMNS else 'd' if name in FLOAT_COLUMNS else 'i'
+        return mv.cast(code)
+
+    def strings(self, name: str) -> list[str]:
+        offs = self._cols[name + '.off'].cast('Q').tolist()
+        raw = bytes(self._cols[name + '.blob'])
+        text = raw.decode('utf-8')
+        if len(text) == len(raw):  # pure ASCII: byte offsets == char offsets, slice the str
+            return [text[a:b] for a, b in pairwise(offs)]
+        return [raw[a:b].decode('utf-8') for a, b in pairwise(offs)]
+
+    def to_rows(self) -> list[dict[str, Any]]:
+        """Materialize Kite-shaped instrument dicts (cached)."""
+        if self._rows is not None:
+            return self._rows
+        n = self.rows_count
+        cols: dict[str, Any] = {c: self.column(c).tolist() for c in INT_COLUMNS + FLOAT_COLUMNS}
+        for c in STR_COLUMNS:
+            cols[c] = self.strings(c) if (c + '.off') in self._cols else [''] * n
+        from_ord = _dt.date.fromordinal
+        exp_cache: dict[int, Any] = {0: ''}
+        expiries = []
+        for eo in self.column('expiry').tolist():
+            v = exp_cache.get(eo)
+            if v is None:
+                v = exp_cache[eo] = from_ord(eo)
+            expiries.append(v)
+        names = list(cols)
+        series = [cols[k] for k in names]
+        rows = [dict(zip(names, vals, strict=True)) for vals in zip(*series, strict=True)] if n else []
+        for r, e in zip(rows, expiries, strict=True):
+            r['expiry'] = e
+        self._rows = rows
+        return rows
+
+    def __len__(self) -> int:
+        return self.rows_count
+
+    def close(self) -> None:
+        cols = getattr(self, '_cols', {})
+        for v in cols.values():
+            v.release()
+        cols.clear()
+        mv = getattr(self, '_mv', None)
+        if mv is not None:
+            mv.release()
+            self._mv = None
+        try:
+            self._mm.close()
+        except (BufferError, ValueError):  # pragma: no cover - outstanding cast views
+            pass
+
+
+def load_snapshot(exchange: str, base_dir: str | None = None, today: _dt.date | None = None) -> InstrumentSnapshot | None:
+    """Open the exchange snapshot if present and fresh; None otherwise."""
+    path = snapshot_path(exchange, base_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        snap = InstrumentSnapshot(path)
+    except Exception:
+        logger.debug("instrument_snapshot_unreadable path=%s", path, exc_info=True)
+        return None
+    if snap.header.get('exchange') != exchange.upper() or not snap.is_fresh(today, get_float('G6_INSTRUMENT_SNAPSHOT_MAX_AGE_SEC', 0.0)):
+        logger.debug("instrument_snapshot_stale path=%s day=%s", path, snap.trading_day)
+        snap.close()
+        return None
+    return snap
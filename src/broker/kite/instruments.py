@@ -12,6 +12,7 @@ Provider contract expectations (minimal to avoid tight coupling):
 - provider._settings.instrument_cache_ttl (float seconds, default 600)
 - provider._state.instruments_cache: dict[str, list]
 - provider._state.instruments_cache_meta: dict[str, float]
+- provider._state.instrument_universe: dict[str, InstrumentUniverse] (built once per fetched list)
 - provider._ensure_client(): late client init
 - provider._auth_failed flag
 - provider.kite client with .instruments() method
@@ -19,6 +20,10 @@ Provider contract expectations (minimal to avoid tight coupling):
 - provider._rl_fallback() throttled logging helper returning bool
 - provider._used_fallback flag (set True when returning synthetic empty result)
 
+When G6_INSTRUMENT_SNAPSHOT=1 the first lookup per exchange in a process maps
+today's on-disk snapshot (instrument_snapshot.py) instead of calling the API,
+and every successful live fetch rewrites that snapshot atomically.
+
 The module is intentionally dependency-light; it defers error classification
 (auth vs other) to a local helper mirroring original heuristic to avoid
 importing broader auth modules and increasing import cost.
@@ -43,6 +48,40 @@ def _is_auth_error(e: BaseException) -> bool:
     return any(k in msg for k in ("auth", "token", "unauthorized", "forbidden", "expired"))
 
 
+def _build_universe(provider: KiteProvider, raw: list[dict[str, Any]], exch: str) -> None:
+    try:
+        from src.broker.kite.universe import universe_for
+        universe_for(provider, raw, exch)
+    except Exception:
+        logger.debug("instrument_universe_build_failed exch=%s", exch, exc_info=True)
+
+
+def _load_snapshot_rows(exch: str) -> list[dict[str, Any]] | None:
+    try:
+        from src.broker.kite import instrument_snapshot as _snap
+        if not _snap.snapshot_enabled():
+            return None
+        t0 = time.perf_counter()
+        snap = _snap.load_snapshot(exch)
+        if snap is None:
+            return None
+        rows = snap.to_rows()
+        logger.info("instrument_snapshot_loaded exch=%s day=%s count=%d ms=%.1f", exch, snap.trading_day, len(rows), (time.perf_counter() - t0) * 1000.0)
+        return rows
+    except Exception:
+        logger.debug("instrument_snapshot_load_failed exch=%s", exch, exc_info=True)
+        return None
+
+
+def _save_snapshot(raw: list[dict[str, Any]], exch: str) -> None:
+    try:
+        from src.broker.kite import instrument_snapshot as _snap
+        if _snap.snapshot_enabled():
+            _snap.write_snapshot(_snap.snapshot_path(exch), raw, exch)
+    except Exception:
+        logger.debug("instrument_snapshot_write_failed exch=%s", exch, exc_info=True)
+
+
 def fetch_instruments(provider: KiteProvider, exchange: str, force_refresh: bool = False) -> list[dict[str, Any]]:
     exch = exchange or "NFO"
     ttl = getattr(provider._settings, 'instrument_cache_ttl', 600.0)
@@ -58,6 +97,13 @@ def fetch_instruments(provider: KiteProvider, exchange: str, force_refresh: bool
         # else fall through to refresh
     elif force_refresh:
         logger.debug("force_refresh_instruments exch=%s", exch)
+    if not force_refresh and cached is None:
+        snap_rows = _load_snapshot_rows(exch)
+        if snap_rows:
+            provider._state.instruments_cache[exch] = snap_rows
+            provider._state.instruments_cache_meta[exch] = now
+            _build_universe(provider, snap_rows, exch)
+            return snap_rows
 
     provider._ensure_client()
     try:
@@ -99,6 +145,8 @@ def fetch_instruments(provider: KiteProvider, exchange: str, force_refresh: bool
                     logger.debug("instrument_fetch_success exch=%s count=%d sample_keys=%s", exch, len(raw), sample_keys)
                 except Exception:
                     pass
+                _build_universe(provider, raw, exch)
+                _save_snapshot(raw, exch)
             return raw
         raise ValueError("unexpected_instruments_shape")
     except Exception as e:
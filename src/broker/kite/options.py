@@ -4,6 +4,7 @@ This module encapsulates the previously inlined `KiteProvider.option_instruments
 into composable helper functions so the provider class thins down to an orchestration
 facade. Responsibilities separated:
 
+Daily universe indexes   -> InstrumentUniverse (universe.py; counts, prefilter memo, contract hash index)
 Prefilter stage          -> prefilter_option_universe
 Strike index build       -> build_strike_membership (wraps existing strike_index helper)
 Candidate selection      -> collect_candidates_for_expiry
@@ -602,30 +603,15 @@ def option_instruments(provider: ProviderLike | Any, index_symbol: str, expiry_d
             exchange_pool = 'NFO'
             universe = provider.get_instruments(exchange_pool)
 
-        raw_total_opts = 0
-        ce_ct = pe_ct = 0
-        distinct_expiries = set()
-        for inst in universe:
-            ity = (inst.get('instrument_type') or '').upper()
-            if ity in ('CE','PE') or ity in ('OPTIDX','OPTSTK','OPT'):
-                raw_total_opts += 1
-                tsymu = str(inst.get('tradingsymbol','')).upper()
-                if ity not in ('CE','PE'):
-                    if tsymu.endswith('CE'): ce_ct += 1
-                    elif tsymu.endswith('PE'): pe_ct += 1
-                else:
-                    if ity == 'CE': ce_ct += 1
-                    elif ity == 'PE': pe_ct += 1
-                expv = inst.get('expiry')
-                if expv:
-                    try:
-                        if hasattr(expv,'strftime'):
-                            distinct_expiries.add(expv.strftime('%Y-%m-%d'))
-                        else:
-                            distinct_expiries.add(str(expv)[:10])
-                    except Exception:
-                        pass
-        filtered, prefiltered_used, prefilter_rejects = prefilter_option_universe(index_symbol, universe, raw_total_opts)
+        # Daily columnar universe: option counts, distinct expiries, per-index
+        # prefilter and (root, expiry, strike, type) indexes are built once per
+        # fetched list instead of re-scanning it on every cache miss.
+        from src.broker.kite.universe import universe_for
+        inst_universe = universe_for(provider, universe, 'DAILY' if universe is getattr(provider, '_daily_universe', None) else 'NFO')
+        raw_total_opts = inst_universe.raw_total_opts
+        ce_ct, pe_ct = inst_universe.ce_count, inst_universe.pe_count
+        distinct_expiries = inst_universe.distinct_expiries
+        filtered, prefiltered_used, prefilter_rejects = inst_universe.prefilter(index_symbol)
         try:
             logger.debug(
                 "option_universe_breakdown index=%s universe=%d raw_opts=%d ce=%d pe=%d distinct_expiries=%d",
@@ -653,7 +639,9 @@ def option_instruments(provider: ProviderLike | Any, index_symbol: str, expiry_d
                 expiry_target = _dt.date.today()
 
         strike_membership = StrikeMembership(strikes_list)
-        pre_index = build_preindex(filtered, strike_membership)
+        pre_index = inst_universe.preindex(index_symbol, expiry_target, strike_membership.sorted)
+        if not pre_index:
+            pre_index = build_preindex(filtered, strike_membership)
         # Expiry mismatch diagnostic: if target not in distinct_expiries (normalized)
         try:
             if hasattr(expiry_date,'strftime'):
@@ -11,7 +11,8 @@ Activation:
 Design:
   * Thread-safe singleton `QuoteBatcher` aggregated under module-level accessor.
   * Each caller contributes a list of fully formatted symbols (EXCH:SYMBOL).
-  * First caller in an empty batch starts a short-lived aggregator thread which:
+  * First caller in an empty batch becomes the batch leader and, on its own
+    thread (no helper thread is spawned):
         - Sleeps for the configured batch window.
         - Atomically captures the accumulated symbol set.
         - Performs one provider network fetch with retry + (optional) rate limiter.
@@ -20,14 +21,15 @@ Design:
     fall back to existing upstream synthetic / retry logic in `quotes.get_quote`.
 
 Non-goals (future extensions possible):
-  * Cross-batch caching (handled by quotes module cache already).
+  * Cross-batch caching (handled by quotes module cache already; cycle-wide
+    de-duplication across indices lives in quote_coalescer).
   * Partial per-symbol error partitioning (all-or-nothing for simplicity).
   * Metrics (can be added after stability: batch_size, merged_calls_saved, wait_ms).
 
 Concurrency & Safety:
   * Lock guards pending request list & symbol set.
   * Minimal window keeps added latency negligible while capturing bursts.
-  * If batch thread fails catastrophically, exception distributed; caller path
+  * If the leader's fetch fails, the exception is distributed; caller path
     proceeds to fallback logic in `quotes.get_quote` (which will synthesize).
 
 Limitations:
@@ -70,8 +72,6 @@ def _batch_window_ms() -> int:
 class _Request:
     symbols: list[str]
     event: threading.Event
-    # Ack event to allow distributor to release requests sequentially ensuring deterministic append order in tests
-    ack: threading.Event
     result: dict[str, Any] | None = None
     error: BaseException | None = None
 
@@ -89,67 +89,48 @@ class QuoteBatcher:
         Returns dict subset containing only the requested symbols.
         May raise on network / rate limit errors (propagated from underlying call).
         """
-        req = _Request(symbols=list(symbols), event=threading.Event(), ack=threading.Event())
+        req = _Request(symbols=list(symbols), event=threading.Event())
         with self._lock:
             self._pending.append(req)
             self._symbols.update(symbols)
-            start_batch = not self._batch_active
-            if start_batch:
+            leader = not self._batch_active
+            if leader:
                 self._batch_active = True
-                window_ms = max(0, _batch_window_ms())
-                t = threading.Thread(target=self._flush_after_window, args=(provider, window_ms/1000.0), daemon=True)
-                t.start()
-        # Wait for batch completion
-        req.event.wait()
+        if leader:
+            self._lead_batch(provider, max(0, _batch_window_ms()) / 1000.0)
+        else:
+            req.event.wait()
         if req.error:
             raise req.error  # propagate
-        # Acknowledge reception so distributor can release next in sequence
-        try:
-            req.ack.set()
-        except Exception:
-            pass
         return req.result or {}
 
-    def _flush_after_window(self, provider: Any, delay_s: float) -> None:
+    def _lead_batch(self, provider: Any, delay_s: float) -> None:
+        """Run on the leader's thread: wait the window, fetch the union, release waiters."""
+        pending: list[_Request] = []
         try:
-            time.sleep(delay_s)
-            # Snapshot pending
+            if delay_s > 0:
+                time.sleep(delay_s)
+            # Snapshot pending and reset for the next batch
             with self._lock:
-                pending = list(self._pending)
+                pending = self._pending
                 symbols = list(self._symbols)
-                # Reset for next batch
                 self._pending = []
                 self._symbols = set()
                 self._batch_active = False
-            if not pending or not symbols:
-                for r in pending:
-                    r.result = {}
-                    r.event.set()
-                return
-            raw = self._perform_fetch(provider, symbols)
-            # Distribute filtered subsets
-            # Release events sequentially waiting for ack to enforce stable ordering of caller append operations
+            raw = self._perform_fetch(provider, symbols) if symbols else {}
             for r in pending:
-                try:
-                    subset = {s: raw[s] for s in r.symbols if isinstance(raw, dict) and s in raw}
-                    r.result = subset
-                except Exception as sub_err:
-                    r.error = sub_err
-                finally:
-                    r.event.set()
-                    try:
-                        # Wait briefly for caller to acknowledge retrieval; timeout keeps progress if caller slow
-                        r.ack.wait(0.05)
-                    except Exception:
-                        pass
-        except BaseException as e:  # propagate error to all waiters
+                r.result = {s: raw[s] for s in r.symbols if isinstance(raw, dict) and s in raw}
+        except BaseException as e:  # propagate error to all waiters of this batch
             with self._lock:
-                pending = list(self._pending)
-                self._pending = []
-                self._symbols = set()
-                self._batch_active = False
+                if not pending:
+                    pending = self._pending
+                    self._pending = []
+                    self._symbols = set()
+                    self._batch_active = False
             for r in pending:
                 r.error = e
+        finally:
+            for r in pending:
                 r.event.set()
 
     def _perform_fetch(self, provider: Any, symbols: list[str]) -> dict[str, Any]:
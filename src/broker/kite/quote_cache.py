@@ -2,11 +2,24 @@
 
 Thread-safe in-memory cache storing raw quote payloads keyed by symbol.
 Previously inline in quotes.py; extracted to enable future alternative backends.
+
+Layout: ``G6_QUOTE_CACHE_SHARDS`` (default 16, rounded up to a power of two)
+independent shards, each an LRU ``OrderedDict`` behind its own lock, bounded to
+``G6_QUOTE_CACHE_MAX_ENTRIES / shards`` entries (default 20000 total). Entries
+expire by the TTL passed at lookup time.
+
+Bulk API: ``get_many(symbols, ttl)`` / ``put_many(raw)`` take each shard lock
+once per call and export hit/miss/size metrics once per call (not per symbol).
+``get`` / ``put`` remain as thin wrappers for existing callers.
 """
 from __future__ import annotations
 
 import threading
 import time
+from collections import OrderedDict
+from collections.abc import Iterable, Mapping
+
+from src.collectors.env_adapter import get_int
 
 try:  # local import guard to avoid hard dependency when metrics disabled
     from src.metrics import get_metrics  # type: ignore
@@ -14,75 +27,169 @@ except Exception:  # pragma: no cover
     def get_metrics():  # type: ignore
         return None
 
-_LOCK = threading.Lock()
-_CACHE: dict[str, tuple[float, dict]] = {}
-_HITS = 0
-_MISSES = 0
 
-def _export_metrics(hit: bool | None) -> None:
+class _Shard:
+    __slots__ = ("lock", "data")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.data: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+
+class ShardedQuoteCache:
+    """TTL + LRU bounded quote cache split across independently locked shards."""
+
+    def __init__(self, shards: int = 16, max_entries: int = 20000) -> None:
+        n = 1
+        while n < max(1, int(shards)):
+            n <<= 1
+        self._mask = n - 1
+        self._shards = [_Shard() for _ in range(n)]
+        self.max_entries = max(n, int(max_entries))
+        self._per_shard = max(1, -(-self.max_entries // n))
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _shard(self, symbol: str) -> _Shard:
+        return self._shards[hash(symbol) & self._mask]
+
+    def _group(self, symbols: Iterable[str]) -> dict[int, list[str]]:
+        groups: dict[int, list[str]] = {}
+        mask = self._mask
+        for s in symbols:
+            groups.setdefault(hash(s) & mask, []).append(s)
+        return groups
+
+    def get_many(self, symbols: Iterable[str], ttl: float) -> dict[str, dict]:
+        """Return fresh cached payloads for ``symbols`` (missing/expired keys are omitted)."""
+        syms = list(symbols)
+        out: dict[str, dict] = {}
+        if ttl > 0 and syms:
+            cutoff = time.time() - ttl
+            for idx, group in self._group(syms).items():
+                sh = self._shards[idx]
+                with sh.lock:
+                    data = sh.data
+                    for s in group:
+                        entry = data.get(s)
+                        if entry is None:
+                            continue
+                        if entry[0] >= cutoff:
+                            data.move_to_end(s)
+                            out[s] = entry[1]
+                        else:
+                            del data[s]
+        hits = len(out)
+        self._record(hits, len(syms) - hits)
+        return out
+
+    def put_many(self, raw: Mapping[str, object]) -> int:
+        """Store every dict payload of ``raw``; returns the number stored."""
+        if not isinstance(raw, Mapping) or not raw:
+            return 0
+        now = time.time()
+        stored = 0
+        evicted = 0
+        cap = self._per_shard
+        for idx, group in self._group(raw.keys()).items():
+            sh = self._shards[idx]
+            with sh.lock:
+                data = sh.data
+                for k in group:
+                    v = raw[k]
+                    if not isinstance(v, dict):
+                        continue
+                    data[k] = (now, v)
+                    data.move_to_end(k)
+                    stored += 1
+                while len(data) > cap:
+                    data.popitem(last=False)
+                    evicted += 1
+        if evicted:
+            with self._stats_lock:
+                self.evictions += evicted
+        _export_metrics(self, hits=0, misses=0)
+        return stored
+
+    def _record(self, hits: int, misses: int) -> None:
+        if not hits and not misses:
+            return
+        with self._stats_lock:
+            self.hits += hits
+            self.misses += misses
+        _export_metrics(self, hits=hits, misses=misses)
+
+    def __len__(self) -> int:
+        return sum(len(sh.data) for sh in self._shards)
+
+    def clear(self) -> None:
+        for sh in self._shards:
+            with sh.lock:
+                sh.data.clear()
+
+    def snapshot_meta(self) -> dict:
+        with self._stats_lock:
+            return {
+                'size': len(self), 'hits': self.hits, 'misses': self.misses,
+                'evictions': self.evictions, 'shards': len(self._shards), 'max_entries': self.max_entries,
+            }
+
+    def reset_counters(self) -> None:
+        with self._stats_lock:
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+
+def _export_metrics(cache: ShardedQuoteCache, *, hits: int, misses: int) -> None:
     m = get_metrics()
     if not m:
         return
     try:
-        # Lazily allocate metrics if missing (registered via spec MetricDef on init; fall back if absent)
-        # We only SET gauges if they exist; we do not create if absent to avoid duplicate registration risk.
-        if hit is True and hasattr(m, 'quote_cache_hits'):
-            try: m.quote_cache_hits.inc()  # type: ignore[attr-defined]
+        # We only touch series that exist; we do not create any to avoid duplicate registration risk.
+        if hits and hasattr(m, 'quote_cache_hits'):
+            try: m.quote_cache_hits.inc(hits)  # type: ignore[attr-defined]
             except Exception: pass
-        elif hit is False and hasattr(m, 'quote_cache_misses'):
-            try: m.quote_cache_misses.inc()  # type: ignore[attr-defined]
+        if misses and hasattr(m, 'quote_cache_misses'):
+            try: m.quote_cache_misses.inc(misses)  # type: ignore[attr-defined]
             except Exception: pass
-        total = _HITS + _MISSES
         if hasattr(m, 'quote_cache_size'):
-            try: m.quote_cache_size.set(len(_CACHE))  # type: ignore[attr-defined]
+            try: m.quote_cache_size.set(len(cache))  # type: ignore[attr-defined]
             except Exception: pass
+        total = cache.hits + cache.misses
         if total and hasattr(m, 'quote_cache_hit_ratio'):
-            try: m.quote_cache_hit_ratio.set(_HITS / total)  # type: ignore[attr-defined]
+            try: m.quote_cache_hit_ratio.set(cache.hits / total)  # type: ignore[attr-defined]
             except Exception: pass
     except Exception:
         pass
 
+
+_CACHE = ShardedQuoteCache(
+    shards=get_int('G6_QUOTE_CACHE_SHARDS', 16),
+    max_entries=get_int('G6_QUOTE_CACHE_MAX_ENTRIES', 20000),
+)
+
+
+def get_many(symbols: Iterable[str], ttl: float) -> dict[str, dict]:
+    return _CACHE.get_many(symbols, ttl)
+
+def put_many(raw: Mapping[str, object]) -> int:
+    return _CACHE.put_many(raw)
+
 def get(symbol: str, ttl: float) -> dict | None:
-    global _HITS, _MISSES  # noqa: PLW0603
-    if ttl <= 0:
-        _MISSES += 1
-        _export_metrics(hit=False)
-        return None
-    now = time.time()
-    with _LOCK:
-        entry = _CACHE.get(symbol)
-        if not entry:
-            _MISSES += 1
-            _export_metrics(hit=False)
-            return None
-        ts, data = entry
-        if (now - ts) <= ttl:
-            _HITS += 1
-            _export_metrics(hit=True)
-            return data
-        _MISSES += 1
-        _export_metrics(hit=False)
-        return None
+    return _CACHE.get_many((symbol,), ttl).get(symbol)
 
 def put(raw: dict, ttl: float) -> None:
     if ttl <= 0 or not isinstance(raw, dict):
         return
-    now = time.time()
-    with _LOCK:
-        for k, v in raw.items():
-            if isinstance(v, dict):
-                _CACHE[k] = (now, v)
-    # Update size & ratio gauges (hit parameter None indicates no change to hit/miss counters just size update)
-    _export_metrics(hit=None)
+    _CACHE.put_many(raw)
 
 def snapshot_meta() -> dict:
-    with _LOCK:
-        return {'size': len(_CACHE), 'hits': _HITS, 'misses': _MISSES}
+    return _CACHE.snapshot_meta()
 
 def reset_counters() -> None:  # test helper
-    global _HITS, _MISSES  # noqa: PLW0603
-    with _LOCK:
-        _HITS = 0
-        _MISSES = 0
+    _CACHE.reset_counters()
 
-__all__ = ['get', 'put', 'snapshot_meta', 'reset_counters']
+__all__ = ['ShardedQuoteCache', 'get', 'put', 'get_many', 'put_many', 'snapshot_meta', 'reset_counters']
@@ -0,0 +1,199 @@
+"""Cycle-scoped quote request coalescing.
+
+Every index/expiry in a collection cycle asks for quotes separately, so the
+same symbols (index spots, overlapping expiry rules) are requested repeatedly
+and each request is a separate rate-limited ``kite.quote`` call. A
+``QuoteCoalescer`` lives for one cycle:
+
+  * Planning: consumers ``register`` the symbols they will need (the unified
+    collector registers every enabled index's spot symbol at cycle start).
+  * First fetch: the union of everything registered so far plus the request
+    is fetched once, split only at the broker per-request limit.
+  * Consumers get a ``QuoteView``: a read-only mapping over their subset of
+    the cycle store. Quote payloads are shared, never copied; a symbol is
+    fetched at most once per cycle.
+
+Fetching happens on the calling thread. Concurrent callers whose symbols are
+already in flight wait on a condition variable instead of issuing duplicate
+requests; no helper threads are created.
+
+Activation: ``G6_QUOTE_COALESCE=1`` makes ``run_unified_collectors`` open a
+cycle scope and ``quote_fetch.fetch_real_quotes`` route through it. A scope
+older than ``G6_QUOTE_COALESCE_MAX_AGE_SEC`` (default 30) is ignored so an
+aborted cycle can never serve stale quotes.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from typing import Any
+
+from src.collectors.env_adapter import get_bool, get_float
+
+KITE_QUOTE_MAX_INSTRUMENTS = 500
+
+__all__ = [
+    "QuoteCoalescer",
+    "QuoteView",
+    "coalescing_enabled",
+    "begin_cycle",
+    "end_cycle",
+    "current_coalescer",
+]
+
+
+def coalescing_enabled() -> bool:
+    return get_bool('G6_QUOTE_COALESCE', False)
+
+
+class QuoteView(Mapping[str, Any]):
+    """Read-only subset view over a coalescer store (no payload copies)."""
+
+    __slots__ = ("_store", "_keys")
+
+    def __init__(self, store: dict[str, Any], keys: Iterable[str]) -> None:
+        self._store = store
+        # dict as an ordered set: O(1) membership, iteration in request order
+        self._keys: dict[str, None] = {k: None for k in keys if k in store}
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return self._store[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._keys
+
+    def __repr__(self) -> str:  # pragma: no cover - debug aid
+        return f"QuoteView({len(self._keys)} symbols)"
+
+
+class QuoteCoalescer:
+    """Union-fetch store for one collection cycle."""
+
+    def __init__(self, provider: Any = None, *, max_per_call: int = KITE_QUOTE_MAX_INSTRUMENTS) -> None:
+        self.provider = provider
+        self.max_per_call = max(1, min(int(max_per_call), KITE_QUOTE_MAX_INSTRUMENTS))
+        self.created = time.time()
+        self._cond = threading.Condition()
+        self._store: dict[str, Any] = {}
+        self._planned: dict[str, None] = {}  # registered but not fetched (ordered set)
+        self._in_flight: set[str] = set()
+        self._missing: set[str] = set()  # fetched but absent from the response
+        self.calls = 0
+        self.requests = 0
+        self.symbols_fetched = 0
+
+    # ---------------- Planning ----------------
+    def register(self, symbols: Iterable[str]) -> None:
+        """Declare symbols a consumer will request later this cycle."""
+        with self._cond:
+            for s in symbols:
+                if s not in self._store and s not in self._in_flight and s not in self._missing:
+                    self._planned[s] = None
+
+    # ---------------- Fetch ----------------
+    def _settled(self, s: str) -> bool:
+        return s in self._store or s in self._missing
+
+    def get(self, symbols: Iterable[str], fetch: Callable[[list[str]], Any]) -> QuoteView:
+        """Return a view for ``symbols``, fetching any not yet in the cycle store.
+
+        ``fetch`` receives chunks of at most ``max_per_call`` symbols and returns
+        a ``{"EXCH:SYMBOL": quote}`` dict; errors propagate to the caller (the
+        symbols of a failed chunk stay unfetched so a later call may retry).
+        """
+        wanted = list(dict.fromkeys(symbols))
+        with self._cond:
+            self.requests += 1
+            todo: list[str] = []
+            for s in wanted:
+                if not self._settled(s) and s not in self._in_flight:
+                    todo.append(s)
+                    self._planned.pop(s, None)
+            if todo:
+                # Piggy-back everything planned so far on this fetch
+                todo.extend(self._planned)
+                self._planned.clear()
+                self._in_flight.update(todo)
+        if todo:
+            try:
+                for i in range(0, len(todo), self.max_per_call):
+                    chunk = todo[i:i + self.max_per_call]
+                    raw = fetch(chunk)
+                    with self._cond:
+                        self.calls += 1
+                        if isinstance(raw, Mapping):
+                            for s in chunk:
+                                if s in raw:
+                                    self._store[s] = raw[s]
+                                else:
+                                    self._missing.add(s)
+                            self.symbols_fetched += len(chunk)
+                        self._in_flight.difference_update(chunk)
+                        self._cond.notify_all()
+            finally:
+                with self._cond:
+                    self._in_flight.difference_update(todo)
+                    self._cond.notify_all()
+        with self._cond:
+            # Symbols fetched by another thread: wait until they land
+            while any(s in self._in_flight for s in wanted):
+                self._cond.wait(0.5)
+            return QuoteView(self._store, wanted)
+
+    def covers(self, symbols: Iterable[str]) -> bool:
+        with self._cond:
+            return all(self._settled(s) for s in symbols)
+
+    def stats(self) -> dict[str, Any]:
+        with self._cond:
+            return {
+                'calls': self.calls,
+                'requests': self.requests,
+                'symbols': len(self._store),
+                'calls_saved': max(0, self.requests - self.calls),
+            }
+
+
+# ---------------------------------------------------------------------------
+# Cycle scope (one active coalescer per process; keyed by provider identity)
+# ---------------------------------------------------------------------------
+_ACTIVE: QuoteCoalescer | None = None
+_ACTIVE_LOCK = threading.Lock()
+
+
+def begin_cycle(provider: Any = None, plan: Iterable[str] = ()) -> QuoteCoalescer:
+    """Open a new cycle scope (replacing any previous one) and register ``plan``."""
+    global _ACTIVE
+    co = QuoteCoalescer(provider)
+    co.register(plan)
+    with _ACTIVE_LOCK:
+        _ACTIVE = co
+    return co
+
+
+def end_cycle() -> QuoteCoalescer | None:
+    global _ACTIVE
+    with _ACTIVE_LOCK:
+        co, _ACTIVE = _ACTIVE, None
+    return co
+
+
+def current_coalescer(provider: Any = None) -> QuoteCoalescer | None:
+    """Active coalescer for ``provider`` (None when absent, expired or bound to another provider)."""
+    co = _ACTIVE
+    if co is None:
+        return None
+    if provider is not None and co.provider is not None and co.provider is not provider:
+        return None
+    if (time.time() - co.created) > get_float('G6_QUOTE_COALESCE_MAX_AGE_SEC', 30.0):
+        return None
+    return co
@@ -1,13 +1,14 @@
 """Real quote fetch orchestration (A7 Step 8 extraction).
 
-Encapsulates normalization, cache fast path, optional batching, rate limiting,
-and cache population. Mirrors original inline logic from quotes.get_quote.
+Encapsulates normalization, cache fast path, cycle-scoped coalescing (see
+quote_coalescer), optional batching, rate limiting, and cache population.
+Mirrors original inline logic from quotes.get_quote.
 """
 from __future__ import annotations
 
 import logging
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Mapping
 from typing import Any
 
 from . import quote_cache
@@ -15,7 +16,8 @@ from .quotes import _normalize_instruments  # reuse helper
 
 logger = logging.getLogger(__name__)
 
-def fetch_real_quotes(provider, instruments: Iterable) -> dict | None:
+def fetch_real_quotes(provider, instruments: Iterable) -> Mapping[str, Any] | None:
+    """Fetch quotes keyed by EXCH:SYMBOL; under a coalescing scope this is a read-only ``QuoteView``."""
     kite = getattr(provider, 'kite', None)
     if kite is None:
         return None
@@ -29,21 +31,24 @@ def fetch_real_quotes(provider, instruments: Iterable) -> dict | None:
         cache_ttl = 1.0
     if cache_ttl < 0:
         cache_ttl = 0
-    if cache_ttl > 0:
-        aggregate_cached: dict[str, Any] = {}
-        all_hit = True
-        for sym in formatted:
-            cached = quote_cache.get(sym, cache_ttl)
-            if cached is None:
-                all_hit = False
-                break
-            aggregate_cached[sym] = cached
-        if all_hit and aggregate_cached:
-            try:
-                provider._last_quotes_synthetic = False
-            except Exception:
-                pass
-            return aggregate_cached
+    # Bulk cache lookup (one lock pass per shard); only missing symbols hit the network
+    cached = quote_cache.get_many(formatted, cache_ttl) if cache_ttl > 0 else {}
+    to_fetch = [s for s in formatted if s not in cached] if cached else formatted
+    if cached and not to_fetch:
+        try:
+            provider._last_quotes_synthetic = False
+        except Exception:
+            pass
+        return cached
+
+    def _with_cached(fetched: Any) -> Mapping[str, Any]:
+        if not cached:
+            return fetched
+        merged = dict(cached)
+        if isinstance(fetched, Mapping):
+            merged.update(fetched)
+        return merged
+
     # Optional batching & limiter
     limiter = None
     from src.utils.env_flags import is_truthy_env  # type: ignore
@@ -67,7 +72,7 @@ def fetch_real_quotes(provider, instruments: Iterable) -> dict | None:
             except Exception:
                 limiter = None
 
-    def _direct_fetch() -> Any:
+    def _direct_fetch(symbols: list[str] = to_fetch) -> Any:
         rl = getattr(provider, '_api_rl', None)
         if callable(rl):
             rl()
@@ -77,18 +82,53 @@ def fetch_real_quotes(provider, instruments: Iterable) -> dict | None:
             except RateLimitedError:
                 raise
         from src.broker.kite_provider import _timed_call  # lazy import
-        return _timed_call(lambda: kite.quote(formatted), getattr(provider._settings, 'kite_timeout_sec', 5.0))
+        try:
+            return _timed_call(lambda: kite.quote(symbols), getattr(provider._settings, 'kite_timeout_sec', 5.0))
+        except Exception as e:
+            # Feed 429s back to the limiter (adaptive mode backs off multiplicatively)
+            if limiter is not None and any(k in str(e).lower() for k in ("too many requests", "rate limit", "429")):
+                try:
+                    limiter.record_rate_limit_error()
+                except Exception:
+                    pass
+            raise
 
     def _fetch_with_batch() -> Any:
         if batching_enabled():
             try:
                 batcher = get_batcher()
-                return batcher.fetch(provider, formatted)
+                return batcher.fetch(provider, to_fetch)
             except Exception:
                 return _direct_fetch()
         return _direct_fetch()
 
     from src.utils.retry import call_with_retry
+    # Cycle-scoped coalescing: union fetch once per cycle, consumers share a view
+    try:
+        from .quote_coalescer import current_coalescer
+        coalescer = current_coalescer(provider)
+    except Exception:  # pragma: no cover
+        coalescer = None
+    if coalescer is not None:
+        def _fetch_chunk(chunk: list[str]) -> Any:
+            chunk_raw = call_with_retry(lambda: _direct_fetch(chunk))
+            if cache_ttl > 0:
+                try:
+                    quote_cache.put_many(chunk_raw)
+                except Exception:
+                    pass
+            return chunk_raw
+        view = coalescer.get(to_fetch, _fetch_chunk)
+        if limiter is not None:
+            try:
+                limiter.record_success()
+            except Exception:
+                pass
+        try:
+            provider._last_quotes_synthetic = False
+        except Exception:
+            pass
+        return _with_cached(view)
     raw = call_with_retry(_fetch_with_batch)
     if limiter is not None:
         try:
@@ -97,13 +137,13 @@ def fetch_real_quotes(provider, instruments: Iterable) -> dict | None:
             pass
     if cache_ttl > 0:
         try:
-            quote_cache.put(raw, cache_ttl)
+            quote_cache.put_many(raw)
         except Exception:
             pass
     try:
         provider._last_quotes_synthetic = False
     except Exception:
         pass
-    return raw
+    return _with_cached(raw)
 
 __all__ = ['fetch_real_quotes']
@@ -15,14 +15,36 @@ The caller is expected to:
 
 Cooldown semantics: while in cooldown, acquire() will sleep the remaining cooldown
 time (once) or, if fast_fail=True, raise RateLimitedError immediately.
+
+Adaptive mode (G6_KITE_RATE_ADAPTIVE=1) returns an ``AdaptiveRateLimiter``
+instead: same caller contract, but
+
+  * AIMD: a rate-limit error multiplies the effective QPS by
+    G6_KITE_RATE_BACKOFF (default 0.5, floor G6_KITE_RATE_MIN_QPS) and drains
+    the bucket; the decrease applies at most once per
+    G6_KITE_RATE_DECREASE_WINDOW seconds (default 1), so a burst of 429s from
+    requests that were already in flight counts as one signal. Every G6_KITE_RATE_PROBE_SUCCESSES consecutive successes (at
+    most once per second) add G6_KITE_RATE_PROBE_STEP QPS up to
+    G6_KITE_RATE_MAX_QPS (default 2 * G6_KITE_QPS).
+  * Shared budget: bucket + AIMD state live in a 72-byte file
+    (G6_KITE_RATE_STATE_FILE, default data/cache/kite_rate.state, mode 0600) updated
+    under an exclusive ``fcntl.flock``, so every local G6 process (orchestrator,
+    side collectors, debug tools) draws from one budget.
+  * Effective QPS is exported as ``g6_kite_rate_effective_qps``.
 """
 from __future__ import annotations
 
 import os
+import struct
 import threading
 import time
 from dataclasses import dataclass
 
+try:
+    import fcntl  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 
 class RateLimitedError(RuntimeError):
     """Raised to signal the caller that the request should be delayed / skipped."""
@@ -110,12 +132,222 @@ class RateLimiter:
             return bool(self._st.cooldown_until and time.time() < self._st.cooldown_until)
 
 
-def build_default_rate_limiter() -> RateLimiter:
+_STATE_MAGIC = b'G6RLST02'
+# magic, tokens, last_refill, qps, cooldown_until, last_adjust, last_decrease, consecutive_rl, success_streak
+_STATE_FMT = struct.Struct('<8sddddddqq')
+
+
+@dataclass
+class _SharedState:
+    tokens: float
+    last_refill: float
+    qps: float
+    cooldown_until: float = 0.0
+    last_adjust: float = 0.0
+    last_decrease: float = 0.0
+    consecutive_rl: int = 0
+    success_streak: int = 0
+
+
+class AdaptiveRateLimiter:
+    """AIMD token bucket whose state is shared by all local processes via a locked file."""
+
+    def __init__(self,
+                 qps: float = 3,
+                 burst: int | None = None,
+                 consecutive_threshold: int = 5,
+                 cooldown_seconds: int = 20,
+                 *,
+                 min_qps: float = 1.0,
+                 max_qps: float | None = None,
+                 backoff: float = 0.5,
+                 probe_step: float = 0.5,
+                 probe_successes: int = 20,
+                 decrease_window: float = 1.0,
+                 state_path: str | None = None):
+        self._initial_qps = max(0.1, float(qps))
+        self._min_qps = max(0.1, min(float(min_qps), self._initial_qps))
+        self._max_qps = max(self._initial_qps, float(max_qps) if max_qps else self._initial_qps * 2)
+        self._burst = burst if (burst and burst > 0) else None
+        self._backoff = min(max(float(backoff), 0.05), 0.95)
+        self._probe_step = max(0.0, float(probe_step))
+        self._probe_successes = max(1, int(probe_successes))
+        self._decrease_window = max(0.0, float(decrease_window))
+        self._consecutive_threshold = max(1, consecutive_threshold)
+        self._cooldown_seconds = max(1, cooldown_seconds)
+        self.state_path = state_path or os.path.join('data', 'cache', 'kite_rate.state')
+        d = os.path.dirname(self.state_path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._fd = os.open(self.state_path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock = threading.Lock()  # flock does not exclude threads sharing one fd
+        with self._state() as st:
+            self._export(st.qps)
+
+    # ---------------- shared state ----------------
+    def _capacity(self, qps: float) -> float:
+        return float(self._burst) if self._burst else max(1.0, qps * 2)
+
+    def _read(self) -> _SharedState | None:
+        raw = os.pread(self._fd, _STATE_FMT.size, 0)
+        if len(raw) != _STATE_FMT.size:
+            return None
+        magic, tokens, last_refill, qps, cd_until, last_adjust, last_decrease, consec, streak = _STATE_FMT.unpack(raw)
+        if magic != _STATE_MAGIC or not (qps > 0):
+            return None
+        return _SharedState(tokens, last_refill, qps, cd_until, last_adjust, last_decrease, int(consec), int(streak))
+
+    def _write(self, st: _SharedState) -> None:
+        os.pwrite(self._fd, _STATE_FMT.pack(_STATE_MAGIC, st.tokens, st.last_refill, st.qps, st.cooldown_until,
+                                            st.last_adjust, st.last_decrease, st.consecutive_rl, st.success_streak), 0)
+
+    class _Locked:
+        __slots__ = ("_rl", "st")
+
+        def __init__(self, rl: AdaptiveRateLimiter) -> None:
+            self._rl = rl
+            self.st: _SharedState | None = None
+
+        def __enter__(self) -> _SharedState:
+            rl = self._rl
+            rl._lock.acquire()
+            try:
+                if fcntl is not None:
+                    fcntl.flock(rl._fd, fcntl.LOCK_EX)
+                try:
+                    st = rl._read()
+                except BaseException:
+                    if fcntl is not None:
+                        fcntl.flock(rl._fd, fcntl.LOCK_UN)
+                    raise
+            except BaseException:
+                rl._lock.release()
+                raise
+            if st is None:
+                now = time.time()
+                st = _SharedState(tokens=rl._capacity(rl._initial_qps), last_refill=now, qps=rl._initial_qps)
+            # Clamp to this process' bounds (another process may be configured differently)
+            st.qps = min(max(st.qps, rl._min_qps), rl._max_qps)
+            self.st = st
+            return st
+
+        def __exit__(self, exc_type, *_exc) -> None:
+            rl = self._rl
+            try:
+                if exc_type is None and self.st is not None:
+                    rl._write(self.st)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(rl._fd, fcntl.LOCK_UN)
+                rl._lock.release()
+
+    def _state(self) -> AdaptiveRateLimiter._Locked:
+        return AdaptiveRateLimiter._Locked(self)
+
+    def _refill(self, st: _SharedState, now: float) -> None:
+        if now > st.last_refill:
+            st.tokens = min(self._capacity(st.qps), st.tokens + (now - st.last_refill) * st.qps)
+            st.last_refill = now
+
+    @staticmethod
+    def _export(qps: float) -> None:
+        try:
+            from src.metrics import get_metrics  # lazy; metrics optional
+            m = get_metrics()
+            g = getattr(m, 'kite_rate_effective_qps', None) if m else None
+            if g is not None:
+                g.set(qps)
+        except Exception:
+            pass
+
+    # ---------------- caller contract (mirrors RateLimiter) ----------------
+    def acquire(self, tokens: float = 1.0, *, fast_fail: bool = False) -> None:
+        while True:
+            now = time.time()
+            with self._state() as st:
+                if st.cooldown_until and now < st.cooldown_until:
+                    if fast_fail:
+                        raise RateLimitedError("rate_limited_cooldown")
+                    sleep_for = st.cooldown_until - now
+                else:
+                    self._refill(st, now)
+                    if st.tokens >= tokens:
+                        st.tokens -= tokens
+                        return
+                    sleep_for = (tokens - st.tokens) / st.qps
+            time.sleep(min(max(sleep_for, 0.001), 1.0))
+
+    def record_rate_limit_error(self) -> None:
+        now = time.time()
+        with self._state() as st:
+            if now - st.last_decrease >= self._decrease_window:
+                st.qps = max(self._min_qps, st.qps * self._backoff)
+                st.last_decrease = now
+            self._refill(st, now)
+            st.tokens = min(st.tokens, 0.0)
+            st.success_streak = 0
+            st.last_adjust = now
+            st.consecutive_rl += 1
+            if st.consecutive_rl >= self._consecutive_threshold:
+                st.cooldown_until = now + self._cooldown_seconds
+            qps = st.qps
+        self._export(qps)
+
+    def record_success(self) -> None:
+        now = time.time()
+        changed = False
+        with self._state() as st:
+            st.consecutive_rl = 0
+            if st.cooldown_until and now >= st.cooldown_until:
+                st.cooldown_until = 0.0
+            st.success_streak += 1
+            if (st.success_streak >= self._probe_successes and st.qps < self._max_qps
+                    and (now - st.last_adjust) >= 1.0):
+                st.qps = min(self._max_qps, st.qps + self._probe_step)
+                st.success_streak = 0
+                st.last_adjust = now
+                changed = True
+            qps = st.qps
+        if changed:
+            self._export(qps)
+
+    def cooldown_active(self) -> bool:
+        with self._state() as st:
+            return bool(st.cooldown_until and time.time() < st.cooldown_until)
+
+    @property
+    def effective_qps(self) -> float:
+        with self._state() as st:
+            return st.qps
+
+    def close(self) -> None:
+        try:
+            os.close(self._fd)
+        except OSError:
+            pass
+
+
+def build_default_rate_limiter() -> RateLimiter | AdaptiveRateLimiter:
     qps = int(os.getenv('G6_KITE_QPS', '3') or 3)
     burst_env = os.getenv('G6_KITE_RATE_MAX_BURST')
     burst = int(burst_env) if burst_env and burst_env.isdigit() else None
     thr = int(os.getenv('G6_KITE_RATE_CONSECUTIVE_THRESHOLD', '5') or 5)
     cd = int(os.getenv('G6_KITE_RATE_COOLDOWN_SECONDS', '20') or 20)
+    from src.collectors.env_adapter import get_bool, get_float, get_int, get_str
+    if get_bool('G6_KITE_RATE_ADAPTIVE', False):
+        try:
+            return AdaptiveRateLimiter(
+                qps=qps, burst=burst, consecutive_threshold=thr, cooldown_seconds=cd,
+                min_qps=get_float('G6_KITE_RATE_MIN_QPS', 1.0),
+                max_qps=get_float('G6_KITE_RATE_MAX_QPS', 0.0) or None,
+                backoff=get_float('G6_KITE_RATE_BACKOFF', 0.5),
+                probe_step=get_float('G6_KITE_RATE_PROBE_STEP', 0.5),
+                probe_successes=get_int('G6_KITE_RATE_PROBE_SUCCESSES', 20),
+                decrease_window=get_float('G6_KITE_RATE_DECREASE_WINDOW', 1.0),
+                state_path=get_str('G6_KITE_RATE_STATE_FILE', '') or None,
+            )
+        except OSError:  # unwritable state file: fall back to the per-process bucket
+            pass
     return RateLimiter(qps=qps, burst=burst, consecutive_threshold=thr, cooldown_seconds=cd)
 
-__all__ = ["RateLimiter", "RateLimitedError", "build_default_rate_limiter"]
+__all__ = ["RateLimiter", "AdaptiveRateLimiter", "RateLimitedError", "build_default_rate_limiter"]
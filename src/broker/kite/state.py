@@ -16,6 +16,8 @@ class ProviderState:
     # Instruments (raw) cache per exchange + fetch timestamp metadata
     instruments_cache: dict[str, list[dict[str, Any]]] = field(default_factory=dict)
     instruments_cache_meta: dict[str, float] = field(default_factory=dict)
+    # Columnar/indexed view per exchange built once per fetched list (see universe.py)
+    instrument_universe: dict[str, Any] = field(default_factory=dict)
 
     # Expiry date list per index
     expiry_dates_cache: dict[str, list[datetime.date]] = field(default_factory=dict)
@@ -53,9 +55,11 @@ class ProviderState:
         if exchange:
             self.instruments_cache.pop(exchange, None)
             self.instruments_cache_meta.pop(exchange, None)
+            self.instrument_universe.pop(exchange, None)
         else:
             self.instruments_cache.clear()
             self.instruments_cache_meta.clear()
+            self.instrument_universe.clear()
 
     def invalidate_expiries(self, index_symbol: str | None = None) -> None:
         if index_symbol:
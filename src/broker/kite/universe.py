@@ -0,0 +1,265 @@
+"""Daily columnar instrument universe with prebuilt option indexes.
+
+Built once per fetched instrument list (see ``fetch_instruments``) instead of
+re-scanning the raw list-of-dicts on every ``option_instruments`` cache miss.
+
+Layout (one slot per option row, CE/PE only; OPTIDX/OPTSTK normalized via the
+tradingsymbol suffix):
+    instruments   list[dict]        original rows (shared, not copied)
+    expiry_ord    array('l')        date.toordinal() of expiry (0 = unknown)
+    strike_x100   array('q')        round(strike * 100)
+    type_code     array('b')        0 = CE, 1 = PE
+    root_id       array('l')        index into ``roots`` (detect_root / parse_root / name)
+
+Hash indexes:
+    by_root_expiry  (root_id, expiry_ord)                         -> [slot]
+    by_contract     (root_id, expiry_ord, strike_x100, type_code) -> [slot]
+
+Precomputed once: raw option count, CE/PE counts, distinct expiries (ISO), and
+per-index prefilter results (memoized on first request for that index).
+
+Matching a strike ladder is therefore ``len(strikes) * 2`` dict lookups.
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import logging
+import threading
+import time
+from array import array
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+Instrument = dict[str, Any]
+
+TYPE_CODES = {'CE': 0, 'PE': 1}
+TYPE_NAMES = ('CE', 'PE')
+
+__all__ = ["InstrumentUniverse", "universe_for", "normalize_expiry", "option_type_of", "TYPE_CODES", "TYPE_NAMES"]
+
+
+def normalize_expiry(exp_val: Any) -> _dt.date | None:
+    """Best-effort expiry normalization (mirrors build_preindex parsing)."""
+    try:
+        if exp_val is None:
+            return None
+        if isinstance(exp_val, _dt.datetime):
+            return exp_val.date()
+        if isinstance(exp_val, _dt.date):
+            return exp_val
+        s = str(exp_val).strip()
+        if not s:
+            return None
+        try:
+            return _dt.datetime.strptime(s[:10], '%Y-%m-%d').date()
+        except Exception:
+            pass
+        for fmt in ('%d-%b-%Y', '%d-%m-%Y', '%Y/%m/%d', '%d/%m/%Y'):
+            try:
+                return _dt.datetime.strptime(s, fmt).date()
+            except Exception:
+                continue
+    except Exception:
+        return None
+    return None
+
+
+def option_type_of(inst: Instrument) -> str | None:
+    """Return 'CE'/'PE' for option rows (inferring from OPTIDX/OPTSTK tradingsymbol suffix)."""
+    itype = (inst.get('instrument_type') or '').upper()
+    if itype in TYPE_CODES:
+        return itype
+    if itype in ('OPTIDX', 'OPTSTK', 'OPT'):
+        tsym = str(inst.get('tradingsymbol', '')).upper()
+        if tsym.endswith('CE'):
+            return 'CE'
+        if tsym.endswith('PE'):
+            return 'PE'
+    return None
+
+
+class InstrumentUniverse:
+    """Columnar, hash-indexed view over one instrument list."""
+
+    def __init__(self, source: Sequence[Instrument], built_day: str | None = None) -> None:
+        self.source = source
+        self.source_len = len(source)
+        self.built_day = built_day or _dt.date.today().isoformat()
+        self.instruments: list[Instrument] = []
+        self.expiry_ord = array('l')
+        self.strike_x100 = array('q')
+        self.type_code = array('b')
+        self.root_id = array('l')
+        self.roots: list[str] = []
+        self._root_ids: dict[str, int] = {}
+        self.by_root_expiry: dict[tuple[int, int], list[int]] = {}
+        self.by_contract: dict[tuple[int, int, int, int], list[int]] = {}
+        self.raw_total_opts = 0
+        self.ce_count = 0
+        self.pe_count = 0
+        self.distinct_expiries: frozenset[str] = frozenset()
+        self.build_ms = 0.0
+        self._prefilter: dict[tuple[str, bool], tuple[list[Instrument], bool, dict[str, int]]] = {}
+        self._lock = threading.Lock()
+
+    # ------------------------------------------------------------------
+    @classmethod
+    def build(cls, source: Sequence[Instrument], built_day: str | None = None) -> InstrumentUniverse:
+        uni = cls(source, built_day)
+        uni._index(source)
+        return uni
+
+    def _intern_root(self, root: str) -> int:
+        rid = self._root_ids.get(root)
+        if rid is None:
+            rid = len(self.roots)
+            self.roots.append(root)
+            self._root_ids[root] = rid
+        return rid
+
+    def _index(self, source: Iterable[Instrument]) -> None:
+        try:
+            from src.utils.symbol_root import detect_root as _detect_root
+            from src.utils.symbol_root import parse_root_before_digits as _parse_root
+        except Exception:  # pragma: no cover
+            _detect_root = lambda _s: ''  # noqa: E731
+            _parse_root = lambda _s: ''  # noqa: E731
+        t0 = time.perf_counter()
+        distinct: set[str] = set()
+        exp_cache: dict[Any, _dt.date | None] = {}
+        for inst in source:
+            itype = option_type_of(inst)
+            if itype is None:
+                continue
+            self.raw_total_opts += 1
+            if itype == 'CE':
+                self.ce_count += 1
+            else:
+                self.pe_count += 1
+            expv = inst.get('expiry')
+            try:
+                exp_key = expv if isinstance(expv, (str, _dt.date)) else str(expv)
+                exp = exp_cache.get(exp_key)
+                if exp is None and exp_key not in exp_cache:
+                    exp = normalize_expiry(expv)
+                    exp_cache[exp_key] = exp
+            except Exception:
+                exp = None
+            if expv:
+                distinct.add(exp.isoformat() if exp else str(expv)[:10])
+            try:
+                strike = int(round(float(inst.get('strike', 0) or 0) * 100))
+            except Exception:
+                strike = 0
+            tsym = str(inst.get('tradingsymbol', '')).upper()
+            try:
+                root = _detect_root(tsym) or _parse_root(tsym) or ''
+            except Exception:
+                root = ''
+            if not root:
+                root = str(inst.get('name') or inst.get('underlying') or '').upper()
+            slot = len(self.instruments)
+            rid = self._intern_root(root)
+            eo = exp.toordinal() if exp else 0
+            tc = TYPE_CODES[itype]
+            self.instruments.append(inst)
+            self.expiry_ord.append(eo)
+            self.strike_x100.append(strike)
+            self.type_code.append(tc)
+            self.root_id.append(rid)
+            self.by_root_expiry.setdefault((rid, eo), []).append(slot)
+            self.by_contract.setdefault((rid, eo, strike, tc), []).append(slot)
+        self.distinct_expiries = frozenset(distinct)
+        self.build_ms = (time.perf_counter() - t0) * 1000.0
+        logger.debug(
+            "instrument_universe_built rows=%d options=%d roots=%d expiries=%d ms=%.1f",
+            self.source_len, self.raw_total_opts, len(self.roots), len(self.distinct_expiries), self.build_ms,
+        )
+
+    # ------------------------------------------------------------------
+    def is_current(self, source: Sequence[Instrument]) -> bool:
+        return self.source is source and self.source_len == len(source) and self.built_day == _dt.date.today().isoformat()
+
+    def root_id_of(self, root: str) -> int | None:
+        return self._root_ids.get(root.upper())
+
+    def expiries_for(self, root: str) -> list[_dt.date]:
+        rid = self.root_id_of(root)
+        if rid is None:
+            return []
+        return sorted(_dt.date.fromordinal(eo) for (r, eo) in self.by_root_expiry if r == rid and eo)
+
+    def slots_for(self, root: str, expiry: _dt.date) -> list[int]:
+        rid = self.root_id_of(root)
+        if rid is None:
+            return []
+        return self.by_root_expiry.get((rid, expiry.toordinal()), [])
+
+    def lookup(self, root: str, expiry: _dt.date, strike: float, opt_type: str) -> list[Instrument]:
+        rid = self.root_id_of(root)
+        tc = TYPE_CODES.get(opt_type.upper())
+        if rid is None or tc is None:
+            return []
+        slots = self.by_contract.get((rid, expiry.toordinal(), int(round(float(strike) * 100)), tc))
+        if not slots:
+            return []
+        inst = self.instruments
+        return [inst[i] for i in slots]
+
+    def preindex(self, root: str, expiry: _dt.date, strikes: Iterable[float]) -> dict[tuple[_dt.date, float, str], list[Instrument]]:
+        """Build the (expiry, strike, type) candidate map for a strike ladder via direct lookups."""
+        out: dict[tuple[_dt.date, float, str], list[Instrument]] = {}
+        for s in strikes:
+            rs = round(float(s), 2)
+            for t in TYPE_NAMES:
+                # only explicit CE/PE rows, matching build_preindex semantics
+                bucket = [i for i in self.lookup(root, expiry, rs, t) if (i.get('instrument_type') or '').upper() == t]
+                if bucket:
+                    out[(expiry, rs, t)] = bucket
+        return out
+
+    def prefilter(self, index_symbol: str) -> tuple[list[Instrument], bool, dict[str, int]]:
+        """Per-index prefilter result, computed once per universe."""
+        from src.utils.env_flags import is_truthy_env  # type: ignore
+        key = (index_symbol.upper(), is_truthy_env('G6_DISABLE_PREFILTER'))
+        hit = self._prefilter.get(key)
+        if hit is not None:
+            return hit
+        with self._lock:
+            hit = self._prefilter.get(key)
+            if hit is None:
+                from src.broker.kite.options import prefilter_option_universe  # local import (cycle)
+                hit = prefilter_option_universe(index_symbol, self.source, self.raw_total_opts)
+                self._prefilter[key] = hit
+        return hit
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            'built_day': self.built_day,
+            'rows': self.source_len,
+            'options': self.raw_total_opts,
+            'ce': self.ce_count,
+            'pe': self.pe_count,
+            'roots': len(self.roots),
+            'distinct_expiries': len(self.distinct_expiries),
+            'build_ms': round(self.build_ms, 2),
+        }
+
+
+def universe_for(provider: Any, source: Sequence[Instrument], exchange: str = 'NFO') -> InstrumentUniverse:
+    """Return the cached universe for ``source`` (rebuilding on new list or new day)."""
+    state = getattr(provider, '_state', None)
+    cache = getattr(state, 'instrument_universe', None) if state is not None else None
+    if not isinstance(cache, dict):
+        cache = {}
+        try:
+            state.instrument_universe = cache  # type: ignore[union-attr]
+        except Exception:
+            pass
+    uni = cache.get(exchange)
+    if uni is None or not uni.is_current(source):
+        uni = InstrumentUniverse.build(source)
+        cache[exchange] = uni
+    return uni
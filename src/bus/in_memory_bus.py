@@ -2,7 +2,6 @@ from __future__ import annotations
 
 import threading
 import time
-from collections import deque
 from collections.abc import Callable
 
 from src.metrics import generated as m
@@ -23,36 +22,31 @@ class Subscriber:
 
     def poll(self, batch_size: int = 100, timeout: float = 0.0):
         deadline = time.time() + timeout if timeout > 0 else None
+        bus = self._bus
+        flt = self._filter
         out: list[Event] = []
-        while True:
-            with self._bus._lock:
-                if self._next_id >= self._bus._next_id:
-                    # nothing new
-                    pass
-                else:
-                    # events index: id - head_id maps into deque index
-                    for ev in self._bus._events:
-                        if ev.id < self._next_id:
-                            continue
-                        if ev.id >= self._next_id + batch_size:
-                            break
-                        if self._filter and not self._filter(ev.type):
-                            continue
-                        out.append(ev)
-                    if out:
-                        self._next_id = out[-1].id + 1
-                # update lag gauge
-                try:
-                    lag = (self._bus._next_id - self._next_id)
-                    m.m_bus_subscriber_lag_events_labels(self._bus.name, self.name).set(lag)  # type: ignore[attr-defined]
-                except Exception:
-                    pass
-            if out or not deadline:
-                break
-            remaining = deadline - time.time()
-            if remaining <= 0:
-                break
-            time.sleep(min(0.01, remaining))
+        with bus._cond:
+            while True:
+                if self._next_id < bus._head_id:
+                    self._next_id = bus._head_id  # lapped: resume at oldest retained
+                end = min(bus._next_id, self._next_id + max(0, batch_size))
+                # Copy only this subscriber's id range out of the ring
+                window = bus._slice(self._next_id, end)
+                if window:
+                    self._next_id = end
+                    out = [ev for ev in window if flt(ev.type)] if flt else window
+                lag = bus._next_id - self._next_id
+                if out or not deadline:
+                    break
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    break
+                if not window:
+                    bus._cond.wait(remaining)
+        try:
+            m.m_bus_subscriber_lag_events_labels(bus.name, self.name).set(lag)  # type: ignore[attr-defined]
+        except Exception:
+            pass
         return out
 
     def ack(self, last_id: int):  # placeholder for future persistence semantics
@@ -60,34 +54,72 @@ class Subscriber:
             self._next_id = last_id + 1
 
 class InMemoryBus:
+    """Bounded in-process bus backed by a fixed-capacity ring.
+
+    Event ids are contiguous, so event ``i`` lives in slot ``i % capacity`` and
+    the retained window is ``[head_id, next_id)``. Subscribers copy only the
+    slots of the id range they ask for and block on a condition variable
+    (notified by ``publish``) while waiting for new events.
+    """
+
     def __init__(self, name: str, max_retained: int = 50000):
         self.name = name
-        self.max_retained = max_retained
         self._lock = threading.RLock()
-        self._events: deque[Event] = deque()
+        self._cond = threading.Condition(self._lock)
+        self._max_retained = max(1, int(max_retained))
+        self._ring: list[Event | None] = [None] * self._max_retained
         self._next_id = 0
         self._head_id = 0
         self._sub_counter = 0
 
+    @property
+    def max_retained(self) -> int:
+        return self._max_retained
+
+    @max_retained.setter
+    def max_retained(self, value: int) -> None:
+        """Resize the ring, keeping the newest events that still fit."""
+        cap = max(1, int(value))
+        with self._lock:
+            keep = self._slice(max(self._head_id, self._next_id - cap), self._next_id)
+            self._max_retained = cap
+            self._ring = [None] * cap
+            for ev in keep:
+                self._ring[ev.id % cap] = ev
+            self._head_id = keep[0].id if keep else self._next_id
+
+    def _slice(self, start: int, end: int) -> list[Event]:
+        """Events with ids in ``[start, end)`` clamped to the retained window (caller holds lock)."""
+        start = max(start, self._head_id)
+        end = min(end, self._next_id)
+        if start >= end:
+            return []
+        cap = self._max_retained
+        a, b = start % cap, end % cap
+        if a < b:
+            return self._ring[a:b]  # type: ignore[return-value]
+        return self._ring[a:] + self._ring[:b]  # type: ignore[operator]
+
     def publish(self, event_type: str, payload: dict, key: str | None = None, meta: dict | None = None) -> int:
         start = time.perf_counter()
-        with self._lock:
+        with self._cond:
             ev_id = self._next_id
             self._next_id += 1
             ts_ms = int(time.time() * 1000)
             ev = Event(id=ev_id, ts_unix_ms=ts_ms, type=event_type, key=key, payload=payload, meta=meta)
-            self._events.append(ev)
-            if len(self._events) > self.max_retained:
-                self._events.popleft()
+            self._ring[ev_id % self._max_retained] = ev
+            if self._next_id - self._head_id > self._max_retained:
                 self._head_id += 1
                 try:
                     m.m_bus_events_dropped_total_labels(self.name, 'overflow').inc()  # type: ignore[attr-defined]
                 except Exception:
                     pass
+            self._cond.notify_all()
+            retained = self._next_id - self._head_id
             @safe_emit(emitter="bus.publish.metrics")
             def _emit_core_metrics():
                 m.m_bus_events_published_total_labels(self.name).inc()  # type: ignore[attr-defined]
-                m.m_bus_queue_retained_events_labels(self.name).set(len(self._events))  # type: ignore[attr-defined]
+                m.m_bus_queue_retained_events_labels(self.name).set(retained)  # type: ignore[attr-defined]
 
             _emit_core_metrics()
         elapsed_ms = (time.perf_counter() - start) * 1000.0
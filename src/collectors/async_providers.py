@@ -4,6 +4,7 @@ import logging
 from typing import Any
 
 from src.error_handling import handle_data_collection_error, handle_provider_error
+from src.providers.async_quote_engine import AsyncQuoteEngine, engine_enabled
 from src.utils.normalization import sanitize_option_fields
 
 logger = logging.getLogger(__name__)
@@ -12,8 +13,16 @@ logger = logging.getLogger(__name__)
 class AsyncProviders:
     """Async facade for providers, mirroring the sync Providers API surface."""
 
-    def __init__(self, primary_provider):
+    def __init__(self, primary_provider, *, quote_engine: AsyncQuoteEngine | None = None, limiter: Any | None = None):
         self.primary_provider = primary_provider
+        # Chunked concurrent quote fan-out; providers exposing their own engine
+        # (AsyncKiteAdapter) already chunk under their rate limiter. Otherwise
+        # every chunk request still takes a token from the provider's limiter.
+        if quote_engine is None and engine_enabled() and getattr(primary_provider, 'quote_engine', None) is None:
+            if limiter is None:
+                limiter = getattr(primary_provider, 'limiter', None)
+            quote_engine = AsyncQuoteEngine(lambda chunk: self.primary_provider.get_quote(chunk), limiter=limiter)
+        self.quote_engine = quote_engine
 
     async def close(self):  # pragma: no cover - trivial
         try:
@@ -79,7 +88,10 @@ class AsyncProviders:
                 quote_instruments.append((exchange, symbol))
         if not quote_instruments:
             return {}
-        quotes = await self.primary_provider.get_quote(quote_instruments)
+        if self.quote_engine is not None:
+            quotes = await self.quote_engine.fetch(quote_instruments)
+        else:
+            quotes = await self.primary_provider.get_quote(quote_instruments)
         enriched: dict[str, Any] = {}
         for inst in instruments:
             symbol = inst.get('tradingsymbol', '')
@@ -4,14 +4,22 @@ Encapsulates per-option Greeks backfill using a provided calculator implementing
 black_scholes(is_call,S,K,T,sigma,r) -> mapping with keys delta,gamma,theta,vega,rho.
 Maintains original semantics: only fill missing (==0) greek fields, normalizes IV,
 and emits success/fail/batch metrics when available.
+
+Calculators exposing ``black_scholes_batch`` are evaluated once per expiry with
+array inputs (see ``src.analytics.option_greeks_batch``); ``G6_GREEKS_VECTORIZED=0``
+restores the per-option loop.
 """
 from __future__ import annotations
 
 import logging
 from typing import Any
 
+from src.collectors.helpers.iv_greeks import use_vectorized
+
 logger = logging.getLogger(__name__)
 
+_GREEK_FIELDS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
 __all__ = ["compute_greeks_block"]
 
 
@@ -36,6 +44,7 @@ def compute_greeks_block(ctx, enriched_data: dict[str, dict[str, Any]], index_sy
             spot = float(index_price)
         except Exception:
             spot = 0.0
+        rows: list[tuple[str, Any, float, bool, float]] = []
         for symbol, data in enriched_data.items():
             try:
                 strike = float(data.get('strike') or data.get('strike_price') or 0)
@@ -47,12 +56,32 @@ def compute_greeks_block(ctx, enriched_data: dict[str, dict[str, Any]], index_sy
                 iv_fraction = iv_raw/100.0 if iv_raw > 1.5 else (iv_raw if iv_raw > 0 else 0.25)
                 if iv_fraction <= 0:
                     iv_fraction = 0.25
-                g = greeks_calculator.black_scholes(is_call=is_call, S=spot, K=strike, T=expiry_date,
-                                                    sigma=iv_fraction, r=risk_free_rate)
-                for k_src, k_dst in [('delta','delta'), ('gamma','gamma'), ('theta','theta'), ('vega','vega'), ('rho','rho')]:
+                rows.append((symbol, data, strike, is_call, iv_fraction))
+            except Exception as oge:
+                greek_fail += 1
+                logger.debug(f"Greek calc failed for {symbol}: {oge}")
+        batch: dict[str, list[float]] | None = None
+        if rows and use_vectorized(greeks_calculator, 'black_scholes_batch'):
+            try:
+                arrays = greeks_calculator.black_scholes_batch(
+                    is_call=[r[3] for r in rows], S=spot, K=[r[2] for r in rows], T=expiry_date,
+                    sigma=[r[4] for r in rows], r=risk_free_rate,
+                )
+                batch = {k: arrays[k].tolist() for k in _GREEK_FIELDS}
+            except Exception:
+                logger.debug("Greeks batch failed for %s %s; falling back to scalar", index_symbol, expiry_rule, exc_info=True)
+                batch = None
+        for pos, (symbol, data, strike, is_call, iv_fraction) in enumerate(rows):
+            try:
+                if batch is not None:
+                    g = {k: batch[k][pos] for k in _GREEK_FIELDS}
+                else:
+                    g = greeks_calculator.black_scholes(is_call=is_call, S=spot, K=strike, T=expiry_date,
+                                                        sigma=iv_fraction, r=risk_free_rate)
+                for k_dst in _GREEK_FIELDS:
                     try:
                         if float(data.get(k_dst, 0)) == 0:
-                            data[k_dst] = g.get(k_src, 0)
+                            data[k_dst] = g.get(k_dst, 0)
                     except Exception:
                         pass
                 if float(data.get('iv', 0)) == 0 and iv_fraction:
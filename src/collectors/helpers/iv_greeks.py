@@ -1,14 +1,49 @@
 """IV estimation helper extracted from unified_collectors.
 
 Keeps original logic and metric side-effects identical.
+
+When the calculator exposes ``implied_volatility_batch`` (``OptionGreeks`` with
+NumPy available) the whole expiry is solved in one vectorized call; set
+``G6_GREEKS_VECTORIZED=0`` to force the per-option scalar solver.
+
+Solves are warm-started from the per-contract IV seed cache
+(``src.analytics.iv_seed_cache``); converged results are written back. Iteration
+counts are observed on ``iv_seed_iterations_histogram`` split by seed=warm|cold
+so the convergence saving is visible.
 """
 from __future__ import annotations
 
+import inspect
 import logging
+import math
+from typing import Any
+
+from src.analytics.iv_seed_cache import contract_key, get_iv_seed_cache
+from src.collectors.env_adapter import get_bool
 
 logger = logging.getLogger(__name__)
 
-__all__ = ["iv_estimation_block"]
+__all__ = ["iv_estimation_block", "use_vectorized"]
+
+
+def use_vectorized(greeks_calculator: Any, method: str = 'implied_volatility_batch') -> bool:
+    """Return True when ``greeks_calculator`` should be driven through its batch API."""
+    if not get_bool('G6_GREEKS_VECTORIZED', True):
+        return False
+    if not callable(getattr(greeks_calculator, method, None)):
+        return False
+    try:
+        return bool(greeks_calculator.batch_available())
+    except Exception:
+        return False
+
+
+def _accepts_seed(fn: Any) -> bool:
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return 'initial_sigma' in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
 
 def iv_estimation_block(ctx, enriched_data, index_symbol, expiry_rule, expiry_date, index_price, greeks_calculator,
                         estimate_iv, risk_free_rate, iv_max_iterations, iv_min, iv_max, iv_precision):
@@ -22,6 +57,7 @@ def iv_estimation_block(ctx, enriched_data, index_symbol, expiry_rule, expiry_da
         solver_max_iv = iv_max if iv_max is not None else 5.0
         solver_precision = iv_precision if iv_precision is not None else 1e-5
         iv_success = iv_fail = total_iter = 0
+        pending: list[tuple[str, Any, float, bool, float, Any]] = []
         for symbol, data in enriched_data.items():
             try:
                 strike = float(data.get('strike') or data.get('strike_price') or 0)
@@ -34,32 +70,74 @@ def iv_estimation_block(ctx, enriched_data, index_symbol, expiry_rule, expiry_da
                     continue
                 existing_iv = float(data.get('iv', 0))
                 if existing_iv <= 0:
+                    pending.append((symbol, data, strike, is_call, market_price, contract_key(index_symbol, expiry_date, strike, opt_type)))
+            except Exception as iv_e:
+                logger.debug(f"IV estimation failed for {symbol}: {iv_e}")
+        seed_cache = get_iv_seed_cache()
+        seeds: list[float | None] = seed_cache.get_many([p[5] for p in pending]) if (seed_cache is not None and pending) else [None] * len(pending)
+        solved: list[tuple[str, Any, float, int, Any, bool]] = []
+        batched = False
+        if pending and use_vectorized(greeks_calculator):
+            try:
+                iv_arr, iter_arr = greeks_calculator.implied_volatility_batch(
+                    is_call=[p[3] for p in pending], S=spot, K=[p[2] for p in pending], T=expiry_date,
+                    market_price=[p[4] for p in pending], r=risk_free_rate, max_iterations=solver_max_iter,
+                    precision=solver_precision, min_iv=solver_min_iv, max_iv=solver_max_iv, return_iterations=True,
+                    initial_sigma=[math.nan if sd is None else sd for sd in seeds],
+                )
+                for p, sd, iv_est, iters in zip(pending, seeds, iv_arr.tolist(), iter_arr.tolist(), strict=True):
+                    solved.append((p[0], p[1], iv_est, iters, p[5], sd is not None))
+                batched = True
+            except Exception:
+                logger.debug("IV batch solve failed for %s %s; falling back to scalar", index_symbol, expiry_rule, exc_info=True)
+                solved = []
+        if not batched:
+            seedable = _accepts_seed(greeks_calculator.implied_volatility) if pending else False
+            for (symbol, data, strike, is_call, market_price, key), sd in zip(pending, seeds, strict=True):
+                try:
+                    extra = {'initial_sigma': sd} if (seedable and sd is not None) else {}
                     iv_result = greeks_calculator.implied_volatility(
                         is_call=is_call, S=spot, K=strike, T=expiry_date, market_price=market_price,
                         r=risk_free_rate, max_iterations=solver_max_iter, precision=solver_precision,
-                        min_iv=solver_min_iv, max_iv=solver_max_iv, return_iterations=True
+                        min_iv=solver_min_iv, max_iv=solver_max_iv, return_iterations=True, **extra
                     )
                     if isinstance(iv_result, tuple):
                         iv_est, iters = iv_result
                     else:  # pragma: no cover
                         iv_est, iters = iv_result, 0
-                    if metrics and hasattr(metrics, 'iv_iterations_histogram') and iters is not None:
-                        try:
-                            metrics.iv_iterations_histogram.labels(index=index_symbol, expiry=expiry_rule).observe(iters)
-                        except Exception:
-                            pass
-                    if iv_est > 0:
-                        if iv_est < solver_min_iv:
-                            iv_est = solver_min_iv
-                        elif iv_est > solver_max_iv:
-                            iv_est = solver_max_iv
-                        data['iv'] = iv_est
-                        iv_success += 1
-                    else:
-                        iv_fail += 1
-                    total_iter += iters
+                    solved.append((symbol, data, iv_est, iters, key, bool(extra)))
+                except Exception as iv_e:
+                    logger.debug(f"IV estimation failed for {symbol}: {iv_e}")
+        converged: list[tuple[Any, float]] = []
+        seed_hist = getattr(metrics, 'iv_seed_iterations_histogram', None) if metrics else None
+        for symbol, data, iv_est, iters, key, warm in solved:
+            try:
+                if metrics and hasattr(metrics, 'iv_iterations_histogram') and iters is not None:
+                    try:
+                        metrics.iv_iterations_histogram.labels(index=index_symbol, expiry=expiry_rule).observe(iters)
+                    except Exception:
+                        pass
+                if seed_hist is not None and iters:
+                    try:
+                        seed_hist.labels(index=index_symbol, seed='warm' if warm else 'cold').observe(iters)
+                    except Exception:
+                        pass
+                if iv_est > 0:
+                    if solver_min_iv < iv_est < solver_max_iv and 0 < iters < solver_max_iter:
+                        converged.append((key, iv_est))
+                    if iv_est < solver_min_iv:
+                        iv_est = solver_min_iv
+                    elif iv_est > solver_max_iv:
+                        iv_est = solver_max_iv
+                    data['iv'] = iv_est
+                    iv_success += 1
+                else:
+                    iv_fail += 1
+                total_iter += iters
             except Exception as iv_e:
                 logger.debug(f"IV estimation failed for {symbol}: {iv_e}")
+        if seed_cache is not None and converged:
+            seed_cache.put_many(converged)
         if metrics:
             try:
                 if hasattr(metrics, 'iv_success') and iv_success:
@@ -14,6 +14,7 @@ Public API:
 from __future__ import annotations
 
 import logging
+from functools import partial
 from typing import Any
 
 logger = logging.getLogger(__name__)
@@ -33,27 +34,42 @@ def emit_overview_aggregation(
     snapshot_base_time = getattr(aggregation_state, 'snapshot_base_time', None) or per_index_ts
     try:
         if pcr_snapshot:
+            # Queued behind this index's expiry writes when async persistence is enabled
+            from src.storage.persist_queue import persist_async
+            args = (index_symbol, dict(pcr_snapshot), snapshot_base_time, representative_day_width, expected_expiries)
+            if not persist_async('overview', partial(_write_overview_snapshot, ctx), *args, metrics=getattr(ctx, 'metrics', None)):
+                _write_overview_snapshot(ctx, *args)
+    except Exception:  # pragma: no cover
+        logger.debug("aggregation_overview_unexpected_failure", exc_info=True)
+    return representative_day_width, snapshot_base_time
+
+
+def _write_overview_snapshot(
+    ctx: Any,
+    index_symbol: str,
+    pcr_snapshot: dict[str, Any],
+    snapshot_base_time: Any,
+    representative_day_width: Any,
+    expected_expiries: Any,
+) -> None:
+    try:
+        ctx.csv_sink.write_overview_snapshot(
+            index_symbol,
+            pcr_snapshot,
+            snapshot_base_time,
+            representative_day_width,
+            expected_expiries=expected_expiries,
+        )
+        if ctx.influx_sink:
             try:
-                ctx.csv_sink.write_overview_snapshot(
+                ctx.influx_sink.write_overview_snapshot(
                     index_symbol,
                     pcr_snapshot,
                     snapshot_base_time,
                     representative_day_width,
                     expected_expiries=expected_expiries,
                 )
-                if ctx.influx_sink:
-                    try:
-                        ctx.influx_sink.write_overview_snapshot(
-                            index_symbol,
-                            pcr_snapshot,
-                            snapshot_base_time,
-                            representative_day_width,
-                            expected_expiries=expected_expiries,
-                        )
-                    except Exception as ie:  # pragma: no cover
-                        logger.debug(f"Influx overview snapshot failed for {index_symbol}: {ie}")
-            except Exception as inner:
-                logger.error(f"Failed to write aggregated overview snapshot for {index_symbol}: {inner}")
-    except Exception:  # pragma: no cover
-        logger.debug("aggregation_overview_unexpected_failure", exc_info=True)
-    return representative_day_width, snapshot_base_time
+            except Exception as ie:  # pragma: no cover
+                logger.debug(f"Influx overview snapshot failed for {index_symbol}: {ie}")
+    except Exception as inner:
+        logger.error(f"Failed to write aggregated overview snapshot for {index_symbol}: {inner}")
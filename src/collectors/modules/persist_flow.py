@@ -10,14 +10,23 @@ Responsibilities:
 - Return PersistResult unchanged
 - Provide lightweight aggregation payload pass-through (metrics_payload subset)
 
-NOTE: This module intentionally keeps logic minimal; any future enhancements
-(e.g., batching, async IO, retry policies) can be layered here without touching
-expiry_processor again.
+With ``G6_ASYNC_PERSIST=1`` the CSV / Influx / metrics chain is handed to the
+process persistence queue (``src.storage.persist_queue``) and the returned
+PersistResult carries a provisional aggregation payload (PCR, day width, tag)
+computed from the enriched data, so the cycle does not wait for the write.
+Write failures then surface through the usual error handlers and the queue's
+failure counters (which check ``PersistResult.failed``) instead of the result
+returned to the cycle.
+
+With ``G6_CYCLE_JOURNAL=1`` the frame is first appended to the write-ahead
+journal (``src.storage.cycle_journal``) and acknowledged once the sinks
+accepted it (inline or from the queue's writer thread).
 """
 from __future__ import annotations
 
 import logging
 from collections.abc import Callable
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 logger = logging.getLogger(__name__)
@@ -36,10 +45,11 @@ else:
     # No type: ignore needed because mypy never executes this branch.
     PersistResult = _PersistResultStub
 try:  # pragma: no cover
-    from src.collectors.helpers.persist import persist_with_context
+    from src.collectors.helpers.persist import persist_and_metrics, persist_with_context
 except Exception:  # pragma: no cover
     def persist_with_context(*a: Any, **kw: Any) -> PersistResult:  # fallback
         raise RuntimeError("persist_with_context unavailable")
+    persist_and_metrics = None  # type: ignore[assignment]
 
 TraceFn = Callable[[str], None] | Callable[[str, Any], None]
 
@@ -94,8 +104,17 @@ def run_persist_flow(
     except Exception:  # pragma: no cover
         pass
 
+    from src.storage.cycle_journal import ack_frame, journal_frame, make_frame
+    seq = journal_frame(make_frame(
+        expiry_ctx.index_symbol, expiry_ctx.expiry_date, expiry_ctx.expiry_rule, expiry_ctx.collection_time,
+        enriched_data, index_price=expiry_ctx.index_price, index_ohlc=index_ohlc,
+    ))
     try:
-        result = persist_with_context(ctx, enriched_data, expiry_ctx, index_ohlc)
+        result = _persist_queued(ctx, seq, enriched_data, expiry_ctx, index_ohlc)
+        if result is None:
+            result = persist_with_context(ctx, enriched_data, expiry_ctx, index_ohlc)
+            if not result.failed:
+                ack_frame(seq)
     except Exception:  # pragma: no cover - defensive catch (should already be handled inside helper)
         logger.error('persist_flow_unexpected_exception', exc_info=True)
         # Fabricate a failed PersistResult while avoiding import churn
@@ -112,4 +131,43 @@ def run_persist_flow(
 
     return result
 
+
+def _persist_and_ack(ctx: Any, seq: int | None, *args: Any) -> PersistResult:
+    from src.storage.cycle_journal import ack_frame
+    result = persist_and_metrics(ctx, *args)
+    if not result.failed:
+        ack_frame(seq)
+    return result
+
+
+def _persist_queued(ctx: Any, seq: int | None, enriched_data: dict[str, dict[str, Any]], expiry_ctx: Any, index_ohlc: Any) -> PersistResult | None:
+    """Enqueue the write when async persistence is on; None means write inline."""
+    if persist_and_metrics is None:
+        return None
+    from src.storage.persist_queue import copy_rows, persist_async, provisional_metrics_payload
+    # Rows are copied too: the sink prunes the mapping and annotates rows on the writer thread
+    snapshot = copy_rows(enriched_data)
+    queued = persist_async(
+        'expiry',
+        partial(_persist_and_ack, ctx),
+        seq,
+        snapshot,
+        expiry_ctx.index_symbol,
+        expiry_ctx.expiry_rule,
+        expiry_ctx.expiry_date,
+        expiry_ctx.collection_time,
+        expiry_ctx.index_price,
+        index_ohlc,
+        expiry_ctx.allow_per_option_metrics,
+        metrics=getattr(ctx, 'metrics', None),
+    )
+    if not queued:
+        return None
+    payload = provisional_metrics_payload(
+        enriched_data, expiry_ctx.expiry_rule, expiry_ctx.collection_time,
+        index_price=expiry_ctx.index_price, index_ohlc=index_ohlc,
+        csv_sink=getattr(ctx, 'csv_sink', None), index=expiry_ctx.index_symbol, expiry=expiry_ctx.expiry_date,
+    )
+    return PersistResult(option_count=len(snapshot), pcr=payload['pcr'], metrics_payload=payload, failed=False)
+
 __all__ = ["run_persist_flow"]
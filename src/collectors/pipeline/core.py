@@ -32,6 +32,7 @@ from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any, Protocol, cast
 
+from src.collectors.helpers.iv_greeks import use_vectorized
 from src.utils.expiry_service import build_expiry_service
 
 logger = logging.getLogger(__name__)
@@ -114,7 +115,11 @@ class NoOpAnalytics(AnalyticsBlock):
         return None
 
 class IVEstimationBlock(AnalyticsBlock):
-    """Estimate IV for options lacking iv (lightweight subset of legacy logic)."""
+    """Estimate IV for options lacking iv (lightweight subset of legacy logic).
+
+    Solves the whole expiry in one vectorized call when the calculator supports
+    it (see ``helpers.iv_greeks.use_vectorized``); per-option otherwise.
+    """
     def __init__(self, greeks_calculator: Any, risk_free_rate: float, max_iter: int = 100, iv_min: float = 0.01, iv_max: float = 5.0, precision: float = 1e-5) -> None:
         self.g = greeks_calculator
         self.r = risk_free_rate
@@ -130,6 +135,7 @@ class IVEstimationBlock(AnalyticsBlock):
         if spot <= 0:
             # best-effort: try provider ATM fallback later
             return
+        pending: list[tuple[dict[str, Any], float, bool, float]] = []
         for symbol, data in ee.enriched.items():
             try:
                 if float(data.get('iv', 0)) > 0:
@@ -141,12 +147,32 @@ class IVEstimationBlock(AnalyticsBlock):
                 if market_price <= 0:
                     continue
                 opt_type = (data.get('instrument_type') or data.get('type') or '').upper()
-                is_call = opt_type == 'CE'
-                iv_res = self.g.implied_volatility(
-                    is_call=is_call, S=spot, K=strike, T=ee.work.expiry_date, market_price=market_price,
-                    r=self.r, max_iterations=self.max_iter, precision=self.precision,
-                    min_iv=self.iv_min, max_iv=self.iv_max, return_iterations=False
-                )
+                pending.append((data, strike, opt_type == 'CE', market_price))
+            except Exception:  # pragma: no cover
+                continue
+        if not pending:
+            return
+        results: list[Any] | None = None
+        if use_vectorized(self.g):
+            try:
+                results = self.g.implied_volatility_batch(
+                    is_call=[p[2] for p in pending], S=spot, K=[p[1] for p in pending], T=ee.work.expiry_date,
+                    market_price=[p[3] for p in pending], r=self.r, max_iterations=self.max_iter,
+                    precision=self.precision, min_iv=self.iv_min, max_iv=self.iv_max, return_iterations=False
+                ).tolist()
+            except Exception as e:  # pragma: no cover
+                logger.debug("IV batch solve failed, falling back to scalar: %s", e)
+                results = None
+        for pos, (data, strike, is_call, market_price) in enumerate(pending):
+            try:
+                if results is not None:
+                    iv_res = results[pos]
+                else:
+                    iv_res = self.g.implied_volatility(
+                        is_call=is_call, S=spot, K=strike, T=ee.work.expiry_date, market_price=market_price,
+                        r=self.r, max_iterations=self.max_iter, precision=self.precision,
+                        min_iv=self.iv_min, max_iv=self.iv_max, return_iterations=False
+                    )
                 if isinstance(iv_res, (int,float)) and iv_res > 0:
                     if iv_res < self.iv_min: iv_res = self.iv_min
                     elif iv_res > self.iv_max: iv_res = self.iv_max
@@ -155,7 +181,9 @@ class IVEstimationBlock(AnalyticsBlock):
                 continue
 
 class GreeksBlock(AnalyticsBlock):
-    """Compute Greeks (delta, gamma, theta, vega, rho) if missing."""
+    """Compute Greeks (delta, gamma, theta, vega, rho) if missing (vectorized when supported)."""
+    _FIELDS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
     def __init__(self, greeks_calculator: Any, risk_free_rate: float) -> None:
         self.g = greeks_calculator
         self.r = risk_free_rate
@@ -166,21 +194,42 @@ class GreeksBlock(AnalyticsBlock):
         spot = float(ee.work.index_price or 0)
         if spot <= 0:
             return
+        rows: list[tuple[dict[str, Any], float, bool, float]] = []
         for symbol, data in ee.enriched.items():
             try:
                 strike = float(data.get('strike') or data.get('strike_price') or 0)
                 if strike <= 0:
                     continue
                 opt_type = (data.get('instrument_type') or data.get('type') or '').upper()
-                is_call = opt_type == 'CE'
                 iv_raw = float(data.get('iv', 0))
                 iv_fraction = iv_raw/100.0 if iv_raw > 1.5 else (iv_raw if iv_raw>0 else 0.25)
                 if iv_fraction <= 0:
                     iv_fraction = 0.25
-                greeks = self.g.black_scholes(is_call=is_call, S=spot, K=strike, T=ee.work.expiry_date, sigma=iv_fraction, r=self.r)
-                for k_src,k_dst in [('delta','delta'),('gamma','gamma'),('theta','theta'),('vega','vega'),('rho','rho')]:
-                    if float(data.get(k_dst,0)) == 0:
-                        data[k_dst] = greeks.get(k_src,0)
+                rows.append((data, strike, opt_type == 'CE', iv_fraction))
+            except Exception:  # pragma: no cover
+                continue
+        if not rows:
+            return
+        batch: dict[str, list[float]] | None = None
+        if use_vectorized(self.g, 'black_scholes_batch'):
+            try:
+                arrays = self.g.black_scholes_batch(
+                    is_call=[r[2] for r in rows], S=spot, K=[r[1] for r in rows], T=ee.work.expiry_date,
+                    sigma=[r[3] for r in rows], r=self.r,
+                )
+                batch = {k: arrays[k].tolist() for k in self._FIELDS}
+            except Exception as e:  # pragma: no cover
+                logger.debug("Greeks batch failed, falling back to scalar: %s", e)
+                batch = None
+        for pos, (data, strike, is_call, iv_fraction) in enumerate(rows):
+            try:
+                if batch is not None:
+                    greeks = {k: batch[k][pos] for k in self._FIELDS}
+                else:
+                    greeks = self.g.black_scholes(is_call=is_call, S=spot, K=strike, T=ee.work.expiry_date, sigma=iv_fraction, r=self.r)
+                for k in self._FIELDS:
+                    if float(data.get(k,0)) == 0:
+                        data[k] = greeks.get(k,0)
                 if float(data.get('iv',0)) == 0 and iv_fraction:
                     data['iv'] = iv_fraction
             except Exception:  # pragma: no cover
@@ -193,45 +242,65 @@ class CsvPersistAdapter(PersistenceBlock):
         self.metrics = metrics
 
     def persist(self, ee: EnrichedExpiry) -> PersistOutcome:
-        try:
-            metrics_payload = self.csv.write_options_data(
-                ee.work.index,
-                ee.work.expiry_date,
-                ee.enriched,
-                datetime.datetime.now(datetime.UTC),
-                index_price=ee.work.index_price,
-                index_ohlc={},
-                suppress_overview=True,
-                return_metrics=True,
-                expiry_rule_tag=ee.work.expiry_rule,
+        from src.storage.cycle_journal import ack_frame, journal_frame, make_frame
+        from src.storage.persist_queue import copy_rows, persist_async, provisional_metrics_payload
+        ts = datetime.datetime.now(datetime.UTC)
+        # Rows are copied too: the sink prunes the mapping and annotates rows
+        args = (ee.work.index, ee.work.expiry_date, copy_rows(ee.enriched), ts, ee.work.index_price, ee.work.expiry_rule)
+        # Write-ahead journal record before the sink fan-out (G6_CYCLE_JOURNAL)
+        seq = journal_frame(make_frame(ee.work.index, ee.work.expiry_date, ee.work.expiry_rule, ts, ee.enriched, index_price=ee.work.index_price))
+        if persist_async('pipeline_expiry', self._write_and_ack, seq, *args, metrics=self.metrics):
+            metrics_payload: dict[str, Any] | None = provisional_metrics_payload(
+                ee.enriched, ee.work.expiry_rule, ts, index_price=ee.work.index_price,
+                csv_sink=self.csv, index=ee.work.index, expiry=ee.work.expiry_date,
             )
-        except Exception as e:  # pragma: no cover (reuses upstream error handling eventually)
-            logger.error("CSV persistence failed in pipeline: %s", e)
-            return PersistOutcome(option_count=0, pcr=None, failed=True)
-        # Optional influx write
-        if self.influx:
+        else:
             try:
-                self.influx.write_options_data(
-                    ee.work.index,
-                    ee.work.expiry_date,
-                    ee.enriched,
-                    datetime.datetime.now(datetime.UTC),
-                )
-            except Exception as e:  # pragma: no cover
-                logger.debug("Influx persistence failed in pipeline: %s", e)
+                metrics_payload = self._write(*args)
+                ack_frame(seq)
+            except Exception as e:  # pragma: no cover (reuses upstream error handling eventually)
+                logger.error("CSV persistence failed in pipeline: %s", e)
+                return PersistOutcome(option_count=0, pcr=None, failed=True)
         pcr = None
         day_width = None
-        ts = None
+        snapshot_ts = None
         expiry_code = None
         try:
             if metrics_payload:
                 pcr = metrics_payload.get("pcr")
                 day_width = metrics_payload.get("day_width")
-                ts = metrics_payload.get("timestamp")
+                snapshot_ts = metrics_payload.get("timestamp")
                 expiry_code = metrics_payload.get("expiry_code")
         except Exception:  # pragma: no cover
             pass
-        return PersistOutcome(option_count=len(ee.enriched), pcr=pcr, failed=False, day_width=day_width, snapshot_timestamp=ts, expiry_code=expiry_code)
+        return PersistOutcome(option_count=len(ee.enriched), pcr=pcr, failed=False, day_width=day_width, snapshot_timestamp=snapshot_ts, expiry_code=expiry_code)
+
+    def _write_and_ack(self, seq: int | None, *args: Any) -> dict[str, Any] | None:
+        from src.storage.cycle_journal import ack_frame
+        metrics_payload = self._write(*args)
+        ack_frame(seq)
+        return metrics_payload
+
+    def _write(self, index: str, expiry_date: Any, enriched: dict[str, dict[str, Any]], ts: datetime.datetime,
+               index_price: float, expiry_rule: str) -> dict[str, Any] | None:
+        """CSV write (raises on failure) followed by the optional best-effort Influx write."""
+        metrics_payload = self.csv.write_options_data(
+            index,
+            expiry_date,
+            enriched,
+            ts,
+            index_price=index_price,
+            index_ohlc={},
+            suppress_overview=True,
+            return_metrics=True,
+            expiry_rule_tag=expiry_rule,
+        )
+        if self.influx:
+            try:
+                self.influx.write_options_data(index, expiry_date, enriched, ts)
+            except Exception as e:  # pragma: no cover
+                logger.debug("Influx persistence failed in pipeline: %s", e)
+        return cast(dict[str, Any] | None, metrics_payload)
 
 # ----------------------------------------------------------------------------
 # Pipeline Orchestrator
@@ -251,24 +320,37 @@ class CollectorPipeline:
         self.analytics = list(analytics)
         self.persistence = persistence
 
+    # Stage split (network fetch / CPU analytics / I/O persist) used by the staged cycle engine
+    def fetch_stage(self, wi: ExpiryWorkItem) -> EnrichedExpiry | None:
+        wi = self.resolver.resolve(wi)
+        instruments = self.fetcher.fetch(wi)
+        if not instruments:
+            logger.warning("Pipeline: no instruments for %s %s", wi.index, wi.expiry_rule)
+            return None
+        enriched = self.enricher.enrich(wi, instruments)
+        if not enriched:
+            logger.warning("Pipeline: no enriched quotes for %s %s", wi.index, wi.expiry_rule)
+            return None
+        return EnrichedExpiry(work=wi, instruments=instruments, enriched=enriched)
+
+    def analytics_stage(self, ee: EnrichedExpiry) -> EnrichedExpiry:
+        for block in self.analytics:
+            try:
+                block.apply(ee)
+            except Exception as ab:  # pragma: no cover
+                logger.debug("Analytics block failure: %s", ab)
+        return ee
+
+    def persist_stage(self, ee: EnrichedExpiry) -> PersistOutcome:
+        return self.persistence.persist(ee)
+
     def run_expiry(self, wi: ExpiryWorkItem) -> tuple[EnrichedExpiry | None, PersistOutcome | None]:
         try:
-            wi = self.resolver.resolve(wi)
-            instruments = self.fetcher.fetch(wi)
-            if not instruments:
-                logger.warning("Pipeline: no instruments for %s %s", wi.index, wi.expiry_rule)
+            ee = self.fetch_stage(wi)
+            if ee is None:
                 return None, None
-            enriched = self.enricher.enrich(wi, instruments)
-            if not enriched:
-                logger.warning("Pipeline: no enriched quotes for %s %s", wi.index, wi.expiry_rule)
-                return None, None
-            ee = EnrichedExpiry(work=wi, instruments=instruments, enriched=enriched)
-            for block in self.analytics:
-                try:
-                    block.apply(ee)
-                except Exception as ab:  # pragma: no cover
-                    logger.debug("Analytics block failure: %s", ab)
-            outcome = self.persistence.persist(ee)
+            self.analytics_stage(ee)
+            outcome = self.persist_stage(ee)
             return ee, outcome
         except Exception as e:  # pragma: no cover
             logger.error("Pipeline expiry failure %s %s: %s", wi.index, wi.expiry_rule, e)
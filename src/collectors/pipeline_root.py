@@ -89,22 +89,35 @@ class CollectorPipeline:
         self.enricher = enricher
         self.analytics = list(analytics)
         self.persistence = persistence
+    # Stage split (network fetch / CPU analytics / I/O persist) used by the staged cycle engine
+    def fetch_stage(self, wi: ExpiryWorkItem) -> EnrichedExpiry | None:
+        wi = self.resolver.resolve(wi)
+        instruments = self.fetcher.fetch(wi)
+        if not instruments:
+            return None
+        enriched = self.enricher.enrich(wi, instruments)
+        if not enriched:
+            return None
+        return EnrichedExpiry(work=wi, instruments=instruments, enriched=enriched)
+
+    def analytics_stage(self, ee: EnrichedExpiry) -> EnrichedExpiry:
+        for block in self.analytics:
+            try:
+                block.apply(ee)
+            except Exception:
+                logger.debug("analytics block failure", exc_info=True)
+        return ee
+
+    def persist_stage(self, ee: EnrichedExpiry) -> PersistOutcome:
+        return self.persistence.persist(ee)
+
     def run_expiry(self, wi: ExpiryWorkItem) -> tuple[EnrichedExpiry | None, PersistOutcome | None]:
         try:
-            wi = self.resolver.resolve(wi)
-            instruments = self.fetcher.fetch(wi)
-            if not instruments:
+            ee = self.fetch_stage(wi)
+            if ee is None:
                 return None, None
-            enriched = self.enricher.enrich(wi, instruments)
-            if not enriched:
-                return None, None
-            ee = EnrichedExpiry(work=wi, instruments=instruments, enriched=enriched)
-            for block in self.analytics:
-                try:
-                    block.apply(ee)
-                except Exception:
-                    logger.debug("analytics block failure", exc_info=True)
-            outcome = self.persistence.persist(ee)
+            self.analytics_stage(ee)
+            outcome = self.persist_stage(ee)
             return ee, outcome
         except Exception:
             logger.error("Pipeline expiry failure", exc_info=True)
@@ -132,20 +145,23 @@ def build_default_pipeline(
             self.csv = csv_sink
 
         def persist(self, ee: EnrichedExpiry) -> PersistOutcome:  # noqa: D401
-            try:
-                metrics_payload = self.csv.write_options_data(
-                    ee.work.index,
-                    ee.work.expiry_date,
-                    ee.enriched,
-                    datetime.datetime.now(datetime.UTC),
-                    index_price=ee.work.index_price,
-                    index_ohlc={},
-                    suppress_overview=True,
-                    return_metrics=True,
-                    expiry_rule_tag=ee.work.expiry_rule,
+            from src.storage.cycle_journal import ack_frame, journal_frame, make_frame
+            from src.storage.persist_queue import copy_rows, persist_async, provisional_metrics_payload
+            now = datetime.datetime.now(datetime.UTC)
+            args = (ee.work.index, ee.work.expiry_date, copy_rows(ee.enriched), now, ee.work.index_price, ee.work.expiry_rule)
+            # Write-ahead journal record before the sink fan-out (G6_CYCLE_JOURNAL)
+            seq = journal_frame(make_frame(ee.work.index, ee.work.expiry_date, ee.work.expiry_rule, now, ee.enriched, index_price=ee.work.index_price))
+            if persist_async('pipeline_root_expiry', self._write_and_ack, seq, *args):
+                metrics_payload: dict[str, Any] | None = provisional_metrics_payload(
+                    ee.enriched, ee.work.expiry_rule, now, index_price=ee.work.index_price,
+                    csv_sink=self.csv, index=ee.work.index, expiry=ee.work.expiry_date,
                 )
-            except Exception:
-                return PersistOutcome(option_count=0, pcr=None, failed=True)
+            else:
+                try:
+                    metrics_payload = self._write(*args)
+                    ack_frame(seq)
+                except Exception:
+                    return PersistOutcome(option_count=0, pcr=None, failed=True)
             pcr: float | None = None
             day_width: int | None = None
             ts: datetime.datetime | None = None
@@ -164,6 +180,26 @@ def build_default_pipeline(
                 expiry_code=expiry_code,
             )
 
+        def _write_and_ack(self, seq: int | None, *args: Any) -> dict[str, Any] | None:
+            from src.storage.cycle_journal import ack_frame
+            metrics_payload = self._write(*args)
+            ack_frame(seq)
+            return metrics_payload
+
+        def _write(self, index: str, expiry_date: Any, enriched: dict[str, dict[str, Any]], ts: datetime.datetime,
+                   index_price: float, expiry_rule: str) -> dict[str, Any] | None:
+            return self.csv.write_options_data(  # type: ignore[no-any-return]
+                index,
+                expiry_date,
+                enriched,
+                ts,
+                index_price=index_price,
+                index_ohlc={},
+                suppress_overview=True,
+                return_metrics=True,
+                expiry_rule_tag=expiry_rule,
+            )
+
     persist: PersistenceBlock = CsvPersistAdapter(csv_sink, influx_sink=influx_sink, metrics=metrics)
     return CollectorPipeline(
         resolver=adapter,
@@ -974,96 +974,115 @@ def run_unified_collectors(
 
     merged_phase_times: dict[str,float] = {} if _PHASE_MERGE else {}
     per_index_summaries: list[dict[str,int]] = [] if _AGGREGATED_SUMMARY_ENABLED else []
-    for index_symbol, params in index_params.items():
-        _res = _process_index(
-            ctx,
-            index_symbol,
-            params,
-            compute_greeks=compute_greeks,
-            estimate_iv=estimate_iv,
-            greeks_calculator=greeks_calculator,
-            mem_flags=mem_flags,
-            concise_mode=concise_mode,
-            build_snapshots=build_snapshots,
-            risk_free_rate=risk_free_rate,
-            metrics=metrics,
-            snapshots_accum=snapshots_accum,
-            dq_enabled=dq_enabled,
-            dq_checker=dq_checker,
-        )
-        if _res.get('summary_rows_entry'):
-            summary_rows.append(_res['summary_rows_entry'])
-        if _res.get('human_block'):
-            human_blocks.append(_res['human_block'])
-        overall_legs_total += _res.get('overall_legs',0)
-        overall_fail_total += _res.get('overall_fails',0)
-        if _PHASE_MERGE and ctx.phase_times:
-            for k,v in ctx.phase_times.items():
-                merged_phase_times[k] = merged_phase_times.get(k,0.0)+v
-            ctx.phase_times.clear()
-        if _AGGREGATED_SUMMARY_ENABLED:
-            per_index_summaries.append({
-                'legs': int(_res.get('overall_legs',0) or 0),
-                'fails': int(_res.get('overall_fails',0) or 0),
-            })
-        if _res.get('indices_struct_entry'):
-            entry = cast(IndexStructEntry, _res['indices_struct_entry'])
-            # Determine emptiness: zero option_count but had attempts
-            try:
-                attempts = int(entry.get('attempts') or 0)
-                option_count = int(entry.get('option_count') or 0)
-                is_empty = attempts > 0 and option_count == 0
-            except Exception:
-                is_empty = False
-            # Update counters
-            try:
-                counter_map = getattr(metrics, '_consec_empty_counters', None) if metrics else None
-                if counter_map is None:
-                    counter_map = _G6_CONSEC_EMPTY_COUNTERS
-                prev = int(counter_map.get(index_symbol, 0) or 0)
-                curr = prev + 1 if is_empty else 0
-                counter_map[index_symbol] = curr
-                if metrics is not None and getattr(metrics, '_consec_empty_counters', None) is None:
-                    try:
-                        metrics._consec_empty_counters = counter_map
-                    except Exception:
-                        pass
-                entry['empty_consec'] = curr
-            except Exception:
-                entry['empty_consec'] = 0
-            indices_struct.append(entry)
-        else:
-            # Fallback: synthesize a minimal entry so structured return isn't empty in minimal environments
+    # Cycle-scoped quote coalescing: plan every enabled index spot symbol so the
+    # first spot lookup fetches them all and later indices reuse the cycle store.
+    _quote_coalescer = None
+    try:
+        from src.broker.kite.quote_coalescer import begin_cycle, coalescing_enabled
+        if coalescing_enabled():
+            from src.broker.kite_provider import INDEX_MAPPING
+            _plan = [f"{INDEX_MAPPING[i][0]}:{INDEX_MAPPING[i][1]}" for i in index_params if i in INDEX_MAPPING]
+            _quote_coalescer = begin_cycle(getattr(providers, 'primary_provider', None), _plan)
+    except Exception:
+        logger.debug('quote_coalescer_begin_failed', exc_info=True)
+    try:
+        for index_symbol, params in index_params.items():
+            _res = _process_index(
+                ctx,
+                index_symbol,
+                params,
+                compute_greeks=compute_greeks,
+                estimate_iv=estimate_iv,
+                greeks_calculator=greeks_calculator,
+                mem_flags=mem_flags,
+                concise_mode=concise_mode,
+                build_snapshots=build_snapshots,
+                risk_free_rate=risk_free_rate,
+                metrics=metrics,
+                snapshots_accum=snapshots_accum,
+                dq_enabled=dq_enabled,
+                dq_checker=dq_checker,
+            )
+            if _res.get('summary_rows_entry'):
+                summary_rows.append(_res['summary_rows_entry'])
+            if _res.get('human_block'):
+                human_blocks.append(_res['human_block'])
+            overall_legs_total += _res.get('overall_legs',0)
+            overall_fail_total += _res.get('overall_fails',0)
+            if _PHASE_MERGE and ctx.phase_times:
+                for k,v in ctx.phase_times.items():
+                    merged_phase_times[k] = merged_phase_times.get(k,0.0)+v
+                ctx.phase_times.clear()
+            if _AGGREGATED_SUMMARY_ENABLED:
+                per_index_summaries.append({
+                    'legs': int(_res.get('overall_legs',0) or 0),
+                    'fails': int(_res.get('overall_fails',0) or 0),
+                })
+            if _res.get('indices_struct_entry'):
+                entry = cast(IndexStructEntry, _res['indices_struct_entry'])
+                # Determine emptiness: zero option_count but had attempts
+                try:
+                    attempts = int(entry.get('attempts') or 0)
+                    option_count = int(entry.get('option_count') or 0)
+                    is_empty = attempts > 0 and option_count == 0
+                except Exception:
+                    is_empty = False
+                # Update counters
+                try:
+                    counter_map = getattr(metrics, '_consec_empty_counters', None) if metrics else None
+                    if counter_map is None:
+                        counter_map = _G6_CONSEC_EMPTY_COUNTERS
+                    prev = int(counter_map.get(index_symbol, 0) or 0)
+                    curr = prev + 1 if is_empty else 0
+                    counter_map[index_symbol] = curr
+                    if metrics is not None and getattr(metrics, '_consec_empty_counters', None) is None:
+                        try:
+                            metrics._consec_empty_counters = counter_map
+                        except Exception:
+                            pass
+                    entry['empty_consec'] = curr
+                except Exception:
+                    entry['empty_consec'] = 0
+                indices_struct.append(entry)
+            else:
+                # Fallback: synthesize a minimal entry so structured return isn't empty in minimal environments
+                try:
+                    opt_count = int(_res.get('overall_legs', 0) or 0)
+                except Exception:
+                    opt_count = 0
+                try:
+                    cfg = params if isinstance(params, dict) else {}
+                    exp_list = cfg.get('expiries') or ['this_week']
+                    first_rule = exp_list[0] if isinstance(exp_list, list) and exp_list else 'this_week'
+                except Exception:
+                    first_rule = 'this_week'
+                indices_struct.append(cast(IndexStructEntry, {
+                    'index': index_symbol,
+                    'status': 'unknown',
+                    'option_count': opt_count,
+                    'attempts': int(_res.get('overall_legs', 0) or 0),
+                    'expiries': [{'rule': first_rule, 'status': 'ok' if opt_count>0 else 'empty', 'options': opt_count, 'failed': opt_count==0}],
+                }))
+            # Accumulate per-index option legs for metrics (each leg = one option instrument)
             try:
-                opt_count = int(_res.get('overall_legs', 0) or 0)
+                if metrics:
+                    legs = int(_res.get('overall_legs', 0) or 0)
+                    # Initialize per-index tracking map if missing
+                    if not hasattr(metrics, '_per_index_last_cycle_options'):
+                        metrics._per_index_last_cycle_options = {}
+                    per_map = metrics._per_index_last_cycle_options
+                    if isinstance(per_map, dict):
+                        per_map[index_symbol] = legs
             except Exception:
-                opt_count = 0
+                logger.debug('metrics_per_index_option_accumulate_failed', exc_info=True)
+    finally:
+        if _quote_coalescer is not None:
             try:
-                cfg = params if isinstance(params, dict) else {}
-                exp_list = cfg.get('expiries') or ['this_week']
-                first_rule = exp_list[0] if isinstance(exp_list, list) and exp_list else 'this_week'
+                from src.broker.kite.quote_coalescer import end_cycle
+                end_cycle()
+                logger.debug('quote_coalescer_cycle %s', _quote_coalescer.stats())
             except Exception:
-                first_rule = 'this_week'
-            indices_struct.append(cast(IndexStructEntry, {
-                'index': index_symbol,
-                'status': 'unknown',
-                'option_count': opt_count,
-                'attempts': int(_res.get('overall_legs', 0) or 0),
-                'expiries': [{'rule': first_rule, 'status': 'ok' if opt_count>0 else 'empty', 'options': opt_count, 'failed': opt_count==0}],
-            }))
-        # Accumulate per-index option legs for metrics (each leg = one option instrument)
-        try:
-            if metrics:
-                legs = int(_res.get('overall_legs', 0) or 0)
-                # Initialize per-index tracking map if missing
-                if not hasattr(metrics, '_per_index_last_cycle_options'):
-                    metrics._per_index_last_cycle_options = {}
-                per_map = metrics._per_index_last_cycle_options
-                if isinstance(per_map, dict):
-                    per_map[index_symbol] = legs
-        except Exception:
-            logger.debug('metrics_per_index_option_accumulate_failed', exc_info=True)
-
+                pass
     # Update collection time metrics
     total_elapsed = time.time() - start_cycle_wall  # cycle duration (seconds)
     # Set aggregate options processed for cycle summary (sum of legs across indices)
@@ -1,16 +1,37 @@
-"""Column Store Ingestion Pipeline (Phase 4A - Simulation Only)
+"""Column Store Ingestion Pipeline (Phase 4B - local SQLite backend)
 
-Implements minimal ingestion buffer + batcher + metrics emission using the
-pre-defined `column_store` metrics family. External writes are simulated so
-we can validate metrics and backpressure behavior without a real backend yet.
+Ingestion buffer + batcher + metrics emission using the pre-defined
+`column_store` metrics family. Batches are bulk inserted into an embedded
+SQLite file (``STORAGE_COLUMN_STORE_DRIVER=sqlite``, see
+``src.column_store.writers``) so analytical queries can move off the CSV tree
+without an external ClickHouse. ``driver=simulate`` keeps the old no-op write.
+
+Write path:
+- One bulk insert per batch; bytes metric reports the encoded growth of the
+  database file (not a str() estimate).
+- Failed batches (failure hook returned a reason, or the writer raised) are
+  retried with exponential backoff; every retry increments retries_total and
+  a batch that still fails after its last retry increments
+  failures_total{reason} once (with the last reason).
+- Batches that exhaust their retries, and the in-memory backlog once it
+  reaches ``high_watermark_rows``, are spilled to JSONL segments on disk and
+  replayed oldest-first while the in-memory backlog is below
+  ``low_watermark_rows``. A replayed segment is written with its file name as
+  batch id; the SQLite writer records applied ids in the same transaction, so
+  a crash between the insert and the segment removal cannot duplicate rows.
+- Backlog gauge counts in-memory + spilled rows; the backpressure flag engages
+  at the high watermark and clears at the low watermark.
 
 Future phases will:
 - Add real ClickHouse writer
-- Implement retry with exponential backoff
 - Support configurable serialization formats
 """
 from __future__ import annotations
 
+import logging
+import os
+import threading
+import time
 from collections.abc import Callable
 from dataclasses import dataclass
 from typing import Any, Protocol
@@ -23,9 +44,6 @@ class _SupportsMetricOps(Protocol):  # minimal structural typing for labels obje
 
 def _safe(obj: Any) -> _SupportsMetricOps | None:
     return obj if obj is not None else None
-import os
-import threading
-import time
 
 try:
     from src.metrics import generated as m  # runtime-provided metrics family
@@ -42,6 +60,10 @@ except Exception:  # pragma: no cover - defensive fallback
     m = _Dummy()
 from src.metrics.safe_emit import safe_emit
 
+from .writers import BatchWriter, SpillStore, SQLiteWriter
+
+logger = logging.getLogger(__name__)
+
 # ---------------------------------------------------------------------------
 # Configuration (environment driven – no centralized config system yet)
 # ---------------------------------------------------------------------------
@@ -64,6 +86,11 @@ class PipelineConfig:
     max_latency_ms: int = 5000
     high_watermark_rows: int = 80000
     low_watermark_rows: int = 40000
+    driver: str = "sqlite"
+    path: str = os.path.join("data", "column_store", "column_store.sqlite")
+    spill_dir: str = os.path.join("data", "column_store", "spill")
+    max_retries: int = 3
+    retry_backoff_ms: int = 50
 
     @staticmethod
     def from_env() -> PipelineConfig:
@@ -74,9 +101,14 @@ class PipelineConfig:
             max_latency_ms=_getenv_int("STORAGE_COLUMN_STORE_MAX_LATENCY_MS", 5000),
             high_watermark_rows=_getenv_int("STORAGE_COLUMN_STORE_HIGH_WATERMARK_ROWS", 80000),
             low_watermark_rows=_getenv_int("STORAGE_COLUMN_STORE_LOW_WATERMARK_ROWS", 40000),
+            driver=os.getenv("STORAGE_COLUMN_STORE_DRIVER", "sqlite").strip().lower(),
+            path=os.getenv("STORAGE_COLUMN_STORE_PATH", os.path.join("data", "column_store", "column_store.sqlite")),
+            spill_dir=os.getenv("STORAGE_COLUMN_STORE_SPILL_DIR", os.path.join("data", "column_store", "spill")),
+            max_retries=_getenv_int("STORAGE_COLUMN_STORE_MAX_RETRIES", 3),
+            retry_backoff_ms=_getenv_int("STORAGE_COLUMN_STORE_RETRY_BACKOFF_MS", 50),
         )
 
-# Row type for simulation: dict of column -> value
+# Row type: dict of column -> value
 Row = dict[str, Any]
 
 class _Buffer:
@@ -107,14 +139,19 @@ class _Buffer:
         return out
 
 class ColumnStorePipeline:
-    def __init__(self, cfg: PipelineConfig):
+    def __init__(self, cfg: PipelineConfig, writer: BatchWriter | None = None):
         self.cfg = cfg
         self._buf = _Buffer()
         self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # one writer of batches/spill segments at a time
         self._stop = threading.Event()
         self._thread: threading.Thread | None = None
-        # Simulated failure injection hook
+        # Failure injection hook (called before every write attempt)
         self._fail_writer: Callable[[list[Row]], str | None] | None = None  # returns reason if failure
+        self._writer: BatchWriter | None = writer
+        self._spill = SpillStore(cfg.spill_dir, cfg.table)
+        self._spilled_rows = self._spill.pending_rows() if cfg.enabled else 0
+        self._backpressure = False
         if self.cfg.enabled:
             self._thread = threading.Thread(target=self._run, name="cs-ingest", daemon=True)
             self._thread.start()
@@ -127,16 +164,32 @@ class ColumnStorePipeline:
             return
         with self._lock:
             self._buf.add(row)
+            if len(self._buf.rows) >= self.cfg.high_watermark_rows:
+                self._spill_rows(self._buf.pop_all())
             self._update_backlog_metrics()
 
+    @property
+    def backlog_rows(self) -> int:
+        return len(self._buf.rows) + self._spilled_rows
+
+    def _spill_rows(self, rows: list[Row]) -> None:
+        try:
+            if self._spill.spill(rows):
+                self._spilled_rows += len(rows)
+        except Exception:
+            logger.warning("cs_spill_failed table=%s rows=%d", self.cfg.table, len(rows), exc_info=True)
+
     def _update_backlog_metrics(self):
         try:
-            backlog = len(self._buf.rows)
+            backlog = self.backlog_rows
             _g = _safe(m.m_cs_ingest_backlog_rows_labels(self.cfg.table))
             if _g: _g.set(backlog)
-            backpressure_active = 1 if backlog >= self.cfg.high_watermark_rows else 0
+            if backlog >= self.cfg.high_watermark_rows:
+                self._backpressure = True
+            elif backlog <= self.cfg.low_watermark_rows:
+                self._backpressure = False
             _g2 = _safe(m.m_cs_ingest_backpressure_flag_labels(self.cfg.table))
-            if _g2: _g2.set(backpressure_active)
+            if _g2: _g2.set(1 if self._backpressure else 0)
         except Exception:
             pass
 
@@ -148,67 +201,119 @@ class ColumnStorePipeline:
                 pass
             self._stop.wait(0.25)
 
-    def _maybe_flush(self):
-        with self._lock:
-            if not self._buf.should_flush(self.cfg.batch_rows, self.cfg.max_latency_ms):
-                return
-            batch = self._buf.pop_all()
-        if not batch:
-            return
-        start = time.perf_counter()
-        failure_reason: str | None = None
+    def _get_writer(self) -> BatchWriter | None:
+        if self._writer is None and self.cfg.driver == "sqlite":
+            self._writer = SQLiteWriter(self.cfg.path)
+        return self._writer
+
+    def _write_with_retry(self, batch: list[Row], batch_id: str | None = None) -> tuple[int, float, str | None]:
+        """Write one batch; returns (encoded_bytes, elapsed_ms, failure_reason)."""
+        attempts = max(0, self.cfg.max_retries) + 1
+        reason: str | None = None
+        for attempt in range(attempts):
+            if attempt:
+                try:
+                    _c_retry = _safe(m.m_cs_ingest_retries_total_labels(self.cfg.table))
+                    if _c_retry: _c_retry.inc()
+                except Exception:
+                    pass
+                self._stop.wait(self.cfg.retry_backoff_ms * (2 ** (attempt - 1)) / 1000.0)
+            start = time.perf_counter()
+            try:
+                reason = self._fail_writer(batch) if self._fail_writer else None
+                if not reason:
+                    writer = self._get_writer()
+                    nbytes = writer.write_batch(self.cfg.table, batch, batch_id=batch_id) if writer is not None else 0
+                    return nbytes, (time.perf_counter() - start) * 1000.0, None
+            except Exception as e:
+                reason = str(e.__class__.__name__)
+                logger.debug("cs_write_failed table=%s attempt=%d", self.cfg.table, attempt, exc_info=True)
         try:
-            if self._fail_writer:
-                reason = self._fail_writer(batch)
-                if reason:
-                    failure_reason = reason
-            # Simulation: pretend write success if no failure reason set
-        except Exception as e:  # pragma: no cover - defensive
-            failure_reason = str(e.__class__.__name__)
-        elapsed_ms = (time.perf_counter() - start) * 1000.0
+            _c_fail = _safe(m.m_cs_ingest_failures_total_labels(self.cfg.table, reason or 'unknown'))
+            if _c_fail: _c_fail.inc()
+        except Exception:
+            pass
+        return 0, 0.0, reason
+
+    def _maybe_flush(self, force: bool = False):
+        with self._flush_lock:
+            with self._lock:
+                due = self._buf.rows and (force or self._buf.should_flush(self.cfg.batch_rows, self.cfg.max_latency_ms))
+                batch = self._buf.pop_all() if due else []
+            ok = True
+            if batch:
+                ok = self._flush_batch(batch)
+                if not ok:
+                    with self._lock:
+                        self._spill_rows(batch)
+            # Replay spilled segments while the backend is healthy and memory backlog is low
+            while ok and self._spilled_rows and len(self._buf.rows) < self.cfg.low_watermark_rows:
+                ok = self._replay_one()
+                if not force:
+                    break
+            with self._lock:
+                self._update_backlog_metrics()
+
+    def _replay_one(self) -> bool:
+        segs = self._spill.segments()
+        if not segs:
+            self._spilled_rows = 0
+            return False
+        path = segs[0]
+        try:
+            rows = self._spill.load(path)
+        except Exception:
+            logger.warning("cs_spill_segment_unreadable path=%s", path, exc_info=True)
+            os.replace(path, path + '.bad')
+            self._spilled_rows = self._spill.pending_rows()
+            return True
+        # Segment name as batch id: a crash after the insert but before the remove
+        # replays the segment into a no-op instead of duplicating its rows
+        if rows and not self._flush_batch(rows, batch_id=os.path.basename(path)):
+            return False
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._spilled_rows = max(0, self._spilled_rows - len(rows))
+        return True
+
+    def _flush_batch(self, batch: list[Row], batch_id: str | None = None) -> bool:
+        nbytes, elapsed_ms, failure_reason = self._write_with_retry(batch, batch_id)
 
         @safe_emit(emitter="cs.ingest.batch")
         def _emit_batch_metrics():
             try:
-                if failure_reason:
-                    _c_fail = _safe(m.m_cs_ingest_failures_total_labels(self.cfg.table, failure_reason))
-                    if _c_fail: _c_fail.inc()
-                else:
-                    rows = len(batch)
-                    est_bytes = 0
-                    try:
-                        est_bytes = sum(sum(len(str(v)) for v in r.values()) for r in batch)
-                    except Exception:
-                        pass
+                if not failure_reason:
                     _c_rows = _safe(m.m_cs_ingest_rows_total_labels(self.cfg.table))
-                    if _c_rows: _c_rows.inc(rows)
+                    if _c_rows: _c_rows.inc(len(batch))
                     _c_bytes = _safe(m.m_cs_ingest_bytes_total_labels(self.cfg.table))
-                    if _c_bytes: _c_bytes.inc(est_bytes)
+                    if _c_bytes: _c_bytes.inc(nbytes)
                     _h_lat = _safe(m.m_cs_ingest_latency_ms_labels(self.cfg.table))
                     if _h_lat: _h_lat.observe(elapsed_ms)
-                # Update backlog (now empty after flush)
-                backlog_now = len(self._buf.rows)
-                _g_backlog = _safe(m.m_cs_ingest_backlog_rows_labels(self.cfg.table))
-                if _g_backlog: _g_backlog.set(backlog_now)
-                bp = 1 if backlog_now >= self.cfg.high_watermark_rows else 0
-                _g_bp = _safe(m.m_cs_ingest_backpressure_flag_labels(self.cfg.table))
-                if _g_bp: _g_bp.set(bp)
             except Exception:
                 pass
         _emit_batch_metrics()
+        return failure_reason is None
 
-    def flush(self):
-        self._maybe_flush()
+    def flush(self, force: bool = False):
+        self._maybe_flush(force=force)
 
     def shutdown(self):
         self._stop.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=2.0)
-        # Final flush
+        # Final flush (retries skip backoff once stopped; failures spill)
         try:
-            self.flush()
+            self.flush(force=True)
         except Exception:
             pass
+        if self._writer is not None:
+            try:
+                self._writer.close()
+            except Exception:
+                pass
 
 # Simple factory (singleton per table)
 _PIPELINES: dict[str, ColumnStorePipeline] = {}
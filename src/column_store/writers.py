@@ -0,0 +1,207 @@
+"""Local column-store backends for ColumnStorePipeline.
+
+SQLiteWriter
+    Embedded SQLite file (WAL mode) so analytical queries can run off the CSV
+    tree without an external ClickHouse. Each batch is one ``executemany`` bulk
+    insert inside a single transaction. The table schema follows the rows: the
+    first batch creates it and later batches add new keys with
+    ``ALTER TABLE ADD COLUMN``. Affinity comes from the first non-null value
+    (int/bool -> INTEGER, float -> REAL, anything else -> TEXT, with dict/list
+    stored as JSON).
+
+    ``write_batch`` returns the true encoded byte growth of the database:
+    ``PRAGMA page_count`` delta * page_size, which includes uncheckpointed WAL
+    frames. The delta is page granular, so small batches may report 0 while
+    the running sum stays exact.
+
+    A ``batch_id`` makes the write idempotent: the id is recorded in
+    ``_cs_applied_batches`` inside the insert transaction and a batch whose id
+    is already there is skipped (returns 0).
+
+SpillStore
+    Append-only JSONL spill segments used when the in-memory backlog exceeds
+    the high watermark or a batch exhausts its retries. Segments are replayed
+    oldest-first once the backend accepts writes again.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from typing import Any, Protocol
+
+Row = dict[str, Any]
+
+__all__ = ["BatchWriter", "SQLiteWriter", "SpillStore"]
+
+_IDENT = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+_APPLIED_TABLE = '_cs_applied_batches'
+
+
+class BatchWriter(Protocol):
+    def write_batch(self, table: str, rows: list[Row], *, batch_id: str | None = None) -> int: ...  # pragma: no cover - interface only
+    def close(self) -> None: ...  # pragma: no cover - interface only
+
+
+def _ident(name: str) -> str:
+    if _IDENT.match(name):
+        return f'"{name}"'
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _affinity(v: Any) -> str:
+    if isinstance(v, bool) or isinstance(v, int):
+        return 'INTEGER'
+    if isinstance(v, float):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _cell(v: Any) -> Any:
+    if v is None or isinstance(v, (int, float, str, bytes)):
+        return v
+    if isinstance(v, (dict, list, tuple)):
+        return json.dumps(v, default=str, separators=(',', ':'))
+    return str(v)
+
+
+class SQLiteWriter:
+    """Bulk-insert writer over an embedded SQLite database file."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._page_size = int(self._conn.execute('PRAGMA page_size').fetchone()[0])
+        self._columns: dict[str, list[str]] = {}
+        self._lock = threading.Lock()
+
+    def _table_columns(self, table: str) -> list[str]:
+        cols = self._columns.get(table)
+        if cols is None:
+            cols = [r[1] for r in self._conn.execute(f'PRAGMA table_info({_ident(table)})')]
+            self._columns[table] = cols
+        return cols
+
+    def _ensure_schema(self, table: str, rows: list[Row]) -> list[str]:
+        existing = self._table_columns(table)
+        known = set(existing)
+        new: dict[str, str] = {}
+        for r in rows:
+            for k, v in r.items():
+                if k in known:
+                    continue
+                if k not in new or (new[k] == 'TEXT' and v is not None and not isinstance(v, str)):
+                    new[k] = _affinity(v) if v is not None else new.get(k, 'TEXT')
+        if not existing:
+            if not new:
+                return existing
+            ddl = ', '.join(f'{_ident(k)} {t}' for k, t in new.items())
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS {_ident(table)} ({ddl})')
+            existing.extend(new)
+        else:
+            for k, t in new.items():
+                self._conn.execute(f'ALTER TABLE {_ident(table)} ADD COLUMN {_ident(k)} {t}')
+                existing.append(k)
+        return existing
+
+    def _db_bytes(self) -> int:
+        return int(self._conn.execute('PRAGMA page_count').fetchone()[0]) * self._page_size
+
+    def write_batch(self, table: str, rows: list[Row], *, batch_id: str | None = None) -> int:
+        if not rows:
+            return 0
+        with self._lock:
+            before = self._db_bytes()
+            self._conn.execute('BEGIN IMMEDIATE')
+            try:
+                if batch_id is not None:
+                    self._conn.execute(
+                        f'CREATE TABLE IF NOT EXISTS {_APPLIED_TABLE} (tbl TEXT NOT NULL, batch_id TEXT NOT NULL, '
+                        'PRIMARY KEY (tbl, batch_id))'
+                    )
+                    cur = self._conn.execute(f'INSERT OR IGNORE INTO {_APPLIED_TABLE} VALUES (?, ?)', (table, batch_id))
+                    if cur.rowcount == 0:  # already applied
+                        self._conn.execute('COMMIT')
+                        return 0
+                cols = self._ensure_schema(table, rows)
+                if cols:
+                    placeholders = ', '.join('?' * len(cols))
+                    sql = f'INSERT INTO {_ident(table)} ({", ".join(_ident(c) for c in cols)}) VALUES ({placeholders})'
+                    self._conn.executemany(sql, [tuple(_cell(r.get(c)) for c in cols) for r in rows])
+                self._conn.execute('COMMIT')
+            except Exception:
+                self._conn.execute('ROLLBACK')
+                self._columns.pop(table, None)  # DDL rolled back with the batch
+                raise
+            return max(0, self._db_bytes() - before)
+
+    def query(self, sql: str, params: Iterable[Any] = ()) -> list[tuple[Any, ...]]:
+        with self._lock:
+            return list(self._conn.execute(sql, tuple(params)))
+
+    def close(self) -> None:
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+class SpillStore:
+    """Oldest-first JSONL spill segments for one table."""
+
+    def __init__(self, directory: str, table: str) -> None:
+        self.dir = directory
+        self.table = table
+        self._seq = 0
+
+    def spill(self, rows: list[Row]) -> str | None:
+        if not rows:
+            return None
+        os.makedirs(self.dir, exist_ok=True)
+        self._seq += 1
+        name = f"{self.table}-{time.time_ns()}-{os.getpid()}-{self._seq:06d}.jsonl"
+        path = os.path.join(self.dir, name)
+        tmp = path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as fh:
+            for r in rows:
+                fh.write(json.dumps(r, default=str, separators=(',', ':')))
+                fh.write('\n')
+        os.replace(tmp, path)
+        return path
+
+    def segments(self) -> list[str]:
+        try:
+            names = sorted(fn for fn in os.listdir(self.dir) if fn.startswith(self.table + '-') and fn.endswith('.jsonl'))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.dir, fn) for fn in names]
+
+    @staticmethod
+    def load(path: str) -> list[Row]:
+        out: list[Row] = []
+        with open(path, encoding='utf-8') as fh:
+            for line in fh:
+                line = line.strip()
+                if line:
+                    out.append(json.loads(line))
+        return out
+
+    def pending_rows(self) -> int:
+        total = 0
+        for p in self.segments():
+            try:
+                with open(p, 'rb') as fh:
+                    total += sum(1 for _ in fh)
+            except OSError:
+                continue
+        return total
@@ -8,10 +8,10 @@ from __future__ import annotations
 
 import os
 from collections import Counter, deque
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone, tzinfo
-from threading import Lock
+from threading import Condition, Lock
 from typing import Any, Protocol, Union, runtime_checkable
 
 try:  # Prefer system zoneinfo if available
@@ -94,6 +94,79 @@ class EventRecord:
         return base
 
 
+class _EventRing:
+    """Bounded history of events keyed by event id, oldest first.
+
+    Retention is count-based like the ``deque(maxlen=...)`` it replaces: the
+    newest ``capacity`` records are kept, and a coalesced replacement frees
+    its entry so older events stay retained rather than leaving a hole. Ids
+    only grow, so dict insertion order is id order; removal is O(1) and
+    ``since`` walks back from the newest record, touching only the requested
+    tail instead of scanning the backlog.
+    """
+
+    __slots__ = ("_recs", "_cap")
+
+    def __init__(self, capacity: int) -> None:
+        self._cap = capacity
+        self._recs: dict[int, EventRecord] = {}
+
+    def append(self, record: EventRecord) -> None:
+        recs = self._recs
+        eid = record.event_id
+        if recs and eid <= next(reversed(recs)):
+            # Out-of-order id: only an in-place replacement keeps id order
+            if eid in recs:
+                recs[eid] = record
+            return
+        recs[eid] = record
+        while len(recs) > self._cap:
+            del recs[next(iter(recs))]
+
+    def discard(self, event_id: int) -> None:
+        self._recs.pop(event_id, None)
+
+    def since(self, last_event_id: int, limit: int | None = None) -> list[EventRecord]:
+        recs = self._recs
+        if not recs or limit == 0:
+            return []
+        cap = limit if limit is not None and limit > 0 else None
+        newer = next(reversed(recs)) - last_event_id  # upper bound on records to return
+        if newer <= 0:
+            return []
+        out: list[EventRecord]
+        if newer <= len(recs) - newer:
+            # Reader near the tail: walk back from the newest; the deque keeps the oldest ``cap``
+            newest_first: deque[EventRecord] = deque(maxlen=cap)
+            for eid, rec in reversed(recs.items()):
+                if eid <= last_event_id:
+                    break
+                newest_first.append(rec)
+            out = list(newest_first)
+            out.reverse()
+            return out
+        # Reader far behind: walk forward and stop after ``cap`` records
+        out = []
+        for eid, rec in recs.items():
+            if eid > last_event_id:
+                out.append(rec)
+                if cap is not None and len(out) >= cap:
+                    break
+        return out
+
+    def clear(self) -> None:
+        self._recs.clear()
+
+    def __len__(self) -> int:
+        return len(self._recs)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        return iter(self._recs.values())
+
+    def __reversed__(self) -> Iterator[EventRecord]:
+        return reversed(self._recs.values())
+
+
 class EventBus:
     """Simple in-memory event bus with bounded history and coalescing."""
 
@@ -111,8 +184,10 @@ class EventBus:
         if max_events <= 0:
             raise ValueError("max_events must be positive")
         self._lock = Lock()
+        # Signalled on every publish so SSE pollers block instead of sleeping
+        self._cond = Condition(self._lock)
         self._max_events = max_events
-        self._events: deque[EventRecord] = deque(maxlen=max_events)
+        self._events = _EventRing(max_events)
         self._seq = 0
         # Map coalesce key -> event_id to allow targeted replacement
         self._coalesce_index: dict[str, int] = {}
@@ -227,13 +302,7 @@ class EventBus:
 
         if key not in self._coalesce_index:
             return
-        target_id = self._coalesce_index.pop(key)
-        # Rebuild deque without the targeted event. Bounded size keeps cost low.
-        filtered: deque[EventRecord] = deque(maxlen=self._max_events)
-        for event in self._events:
-            if event.event_id != target_id:
-                filtered.append(event)
-        self._events = filtered
+        self._events.discard(self._coalesce_index.pop(key))
 
     # ------------------------------------------------------------------
     # Public API
@@ -299,6 +368,7 @@ class EventBus:
                 coalesce_key=coalesce_key,
             )
             self._events.append(record)
+            self._cond.notify_all()
             if coalesce_key:
                 self._coalesce_index[coalesce_key] = event_id
                 # Increment coalesced metrics
@@ -548,15 +618,17 @@ class EventBus:
         """Return events with id greater than *last_event_id* in arrival order."""
 
         with self._lock:
-            items: Iterable[EventRecord] = (e for e in self._events if e.event_id > last_event_id)
-            if limit is not None and limit >= 0:
-                out: list[EventRecord] = []
-                for e in items:
-                    out.append(e)
-                    if len(out) >= limit:
-                        break
-                return out
-            return list(items)
+            return self._events.since(last_event_id, limit)
+
+    def wait_for(self, last_event_id: int, timeout: float) -> bool:
+        """Block until an event newer than *last_event_id* is published or *timeout* elapses.
+
+        Returns True when newer events are available.
+        """
+        with self._cond:
+            if self._seq <= last_event_id and timeout > 0:
+                self._cond.wait_for(lambda: self._seq > last_event_id, timeout)
+            return self._seq > last_event_id
 
     def clear(self) -> None:
         with self._lock:
@@ -569,7 +641,7 @@ class EventBus:
     def latest_full_snapshot(self) -> dict[str, Any] | None:
         """Return the most recent panel_full payload (including embedded _generation) if present.
 
-        Scans from the right (newest) side of the deque for first panel_full event.
+        Scans from the right (newest) side of the backlog for first panel_full event.
         Returns a shallow copy so callers can safely mutate without affecting stored record.
         """
         with self._lock:
@@ -705,10 +777,8 @@ class EventBus:
     def stats_snapshot(self) -> dict[str, Any]:
         """Return a thread-safe snapshot of bus stats for external endpoints."""
         with self._lock:
-            if self._events:
-                oldest = self._events[0].event_id
-            else:
-                oldest = 0
+            first = next(iter(self._events), None)
+            oldest = first.event_id if first is not None else 0
             return {
                 'latest_id': self._seq,
                 'oldest_id': oldest,
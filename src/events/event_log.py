@@ -12,6 +12,9 @@ Design goals:
 Environment overrides:
   * G6_EVENTS_LOG_PATH - explicit path to event log file
   * G6_EVENTS_DISABLE - if set to truthy => dispatch() becomes no-op
+  * G6_EVENTS_LOG_ASYNC - hand lines to a background ``BufferedLineWriter``
+    (bounded queue, batched writes, open handle, rotation) instead of writing
+    synchronously; see ``event_log_writer`` for the tuning knobs
 
 Event schema (baseline):
   ts: float (epoch seconds)
@@ -33,6 +36,8 @@ import threading
 import time
 from typing import Any
 
+from .event_log_writer import BufferedLineWriter, register_atexit
+
 logger = logging.getLogger(__name__)
 
 _lock = threading.Lock()
@@ -45,6 +50,7 @@ _sampling_map: dict[str, float] = {}
 _sampling_default: float = 1.0
 _recent_buffer: list[str] = []  # raw JSON lines
 _recent_buffer_max = 500
+_writer: BufferedLineWriter | None = None  # lazily created when async writes are enabled
 
 _LEVEL_RANK = {"debug": 10, "info": 20, "warn": 30, "warning": 30, "error": 40, "critical": 50}
 
@@ -60,6 +66,55 @@ def events_enabled() -> bool:
     return os.environ.get("G6_EVENTS_DISABLE", "").lower() not in ("1", "true", "yes", "on")
 
 
+def _async_enabled() -> bool:
+    return os.environ.get("G6_EVENTS_LOG_ASYNC", "").lower() in ("1", "true", "yes", "on")
+
+
+def _env_num(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+def _get_writer() -> BufferedLineWriter:
+    """Return the process-wide background writer, creating it from env on first use."""
+    global _writer
+    if _writer is None:
+        with _lock:
+            if _writer is None:
+                _writer = BufferedLineWriter(
+                    max_queue=int(_env_num("G6_EVENTS_LOG_QUEUE_MAX", 10000)),
+                    batch_lines=int(_env_num("G6_EVENTS_LOG_BATCH_LINES", 256)),
+                    flush_interval=_env_num("G6_EVENTS_LOG_FLUSH_MS", 500) / 1000.0,
+                    rotate_bytes=int(_env_num("G6_EVENTS_LOG_ROTATE_MB", 0) * 1024 * 1024),
+                    rotate_daily=os.environ.get("G6_EVENTS_LOG_ROTATE_DAILY", "").lower() in ("1", "true", "yes", "on"),
+                    compress=os.environ.get("G6_EVENTS_LOG_COMPRESS", "").lower() in ("1", "true", "yes", "on"),
+                )
+                register_atexit(_writer)
+    return _writer
+
+
+def flush(timeout: float = 5.0) -> bool:
+    """Wait until queued event lines are written (no-op when writes are synchronous)."""
+    w = _writer
+    return True if w is None else w.flush(timeout)
+
+
+def shutdown_writer(timeout: float = 5.0) -> None:
+    """Drain and stop the background writer; a later dispatch starts a fresh one."""
+    global _writer
+    with _lock:
+        w, _writer = _writer, None
+    if w is not None:
+        w.close(timeout)
+
+
+def writer_stats() -> dict[str, int] | None:
+    w = _writer
+    return None if w is None else w.stats()
+
+
 def register_events_metrics(counter_obj: Any) -> None:
     """Register a metrics counter with signature counter(labels...) for events.
 
@@ -124,6 +179,14 @@ def dispatch(event: str, *, level: str = "info", index: str | None = None,
         return
     global _io_suppressed
     path = _log_path()
+    if _async_enabled():
+        _get_writer().submit(path, line)
+        with _lock:
+            _recent_buffer.append(line)
+            if len(_recent_buffer) > _recent_buffer_max:
+                del _recent_buffer[0: len(_recent_buffer) - _recent_buffer_max]
+        _inc_metric(event)
+        return
     directory = os.path.dirname(path)
     try:
         if directory and not os.path.exists(directory):
@@ -141,22 +204,27 @@ def dispatch(event: str, *, level: str = "info", index: str | None = None,
             if len(_recent_buffer) > _recent_buffer_max:
                 # drop oldest
                 del _recent_buffer[0: len(_recent_buffer) - _recent_buffer_max]
-        if _metrics_counter is not None:
-            # Best-effort structural interaction: expect .labels(...).inc()
-            try:
-                labels_fn = getattr(_metrics_counter, 'labels', None)
-                if callable(labels_fn):
-                    inst = labels_fn(event=event)
-                    inc_fn = getattr(inst, 'inc', None)
-                    if callable(inc_fn):
-                        inc_fn()
-            except Exception:  # pragma: no cover
-                logger.debug("events metric increment failed")
+        _inc_metric(event)
     except Exception:  # noqa
         if not _io_suppressed:
             logger.exception("[events] Failed writing event line; suppressing further errors")
             _io_suppressed = True
 
+
+def _inc_metric(event: str) -> None:
+    if _metrics_counter is None:
+        return
+    # Best-effort structural interaction: expect .labels(...).inc()
+    try:
+        labels_fn = getattr(_metrics_counter, 'labels', None)
+        if callable(labels_fn):
+            inst = labels_fn(event=event)
+            inc_fn = getattr(inst, 'inc', None)
+            if callable(inc_fn):
+                inc_fn()
+    except Exception:  # pragma: no cover
+        logger.debug("events metric increment failed")
+
 def configure_from_env() -> None:
     """Load filtering & sampling configuration from environment variables.
 
@@ -232,4 +300,7 @@ __all__ = [
     "set_sampling",
     "set_default_sampling",
     "get_recent_events",
+    "flush",
+    "shutdown_writer",
+    "writer_stats",
 ]
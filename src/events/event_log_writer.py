@@ -0,0 +1,247 @@
+"""Background NDJSON writer for the structured event log.
+
+``event_log.dispatch`` hands serialized lines to a ``BufferedLineWriter``
+instead of opening the log file itself. The writer owns:
+
+  * a bounded queue (``submit`` never blocks; lines are dropped and counted
+    when the queue is full)
+  * one daemon thread that batches lines and keeps each file handle open
+  * flushing when a batch reaches ``batch_lines``, every ``flush_interval``
+    seconds, on ``flush()`` and on ``close()`` (registered with ``atexit``)
+  * rotation by size (``rotate_bytes``) and/or calendar day; rotated segments
+    are renamed ``<path>.<YYYYmmdd-HHMMSS>`` and optionally gzip-compressed
+
+Only the writer thread touches the filesystem, so collection threads never
+block on disk I/O for telemetry.
+"""
+from __future__ import annotations
+
+import atexit
+import datetime as _dt
+import gzip
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import IO
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["BufferedLineWriter", "register_atexit"]
+
+
+class _Marker:
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_STOP = object()
+
+
+class BufferedLineWriter:
+    """Queue-fed batching line writer with size/day rotation."""
+
+    def __init__(
+        self,
+        *,
+        max_queue: int = 10000,
+        batch_lines: int = 256,
+        flush_interval: float = 0.5,
+        rotate_bytes: int = 0,
+        rotate_daily: bool = False,
+        compress: bool = False,
+    ) -> None:
+        self._q: queue.Queue[object] = queue.Queue(maxsize=max(1, int(max_queue)))
+        self.batch_lines = max(1, int(batch_lines))
+        self.flush_interval = max(0.01, float(flush_interval))
+        self.rotate_bytes = max(0, int(rotate_bytes))
+        self.rotate_daily = bool(rotate_daily)
+        self.compress = bool(compress)
+        self._handles: dict[str, IO[str]] = {}
+        self._sizes: dict[str, int] = {}
+        self._days: dict[str, _dt.date] = {}
+        self._thread: threading.Thread | None = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        self._io_suppressed = False
+        self.written = 0
+        self.dropped = 0
+        self.batches = 0
+        self.rotations = 0
+
+    # ---------------- Producer side ----------------
+    def submit(self, path: str, line: str) -> bool:
+        """Queue ``line`` for ``path``; returns False when dropped (queue full / closed)."""
+        if self._closed:
+            return False
+        self._ensure_thread()
+        try:
+            self._q.put_nowait((path, line))
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything submitted before this call is on disk."""
+        if self._thread is None or not self._thread.is_alive():
+            return True
+        marker = _Marker()
+        try:
+            self._q.put(marker, timeout=timeout)
+        except queue.Full:
+            return False
+        return marker.done.wait(timeout)
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Drain the queue, close file handles and stop the thread."""
+        if self._closed:
+            return
+        self._closed = True
+        t = self._thread
+        if t is not None and t.is_alive():
+            try:
+                self._q.put(_STOP, timeout=timeout)
+            except queue.Full:  # pragma: no cover - writer wedged
+                pass
+            t.join(timeout)
+        self._close_handles()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'written': self.written,
+            'dropped': self.dropped,
+            'batches': self.batches,
+            'rotations': self.rotations,
+            'queued': self._q.qsize(),
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                t = threading.Thread(target=self._run, name="g6-event-log-writer", daemon=True)
+                t.start()
+                self._thread = t
+
+    # ---------------- Writer thread ----------------
+    def _run(self) -> None:
+        pending: dict[str, list[str]] = {}
+        count = 0
+        last_flush = time.monotonic()
+        while True:
+            timeout = max(0.0, self.flush_interval - (time.monotonic() - last_flush))
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if isinstance(item, tuple):
+                pending.setdefault(item[0], []).append(item[1])
+                count += 1
+                if count < self.batch_lines and time.monotonic() - last_flush < self.flush_interval:
+                    continue
+            # Batch full, interval elapsed, flush marker or shutdown
+            if pending:
+                self._write_batch(pending)
+                pending = {}
+                count = 0
+            last_flush = time.monotonic()
+            if isinstance(item, _Marker):
+                item.done.set()
+            elif item is _STOP:
+                return
+
+    def _write_batch(self, pending: dict[str, list[str]]) -> None:
+        for path, lines in pending.items():
+            data = "\n".join(lines) + "\n"
+            nbytes = len(data.encode("utf-8"))
+            try:
+                self._maybe_rotate(path, nbytes)
+                fh = self._handle(path)
+                fh.write(data)
+                fh.flush()
+                self._sizes[path] = self._sizes.get(path, 0) + nbytes
+                self.written += len(lines)
+            except Exception:
+                self.dropped += len(lines)
+                if not self._io_suppressed:
+                    logger.exception("[events] Failed writing event batch to %s; suppressing further errors", path)
+                    self._io_suppressed = True
+                self._drop_handle(path)
+        self.batches += 1
+
+    def _handle(self, path: str) -> IO[str]:
+        fh = self._handles.get(path)
+        if fh is None:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            fh = open(path, "a", encoding="utf-8")
+            self._handles[path] = fh
+            try:
+                st = os.stat(path)
+                self._sizes[path] = st.st_size
+                self._days[path] = _dt.date.fromtimestamp(st.st_mtime) if st.st_size else _dt.date.today()
+            except OSError:
+                self._sizes[path] = 0
+                self._days[path] = _dt.date.today()
+        return fh
+
+    def _drop_handle(self, path: str) -> None:
+        fh = self._handles.pop(path, None)
+        if fh is not None:
+            try:
+                fh.close()
+            except Exception:
+                pass
+
+    def _close_handles(self) -> None:
+        for path in list(self._handles):
+            self._drop_handle(path)
+
+    def _maybe_rotate(self, path: str, incoming: int) -> None:
+        if not self.rotate_bytes and not self.rotate_daily:
+            return
+        self._handle(path)  # populate size/day bookkeeping
+        size = self._sizes.get(path, 0)
+        due = False
+        if self.rotate_bytes and size > 0 and size + incoming > self.rotate_bytes:
+            due = True
+        if self.rotate_daily and size > 0 and self._days.get(path) != _dt.date.today():
+            due = True
+        if due:
+            self._rotate(path)
+
+    def _rotate(self, path: str) -> None:
+        self._drop_handle(path)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        target = f"{path}.{stamp}"
+        n = 1
+        while os.path.exists(target) or os.path.exists(target + ".gz"):
+            target = f"{path}.{stamp}.{n}"
+            n += 1
+        os.replace(path, target)
+        self.rotations += 1
+        if self.compress:
+            try:
+                with open(target, "rb") as src, gzip.open(target + ".gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+                os.remove(target)
+            except Exception:  # pragma: no cover - keep the uncompressed segment
+                logger.warning("[events] Failed to compress rotated segment %s", target)
+
+
+def _close_at_exit(writer: BufferedLineWriter) -> None:
+    try:
+        writer.close(timeout=2.0)
+    except Exception:  # pragma: no cover
+        pass
+
+
+def register_atexit(writer: BufferedLineWriter) -> None:
+    atexit.register(_close_at_exit, writer)
@@ -911,6 +911,17 @@ class MetricsRegistry:
             except Exception:
                 return []
 
+    # ---------------- Structured Snapshot -----------------
+    def snapshot(self, max_age: float = 0.0):  # pragma: no cover - thin accessor
+        """Return a ``MetricsSnapshot`` of current values (delegates to snapshot module).
+
+        Values are keyed by sample name then sorted label tuple and carry a
+        monotonic version; in-process consumers use this instead of scraping
+        and regex-parsing the text exposition.
+        """
+        from .snapshot import collect_snapshot as _cs
+        return _cs(max_age=max_age)
+
     # ---------------- Governance Summary Helper -----------------
     def governance_summary(self):  # pragma: no cover - aggregation helper
         """Return unified snapshot of governance layer state.
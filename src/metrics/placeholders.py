@@ -81,6 +81,40 @@ def init_always_on_placeholders(reg: Any, group_allowed: Callable[[str], bool])
     _ensure('expiry_misclassification_total', Counter, 'g6_expiry_misclassification_total', 'Expiry misclassification detections', ['index','expiry_code','expected_date','actual_date'], group='expiry_remediation')
     _ensure('expiry_canonical_date', Gauge, 'g6_expiry_canonical_date', 'Observed canonical expiry date by tag', ['index','expiry_code','expiry_date'], group='expiry_remediation')
 
+    # Adaptive (AIMD) Kite limiter: effective QPS of the budget shared by local processes
+    _ensure('kite_rate_effective_qps', Gauge, 'g6_kite_rate_effective_qps',
+            'Effective Kite API QPS of the adaptive shared rate limiter')
+
+    # Staged cycle engine (persistent per-stage pools): backlog and busy fraction per stage
+    _ensure('cycle_stage_queue_depth', Gauge, 'g6_cycle_stage_queue_depth',
+            'Work items submitted to a cycle stage pool but not yet started', ['stage'])
+    _ensure('cycle_stage_utilization', Gauge, 'g6_cycle_stage_utilization',
+            'Busy fraction of a cycle stage pool since the previous cycle (0-1)', ['stage'])
+
+    # Async persistence queue (G6_ASYNC_PERSIST): backlog, write lag and backpressure outcomes
+    _ensure('persist_queue_depth', Gauge, 'g6_persist_queue_depth',
+            'Persistence jobs queued or spilled but not yet written')
+    _ensure('persist_lag_seconds', Gauge, 'g6_persist_lag_seconds',
+            'Seconds from enqueue to write completion of the latest persistence job')
+    _ensure('persist_queue_dropped_total', Counter, 'g6_persist_queue_dropped_total',
+            'Persistence jobs discarded by the drop_oldest backpressure policy')
+    _ensure('persist_queue_spilled_total', Counter, 'g6_persist_queue_spilled_total',
+            'Persistence jobs spilled to disk by the spill backpressure policy')
+    _ensure('persist_queue_failed_total', Counter, 'g6_persist_queue_failed_total',
+            'Queued persistence jobs that raised or reported a failed write')
+
+    # Write-ahead cycle journal (G6_CYCLE_JOURNAL): startup replay
+    _ensure('journal_replayed_frames_total', Counter, 'g6_journal_replayed_frames_total',
+            'Unacknowledged journal frames replayed into the sinks at startup')
+    _ensure('journal_recovery_seconds', Gauge, 'g6_journal_recovery_seconds',
+            'Duration of the last startup journal recovery')
+
+    # Direct line-protocol Influx writer (G6_INFLUX_LINE_PROTOCOL): disk retry spool
+    _ensure('influxdb_spooled_batches_total', Counter, 'g6_influxdb_spooled_batches_total',
+            'Influx line-protocol batches spooled to disk after exhausting retries')
+    _ensure('influxdb_spool_bytes', Gauge, 'g6_influxdb_spool_bytes',
+            'Bytes of gzipped Influx payloads waiting in the disk retry spool')
+
     # IV estimation histogram (placeholder single source of truth post redundancy cleanup)
     # Buckets mirrored from historical group_registry registration
     try:
@@ -94,6 +128,20 @@ def init_always_on_placeholders(reg: Any, group_allowed: Callable[[str], bool])
                     pass
     except Exception:
         pass
+    # IV solver iterations split by warm (seed cache hit) vs cold start
+    try:
+        if not hasattr(reg, 'iv_seed_iterations_histogram'):
+            hist = Histogram('g6_iv_seed_iterations',
+                             'IV solver iterations by seed source (warm=seed cache, cold=rational guess)',
+                             ['index','seed'], buckets=[1,2,3,5,8,13,21])
+            reg.iv_seed_iterations_histogram = hist
+            if group_allowed('iv_estimation'):
+                try:
+                    reg._metric_groups['iv_seed_iterations_histogram'] = 'iv_estimation'  # type: ignore[attr-defined]
+                except Exception:
+                    pass
+    except Exception:
+        pass
 
     # SLA health moved to sla.init_sla_placeholders (extracted)
 
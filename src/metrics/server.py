@@ -7,6 +7,9 @@ resource sampling & watchdog background threads (delegated to resource_sampling)
 Public API:
   setup_metrics_server(...): -> (metrics_registry, shutdown_callable)
 
+The endpoint also serves ``/metrics/snapshot`` (compact JSON, see
+``snapshot.py``) for out-of-process readers.
+
 Backward compatibility: `metrics.get_metrics()` will still auto-call this
 when the singleton is absent; import order remains unchanged.
 """
@@ -16,10 +19,11 @@ import logging
 import os
 from collections.abc import Callable
 
-from prometheus_client import REGISTRY, CollectorRegistry, start_http_server  # type: ignore
+from prometheus_client import REGISTRY, CollectorRegistry  # type: ignore
 
 from . import _singleton  # central singleton anchor
 from .metrics import MetricsRegistry  # local import to avoid circular: class defined there
+from .snapshot import SNAPSHOT_PATH, start_metrics_http_server
 
 logger = logging.getLogger(__name__)
 
@@ -85,9 +89,9 @@ def setup_metrics_server(port: int = 9108, host: str = "0.0.0.0", *,
     custom_reg = None
     if use_custom_registry:
         custom_reg = CollectorRegistry()
-        start_http_server(port, addr=host, registry=custom_reg)
+        start_metrics_http_server(port, addr=host, registry=custom_reg)
     else:
-        start_http_server(port, addr=host)
+        start_metrics_http_server(port, addr=host)
     _METRICS_PORT = port
     _METRICS_HOST = host
 
@@ -95,6 +99,7 @@ def setup_metrics_server(port: int = 9108, host: str = "0.0.0.0", *,
     log_fn = logger.debug if fancy else logger.info
     log_fn(f"Metrics server started on {host}:{port}")
     log_fn(f"Metrics available at http://{host}:{port}/metrics")
+    log_fn(f"Metrics snapshot available at http://{host}:{port}{SNAPSHOT_PATH}")
 
     # Atomically create registry if absent to prevent race between concurrent imports/tests.
     def _build():  # local factory
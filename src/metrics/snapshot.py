@@ -0,0 +1,221 @@
+"""Structured metrics snapshot (in-process accessor + JSON endpoint).
+
+Internal consumers (web dashboard ``MetricsCache``, ``MetricsProcessor`` and
+through it ``MetricsAdapter`` / ``UnifiedDataSource``) previously scraped the
+Prometheus text exposition over HTTP and parsed it with regexes, usually in
+the same process as the exporter. This module exposes the registry directly:
+
+  * ``collect_snapshot()`` walks ``registry.collect()`` once and returns a
+    ``MetricsSnapshot``: values keyed by sample name, then by the sorted label
+    tuple, plus a monotonic ``version`` (bumped on every fresh collection).
+  * ``MetricsRegistry.snapshot()`` is the in-process accessor.
+  * ``make_metrics_app()`` serves ``/metrics/snapshot`` as compact JSON next
+    to the usual text exposition; ``fetch_snapshot()`` is the matching
+    out-of-process reader and ``read_snapshot()`` picks whichever applies:
+    it collects in-process only when ``metrics_url`` is served by this
+    process (and then from the registry that server exposes, custom or
+    default); any other URL is fetched over HTTP.
+
+Sample names follow the exposition (``*_total``, ``*_bucket`` ...);
+``*_created`` timestamps are omitted.
+"""
+from __future__ import annotations
+
+import json
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections.abc import Callable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+from urllib.parse import urlsplit
+
+SeriesKey = tuple[tuple[str, str], ...]
+
+SNAPSHOT_PATH = '/metrics/snapshot'
+
+__all__ = [
+    'MetricsSnapshot',
+    'collect_snapshot',
+    'fetch_snapshot',
+    'read_snapshot',
+    'snapshot_url',
+    'make_metrics_app',
+    'start_metrics_http_server',
+]
+
+
+@dataclass(frozen=True)
+class MetricsSnapshot:
+    """Immutable point-in-time view of registry values."""
+
+    version: int
+    ts: float
+    series: Mapping[str, Mapping[SeriesKey, float]]
+
+    def names(self) -> list[str]:
+        return list(self.series)
+
+    def samples(self, name: str) -> list[tuple[dict[str, str], float]]:
+        return [(dict(k), v) for k, v in self.series.get(name, {}).items()]
+
+    def value(self, name: str, labels: Mapping[str, str] | None = None, default: float | None = None) -> float | None:
+        """Exact label match when ``labels`` given, else the unlabeled (or first) series."""
+        s = self.series.get(name)
+        if not s:
+            return default
+        if labels:
+            return s.get(tuple(sorted(labels.items())), default)
+        if () in s:
+            return s[()]
+        return next(iter(s.values()))
+
+    def total(self, name: str) -> float:
+        return float(sum(self.series.get(name, {}).values()))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            'version': self.version,
+            'ts': self.ts,
+            'metrics': {n: [[dict(k), v] for k, v in s.items()] for n, s in self.series.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, obj: Mapping[str, Any]) -> MetricsSnapshot:
+        series: dict[str, dict[SeriesKey, float]] = {}
+        for name, rows in (obj.get('metrics') or {}).items():
+            series[name] = {tuple(sorted(lbl.items())): float(v) for lbl, v in rows}
+        return cls(version=int(obj.get('version', 0)), ts=float(obj.get('ts', 0.0)), series=series)
+
+
+_lock = threading.Lock()
+_version = 0
+_cached: dict[int, MetricsSnapshot] = {}  # id(registry) -> last snapshot
+_served: dict[int, Any] = {}  # port -> registry exposed by start_metrics_http_server in this process
+_LOCAL_HOSTS = frozenset({'localhost', '127.0.0.1', '0.0.0.0', '::1', '::'})
+
+
+def _default_registry() -> Any:
+    from prometheus_client import REGISTRY  # type: ignore
+    return REGISTRY
+
+
+def collect_snapshot(registry: Any = None, *, max_age: float = 0.0) -> MetricsSnapshot:
+    """Collect ``registry`` (default Prometheus registry) into a ``MetricsSnapshot``.
+
+    A snapshot younger than ``max_age`` seconds is reused (same version).
+    """
+    global _version
+    reg = registry if registry is not None else _default_registry()
+    now = time.time()
+    if max_age > 0:
+        prev = _cached.get(id(reg))
+        if prev is not None and now - prev.ts < max_age:
+            return prev
+    series: dict[str, dict[SeriesKey, float]] = {}
+    for family in reg.collect():
+        for sample in family.samples:
+            name = sample.name
+            if name.endswith('_created') and family.type in ('counter', 'histogram', 'summary', 'gaugehistogram'):
+                continue
+            series.setdefault(name, {})[tuple(sorted(sample.labels.items()))] = float(sample.value)
+    with _lock:
+        _version += 1
+        snap = MetricsSnapshot(version=_version, ts=now, series=series)
+        _cached[id(reg)] = snap
+    return snap
+
+
+def snapshot_url(metrics_url: str) -> str:
+    """Map a text exposition URL (``http://h:p`` or ``http://h:p/metrics``) to its snapshot URL."""
+    base = metrics_url.rstrip('/')
+    if base.endswith(SNAPSHOT_PATH):
+        return base
+    if base.endswith('/metrics'):
+        base = base[: -len('/metrics')]
+    return base + SNAPSHOT_PATH
+
+
+def fetch_snapshot(url: str, timeout: float = 2.0) -> MetricsSnapshot | None:
+    """Read a snapshot over HTTP; None when the exporter has no snapshot route (404).
+
+    Network errors propagate so callers keep their existing error handling.
+    """
+    try:
+        with urllib.request.urlopen(snapshot_url(url), timeout=timeout) as resp:
+            body = resp.read()
+    except urllib.error.HTTPError as e:
+        if e.code == 404:
+            return None
+        raise
+    return MetricsSnapshot.from_dict(json.loads(body))
+
+
+def _in_process_registry_active() -> bool:
+    try:
+        from . import _singleton
+        return _singleton.get_singleton() is not None
+    except Exception:
+        return False
+
+
+def _local_registry(metrics_url: str | None) -> Any:
+    """Registry to collect in-process for ``metrics_url``; None when it must be fetched over HTTP."""
+    if not metrics_url:
+        if _served:
+            return next(iter(_served.values()))
+        return _default_registry() if _in_process_registry_active() else None
+    try:
+        parts = urlsplit(metrics_url if '//' in metrics_url else f'http://{metrics_url}')
+        host, port = parts.hostname or '', parts.port or 80
+    except ValueError:
+        return None
+    if host not in _LOCAL_HOSTS:
+        return None
+    return _served.get(port)
+
+
+def read_snapshot(metrics_url: str | None = None, *, timeout: float = 2.0, max_age: float = 0.0) -> MetricsSnapshot | None:
+    """In-process snapshot when ``metrics_url`` is served by this process, else fetch from ``metrics_url``."""
+    reg = _local_registry(metrics_url)
+    if reg is not None:
+        return collect_snapshot(reg, max_age=max_age)
+    if not metrics_url:
+        return None
+    return fetch_snapshot(metrics_url, timeout=timeout)
+
+
+def make_metrics_app(registry: Any = None) -> Callable[..., Iterable[bytes]]:
+    """WSGI app: ``/metrics/snapshot`` as JSON, everything else the Prometheus exposition."""
+    from prometheus_client import make_wsgi_app  # type: ignore
+    reg = registry if registry is not None else _default_registry()
+    prom_app = make_wsgi_app(reg)
+
+    def app(environ: dict[str, Any], start_response: Callable[..., Any]) -> Iterable[bytes]:
+        if environ.get('PATH_INFO', '').rstrip('/') == SNAPSHOT_PATH:
+            body = json.dumps(collect_snapshot(reg).to_dict(), separators=(',', ':')).encode('utf-8')
+            start_response('200 OK', [('Content-Type', 'application/json'), ('Content-Length', str(len(body)))])
+            return [body]
+        return prom_app(environ, start_response)
+
+    return app
+
+
+def start_metrics_http_server(port: int, addr: str = '0.0.0.0', registry: Any = None) -> Any:
+    """Threaded HTTP server for ``make_metrics_app`` (drop-in for ``start_http_server``)."""
+    from wsgiref.simple_server import WSGIRequestHandler, make_server
+
+    from prometheus_client.exposition import ThreadingWSGIServer  # type: ignore
+
+    class _Quiet(WSGIRequestHandler):
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+            return
+
+    reg = registry if registry is not None else _default_registry()
+    httpd = make_server(addr, port, make_metrics_app(reg), ThreadingWSGIServer, handler_class=_Quiet)
+    with _lock:
+        _served[httpd.server_port] = reg
+    t = threading.Thread(target=httpd.serve_forever, name='g6-metrics-http', daemon=True)
+    t.start()
+    return httpd
@@ -143,6 +143,12 @@ def bootstrap_runtime(config_path: str,
             from src.orchestrator.components import apply_circuit_breakers, init_health, init_providers, init_storage
             providers = init_providers(raw_cfg)
             csv_sink, influx_sink = init_storage(raw_cfg)
+            # Replay frames a crashed run journaled but never acknowledged (G6_CYCLE_JOURNAL)
+            try:
+                from src.storage.cycle_journal import recover_cycle_journal
+                recover_cycle_journal(csv_sink, influx_sink, metrics=metrics)
+            except Exception:
+                logger.exception("Cycle journal recovery failed; continuing without replay")
             apply_circuit_breakers(raw_cfg, providers)
             health = init_health(raw_cfg, providers, csv_sink, influx_sink)
             ctx.providers = providers
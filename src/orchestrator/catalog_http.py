@@ -717,6 +717,8 @@ class _CatalogHandler(BaseHTTPRequestHandler):
                             if pending:
                                 for ev in pending:
                                     _send(ev)
+                                # Advance past type-filtered events too so they are not re-read
+                                last_event_id = max(last_event_id, pending[-1].event_id)
                             else:
                                 now = time.time()
                                 if now - last_heartbeat >= heartbeat_interval:
@@ -726,7 +728,12 @@ class _CatalogHandler(BaseHTTPRequestHandler):
                                     except Exception:
                                         break
                                     last_heartbeat = now
-                                time.sleep(poll_interval)
+                                wait_for = getattr(bus, 'wait_for', None)
+                                if callable(wait_for):
+                                    # Wake on publish; bounded so heartbeats keep flowing
+                                    wait_for(last_event_id, min(poll_interval, heartbeat_interval))
+                                else:
+                                    time.sleep(poll_interval)
                         except Exception:
                             break
                 finally:
@@ -459,6 +459,33 @@ def init_providers(config) -> Any:
     return providers_wrapper
 
 
+def _maybe_attach_parquet_sink(config, csv_sink: Any) -> None:
+    """Attach a ParquetSink mirror to the CSV sink when G6_PARQUET_SINK is enabled."""
+    if not is_truthy_env('G6_PARQUET_SINK') or not hasattr(csv_sink, 'attach_columnar_sink'):
+        return
+    try:
+        from src.storage import parquet_sink as _pq
+        if not _pq.AVAILABLE:
+            logger.warning("G6_PARQUET_SINK set but pyarrow is not installed; parquet sink disabled")
+            return
+        try:
+            storage_cfg = config.get('storage', {}) or {}
+        except Exception:
+            storage_cfg = {}
+        base = os.environ.get('G6_PARQUET_DIR') or storage_cfg.get('parquet_dir') or 'data/g6_parquet'
+        try:
+            roll = int(os.environ.get('G6_PARQUET_ROLL_ROW_GROUPS', '15') or 15)
+        except ValueError:
+            roll = 15
+        sink = _pq.ParquetSink(base_dir=base, roll_row_groups=roll)
+        csv_sink.attach_columnar_sink(sink)
+        import atexit
+        atexit.register(sink.close)
+        logger.info("Parquet sink enabled dir=%s roll_row_groups=%d", sink.base_dir, roll)
+    except Exception:
+        logger.warning("Parquet sink initialization failed", exc_info=True)
+
+
 def init_storage(config) -> tuple[Any, Any]:
     from src.utils.path_utils import resolve_path  # local import to mirror legacy
     data_dir = resolve_path(config.data_dir(), create=True)
@@ -471,6 +498,7 @@ def init_storage(config) -> tuple[Any, Any]:
         pass
     csv_sink_ctor: Any = CsvSinkT
     csv_sink = csv_sink_ctor(base_dir=data_dir)
+    _maybe_attach_parquet_sink(config, csv_sink)
     influx: Any = None  # ensure defined for all control paths
     influx_cfg = config.get('influx', {})
     try:
@@ -10,7 +10,8 @@ import json
 import logging
 import os
 import time
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import as_completed
+from functools import partial
 from typing import Any
 
 try:
@@ -26,6 +27,8 @@ except Exception:  # pragma: no cover
         return None
 
 from src.orchestrator.context import RuntimeContext
+from src.orchestrator.stage_engine import get_stage_engine, publish_stage_metrics
+from src.storage.persist_queue import persist_async
 
 try:  # optional event dispatch (graceful if module absent)
     from src.events.event_log import dispatch as emit_event
@@ -139,6 +142,20 @@ def _collect_single_index(index_key: str, index_params: dict[str, Any], ctx: Run
             logger.debug("fallback get_index_data failed for %s", index_key, exc_info=True)
 
 
+def _write_pipeline_overview(csv_sink: Any, influx_sink: Any, index: str, pcrs: dict[str, Any], snap_ts: Any, day_w: Any) -> None:
+    """Overview snapshot for the pipeline collector path (CSV + optional influx)."""
+    if csv_sink:
+        try:
+            csv_sink.write_overview_snapshot(index, pcrs, snap_ts, day_w, expected_expiries=list(pcrs.keys()))
+        except Exception:
+            logger.debug("overview snapshot csv failed (pipeline) index=%s", index, exc_info=True)
+    if influx_sink:
+        try:
+            influx_sink.write_overview_snapshot(index, pcrs, snap_ts, day_w, expected_expiries=list(pcrs.keys()))
+        except Exception:
+            logger.debug("overview snapshot influx failed (pipeline) index=%s", index, exc_info=True)
+
+
 def run_cycle(ctx: RuntimeContext) -> float:
     """Execute one data collection cycle.
 
@@ -243,8 +260,10 @@ def run_cycle(ctx: RuntimeContext) -> float:
             completed: set[str] = set()
             failures: dict[str, Exception] = {}
             elapsed_map: dict[str, float] = {}
-            # Internal submission wrapper to capture start times
-            def submit_all(executor):
+            # Internal submission wrapper to capture start times (persistent index pool shared across cycles)
+            engine = get_stage_engine()
+            pool_workers = min(len(indices), max_workers)
+            def submit_all():
                 fut_map = {}
                 for idx in indices:
                     if remaining() <= 0:
@@ -252,7 +271,10 @@ def run_cycle(ctx: RuntimeContext) -> float:
                     if stagger_ms > 0:
                         time.sleep(stagger_ms/1000.0)
                     params_map = ctx.index_params or {}
-                    fut = executor.submit(_collect_single_index, idx, params_map[idx], ctx)
+                    fut = engine.submit_index(idx, pool_workers, _collect_single_index, idx, params_map[idx], ctx)
+                    if fut is None:
+                        logger.warning("Parallel index collection for %s still running from previous cycle; skipping", idx)
+                        continue
                     try:
                         fut._g6_index = idx
                         fut._g6_start = time.time()
@@ -260,47 +282,46 @@ def run_cycle(ctx: RuntimeContext) -> float:
                         pass
                     fut_map[fut] = idx
                 return fut_map
-            with ThreadPoolExecutor(max_workers=min(len(indices), max_workers)) as executor:
-                futures = submit_all(executor)
-                for fut in as_completed(futures):
-                    idx = futures[fut]
-                    start_i = getattr(fut, '_g6_start', time.time())
-                    try:
-                        # Enforce per-index timeout relative to submission
-                        fut.result(timeout=max(0.0, per_index_timeout_val))
-                        elapsed_i = time.time() - start_i
-                        elapsed_map[idx] = elapsed_i
-                        if ctx.metrics and hasattr(ctx.metrics, 'parallel_index_elapsed'):
-                            try:
-                                ctx.metrics.parallel_index_elapsed.observe(elapsed_i)
-                            except Exception:
-                                pass
-                        completed.add(idx)
-                    except Exception as e:  # noqa
-                        # Distinguish timeout vs other failure
-                        is_timeout = isinstance(e, TimeoutError)
-                        failures[idx] = e
-                        logger.exception("Parallel index collection failed for %s (timeout=%s)", idx, is_timeout)
-                        if ctx.metrics and hasattr(ctx.metrics, 'parallel_index_failures'):
-                            try:
-                                ctx.metrics.parallel_index_failures.labels(index=idx).inc()
-                            except Exception:
-                                pass
-                        if is_timeout and ctx.metrics and hasattr(ctx.metrics, 'parallel_index_timeouts'):
-                            try:
-                                ctx.metrics.parallel_index_timeouts.labels(index=idx).inc()
-                            except Exception:
-                                pass
-                    # Budget check after each completion
-                    if remaining() <= 0:
-                        # Count skipped indices
-                        skipped = [i for i in indices if i not in completed and i not in failures]
-                        if skipped and ctx.metrics and hasattr(ctx.metrics, 'parallel_cycle_budget_skips'):
-                            try:
-                                ctx.metrics.parallel_cycle_budget_skips.inc(len(skipped))
-                            except Exception:
-                                pass
-                        break
+            futures = submit_all()
+            for fut in as_completed(futures):
+                idx = futures[fut]
+                start_i = getattr(fut, '_g6_start', time.time())
+                try:
+                    # Enforce per-index timeout relative to submission
+                    fut.result(timeout=max(0.0, per_index_timeout_val))
+                    elapsed_i = time.time() - start_i
+                    elapsed_map[idx] = elapsed_i
+                    if ctx.metrics and hasattr(ctx.metrics, 'parallel_index_elapsed'):
+                        try:
+                            ctx.metrics.parallel_index_elapsed.observe(elapsed_i)
+                        except Exception:
+                            pass
+                    completed.add(idx)
+                except Exception as e:  # noqa
+                    # Distinguish timeout vs other failure
+                    is_timeout = isinstance(e, TimeoutError)
+                    failures[idx] = e
+                    logger.exception("Parallel index collection failed for %s (timeout=%s)", idx, is_timeout)
+                    if ctx.metrics and hasattr(ctx.metrics, 'parallel_index_failures'):
+                        try:
+                            ctx.metrics.parallel_index_failures.labels(index=idx).inc()
+                        except Exception:
+                            pass
+                    if is_timeout and ctx.metrics and hasattr(ctx.metrics, 'parallel_index_timeouts'):
+                        try:
+                            ctx.metrics.parallel_index_timeouts.labels(index=idx).inc()
+                        except Exception:
+                            pass
+                # Budget check after each completion
+                if remaining() <= 0:
+                    # Count skipped indices
+                    skipped = [i for i in indices if i not in completed and i not in failures]
+                    if skipped and ctx.metrics and hasattr(ctx.metrics, 'parallel_cycle_budget_skips'):
+                        try:
+                            ctx.metrics.parallel_cycle_budget_skips.inc(len(skipped))
+                        except Exception:
+                            pass
+                    break
             # Retry phase (serial) for failures if within budget
             if failures and retry_limit > 0 and remaining() > 0:
                 for idx, err in list(failures.items()):
@@ -350,6 +371,16 @@ def run_cycle(ctx: RuntimeContext) -> float:
                             overview_capture: dict[str, dict[str,float]] = {}
                             base_ts: dict[str, float] = {}
                             day_width_map: dict[str, int] = {}
+                            staged = is_truthy_env('G6_CYCLE_STAGE_PIPELINE') and hasattr(pipe, 'fetch_stage')
+                            staged_items: list[Any] = []
+
+                            def _capture(_idx: str, outcome: Any) -> None:
+                                if outcome and not outcome.failed and outcome.pcr is not None and outcome.expiry_code:
+                                    overview_capture.setdefault(_idx, {})[outcome.expiry_code] = outcome.pcr
+                                    if outcome.snapshot_timestamp and outcome.snapshot_timestamp.timestamp() < base_ts.get(_idx, float('inf')):
+                                        base_ts[_idx] = outcome.snapshot_timestamp.timestamp()
+                                    if outcome.day_width:
+                                        day_width_map[_idx] = outcome.day_width
                             for _idx, _params in (ctx.index_params or {}).items():
                                 if not isinstance(_params, dict) or not _params.get('enable', True):
                                     continue
@@ -404,15 +435,18 @@ def run_cycle(ctx: RuntimeContext) -> float:
                                         if ExpiryWorkItem is None:
                                             raise RuntimeError('ExpiryWorkItem unavailable')
                                         wi = ExpiryWorkItem(index=_idx, expiry_rule=_rule, expiry_date=None, strikes=strikes, index_price=index_price, atm_strike=atm)
+                                        if staged:
+                                            staged_items.append(wi)
+                                            continue
                                         _ee, outcome = pipe.run_expiry(wi)
-                                        if outcome and not outcome.failed and outcome.pcr is not None and outcome.expiry_code:
-                                            overview_capture.setdefault(_idx, {})[outcome.expiry_code] = outcome.pcr
-                                            if outcome.snapshot_timestamp and outcome.snapshot_timestamp.timestamp() < base_ts.get(_idx, float('inf')):
-                                                base_ts[_idx] = outcome.snapshot_timestamp.timestamp()
-                                            if outcome.day_width:
-                                                day_width_map[_idx] = outcome.day_width
+                                        _capture(_idx, outcome)
                                     except Exception:
                                         logger.debug("pipeline expiry run failed index=%s rule=%s", _idx, _rule, exc_info=True)
+                            if staged and staged_items:
+                                # Stage-pipelined across indices: fetch / analytics / persist pools overlap
+                                _budget_deadline = start + cycle_interval * cycle_budget_fraction
+                                for _wi, _ee, outcome in get_stage_engine().run_expiries(pipe, staged_items, deadline=_budget_deadline):
+                                    _capture(_wi.index, outcome)
                             # Persist overview snapshots (CSV + optional influx)
                             try:
                                 for _idx, _pcrs in overview_capture.items():
@@ -421,16 +455,9 @@ def run_cycle(ctx: RuntimeContext) -> float:
                                         import datetime as _dt
                                         snap_ts = _dt.datetime.fromtimestamp(ts_val, _dt.UTC) if ts_val else _dt.datetime.now(_dt.UTC)
                                         day_w = day_width_map.get(_idx, 0)
-                                        if ctx.csv_sink:
-                                            try:
-                                                ctx.csv_sink.write_overview_snapshot(_idx, _pcrs, snap_ts, day_w, expected_expiries=list(_pcrs.keys()))
-                                            except Exception:
-                                                logger.debug("overview snapshot csv failed (pipeline) index=%s", _idx, exc_info=True)
-                                        if ctx.influx_sink:
-                                            try:
-                                                ctx.influx_sink.write_overview_snapshot(_idx, _pcrs, snap_ts, day_w, expected_expiries=list(_pcrs.keys()))
-                                            except Exception:
-                                                logger.debug("overview snapshot influx failed (pipeline) index=%s", _idx, exc_info=True)
+                                        # Queued behind the expiry writes when G6_ASYNC_PERSIST is on
+                                        if not persist_async('pipeline_overview', partial(_write_pipeline_overview, ctx.csv_sink, ctx.influx_sink), _idx, dict(_pcrs), snap_ts, day_w, metrics=getattr(ctx, 'metrics', None)):
+                                            _write_pipeline_overview(ctx.csv_sink, ctx.influx_sink, _idx, _pcrs, snap_ts, day_w)
                             except Exception:
                                 logger.debug("overview snapshot aggregation failed (pipeline)", exc_info=True)
                             # Skip legacy unified collectors path this cycle (early return)
@@ -443,6 +470,10 @@ def run_cycle(ctx: RuntimeContext) -> float:
                                     c_hist.observe(_elapsed_pipeline)
                             except Exception:
                                 logger.debug("cycle_time_seconds observe failed (pipeline early)")
+                            try:
+                                publish_stage_metrics(getattr(ctx, 'metrics', None))
+                            except Exception:
+                                logger.debug("stage engine metrics publish failed (pipeline early)", exc_info=True)
                             ctx.cycle_count += 1
                             return _elapsed_pipeline  # early return after pipeline execution
                         except Exception:
@@ -493,6 +524,10 @@ def run_cycle(ctx: RuntimeContext) -> float:
             c_hist.observe(elapsed)
     except Exception:
         logger.debug("cycle_time_seconds observe failed", exc_info=True)
+    try:
+        publish_stage_metrics(getattr(ctx, 'metrics', None))
+    except Exception:
+        logger.debug("stage engine metrics publish failed", exc_info=True)
     # Global phase timing consolidated emission (once per overall cycle)
     try:
         if os.environ.get('G6_GLOBAL_PHASE_TIMING','').lower() in ('1','true','yes','on'):
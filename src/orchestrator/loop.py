@@ -85,6 +85,13 @@ def run_loop(ctx: RuntimeContext, *, cycle_fn: Callable[[RuntimeContext], None],
     except KeyboardInterrupt:
         logger.info("[loop] KeyboardInterrupt (outer) -> graceful shutdown")
     finally:
+        # Flush queued CSV / Influx writes (bounded by G6_PERSIST_DRAIN_TIMEOUT) before exit
+        try:
+            from src.storage.persist_queue import shutdown_persist_queue
+            if not shutdown_persist_queue():
+                logger.warning("[loop] Persistence queue not fully drained at shutdown")
+        except Exception:
+            logger.debug("[loop] persistence queue shutdown failed", exc_info=True)
         logger.info("Orchestration loop terminated")
 
 __all__ = ["run_loop"]
@@ -0,0 +1,258 @@
+"""Long-lived staged cycle engine (persistent worker pools shared across cycles).
+
+Replaces the per-cycle ``ThreadPoolExecutor`` construction in ``run_cycle``
+with pools that live for the process lifetime:
+
+  * ``index``     – whole-index collectors for the ``G6_PARALLEL_INDICES`` path
+  * ``fetch``     – network bound: resolve expiry, fetch instruments, enrich quotes
+  * ``analytics`` – CPU bound: IV / Greeks blocks
+  * ``persist``   – I/O bound: CSV / Influx writes
+
+``run_expiries`` pipelines ``CollectorPipeline`` work items through the three
+stages, so index B's quote fetch overlaps index A's Greeks and CSV writes and
+cycle wall time tends to the slowest stage instead of the sum of all stages.
+The persist stage defaults to a single worker so sink writes stay serialized
+exactly as in the sequential path (CsvSink keeps per-index state).
+
+Per-stage queue depth (submitted, not yet started) and utilization (busy
+worker-seconds / available worker-seconds since the previous publish) are
+exported via ``publish_metrics`` as ``g6_cycle_stage_queue_depth`` and
+``g6_cycle_stage_utilization`` (label ``stage``) when the registry has them.
+
+Environment:
+  G6_CYCLE_STAGE_PIPELINE      enable staged execution for the pipeline collector path
+  G6_STAGE_FETCH_WORKERS       fetch pool size (default 4)
+  G6_STAGE_ANALYTICS_WORKERS   analytics pool size (default 2)
+  G6_STAGE_PERSIST_WORKERS     persist pool size (default 1)
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+STAGES = ('fetch', 'analytics', 'persist')
+
+__all__ = ["STAGES", "StageEngine", "get_stage_engine", "publish_stage_metrics", "shutdown_stage_engine"]
+
+
+def _env_workers(name: str, default: int) -> int:
+    try:
+        return max(1, int((os.environ.get(name) or str(default)).split('#', 1)[0].strip()))
+    except ValueError:
+        return default
+
+
+class _Stage:
+    """Persistent executor plus queue / busy-time accounting."""
+
+    def __init__(self, name: str, workers: int) -> None:
+        self.name = name
+        self.workers = workers
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"g6-stage-{name}")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.busy = 0
+        self.completed = 0
+        self._busy_seconds = 0.0
+        self._mark_busy = 0.0
+        self._mark_ts = time.perf_counter()
+
+    def submit(self, fn: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            self.queued += 1
+
+        def _run() -> Any:
+            with self._lock:
+                self.queued -= 1
+                self.busy += 1
+            t0 = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                dt = time.perf_counter() - t0
+                with self._lock:
+                    self.busy -= 1
+                    self.completed += 1
+                    self._busy_seconds += dt
+
+        fut = self._executor.submit(_run)
+        fut.add_done_callback(self._on_done)
+        return fut
+
+    def _on_done(self, fut: Future) -> None:
+        # Cancelled before starting (pool replaced / shut down): _run never decremented queued
+        if fut.cancelled():
+            with self._lock:
+                self.queued -= 1
+
+    def utilization(self) -> float:
+        """Busy fraction of worker capacity since the previous call (resets the window)."""
+        now = time.perf_counter()
+        with self._lock:
+            busy = self._busy_seconds - self._mark_busy
+            span = (now - self._mark_ts) * self.workers
+            self._mark_busy = self._busy_seconds
+            self._mark_ts = now
+        return min(1.0, busy / span) if span > 0 else 0.0
+
+    def shutdown(self, wait: bool) -> None:
+        self._executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+class StageEngine:
+    def __init__(self, *, fetch_workers: int = 4, analytics_workers: int = 2, persist_workers: int = 1) -> None:
+        self.stages: dict[str, _Stage] = {
+            'fetch': _Stage('fetch', fetch_workers),
+            'analytics': _Stage('analytics', analytics_workers),
+            'persist': _Stage('persist', persist_workers),
+        }
+        self._index_stage: _Stage | None = None
+        self._inflight: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def config(self) -> tuple[int, int, int]:
+        return tuple(self.stages[s].workers for s in STAGES)  # type: ignore[return-value]
+
+    # ---------------- whole-index path -----------------
+    def submit_index(self, index: str, workers: int, fn: Callable[..., Any], *args: Any) -> Future | None:
+        """Submit a whole-index collection on the persistent index pool.
+
+        Returns None when the previous cycle's run for ``index`` is still in
+        flight (it outlived its timeout); the caller treats that as skipped.
+        """
+        retired: _Stage | None = None
+        with self._lock:
+            if self._index_stage is None or self._index_stage.workers != workers:
+                retired = self._index_stage
+                self._index_stage = _Stage('index', workers)
+            stage = self._index_stage
+        if retired is not None:
+            # outside the lock: cancelling queued futures runs their _release callbacks here
+            retired.shutdown(wait=False)
+        with self._lock:
+            if index in self._inflight:
+                return None
+            self._inflight.add(index)
+
+        fut = stage.submit(fn, *args)
+        # done-callback (not try/finally in the task) so a future cancelled by a
+        # pool rebuild still frees its index
+        fut.add_done_callback(lambda _f: self._release(index))
+        return fut
+
+    def _release(self, index: str) -> None:
+        with self._lock:
+            self._inflight.discard(index)
+
+    # ---------------- staged pipeline path -----------------
+    def run_expiries(self, pipe: Any, items: Sequence[Any], *, deadline: float | None = None) -> list[tuple[Any, Any, Any]]:
+        """Pipeline work items through fetch -> analytics -> persist.
+
+        Returns ``(work_item, enriched_expiry, outcome)`` per item in input
+        order; failed or empty items yield ``(item, None, None)`` like
+        ``CollectorPipeline.run_expiry``. Past ``deadline`` (epoch seconds) no
+        further items enter the fetch stage, but fetched items still persist.
+        """
+        results: list[tuple[Any, Any, Any]] = [(wi, None, None) for wi in items]
+        pending: dict[Future, tuple[int, str]] = {}
+        for i, wi in enumerate(items):
+            if deadline is not None and time.time() >= deadline:
+                logger.debug("stage engine: cycle budget exhausted; %s items not started", len(items) - i)
+                break
+            pending[self.stages['fetch'].submit(pipe.fetch_stage, wi)] = (i, 'fetch')
+        while pending:
+            done, _ = wait(list(pending), return_when=FIRST_COMPLETED)
+            for fut in done:
+                i, stage = pending.pop(fut)
+                try:
+                    value = fut.result()
+                except Exception:
+                    wi = items[i]
+                    logger.error("Pipeline expiry failure %s %s (stage=%s)", getattr(wi, 'index', '?'), getattr(wi, 'expiry_rule', '?'), stage, exc_info=True)
+                    continue
+                if stage == 'fetch':
+                    if value is not None:
+                        pending[self.stages['analytics'].submit(pipe.analytics_stage, value)] = (i, 'analytics')
+                elif stage == 'analytics':
+                    results[i] = (items[i], value, None)
+                    pending[self.stages['persist'].submit(pipe.persist_stage, value)] = (i, 'persist')
+                else:
+                    results[i] = (items[i], results[i][1], value)
+        return results
+
+    # ---------------- introspection -----------------
+    def stats(self) -> dict[str, dict[str, int]]:
+        out = {name: {'workers': st.workers, 'queued': st.queued, 'busy': st.busy, 'completed': st.completed}
+               for name, st in self.stages.items()}
+        if self._index_stage is not None:
+            st = self._index_stage
+            out['index'] = {'workers': st.workers, 'queued': st.queued, 'busy': st.busy, 'completed': st.completed}
+        return out
+
+    def publish_metrics(self, metrics: Any) -> dict[str, float]:
+        """Set queue depth / utilization gauges (per stage); returns utilization map."""
+        stages = dict(self.stages)
+        if self._index_stage is not None:
+            stages['index'] = self._index_stage
+        util = {name: st.utilization() for name, st in stages.items()}
+        if metrics is None:
+            return util
+        g_depth = getattr(metrics, 'cycle_stage_queue_depth', None)
+        g_util = getattr(metrics, 'cycle_stage_utilization', None)
+        for name, st in stages.items():
+            try:
+                if g_depth is not None:
+                    g_depth.labels(stage=name).set(st.queued)
+                if g_util is not None:
+                    g_util.labels(stage=name).set(util[name])
+            except Exception:
+                logger.debug("stage engine metrics publish failed stage=%s", name, exc_info=True)
+        return util
+
+    def shutdown(self, wait: bool = True) -> None:
+        for st in self.stages.values():
+            st.shutdown(wait)
+        if self._index_stage is not None:
+            self._index_stage.shutdown(wait)
+
+
+_ENGINE: StageEngine | None = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_stage_engine() -> StageEngine:
+    """Process-wide engine; rebuilt only when the stage worker env settings change."""
+    global _ENGINE
+    cfg = (
+        _env_workers('G6_STAGE_FETCH_WORKERS', 4),
+        _env_workers('G6_STAGE_ANALYTICS_WORKERS', 2),
+        _env_workers('G6_STAGE_PERSIST_WORKERS', 1),
+    )
+    with _ENGINE_LOCK:
+        if _ENGINE is None or _ENGINE.config != cfg:
+            if _ENGINE is not None:
+                _ENGINE.shutdown(wait=False)
+            _ENGINE = StageEngine(fetch_workers=cfg[0], analytics_workers=cfg[1], persist_workers=cfg[2])
+        return _ENGINE
+
+
+def publish_stage_metrics(metrics: Any) -> dict[str, float]:
+    """Publish per-stage gauges for the process engine; no-op when it was never used."""
+    engine = _ENGINE
+    return engine.publish_metrics(metrics) if engine is not None else {}
+
+
+def shutdown_stage_engine(wait: bool = True) -> None:
+    global _ENGINE
+    with _ENGINE_LOCK:
+        if _ENGINE is not None:
+            _ENGINE.shutdown(wait)
+            _ENGINE = None
@@ -4,13 +4,16 @@ import asyncio
 from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
+from ..async_quote_engine import AsyncQuoteEngine
 from ..rate_limiter import RateLimiterRegistry
 
 
 class AsyncKiteAdapter:
     """Async wrapper around the sync KiteProvider using a thread pool.
 
-    Applies a token-bucket rate limiter (per-process) to avoid bursts.
+    Applies a token-bucket rate limiter (per-process) to avoid bursts. Quotes go
+    through an ``AsyncQuoteEngine``: large symbol sets are split at the broker's
+    per-request limit and fetched concurrently under the same token bucket.
     """
 
     def __init__(self, provider, *, max_workers: int | None = None, cps: float = 0.0, burst: int = 0):
@@ -18,6 +21,12 @@ class AsyncKiteAdapter:
         self._loop = asyncio.get_event_loop()
         self._pool = ThreadPoolExecutor(max_workers=max_workers) if max_workers else None
         self._rl = RateLimiterRegistry().get("kite", cps, burst)
+        self.quote_engine = AsyncQuoteEngine(self._quote_chunk, limiter=self._rl)
+
+    @property
+    def limiter(self) -> Any:
+        """Token bucket shared by every call this adapter makes."""
+        return self._rl
 
     async def close(self) -> None:  # pragma: no cover - simple
         # No async resources; shut down pool if owned
@@ -33,8 +42,12 @@ class AsyncKiteAdapter:
         await self._rl.acquire(1)
         return await self._loop.run_in_executor(self._pool, lambda: fn(*args, **kwargs))
 
+    async def _quote_chunk(self, chunk: list[tuple[str, str]]) -> dict[str, Any]:
+        # Limiter already acquired by the engine (one token per chunk)
+        return await self._loop.run_in_executor(self._pool, self._prov.get_quote, chunk)
+
     async def get_quote(self, instruments: list[tuple[str, str]]) -> dict[str, Any]:
-        return await self._call(self._prov.get_quote, instruments)
+        return await self.quote_engine.fetch(instruments)
 
     async def get_ltp(self, instruments: list[tuple[str, str]]) -> dict[str, Any]:
         return await self._call(self._prov.get_ltp, instruments)
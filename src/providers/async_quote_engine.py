@@ -0,0 +1,127 @@
+"""Asyncio-native quote fetch engine.
+
+Splits a quote request into broker-sized chunks (Kite ``quote()`` accepts at
+most 500 instruments per call), keeps a bounded number of chunk requests in
+flight, gates each one on a token bucket and merges the per-chunk dicts.
+
+With several indices collected concurrently (``ParallelCollector`` gathers one
+task per index) all quote traffic funnels through one engine per provider, so
+the in-flight bound and the token bucket are shared: a cycle's quote latency is
+set by the rate limiter instead of by serial round trips.
+
+Failure semantics: chunks fail independently. Successful chunks are merged and
+returned; the call only raises when *every* chunk failed (the first error is
+re-raised so callers keep their existing fallback paths).
+
+Env:
+    G6_ASYNC_QUOTE_ENGINE          enable chunked fan-out in AsyncProviders (default on)
+    G6_ASYNC_QUOTE_CHUNK           instruments per request (default 500)
+    G6_ASYNC_QUOTE_MAX_IN_FLIGHT   concurrent chunk requests (default 4)
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Hashable, Sequence
+from typing import Any
+
+from src.collectors.env_adapter import get_bool, get_int
+
+logger = logging.getLogger(__name__)
+
+KITE_QUOTE_MAX_INSTRUMENTS = 500
+
+__all__ = ["AsyncQuoteEngine", "engine_enabled", "KITE_QUOTE_MAX_INSTRUMENTS"]
+
+
+def engine_enabled() -> bool:
+    return get_bool('G6_ASYNC_QUOTE_ENGINE', True)
+
+
+class AsyncQuoteEngine:
+    """Chunked, concurrency-bounded, rate-limited quote fetcher.
+
+    Args:
+        fetch: coroutine function taking one chunk (list of instruments) and
+            returning a ``{"EXCH:SYMBOL": quote}`` dict.
+        chunk_size: instruments per request (defaults to G6_ASYNC_QUOTE_CHUNK).
+        max_in_flight: concurrent chunk requests across all callers of this engine.
+        limiter: optional object with ``async acquire(n)`` (e.g. ``TokenBucket``);
+            one token per chunk request.
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[list[Any]], Awaitable[dict[str, Any]]],
+        *,
+        chunk_size: int | None = None,
+        max_in_flight: int | None = None,
+        limiter: Any | None = None,
+    ) -> None:
+        self._fetch = fetch
+        size = chunk_size if chunk_size is not None else get_int('G6_ASYNC_QUOTE_CHUNK', KITE_QUOTE_MAX_INSTRUMENTS)
+        self.chunk_size = max(1, min(int(size), KITE_QUOTE_MAX_INSTRUMENTS))
+        flight = max_in_flight if max_in_flight is not None else get_int('G6_ASYNC_QUOTE_MAX_IN_FLIGHT', 4)
+        self.max_in_flight = max(1, int(flight))
+        self._limiter = limiter
+        # asyncio primitives bind to a loop; recreate when driven from a new one (asyncio.run per cycle)
+        self._sem: asyncio.Semaphore | None = None
+        self._sem_loop: asyncio.AbstractEventLoop | None = None
+        self.last_stats: dict[str, Any] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._sem is None or self._sem_loop is not loop:
+            self._sem = asyncio.Semaphore(self.max_in_flight)
+            self._sem_loop = loop
+        return self._sem
+
+    def chunks(self, instruments: Sequence[Any]) -> list[list[Any]]:
+        """De-duplicate (order preserving) and split at the per-request limit."""
+        seen: set[Hashable] = set()
+        uniq: list[Any] = []
+        for inst in instruments:
+            key = tuple(inst) if isinstance(inst, list) else inst
+            if key in seen:
+                continue
+            seen.add(key)
+            uniq.append(inst)
+        n = self.chunk_size
+        return [uniq[i:i + n] for i in range(0, len(uniq), n)]
+
+    async def _fetch_chunk(self, chunk: list[Any]) -> dict[str, Any]:
+        async with self._semaphore():
+            if self._limiter is not None:
+                await self._limiter.acquire(1)
+            return await self._fetch(chunk) or {}
+
+    async def fetch(self, instruments: Sequence[Any]) -> dict[str, Any]:
+        """Fetch quotes for ``instruments`` and return the merged dict."""
+        chunks = self.chunks(instruments)
+        if not chunks:
+            return {}
+        started = time.perf_counter()
+        if len(chunks) == 1:
+            results: list[Any] = [await self._fetch_chunk(chunks[0])]
+        else:
+            results = await asyncio.gather(*(self._fetch_chunk(c) for c in chunks), return_exceptions=True)
+        merged: dict[str, Any] = {}
+        errors: list[BaseException] = []
+        for res in results:
+            if isinstance(res, BaseException):
+                errors.append(res)
+            elif isinstance(res, dict):
+                merged.update(res)
+        self.last_stats = {
+            'instruments': sum(len(c) for c in chunks),
+            'chunks': len(chunks),
+            'failed_chunks': len(errors),
+            'quotes': len(merged),
+            'duration_ms': (time.perf_counter() - started) * 1000.0,
+        }
+        if errors:
+            if len(errors) == len(chunks):
+                raise errors[0]
+            logger.debug("async_quote_partial failed=%d/%d first=%r", len(errors), len(chunks), errors[0])
+        return merged
@@ -0,0 +1,174 @@
+"""Previous-close helpers for CsvSink: reverse-seek last-row reader and per-day closes manifest.
+
+``read_last_row`` returns the final data row of a CSV by reading the header
+line and then seeking backwards from the end in small blocks, so looking up a
+prior day's close costs a couple of reads instead of parsing the whole file.
+``trim_partial_line`` uses the same reverse seek to cut a final line left
+without its newline by a crash (used by cycle-journal replay).
+
+The closes manifest is a compact JSON document written at end of session
+(``CsvSink.close`` / day rollover)::
+
+    <base_dir>/.closes/<YYYY-MM-DD>.json
+    {"date": "2025-09-26",
+     "overview": {"NIFTY": {"index_price": 25010.5, "tp": 212.4}},
+     "series": {"NIFTY|this_week|+50": 180.25, ...},
+     "sizes": {"NIFTY/this_week/+50/2025-09-26.csv": 48213, ...}}
+
+so the next day's previous-close lookups for every series are a single small
+file read. ``sizes`` records each source CSV's byte size when the manifest was
+written; a lookup only trusts a manifest value while its file still has that
+size (``closes_current``) and otherwise falls back to ``read_last_row``, so
+rows appended after the manifest (late writes, another process) are never
+masked. Writes merge into any existing manifest for the same date (several
+processes / restarts) and are atomic (temp file + ``os.replace``).
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import os
+from collections.abc import Iterable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CLOSES_DIRNAME = '.closes'
+
+__all__ = [
+    "CLOSES_DIRNAME",
+    "closes_current",
+    "file_sizes",
+    "load_closes",
+    "manifest_path",
+    "read_last_row",
+    "series_key",
+    "trim_partial_line",
+    "write_closes",
+]
+
+
+def series_key(index: str, expiry_code: str, offset: int) -> str:
+    off = int(offset)
+    return f"{index}|{expiry_code}|{'+' if off > 0 else ''}{off}"
+
+
+def manifest_path(base_dir: str, date_key: str) -> str:
+    return os.path.join(base_dir, CLOSES_DIRNAME, f"{date_key}.json")
+
+
+def _size_key(base_dir: str, path: str) -> str:
+    return os.path.relpath(path, base_dir).replace(os.sep, '/')
+
+
+def file_sizes(base_dir: str, paths: Iterable[str]) -> dict[str, int]:
+    """Current byte size of each existing file, keyed by its base_dir-relative path."""
+    sizes: dict[str, int] = {}
+    for path in paths:
+        try:
+            sizes[_size_key(base_dir, path)] = os.path.getsize(path)
+        except OSError:
+            continue
+    return sizes
+
+
+def closes_current(closes: dict[str, Any], base_dir: str, path: str) -> bool:
+    """True when ``path`` still has the size recorded in the manifest (its closes are up to date)."""
+    recorded = (closes.get('sizes') or {}).get(_size_key(base_dir, path))
+    if recorded is None:
+        return False
+    try:
+        return os.path.getsize(path) == recorded
+    except OSError:
+        return False
+
+
+def read_last_row(path: str, *, block_size: int = 8192) -> dict[str, str] | None:
+    """Return the last non-blank data row of ``path`` as a dict keyed by the header, or None.
+
+    Rows are assumed not to contain embedded newlines (true for CsvSink output).
+    """
+    with open(path, 'rb') as fh:
+        header_line = fh.readline()
+        if not header_line.strip():
+            return None
+        data_start = len(header_line)
+        pos = fh.seek(0, os.SEEK_END)
+        buf = b''
+        line = b''
+        while pos > data_start:
+            step = min(block_size, pos - data_start)
+            pos -= step
+            fh.seek(pos)
+            buf = fh.read(step) + buf
+            stripped = buf.rstrip(b'\r\n')
+            nl = stripped.rfind(b'\n')
+            if nl >= 0:
+                line = stripped[nl + 1:]
+                break
+            if pos == data_start:
+                line = stripped
+    line = line.rstrip(b'\r')
+    if not line.strip():
+        return None
+    header = next(csv.reader([header_line.decode('utf-8').rstrip('\r\n')]))
+    values = next(csv.reader([line.decode('utf-8')]))
+    return dict(zip(header, values, strict=False))
+
+
+def trim_partial_line(path: str, *, block_size: int = 8192) -> int:
+    """Truncate ``path`` after its last newline; returns the number of bytes removed."""
+    with open(path, 'r+b') as fh:
+        size = fh.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0
+        fh.seek(size - 1)
+        if fh.read(1) == b'\n':
+            return 0
+        pos = size
+        keep = 0
+        while pos > 0:
+            step = min(block_size, pos)
+            pos -= step
+            fh.seek(pos)
+            nl = fh.read(step).rfind(b'\n')
+            if nl >= 0:
+                keep = pos + nl + 1
+                break
+        fh.truncate(keep)
+        return size - keep
+
+
+def load_closes(base_dir: str, date_key: str) -> dict[str, Any] | None:
+    """Load the closes manifest for ``date_key``; None when absent or unreadable."""
+    try:
+        with open(manifest_path(base_dir, date_key), encoding='utf-8') as fh:
+            data = json.load(fh)
+        return data if isinstance(data, dict) else None
+    except FileNotFoundError:
+        return None
+    except Exception:
+        logger.debug("closes_manifest_unreadable date=%s", date_key, exc_info=True)
+        return None
+
+
+def write_closes(base_dir: str, date_key: str, overview: dict[str, dict[str, float]],
+                 series: dict[str, float], sizes: dict[str, int] | None = None) -> str | None:
+    """Merge ``overview`` / ``series`` closes (and source file ``sizes``) into the manifest for ``date_key``; returns its path."""
+    if not overview and not series:
+        return None
+    path = manifest_path(base_dir, date_key)
+    existing = load_closes(base_dir, date_key) or {}
+    merged_overview = dict(existing.get('overview') or {})
+    for idx, vals in overview.items():
+        merged_overview[idx] = {**(merged_overview.get(idx) or {}), **vals}
+    merged_series = {**(existing.get('series') or {}), **series}
+    merged_sizes = {**(existing.get('sizes') or {}), **(sizes or {})}
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as fh:
+        json.dump({'date': date_key, 'overview': merged_overview, 'series': merged_series, 'sizes': merged_sizes},
+                  fh, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp, path)
+    return path
@@ -3,6 +3,8 @@
 CSV Storage Sink for G6 Platform.
 """
 
+import atexit
+import contextlib
 import csv
 import datetime
 import json
@@ -12,12 +14,59 @@ import os as _os_env  # for env access without shadowing
 import re  # added for ISO date detection in expiry tag
 import shutil
 import time
+import weakref
+from collections.abc import Iterator
 from typing import Any
 
 from ..utils.timeutils import (
     format_ist_dt_30s,  # unified IST full datetime formatting with 30s rounding
     round_timestamp,  # generic (still used for raw rounding where needed)
     )
+from .close_manifest import (
+    closes_current,
+    file_sizes,
+    load_closes,
+    read_last_row,
+    series_key,
+    trim_partial_line,
+    write_closes,
+)
+from .file_buffer_manager import FileBufferManager
+
+# Per-offset option file columns (rows built by CsvSink._prepare_option_row)
+_OPTION_HEADER = (
+    'timestamp', 'index', 'expiry_tag', 'expiry_date', 'offset', 'index_price', 'atm', 'strike',
+    'ce', 'pe', 'tp', 'avg_ce', 'avg_pe', 'avg_tp',
+    'ce_vol', 'pe_vol', 'ce_oi', 'pe_oi',
+    'ce_iv', 'pe_iv', 'ce_delta', 'pe_delta', 'ce_theta', 'pe_theta',
+    'ce_vega', 'pe_vega', 'ce_gamma', 'pe_gamma', 'ce_rho', 'pe_rho',
+    'tp_net_change', 'tp_day_change',
+)
+_OPTION_TP_COL = _OPTION_HEADER.index('tp')
+
+# Live sinks closed at interpreter exit (pooled handles flushed, closes manifest written).
+# Weak references so the exit hook never keeps a discarded sink (and its caches) alive.
+_CLOSE_AT_EXIT: "weakref.WeakSet[CsvSink]" = weakref.WeakSet()
+
+
+def _close_sinks_at_exit() -> None:
+    for sink in list(_CLOSE_AT_EXIT):
+        try:
+            sink.close()
+        except Exception:
+            pass
+
+
+atexit.register(_close_sinks_at_exit)
+
+
+def _not_newer(ts: str, last_ts: str) -> bool:
+    """True when row timestamp ``ts`` is at or before ``last_ts`` (both '%d-%m-%Y %H:%M:%S')."""
+    try:
+        fmt = '%d-%m-%Y %H:%M:%S'
+        return datetime.datetime.strptime(ts, fmt) <= datetime.datetime.strptime(last_ts, fmt)
+    except (TypeError, ValueError):
+        return ts == last_ts
 
 
 class CsvSink:
@@ -74,6 +123,13 @@ class CsvSink:
         self._tp_open_date_by_key: dict[tuple[str, str, int], str] = {}
         self._tp_prev_close_by_key: dict[tuple[str, str, int], float] = {}
         self._tp_prev_loaded_date_by_key: dict[tuple[str, str, int], str] = {}
+        # End-of-session closes (last written values of the current day) persisted to
+        # <base_dir>/.closes/<date>.json on day rollover / close(); see close_manifest.py
+        self._closes_date: str | None = None
+        self._closes_series: dict[str, float] = {}
+        self._closes_overview: dict[str, dict[str, float]] = {}
+        self._closes_files: set[str] = set()  # source CSVs whose sizes go into the manifest
+        self._closes_manifest_cache: dict[str, dict[str, Any] | None] = {}
         # Last known VIX (for aggregated snapshot fallback)
         self._last_vix: float | None = None
         # ---------------- Batching State (Task 10) ----------------
@@ -106,6 +162,68 @@ class CsvSink:
         self._rewrite_annotations: list[Any] = []
         # Track pending quarantined rows per ISO date for metrics
         self._expiry_quarantine_pending_counts: dict[str, int] = {}
+        # ---------------- Writer pool (persistent append handles) ----------------
+        # G6_CSV_WRITER_POOL=1 keeps option-file handles open (LRU bounded by
+        # G6_CSV_MAX_OPEN_FILES), writes each file once per write_options_data call
+        # and fsyncs every G6_CSV_FSYNC_INTERVAL seconds. Uses flock instead of .lock files.
+        self._writer_pool: FileBufferManager | None = None
+        if _os_env.environ.get('G6_CSV_WRITER_POOL', '0').lower() in ('1','true','yes','on'):
+            try:
+                max_open = int(_os_env.environ.get('G6_CSV_MAX_OPEN_FILES', '64') or 64)
+            except ValueError:
+                max_open = 64
+            try:
+                fsync_interval = float(_os_env.environ.get('G6_CSV_FSYNC_INTERVAL', '10') or 0)
+            except ValueError:
+                fsync_interval = 10.0
+            self._writer_pool = FileBufferManager(
+                max_open_files=max_open,
+                flush_interval_seconds=3600.0,  # flushed explicitly per write_options_data
+                newline='',
+                fsync_interval_seconds=fsync_interval,
+                on_file_created=self._on_csv_file_created,
+            )
+        _CLOSE_AT_EXIT.add(self)
+        # Optional columnar mirror (ParquetSink) fed with every accepted option row
+        self._columnar_sink: Any | None = None
+        # Cycle-journal replay: duplicate suppression is seeded from rows already on disk
+        self._replay_mode = False
+
+    def attach_columnar_sink(self, sink: Any) -> None:
+        """Mirror accepted option rows into a columnar sink (e.g. ParquetSink); None detaches."""
+        self._columnar_sink = sink
+
+    @contextlib.contextmanager
+    def replaying(self) -> Iterator[None]:
+        """Scope for cycle-journal replay (see storage/cycle_journal.py).
+
+        The first time a file is touched in this scope its partially written
+        final line (crash mid-append) is trimmed and its last row seeds
+        duplicate suppression, so rows that reached disk before the crash are
+        not written twice.
+        """
+        prev = self._replay_mode
+        self._replay_mode = True
+        try:
+            yield
+        finally:
+            self._replay_mode = prev
+
+    def _seed_last_row_key(self, option_file: str, offset: int) -> None:
+        try:
+            if trim_partial_line(option_file):
+                self.logger.warning(f"Trimmed partial trailing row from {option_file} during journal replay")
+            if os.path.getsize(option_file) == 0:
+                os.remove(option_file)
+                return
+            last = read_last_row(option_file)
+        except FileNotFoundError:
+            return
+        except Exception:
+            self.logger.debug("replay_seed_last_row_failed path=%s", option_file, exc_info=True)
+            return
+        if last:
+            self._last_row_keys[(option_file, offset)] = next(iter(last.values()))
 
     def attach_metrics(self, metrics_registry: Any) -> None:
         """Attach metrics registry after initialization to avoid circular imports."""
@@ -249,14 +367,8 @@ class CsvSink:
         # If no config or tag supplied, allow heuristic result (legacy behaviour).
         if supplied_tag:  # only enforce if caller explicitly passed a tag
             try:
-                # Lazy-load config once and cache on class
-                if not hasattr(self, '_config_cache'):
-                    cfg_path = os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')), 'config', 'g6_config.json')
-                    with open(cfg_path, encoding='utf-8') as _cf:
-                        self._config_cache = json.load(_cf)
-                indices_cfg = (self._config_cache or {}).get('indices', {})
-                allowed = indices_cfg.get(index, {}).get('expiries') or []
-                if allowed and expiry_code not in allowed:
+                allowed = self._disallowed_tag_allowlist(index, expiry_code)
+                if allowed:
                     # Skip writing disallowed tag
                     if self._concise:
                         self.logger.debug(f"CSV_SKIPPED_DISALLOWED index={index} tag={expiry_code} allowed={allowed}")
@@ -303,12 +415,11 @@ class CsvSink:
 
         # ---------------- Allowed expiry_dates validation (Task 39) ----------------
         try:
-            allowed_set = getattr(self, 'allowed_expiry_dates', None)
-            if allowed_set and isinstance(allowed_set, (set, list, tuple)) and exp_date not in allowed_set:
+            if self._expiry_date_disallowed(exp_date):
                 if self._concise:
                     self.logger.debug(f"CSV_SKIP_INVALID_EXPIRY index={index} tag={expiry_code} expiry={expiry_str}")
                 else:
-                    self.logger.warning(f"Skipping write: expiry_date {expiry_str} not in allowed set for {index} (size={len(allowed_set)})")
+                    self.logger.warning(f"Skipping write: expiry_date {expiry_str} not in allowed set for {index} (size={len(self.allowed_expiry_dates)})")
                 return {'expiry_code': expiry_code, 'pcr': 0, 'timestamp': timestamp, 'day_width': 0, 'skipped_invalid_expiry': True} if return_metrics else None
         except Exception:
             pass
@@ -345,6 +456,8 @@ class CsvSink:
 
     # Prepare daily open tracking for index/tp and load previous closes
         date_key = timestamp.strftime('%Y-%m-%d')
+        # Day rollover persists the previous session's closes before they are looked up
+        self._record_close(date_key)
         # Ensure prev close values are available (best-effort)
         try:
             self._ensure_prev_close_loaded(index=index, date_key=date_key)
@@ -444,6 +557,8 @@ class CsvSink:
                                                                                          timestamp=timestamp,
                                                                                          batching_enabled=batching_enabled,
                                                                                          batch_key=batch_key)
+        # Pool mode: one coalesced write per touched file for this call
+        self.flush_writer_pool()
 
         # Write debug JSON only when flushed (avoid misleading partial snapshot)
         if flushed:
@@ -487,7 +602,44 @@ class CsvSink:
             }
         return None
 
+    def preview_expiry(self, index: str, expiry: Any, expiry_rule_tag: str | None = None) -> tuple[str, str | None]:
+        """(expiry_code, skip_flag) ``write_options_data`` would use, without writing.
+
+        ``skip_flag`` is the key the write would set in its metrics payload when
+        it rejects the expiry ('skipped' / 'skipped_invalid_expiry'), else None.
+        Used for the provisional aggregation payload of queued writes.
+        """
+        exp_date, expiry_code, supplied_tag, _ = self._resolve_expiry_context(
+            index=index, expiry=expiry, expiry_rule_tag=expiry_rule_tag, options_data={},
+        )
+        try:
+            if supplied_tag and self._disallowed_tag_allowlist(index, expiry_code):
+                return expiry_code, 'skipped'
+        except Exception:
+            pass
+        try:
+            if self._expiry_date_disallowed(exp_date):
+                return expiry_code, 'skipped_invalid_expiry'
+        except Exception:
+            pass
+        return expiry_code, None
+
     # ------------------------- Helper Methods -------------------------
+    def _disallowed_tag_allowlist(self, index: str, expiry_code: str) -> list[str]:
+        """Configured expiries for ``index`` when ``expiry_code`` is not among them, else []."""
+        # Lazy-load config once and cache on class
+        if not hasattr(self, '_config_cache'):
+            cfg_path = os.path.join(os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')), 'config', 'g6_config.json')
+            with open(cfg_path, encoding='utf-8') as _cf:
+                self._config_cache = json.load(_cf)
+        indices_cfg = (self._config_cache or {}).get('indices', {})
+        allowed = indices_cfg.get(index, {}).get('expiries') or []
+        return allowed if allowed and expiry_code not in allowed else []
+
+    def _expiry_date_disallowed(self, exp_date: datetime.date) -> bool:
+        allowed_set = getattr(self, 'allowed_expiry_dates', None)
+        return bool(allowed_set and isinstance(allowed_set, (set, list, tuple)) and exp_date not in allowed_set)
+
     def _resolve_expiry_context(self, *, index: str, expiry: Any, expiry_rule_tag: str | None, options_data: dict[str, Any]) -> tuple[datetime.date, str, str | None, str]:
         """Resolve expiry date, logical tag, and corrected monthly anchor.
 
@@ -704,14 +856,22 @@ class CsvSink:
         unique_strikes = len(strike_data)
         mismatched_meta = 0
         exp_date_loc = exp_date  # local ref
+        pool = self._writer_pool
         # Pre-compute day batch key path pieces
+        file_date = timestamp.strftime('%Y-%m-%d')
         for strike, data in strike_data.items():
             offset = int(strike - atm_strike)
             offset_dir = f"+{offset}" if offset > 0 else f"{offset}"
             option_dir = os.path.join(self.base_dir, index, expiry_code, offset_dir)
-            os.makedirs(option_dir, exist_ok=True)
-            option_file = os.path.join(option_dir, f"{timestamp.strftime('%Y-%m-%d')}.csv")
-            file_exists = os.path.isfile(option_file)
+            option_file = os.path.join(option_dir, f"{file_date}.csv")
+            file_series = series_key(index, expiry_code, offset)
+            if self._replay_mode and (option_file, offset) not in self._last_row_keys:
+                self._seed_last_row_key(option_file, offset)
+            if pool is not None and pool.is_open(option_file):
+                file_exists = True
+            else:
+                os.makedirs(option_dir, exist_ok=True)
+                file_exists = os.path.isfile(option_file)
             call_data = data.get('CE', {})
             put_data = data.get('PE', {})
             # Mismatch meta detection
@@ -789,6 +949,7 @@ class CsvSink:
                                                       batching_enabled=batching_enabled,
                                                       batch_key=batch_key):
                 continue
+            self._record_close(file_date, option_file, series=file_series, tp=row[_OPTION_TP_COL])
         # Post-loop: meta mismatch log & batch flush decision
         if mismatched_meta:
             try:
@@ -884,13 +1045,18 @@ class CsvSink:
         """
         try:
             last_ts = self._last_row_keys.get(row_sig)
-            if last_ts == row[0]:
+            if last_ts == row[0] or (self._replay_mode and last_ts is not None and _not_newer(row[0], last_ts)):
                 if self.verbose:
                     try:
                         self.logger.debug(f"Duplicate row suppressed index={index} expiry={expiry_code} offset={offset} ts={row[0]}")
                     except Exception:
                         pass
                 return True
+            if self._columnar_sink is not None:
+                try:
+                    self._columnar_sink.add_row(header, row, batch_key[2])
+                except Exception:
+                    self.logger.debug("columnar_sink_add_row_failed", exc_info=True)
             if batching_enabled:
                 buf = self._batch_buffers[batch_key].setdefault(option_file, {'header': header, 'rows': []})
                 buf['rows'].append(row)
@@ -1142,37 +1308,42 @@ class CsvSink:
     def _ensure_tp_prev_close_for_key(self, *, index: str, expiry_code: str, offset: int, date_key: str) -> None:
         """Load previous day's TP close for specific (index, expiry_code, offset) series.
 
-        Reads the last row's 'tp' from the most recent prior date's options data file.
-        Caches per series per day.
+        Uses the most recent prior date's closes manifest entry while that day's options
+        file is unchanged since the manifest was written, else the last row's 'tp' of the
+        file (reverse-seek read). Caches per series per day.
         """
         try:
             key = (index, expiry_code, int(offset))
             if self._tp_prev_loaded_date_by_key.get(key) == date_key:
                 return
-            # Walk back up to 5 prior days
+            # Walk back up to 5 prior days: closes manifest first, else tail of the day file
             today = datetime.datetime.strptime(date_key, '%Y-%m-%d').date()
+            skey = series_key(index, expiry_code, offset)
+            offset_dir = f"+{offset}" if int(offset) > 0 else f"{int(offset)}"
             for back in range(1, 6):
-                prev_day = today - datetime.timedelta(days=back)
-                # Build option file path for this series
-                offset_dir = f"+{offset}" if int(offset) > 0 else f"{int(offset)}"
-                option_file = os.path.join(self.base_dir, index, expiry_code, offset_dir, f"{prev_day.strftime('%Y-%m-%d')}.csv")
+                prev_str = (today - datetime.timedelta(days=back)).strftime('%Y-%m-%d')
+                option_file = os.path.join(self.base_dir, index, expiry_code, offset_dir, f"{prev_str}.csv")
+                closes = self._closes_for(prev_str)
+                if (closes is not None and skey in (closes.get('series') or {})
+                        and closes_current(closes, self.base_dir, option_file)):
+                    try:
+                        self._tp_prev_close_by_key[key] = float(closes['series'][skey] or 0.0)
+                        break
+                    except Exception:
+                        pass
                 if not os.path.isfile(option_file):
                     continue
                 try:
-                    with open(option_file, encoding='utf-8') as fh:
-                        rdr = csv.DictReader(fh)
-                        last = None
-                        for r in rdr:
-                            last = r
-                        if last is None:
-                            continue
-                        try:
-                            prev_tp = float(last.get('tp', '') or 0.0)
-                        except Exception:
-                            prev_tp = None
-                        if prev_tp is not None:
-                            self._tp_prev_close_by_key[key] = prev_tp
-                            break
+                    last = read_last_row(option_file)
+                    if last is None:
+                        continue
+                    try:
+                        prev_tp = float(last.get('tp', '') or 0.0)
+                    except Exception:
+                        prev_tp = None
+                    if prev_tp is not None:
+                        self._tp_prev_close_by_key[key] = prev_tp
+                        break
                 except Exception:
                     continue
             self._tp_prev_loaded_date_by_key[key] = date_key
@@ -1218,14 +1389,7 @@ class CsvSink:
         # Aggregates
         tp_price = ce_price + pe_price
         avg_tp = ce_avg + pe_avg
-        header = [
-            'timestamp', 'index', 'expiry_tag', 'expiry_date', 'offset', 'index_price', 'atm', 'strike',
-            'ce', 'pe', 'tp', 'avg_ce', 'avg_pe', 'avg_tp',
-            'ce_vol', 'pe_vol', 'ce_oi', 'pe_oi',
-            'ce_iv', 'pe_iv', 'ce_delta', 'pe_delta', 'ce_theta', 'pe_theta',
-            'ce_vega', 'pe_vega', 'ce_gamma', 'pe_gamma', 'ce_rho', 'pe_rho',
-            'tp_net_change', 'tp_day_change'
-        ]
+        header = list(_OPTION_HEADER)
         # Compute per-offset tp changes using per-series open and prev close caches
         date_key: str | None = None
         try:
@@ -1239,14 +1403,14 @@ class CsvSink:
             self._ensure_tp_prev_close_for_key(index=index, expiry_code=expiry_code, offset=offset, date_key=date_key)
         except Exception:
             pass
-        series_key = (index, expiry_code, int(offset))
+        tp_key = (index, expiry_code, int(offset))
         # Initialize per-day open if needed
-        if self._tp_open_date_by_key.get(series_key) != date_key:
-            self._tp_open_date_by_key[series_key] = date_key
-            self._tp_open_by_key[series_key] = float(tp_price)
-        prev_tp_close = self._tp_prev_close_by_key.get(series_key)
+        if self._tp_open_date_by_key.get(tp_key) != date_key:
+            self._tp_open_date_by_key[tp_key] = date_key
+            self._tp_open_by_key[tp_key] = float(tp_price)
+        prev_tp_close = self._tp_prev_close_by_key.get(tp_key)
         tp_net_change = float(tp_price) - float(prev_tp_close) if prev_tp_close is not None else 0.0
-        tp_day_change = float(tp_price) - float(self._tp_open_by_key.get(series_key, tp_price))
+        tp_day_change = float(tp_price) - float(self._tp_open_by_key.get(tp_key, tp_price))
 
         row = [
             ts_str_rounded, index, expiry_code, expiry_date_str, offset, index_price, atm_strike, offset_price,
@@ -1289,7 +1453,43 @@ class CsvSink:
             pass
         return row, header
 
+    def _on_csv_file_created(self, _path: str) -> None:
+        try:
+            if self.metrics and hasattr(self.metrics, 'csv_files_created'):
+                self.metrics.csv_files_created.inc()  # type: ignore[call-arg]
+        except Exception:
+            pass
+
+    def flush_writer_pool(self) -> None:
+        """Write rows queued in the writer pool (no-op when pool mode is off)."""
+        if self._writer_pool is not None:
+            try:
+                self._writer_pool.flush_all(force=False)
+            except Exception:
+                self.logger.debug("csv_writer_pool_flush_failed", exc_info=True)
+
+    def close(self) -> None:
+        """Flush, fsync and close pooled handles and the columnar mirror (safe to call repeatedly).
+
+        Also writes the end-of-session closes manifest used by the next day's prev-close lookups.
+        """
+        if self._columnar_sink is not None:
+            try:
+                self._columnar_sink.close()
+            except Exception:
+                self.logger.debug("columnar_sink_close_failed", exc_info=True)
+        if self._writer_pool is not None:
+            try:
+                self._writer_pool.close_all()
+            except Exception:
+                self.logger.debug("csv_writer_pool_close_failed", exc_info=True)
+        # After the pool is drained so the recorded file sizes include every row
+        self.write_close_manifest()
+
     def _append_csv_row(self, filepath: str, row: list[Any], header: list[str] | None) -> None:
+        if self._writer_pool is not None:
+            self._writer_pool.write_rows(filepath, [row], header)
+            return
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         file_exists = os.path.isfile(filepath)
         # Lightweight write lock gate using .lock sentinel (best-effort, non-blocking if exists)
@@ -1325,6 +1525,9 @@ class CsvSink:
     def _append_many_csv_rows(self, filepath: str, rows: list[list[Any]], header: list[str] | None) -> None:
         if not rows:
             return
+        if self._writer_pool is not None:
+            self._writer_pool.write_rows(filepath, rows, header)
+            return
         os.makedirs(os.path.dirname(filepath), exist_ok=True)
         file_exists = os.path.isfile(filepath)
         lock_path = filepath + '.lock'
@@ -1435,8 +1638,9 @@ class CsvSink:
     def _ensure_prev_close_loaded(self, *, index: str, date_key: str) -> None:
         """Load previous day's close values for index_price and tp from overview CSV.
 
-        Caches results per (index, date_key) to avoid repeated disk I/O.
-        Falls back gracefully if no file or columns present.
+        Prefers the prior day's closes manifest (while the overview file is unchanged
+        since it was written); otherwise reads the file's last row with a reverse seek. Caches results per (index, date_key) to avoid
+        repeated disk I/O. Falls back gracefully if no file or columns present.
         """
         try:
             if self._prev_close_loaded_date.get(index) == date_key:
@@ -1447,30 +1651,32 @@ class CsvSink:
             prev_idx_close = None
             prev_tp_close = None
             for back in range(1, 6):
-                prev_day = today - datetime.timedelta(days=back)
-                fp = os.path.join(base_dir, f"{prev_day.strftime('%Y-%m-%d')}.csv")
-                if not os.path.isfile(fp):
-                    continue
-                try:
-                    with open(fp, encoding='utf-8') as fh:
-                        rdr = csv.DictReader(fh)
-                        last_row = None
-                        for r in rdr:
-                            last_row = r
-                        if last_row:
-                            # index_price prev close
-                            try:
-                                prev_idx_close = float(last_row.get('index_price', '') or 0.0)
-                            except Exception:
-                                prev_idx_close = None
-                            # tp prev close (may be absent on older schema)
-                            try:
-                                prev_tp_close = float(last_row.get('tp', '') or 0.0)
-                            except Exception:
-                                prev_tp_close = None
-                            break
-                except Exception:
-                    continue
+                prev_str = (today - datetime.timedelta(days=back)).strftime('%Y-%m-%d')
+                closes = self._closes_for(prev_str)
+                fp = os.path.join(base_dir, f"{prev_str}.csv")
+                last_row: dict[str, Any] | None = None
+                if (closes is not None and index in (closes.get('overview') or {})
+                        and closes_current(closes, self.base_dir, fp)):
+                    last_row = closes['overview'][index]
+                else:
+                    if not os.path.isfile(fp):
+                        continue
+                    try:
+                        last_row = read_last_row(fp)
+                    except Exception:
+                        continue
+                if last_row:
+                    # index_price prev close
+                    try:
+                        prev_idx_close = float(last_row.get('index_price', '') or 0.0)
+                    except Exception:
+                        prev_idx_close = None
+                    # tp prev close (may be absent on older schema)
+                    try:
+                        prev_tp_close = float(last_row.get('tp', '') or 0.0)
+                    except Exception:
+                        prev_tp_close = None
+                    break
             if prev_idx_close is not None:
                 self._index_prev_close[index] = prev_idx_close
             if prev_tp_close is not None:
@@ -1480,6 +1686,45 @@ class CsvSink:
             # Best-effort; leave unset on failure
             self._prev_close_loaded_date[index] = date_key
 
+    def _closes_for(self, date_key: str) -> dict[str, Any] | None:
+        if date_key not in self._closes_manifest_cache:
+            self._closes_manifest_cache[date_key] = load_closes(self.base_dir, date_key)
+        return self._closes_manifest_cache[date_key]
+
+    def _record_close(self, date_key: str, path: str | None = None, *, series: str | None = None, tp: Any = None,
+                      index: str | None = None, index_price: Any = None) -> None:
+        """Remember the last written value for the day's closes manifest (rolls over on date change)."""
+        try:
+            if self._closes_date != date_key:
+                if self._closes_date is not None and date_key < self._closes_date:
+                    return  # late row for an earlier day; file tail remains authoritative
+                self.write_close_manifest()
+                self._closes_date = date_key
+                self._closes_series = {}
+                self._closes_overview = {}
+                self._closes_files = set()
+            if path is not None:
+                self._closes_files.add(path)
+            if series is not None:
+                self._closes_series[series] = float(tp or 0.0)
+            if index is not None:
+                self._closes_overview[index] = {'index_price': float(index_price or 0.0)}
+        except Exception:
+            self.logger.debug("closes_record_failed", exc_info=True)
+
+    def write_close_manifest(self) -> str | None:
+        """Persist the current day's last written closes (end of session); returns manifest path."""
+        if self._closes_date is None:
+            return None
+        try:
+            path = write_closes(self.base_dir, self._closes_date, self._closes_overview, self._closes_series,
+                                file_sizes(self.base_dir, self._closes_files))
+            self._closes_manifest_cache.pop(self._closes_date, None)
+            return path
+        except Exception:
+            self.logger.debug("closes_manifest_write_failed", exc_info=True)
+            return None
+
     def _write_overview_file(self, index: str, expiry_code: str, pcr: float, day_width: float, timestamp: datetime.datetime, index_price: float,
                              *, index_net_change: float = 0.0, index_day_change: float = 0.0,
                              tp_value: float = 0.0, tp_net_change: float = 0.0, tp_day_change: float = 0.0,
@@ -1533,6 +1778,7 @@ class CsvSink:
                 float(vix or 0.0),
             ])
 
+        self._record_close(timestamp.strftime('%Y-%m-%d'), overview_file, index=index, index_price=index_price)
         self.logger.info(f"Overview data written to {overview_file}")
         # Metric (wrapper)
         self._metric_inc('csv_overview_writes', 1, {'index': index})
@@ -1595,6 +1841,7 @@ class CsvSink:
                 expiries_expected, expiries_collected,
                 expected_mask, collected_mask, missing_mask
             ])
+        self._record_close(date_key, overview_file, index=index, index_price=idx_price)
 
         if getattr(self, '_concise', False):
             self.logger.debug(f"Aggregated overview snapshot written for {index} -> {overview_file}")
@@ -0,0 +1,437 @@
+"""Crash-safe write-ahead journal for per-expiry chain frames.
+
+With ``G6_CYCLE_JOURNAL=1`` every normalized chain frame (one index/expiry
+snapshot of a cycle: options, index price, OHLC, collection time, expiry tag)
+is appended to a per-day journal *before* the CSV / Influx / columnar fan-out
+and acknowledged once the sinks accepted it. If the process dies mid-cycle,
+the next start replays the unacknowledged frames into the sinks.
+
+Layout (``G6_CYCLE_JOURNAL_DIR``, default ``data/journal``)::
+
+    <YYYY-MM-DD>.wal      append-only records
+    <YYYY-MM-DD>.wal.ack  24-byte acknowledgement watermark + per-seq ack log
+
+Each record is a 20-byte header ``<magic b'G6WJ', seq u64, length u32,
+crc32 u32>`` followed by the pickled frame. ``seq`` increases monotonically
+across days. The ack file holds ``<magic b'G6WA', acked_seq u64,
+replay_offset u64, crc32 u32>`` header, rewritten in place. ``replay_offset``
+is the start of the oldest unacknowledged record, so recovery seeks straight
+to it and reads only the journal tail instead of rescanning the data tree.
+Acks may arrive out of order (queued writes, a frame whose sink write failed
+and is never acked): a seq acknowledged above the watermark is appended to
+the ack file as a u64 after the header, and recovery skips those records so
+only frames that were really never persisted are replayed. The log is
+truncated back to the bare header whenever nothing is pending. A torn final
+record (short read or checksum mismatch) is truncated away.
+
+Replay is idempotent: ``CsvSink.replaying()`` seeds duplicate suppression
+from the last row already on disk (and trims a partially written final line)
+for every file a replayed frame touches and drops rows not newer than it,
+Influx points overwrite by series and
+timestamp, and the columnar mirror only sees rows the CSV sink accepted.
+
+Not covered: rows held back by CSV batching (``G6_CSV_BATCH_FLUSH``) and
+points still buffered inside the Influx client are acknowledged when handed
+to the sink. ``G6_CYCLE_JOURNAL_FSYNC=1`` adds an fsync per record for power
+loss (process crashes only need the write to reach the OS).
+"""
+from __future__ import annotations
+
+import datetime as _dt
+import logging
+import os
+import pickle
+import struct
+import threading
+import time
+import zlib
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from typing import Any
+
+from src.utils.env_flags import is_truthy_env
+
+logger = logging.getLogger(__name__)
+
+RECORD_MAGIC = b'G6WJ'
+ACK_MAGIC = b'G6WA'
+_HEADER = struct.Struct('<4sQII')
+_ACK = struct.Struct('<4sQQ')
+_ACK_SIZE = _ACK.size + 4
+_ACK_SEQ = struct.Struct('<Q')
+
+__all__ = [
+    "CycleJournal",
+    "RecoveryStats",
+    "ack_frame",
+    "get_cycle_journal",
+    "journal_frame",
+    "make_frame",
+    "recover_cycle_journal",
+    "replay_frame",
+]
+
+
+@dataclass
+class RecoveryStats:
+    files: int = 0
+    replayed: int = 0
+    failed: int = 0
+    truncated_bytes: int = 0
+    removed_files: int = 0
+    seconds: float = 0.0
+
+
+class _DayFile:
+    """Open journal + ack handles and in-flight bookkeeping for one day."""
+
+    def __init__(self, path: str, end: int, last_seq: int) -> None:
+        self.path = path
+        self.fh = open(path, 'ab')
+        self.ack_fd = os.open(f"{path}.ack", os.O_RDWR | os.O_CREAT, 0o644)
+        self.ack_end = max(_ACK_SIZE, os.fstat(self.ack_fd).st_size)
+        self.end = end
+        self.last_seq = last_seq
+        self.pending: dict[int, int] = {}  # seq -> record start offset
+
+    def write_ack(self, acked_seq: int, offset: int) -> None:
+        """Rewrite the watermark header (the per-seq log after it is kept)."""
+        os.pwrite(self.ack_fd, _ack_bytes(acked_seq, offset), 0)
+
+    def reset_ack(self, acked_seq: int, offset: int) -> None:
+        """Watermark covers everything: drop the per-seq log."""
+        os.pwrite(self.ack_fd, _ack_bytes(acked_seq, offset), 0)
+        os.ftruncate(self.ack_fd, _ACK_SIZE)
+        self.ack_end = _ACK_SIZE
+
+    def log_ack(self, seq: int) -> None:
+        """Record an acknowledgement above the watermark."""
+        os.pwrite(self.ack_fd, _ACK_SEQ.pack(seq), self.ack_end)
+        self.ack_end += _ACK_SEQ.size
+
+    def close(self) -> None:
+        try:
+            self.fh.close()
+        finally:
+            os.close(self.ack_fd)
+
+
+def _ack_bytes(acked_seq: int, offset: int) -> bytes:
+    body = _ACK.pack(ACK_MAGIC, acked_seq, offset)
+    return body + struct.pack('<I', zlib.crc32(body))
+
+
+def _write_ack_file(path: str, acked_seq: int, offset: int, acked_above: set[int] | frozenset[int] = frozenset()) -> None:
+    data = _ack_bytes(acked_seq, offset) + b''.join(_ACK_SEQ.pack(s) for s in sorted(acked_above) if s > acked_seq)
+    fd = os.open(f"{path}.ack", os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        os.pwrite(fd, data, 0)
+        os.ftruncate(fd, len(data))
+    finally:
+        os.close(fd)
+
+
+def _read_ack(path: str) -> tuple[int, int, set[int]] | None:
+    """(acked_seq, replay_offset, seqs acked above it) from ``<path>.ack``; None when missing or corrupt."""
+    try:
+        with open(f"{path}.ack", 'rb') as fh:
+            raw = fh.read()
+    except FileNotFoundError:
+        return None
+    if len(raw) < _ACK_SIZE:
+        return None
+    body, (crc,) = raw[:_ACK.size], struct.unpack('<I', raw[_ACK.size:_ACK_SIZE])
+    magic, acked_seq, offset = _ACK.unpack(body)
+    if magic != ACK_MAGIC or zlib.crc32(body) != crc:
+        return None
+    log = raw[_ACK_SIZE:]
+    usable = len(log) - len(log) % _ACK_SEQ.size  # a torn final entry is ignored
+    acked_above = {s for (s,) in _ACK_SEQ.iter_unpack(log[:usable]) if s > acked_seq}
+    return acked_seq, offset, acked_above
+
+
+def _scan(path: str, offset: int) -> Iterator[tuple[int, int, int, bytes]]:
+    """Yield ``(seq, start, end, payload)`` from ``offset``; truncates a torn tail."""
+    with open(path, 'r+b') as fh:
+        size = fh.seek(0, os.SEEK_END)
+        pos = min(offset, size)
+        fh.seek(pos)
+        while pos < size:
+            head = fh.read(_HEADER.size)
+            ok = len(head) == _HEADER.size
+            if ok:
+                magic, seq, length, crc = _HEADER.unpack(head)
+                payload = fh.read(length) if magic == RECORD_MAGIC else b''
+                ok = magic == RECORD_MAGIC and len(payload) == length and zlib.crc32(payload) == crc
+            if not ok:
+                logger.warning("cycle journal %s: torn record at offset %s; truncating %s bytes", path, pos, size - pos)
+                fh.truncate(pos)
+                return
+            end = pos + _HEADER.size + length
+            yield seq, pos, end, payload
+            pos = end
+
+
+class CycleJournal:
+    """Per-day append-only frame journal with out-of-order acknowledgement."""
+
+    def __init__(self, directory: str, *, fsync: bool = False, keep_days: int = 2) -> None:
+        self.directory = directory
+        self.fsync = fsync
+        self.keep_days = max(0, int(keep_days))
+        self._lock = threading.Lock()
+        self._days: dict[str, _DayFile] = {}
+        self._seq_day: dict[int, str] = {}
+        self._seq: int | None = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{day}.wal")
+
+    def _journal_days(self) -> list[str]:
+        return sorted(name[:-4] for name in os.listdir(self.directory) if name.endswith('.wal'))
+
+    # ---------------- Writing ----------------
+    def append(self, frame: dict[str, Any], *, day: str | None = None) -> int:
+        """Append ``frame``; returns its sequence number (pass it to ``ack``)."""
+        payload = pickle.dumps(frame, protocol=pickle.HIGHEST_PROTOCOL)
+        day = day or _dt.date.today().isoformat()
+        with self._lock:
+            if self._seq is None:
+                self._seq = self._last_seq_on_disk()
+            d = self._day_file(day)
+            self._seq += 1
+            seq = self._seq
+            d.fh.write(_HEADER.pack(RECORD_MAGIC, seq, len(payload), zlib.crc32(payload)) + payload)
+            d.fh.flush()
+            if self.fsync:
+                os.fsync(d.fh.fileno())
+            d.pending[seq] = d.end
+            d.end += _HEADER.size + len(payload)
+            d.last_seq = seq
+            self._seq_day[seq] = day
+        return seq
+
+    def ack(self, seq: int) -> None:
+        """Mark ``seq`` as persisted by every sink and advance the replay watermark."""
+        with self._lock:
+            day = self._seq_day.pop(seq, None)
+            d = self._days.get(day) if day else None
+            if d is None or d.pending.pop(seq, None) is None:
+                return
+            if not d.pending:
+                d.reset_ack(d.last_seq, d.end)
+                return
+            oldest = min(d.pending)
+            if seq < oldest:
+                d.write_ack(oldest - 1, d.pending[oldest])
+            else:
+                d.log_ack(seq)
+
+    def pending(self) -> list[int]:
+        with self._lock:
+            return sorted(self._seq_day)
+
+    def _day_file(self, day: str) -> _DayFile:
+        d = self._days.get(day)
+        if d is None:
+            path = self._path(day)
+            end = os.path.getsize(path) if os.path.exists(path) else 0
+            d = _DayFile(path, end, self._seq or 0)
+            if not d.pending and end == 0:
+                d.write_ack(d.last_seq, 0)
+            self._days[day] = d
+            # Day rollover: release handles of fully acknowledged earlier days
+            for other in [k for k, v in self._days.items() if k < day and not v.pending]:
+                self._days.pop(other).close()
+        return d
+
+    def _last_seq_on_disk(self) -> int:
+        days = self._journal_days()
+        if not days:
+            return 0
+        path = self._path(days[-1])
+        ack = _read_ack(path)
+        last, offset = (ack[0], ack[1]) if ack is not None else (0, 0)
+        if ack is not None and ack[2]:
+            last = max(last, max(ack[2]))
+        for seq, _s, _e, _p in _scan(path, offset):
+            last = max(last, seq)
+        return last
+
+    # ---------------- Recovery ----------------
+    def recover(self, apply: Callable[[dict[str, Any]], None]) -> RecoveryStats:
+        """Replay unacknowledged frames (oldest day first) through ``apply`` and acknowledge them.
+
+        Must run before the first ``append`` of the process. Frames whose
+        ``apply`` raises stay unacknowledged and are retried on the next start.
+        """
+        t0 = time.perf_counter()
+        stats = RecoveryStats()
+        today = _dt.date.today()
+        with self._lock:
+            last_seq = 0
+            for day in self._journal_days():
+                path = self._path(day)
+                ack = _read_ack(path)
+                acked_seq, offset, acked_above = ack if ack is not None else (0, 0, set())
+                size_before = os.path.getsize(path)
+                replay_from: int | None = None
+                failed_here = False
+                stats.files += 1
+                for seq, start, _end, payload in _scan(path, offset):
+                    last_seq = max(last_seq, seq)
+                    if seq <= acked_seq:
+                        continue
+                    if seq in acked_above:
+                        # persisted before the crash, only an older frame was not
+                        if replay_from is None:
+                            acked_seq = seq
+                        continue
+                    try:
+                        apply(pickle.loads(payload))
+                        stats.replayed += 1
+                        acked_above.add(seq)
+                    except Exception:
+                        stats.failed += 1
+                        failed_here = True
+                        if replay_from is None:
+                            replay_from = start
+                        logger.error("cycle journal replay failed seq=%s (%s)", seq, path, exc_info=True)
+                        continue
+                    if replay_from is None:
+                        acked_seq = seq
+                end = os.path.getsize(path)
+                stats.truncated_bytes += size_before - end
+                _write_ack_file(path, acked_seq, replay_from if replay_from is not None else end, acked_above)
+                last_seq = max(last_seq, acked_seq)
+                if not failed_here and self._expired(day, today):
+                    for p in (path, f"{path}.ack"):
+                        try:
+                            os.remove(p)
+                        except FileNotFoundError:
+                            pass
+                    stats.removed_files += 1
+            self._seq = max(self._seq or 0, last_seq)
+        stats.seconds = time.perf_counter() - t0
+        return stats
+
+    def _expired(self, day: str, today: _dt.date) -> bool:
+        try:
+            return (today - _dt.date.fromisoformat(day)).days >= self.keep_days
+        except ValueError:
+            return False
+
+    def close(self) -> None:
+        with self._lock:
+            for d in self._days.values():
+                d.close()
+            self._days.clear()
+
+
+# ---------------------------------------------------------------------------
+# Frames and sink replay
+# ---------------------------------------------------------------------------
+def make_frame(index: str, expiry_date: Any, expiry_rule: str, collection_time: Any, options: dict[str, dict[str, Any]],
+               *, index_price: Any = None, index_ohlc: Any = None) -> dict[str, Any]:
+    return {
+        'index': index,
+        'expiry_date': expiry_date,
+        'expiry_rule': expiry_rule,
+        'ts': collection_time,
+        'index_price': index_price,
+        'index_ohlc': index_ohlc or {},
+        'options': options,
+    }
+
+
+def replay_frame(csv_sink: Any, influx_sink: Any, frame: dict[str, Any]) -> None:
+    """Re-run the sink fan-out for one journaled frame (CSV duplicate-safe, then Influx)."""
+    if csv_sink is not None:
+        replaying = getattr(csv_sink, 'replaying', None)
+        if replaying is not None:
+            with replaying():
+                _csv_write(csv_sink, frame)
+        else:
+            _csv_write(csv_sink, frame)
+    if influx_sink is not None:
+        influx_sink.write_options_data(frame['index'], frame['expiry_date'], dict(frame['options']), frame['ts'])
+
+
+def _csv_write(csv_sink: Any, frame: dict[str, Any]) -> None:
+    csv_sink.write_options_data(
+        frame['index'], frame['expiry_date'], dict(frame['options']), frame['ts'],
+        index_price=frame['index_price'], index_ohlc=frame['index_ohlc'],
+        suppress_overview=True, return_metrics=True, expiry_rule_tag=frame['expiry_rule'],
+    )
+
+
+# ---------------------------------------------------------------------------
+# Process journal
+# ---------------------------------------------------------------------------
+_JOURNAL: CycleJournal | None = None
+_JOURNAL_LOCK = threading.Lock()
+
+
+def get_cycle_journal() -> CycleJournal | None:
+    """Process journal when ``G6_CYCLE_JOURNAL`` is enabled, else None."""
+    global _JOURNAL
+    if not is_truthy_env('G6_CYCLE_JOURNAL'):
+        return None
+    with _JOURNAL_LOCK:
+        if _JOURNAL is None:
+            try:
+                keep = int(os.environ.get('G6_CYCLE_JOURNAL_KEEP_DAYS', '2') or 2)
+            except ValueError:
+                keep = 2
+            _JOURNAL = CycleJournal(
+                os.environ.get('G6_CYCLE_JOURNAL_DIR') or os.path.join('data', 'journal'),
+                fsync=is_truthy_env('G6_CYCLE_JOURNAL_FSYNC'),
+                keep_days=keep,
+            )
+        return _JOURNAL
+
+
+def journal_frame(frame: dict[str, Any]) -> int | None:
+    """Append ``frame`` to the process journal; None when journaling is off or the append failed."""
+    journal = get_cycle_journal()
+    if journal is None:
+        return None
+    try:
+        return journal.append(frame)
+    except Exception:
+        logger.error("cycle journal append failed; continuing without write-ahead record", exc_info=True)
+        return None
+
+
+def ack_frame(seq: int | None) -> None:
+    if seq is None or _JOURNAL is None:
+        return
+    try:
+        _JOURNAL.ack(seq)
+    except Exception:
+        logger.debug("cycle journal ack failed seq=%s", seq, exc_info=True)
+
+
+def recover_cycle_journal(csv_sink: Any, influx_sink: Any, metrics: Any | None = None) -> RecoveryStats | None:
+    """Startup recovery: replay unacknowledged frames into the sinks (no-op when journaling is off)."""
+    journal = get_cycle_journal()
+    if journal is None:
+        return None
+    stats = journal.recover(lambda frame: replay_frame(csv_sink, influx_sink, frame))
+    if stats.replayed or stats.failed or stats.truncated_bytes:
+        logger.warning(
+            "cycle journal recovery replayed=%s failed=%s truncated_bytes=%s in %.1fms",
+            stats.replayed, stats.failed, stats.truncated_bytes, stats.seconds * 1000,
+        )
+    else:
+        logger.info("cycle journal clean (%s file(s), %.1fms)", stats.files, stats.seconds * 1000)
+    if metrics is not None:
+        try:
+            if stats.replayed and hasattr(metrics, 'journal_replayed_frames_total'):
+                metrics.journal_replayed_frames_total.inc(stats.replayed)
+            if hasattr(metrics, 'journal_recovery_seconds'):
+                metrics.journal_recovery_seconds.set(stats.seconds)
+        except Exception:
+            logger.debug("cycle journal recovery metrics failed", exc_info=True)
+    return stats
@@ -4,18 +4,36 @@ This utility batches CSV row writes per file and periodically flushes to disk,
 reducing the overhead of opening/closing files on every write. It enforces a
 limit on concurrently open file handles using a simple LRU eviction policy.
 
+It is the backend of ``CsvSink`` writer-pool mode (``G6_CSV_WRITER_POOL=1``):
+append handles stay open for the trading day, rows queued during a cycle are
+written with a single flush per file, and ``fsync`` runs on a configurable
+cadence instead of never/always.
+
 Notes:
-- Designed to be lightweight, thread-agnostic (call from single writer thread).
-- Flushes on either time threshold or row-count threshold.
+- Thread-safe (internal RLock); CsvSink may be driven from parallel collectors.
+- Flushes on either time threshold or row-count threshold, or explicitly via
+  ``flush_all`` (CsvSink calls it once per ``write_options_data``).
+- Cross-process coordination uses ``fcntl.flock`` advisory locks around each
+  flush (POSIX only; no-op elsewhere) instead of ``.lock`` sentinel files.
+- New files are detected from the append position (size 0) rather than a
+  separate ``os.path.isfile`` probe, so a header is never written twice.
 """
 from __future__ import annotations
 
 import csv
 import os
+import threading
 import time
+from collections import OrderedDict
+from collections.abc import Callable, Iterable
 from dataclasses import dataclass, field
 from typing import Any, TextIO
 
+try:
+    import fcntl  # type: ignore[import-not-found]
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None  # type: ignore[assignment]
+
 
 @dataclass
 class _FileEntry:
@@ -26,6 +44,7 @@ class _FileEntry:
     pending: list[list[object]] = field(default_factory=list)
     last_access: float = field(default_factory=time.time)
     last_flush: float = field(default_factory=time.time)
+    dirty: bool = False  # written since last fsync
 
 
 class FileBufferManager:
@@ -36,13 +55,24 @@ class FileBufferManager:
         buffer_size: int = 0,
         newline: str = "",
         encoding: str = "utf-8",
+        fsync_interval_seconds: float = 0.0,
+        advisory_lock: bool = True,
+        on_file_created: Callable[[str], None] | None = None,
     ) -> None:
         self.max_open_files = max(1, int(max_open_files))
         self.flush_interval_seconds = max(0.1, float(flush_interval_seconds))
         self.buffer_size = max(0, int(buffer_size))
         self.newline = newline
         self.encoding = encoding
-        self._files: dict[str, _FileEntry] = {}
+        # 0 disables periodic fsync (data still reaches the OS on every flush)
+        self.fsync_interval_seconds = max(0.0, float(fsync_interval_seconds))
+        self.advisory_lock = bool(advisory_lock) and fcntl is not None
+        self.on_file_created = on_file_created
+        self._files: OrderedDict[str, _FileEntry] = OrderedDict()
+        self._lock = threading.RLock()
+        self._last_fsync = time.time()
+        self._known_dirs: set[str] = set()
+        self.stats: dict[str, int] = {'opens': 0, 'evictions': 0, 'flushes': 0, 'fsyncs': 0, 'rows': 0}
 
     # ---------------- Public API ----------------
     def write_row(self, filepath: str, row: list[object], header: list[str] | None = None) -> None:
@@ -51,82 +81,133 @@ class FileBufferManager:
         If file is new and header is provided, header is written immediately
         before any queued rows to keep schema consistent for first reader.
         """
-        fe = self._ensure_file(filepath, header)
-        fe.pending.append(row)
-        fe.last_access = time.time()
-        # Flush based on row threshold or time interval
-        if self.buffer_size and len(fe.pending) >= self.buffer_size:
-            self._flush_one(fe)
-        else:
-            if (time.time() - fe.last_flush) >= self.flush_interval_seconds:
+        self.write_rows(filepath, [row], header)
+
+    def write_rows(self, filepath: str, rows: Iterable[list[object]], header: list[str] | None = None) -> None:
+        """Queue several rows for one file (same flush rules as ``write_row``)."""
+        with self._lock:
+            fe = self._ensure_file(filepath, header)
+            fe.pending.extend(rows)
+            fe.last_access = time.time()
+            # Flush based on row threshold or time interval
+            if self.buffer_size and len(fe.pending) >= self.buffer_size:
                 self._flush_one(fe)
+            else:
+                if (time.time() - fe.last_flush) >= self.flush_interval_seconds:
+                    self._flush_one(fe)
+
+    def is_open(self, filepath: str) -> bool:
+        return filepath in self._files
 
     def flush_all(self, force: bool = True) -> None:
-        for fe in list(self._files.values()):
-            if force or fe.pending:
-                self._flush_one(fe)
+        with self._lock:
+            for fe in list(self._files.values()):
+                if force or fe.pending:
+                    self._flush_one(fe)
+            if self.fsync_interval_seconds and (time.time() - self._last_fsync) >= self.fsync_interval_seconds:
+                self._fsync_dirty()
+
+    def fsync_all(self) -> None:
+        with self._lock:
+            self._fsync_dirty()
 
     def close_all(self) -> None:
-        try:
-            self.flush_all(force=True)
-        finally:
-            for path, fe in list(self._files.items()):
-                try:
-                    fe.fh.close()
-                except Exception:
-                    pass
-                finally:
-                    self._files.pop(path, None)
+        with self._lock:
+            try:
+                self.flush_all(force=True)
+                if self.fsync_interval_seconds:
+                    self._fsync_dirty()
+            finally:
+                for path, fe in list(self._files.items()):
+                    try:
+                        fe.fh.close()
+                    except Exception:
+                        pass
+                    finally:
+                        self._files.pop(path, None)
+
+    def __len__(self) -> int:
+        return len(self._files)
 
     # ---------------- Internals ----------------
     def _ensure_file(self, filepath: str, header: list[str] | None) -> _FileEntry:
         fe = self._files.get(filepath)
         if fe is not None:
+            self._files.move_to_end(filepath)
             return fe
         # Enforce LRU constraint
         if len(self._files) >= self.max_open_files:
             self._evict_lru()
-        # Open path (append if exists, else write)
-        os.makedirs(os.path.dirname(filepath), exist_ok=True)
-        file_exists = os.path.isfile(filepath)
-        mode = "a" if file_exists else "w"
-        fh = open(filepath, mode, newline=self.newline, encoding=self.encoding)
+        d = os.path.dirname(filepath)
+        if d and d not in self._known_dirs:
+            os.makedirs(d, exist_ok=True)
+            self._known_dirs.add(d)
+        # Always append: never truncate a file another process created in the meantime
+        fh = open(filepath, "a", newline=self.newline, encoding=self.encoding)
         # Help type checker: treat file handle as TextIO for csv writer
         fh_typed: TextIO = fh  # type: ignore[assignment]
         writer = csv.writer(fh_typed)
-        fe = _FileEntry(path=filepath, fh=fh_typed, writer=writer, header_written=file_exists)
+        is_new = fh_typed.tell() == 0
+        fe = _FileEntry(path=filepath, fh=fh_typed, writer=writer, header_written=not is_new)
         self._files[filepath] = fe
+        self.stats['opens'] += 1
         # Header for new file
         if (not fe.header_written) and header:
-            writer.writerow(header)
+            with self._flocked(fe):
+                if fh_typed.tell() == 0 and os.fstat(fh_typed.fileno()).st_size == 0:
+                    writer.writerow(header)
+                    fh_typed.flush()
             fe.header_written = True
-            fh_typed.flush()
+            fe.dirty = True
+        if is_new and self.on_file_created is not None:
+            try:
+                self.on_file_created(filepath)
+            except Exception:
+                pass
         return fe
 
+    def _flocked(self, fe: _FileEntry) -> _FLock:
+        return _FLock(fe.fh if self.advisory_lock else None)
+
     def _flush_one(self, fe: _FileEntry) -> None:
         if not fe.pending:
             fe.last_flush = time.time()
             return
         try:
-            for row in fe.pending:
-                fe.writer.writerow(row)
-            fe.fh.flush()
+            with self._flocked(fe):
+                fe.writer.writerows(fe.pending)
+                fe.fh.flush()
+            self.stats['flushes'] += 1
+            self.stats['rows'] += len(fe.pending)
+            fe.dirty = True
         finally:
             fe.pending.clear()
             fe.last_flush = time.time()
 
+    def _fsync_dirty(self) -> None:
+        for fe in self._files.values():
+            if not fe.dirty:
+                continue
+            try:
+                os.fsync(fe.fh.fileno())
+                self.stats['fsyncs'] += 1
+            except Exception:
+                pass
+            fe.dirty = False
+        self._last_fsync = time.time()
+
     def _evict_lru(self) -> None:
-        # Select least recently accessed
+        # Select least recently accessed (OrderedDict front)
         if not self._files:
             return
-        oldest_path = min(self._files, key=lambda p: self._files[p].last_access)
-        fe = self._files.pop(oldest_path)
+        _oldest_path, fe = self._files.popitem(last=False)
+        self.stats['evictions'] += 1
         try:
             # Ensure pending data is written before closing
             if fe.pending:
-                for row in fe.pending:
-                    fe.writer.writerow(row)
-                fe.fh.flush()
+                self._flush_one(fe)
+            if fe.dirty and self.fsync_interval_seconds:
+                os.fsync(fe.fh.fileno())
         except Exception:
             pass
         finally:
@@ -134,3 +215,27 @@ class FileBufferManager:
                 fe.fh.close()
             except Exception:
                 pass
+
+
+class _FLock:
+    """Context manager taking an exclusive ``flock`` on an open handle (no-op when None)."""
+
+    __slots__ = ("_fh",)
+
+    def __init__(self, fh: TextIO | None) -> None:
+        self._fh = fh
+
+    def __enter__(self) -> _FLock:
+        if self._fh is not None:
+            try:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_EX)  # type: ignore[union-attr]
+            except Exception:
+                self._fh = None
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        if self._fh is not None:
+            try:
+                fcntl.flock(self._fh.fileno(), fcntl.LOCK_UN)  # type: ignore[union-attr]
+            except Exception:
+                pass
@@ -2,11 +2,18 @@
 """
 InfluxBufferManager: batches points and flushes periodically or when batch_size is hit.
 Includes retry with exponential backoff and integrates with a circuit breaker via callback.
+Batches still failing after the last retry are handed to ``on_give_up`` (e.g. a disk spool).
+
+Sending happens on the background flush thread: ``add``/``add_many`` only cut
+full batches onto a ready queue, so a slow or unreachable backend (retries,
+backoff sleeps, socket timeouts) never stalls the producer. ``flush`` and
+``stop`` send synchronously on the calling thread.
 """
 from __future__ import annotations
 
 import threading
 import time
+from collections import deque
 from collections.abc import Callable
 from typing import Any
 
@@ -22,6 +29,7 @@ class InfluxBufferManager:
         backoff_base: float = 0.25,
         on_success: Callable[[int], None] | None = None,
         on_failure: Callable[[Exception], None] | None = None,
+        on_give_up: Callable[[list[Any], Exception], None] | None = None,
     ) -> None:
         self._write_fn = write_fn
         self._batch_size = max(1, int(batch_size))
@@ -30,50 +38,77 @@ class InfluxBufferManager:
         self._max_retries = max(0, int(max_retries))
         self._backoff_base = float(backoff_base)
         self._buf: list[Any] = []
+        self._ready: deque[list[Any]] = deque()  # cut batches waiting for the flush thread
+        self._queued = 0  # points in _buf + _ready
         self._lock = threading.Lock()
+        self._cond = threading.Condition(self._lock)
+        # held while taking batches off _ready and sending them, so batches go out in order
+        self._send_lock = threading.Lock()
         self._stop = threading.Event()
         self._last_flush = time.time()
         self._thread = threading.Thread(target=self._loop, name="influx-buffer", daemon=True)
         self._on_success = on_success
         self._on_failure = on_failure
+        self._on_give_up = on_give_up
         self._thread.start()
 
     def add(self, point: Any) -> None:
-        with self._lock:
-            if len(self._buf) >= self._max_queue:
-                # drop oldest to avoid unbounded growth
-                self._buf.pop(0)
-            self._buf.append(point)
-            if len(self._buf) >= self._batch_size:
-                self._flush_locked()
+        self.add_many([point])
 
     def add_many(self, points: list[Any]) -> None:
         with self._lock:
             if len(points) >= self._max_queue:
                 points = points[-self._max_queue :]
-            # if buffer + points exceeds max, keep tail
-            new_size = len(self._buf) + len(points)
-            if new_size > self._max_queue:
-                drop = new_size - self._max_queue
-                if drop > 0:
-                    self._buf = self._buf[drop:]
+            # if queued + points exceeds max, drop oldest
+            self._drop_oldest_locked(self._queued + len(points) - self._max_queue)
             self._buf.extend(points)
-            if len(self._buf) >= self._batch_size:
-                self._flush_locked()
+            self._queued += len(points)
+            while len(self._buf) >= self._batch_size:
+                self._ready.append(self._buf[: self._batch_size])
+                self._buf = self._buf[self._batch_size :]
+                self._last_flush = time.time()
+                self._cond.notify()
 
-    def _loop(self) -> None:
-        while not self._stop.is_set():
-            time.sleep(self._flush_interval)
-            with self._lock:
-                if (time.time() - self._last_flush) >= self._flush_interval and self._buf:
-                    self._flush_locked()
+    def _drop_oldest_locked(self, n: int) -> None:
+        while n > 0 and self._ready:
+            head = self._ready[0]
+            if len(head) <= n:
+                self._ready.popleft()
+                n -= len(head)
+                self._queued -= len(head)
+            else:
+                del head[:n]
+                self._queued -= n
+                n = 0
+        if n > 0:
+            n = min(n, len(self._buf))
+            self._buf = self._buf[n:]
+            self._queued -= n
 
-    def _flush_locked(self) -> None:
-        to_send = self._buf
-        self._buf = []
+    def _cut_locked(self) -> None:
+        if self._buf:
+            self._ready.append(self._buf)
+            self._buf = []
         self._last_flush = time.time()
-        # send outside lock
-        self._send(to_send)
+
+    def _loop(self) -> None:
+        while True:
+            with self._cond:
+                while not self._ready and not self._stop.is_set():
+                    due = self._flush_interval - (time.time() - self._last_flush)
+                    if self._buf and due <= 0:
+                        self._cut_locked()
+                        break
+                    self._cond.wait(due if self._buf else self._flush_interval)
+                if not self._ready:
+                    return  # stopped; stop() flushes the remainder
+            with self._send_lock:
+                with self._lock:
+                    if not self._ready:
+                        continue  # taken by a concurrent flush()
+                    batch = self._ready.popleft()
+                    self._queued -= len(batch)
+                self._send(batch)
 
     def _send(self, points: list[Any]) -> None:
         # retry with backoff
@@ -88,16 +123,29 @@ class InfluxBufferManager:
                 if self._on_failure:
                     self._on_failure(e)
                 if attempt >= self._max_retries:
+                    if self._on_give_up:
+                        try:
+                            self._on_give_up(points, e)
+                        except Exception:
+                            pass
                     return
                 time.sleep(self._backoff_base * (2**attempt))
 
     def flush(self) -> None:
-        with self._lock:
-            if self._buf:
-                self._flush_locked()
+        """Send everything buffered so far on the calling thread."""
+        with self._send_lock:
+            with self._lock:
+                self._cut_locked()
+                batches = list(self._ready)
+                self._ready.clear()
+                self._queued = 0
+            for batch in batches:
+                self._send(batch)
 
     def stop(self) -> None:
         self._stop.set()
+        with self._cond:
+            self._cond.notify_all()
         try:
             self._thread.join(timeout=1.0)
         except Exception:
@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""
+Direct line-protocol write path for the Influx options sink.
+
+``InfluxSink.write_options_data`` historically built one ``Point`` per option
+with chained ``.tag()/.field()`` calls and let the client serialize it again;
+at full chain width the object churn dominated sink CPU. With
+``G6_INFLUX_LINE_PROTOCOL`` enabled the sink instead uses:
+
+  * ``OptionLineEncoder``  – renders line-protocol bytes straight from the
+    chain dict; the escaped measurement+tag prefix per
+    (index, expiry, strike, type[, symbol]) is computed once and cached, so a
+    steady-state cycle only formats field values and the timestamp.
+  * ``LineProtocolWriter`` – batches encoded lines through
+    ``InfluxBufferManager`` and POSTs gzip-compressed payloads to
+    ``/api/v2/write`` over keep-alive HTTP connections held in an
+    ``InfluxConnectionPool``.
+  * ``LineProtocolSpool``  – batches that still fail after the buffer
+    manager's retries are written (already gzipped) to a bounded disk spool
+    and replayed oldest-first after the next successful write.
+
+Sending runs on the buffer manager's flush thread, never on the collector
+thread that calls ``add_lines``. Client-side (4xx other than 429) rejections
+are not spooled: replaying a payload the server refused (malformed, or points
+beyond retention after a long outage) would only fail again. A spooled
+payload that later draws such a rejection during replay is dropped so it
+cannot block the newer batches queued behind it.
+"""
+from __future__ import annotations
+
+import gzip
+import http.client
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from .influx_buffer_manager import InfluxBufferManager
+from .influx_connection_pool import InfluxConnectionPool
+
+logger = logging.getLogger(__name__)
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_US = timedelta(microseconds=1)
+_TAG_ESCAPES = str.maketrans({',': r'\,', '=': r'\=', ' ': r'\ '})
+_MEASUREMENT_ESCAPES = str.maketrans({',': r'\,', ' ': r'\ '})
+_GREEKS = ('delta', 'gamma', 'theta', 'vega', 'rho')
+
+
+def escape_tag(value: Any) -> str:
+    """Escape a tag key/value (commas, equals signs and spaces)."""
+    return str(value).translate(_TAG_ESCAPES)
+
+
+def timestamp_ns(ts: datetime) -> int:
+    """Epoch nanoseconds for ``ts``; naive datetimes are taken as UTC (as ``Point`` does)."""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=UTC)
+    return ((ts - _EPOCH) // _US) * 1000
+
+
+class OptionLineEncoder:
+    """Encode option chain rows as ``option_data`` line-protocol lines.
+
+    Produces the same series as the ``Point`` path: tags index / expiry /
+    type / strike (+ symbol when enabled) and float fields price, oi, volume,
+    iv plus any greeks present. Non-finite values are skipped like the
+    client library does.
+    """
+
+    def __init__(
+        self, measurement: str = 'option_data', *, symbol_tag: bool = True, max_prefixes: int = 50_000
+    ) -> None:
+        self._measurement = measurement.translate(_MEASUREMENT_ESCAPES)
+        self._symbol_tag = symbol_tag
+        self._max_prefixes = max(1, int(max_prefixes))
+        self._prefixes: dict[tuple[str, str, Any, str, str], str] = {}
+
+    def prefix(self, index: str, expiry: str, strike: Any, opt_type: str, symbol: str = '') -> str:
+        key = (index, expiry, strike, opt_type, symbol if self._symbol_tag else '')
+        cached = self._prefixes.get(key)
+        if cached is None:
+            # tags in key order, as the client library serializes them
+            cached = (
+                f"{self._measurement},expiry={escape_tag(expiry)},index={escape_tag(index)}"
+                f",strike={escape_tag(strike)}"
+            )
+            if self._symbol_tag and symbol:
+                cached += f",symbol={escape_tag(symbol)}"
+            if opt_type:
+                cached += f",type={escape_tag(opt_type)}"
+            if len(self._prefixes) >= self._max_prefixes:
+                self._prefixes.clear()
+            self._prefixes[key] = cached
+        return cached
+
+    def cache_size(self) -> int:
+        return len(self._prefixes)
+
+    def encode(
+        self, index: str, expiry: str, options_data: dict[str, dict[str, Any]], timestamp: datetime
+    ) -> list[bytes]:
+        ts = timestamp_ns(timestamp)
+        isfinite = math.isfinite
+        lines: list[bytes] = []
+        for symbol, data in options_data.items():
+            fields = []
+            for name, value in (
+                ('price', data.get('last_price', 0)),
+                ('oi', data.get('oi', 0)),
+                ('volume', data.get('volume', 0)),
+                ('iv', data.get('iv', 0)),
+            ):
+                v = float(value or 0)
+                if isfinite(v):
+                    fields.append(f"{name}={v!r}")
+            for name in _GREEKS:
+                value = data.get(name)
+                if value is not None:
+                    v = float(value)
+                    if isfinite(v):
+                        fields.append(f"{name}={v!r}")
+            if not fields:
+                continue
+            opt_type = data.get('type', data.get('instrument_type', ''))
+            prefix = self.prefix(index, expiry, data.get('strike', 0), opt_type, symbol)
+            lines.append(f"{prefix} {','.join(fields)} {ts}".encode())
+        return lines
+
+
+class InfluxWriteError(Exception):
+    """Non-2xx response from the Influx write endpoint."""
+
+    def __init__(self, status: int, body: str) -> None:
+        super().__init__(f"influx write failed status={status} body={body}")
+        self.status = status
+        # Throttling / server errors may succeed later; other 4xx never will.
+        self.retriable = status == 429 or status >= 500
+
+
+class LineProtocolSpool:
+    """Bounded on-disk FIFO of gzipped line-protocol payloads."""
+
+    SUFFIX = '.lp.gz'
+
+    def __init__(self, directory: str, max_bytes: int = 256 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_bytes = max(0, int(max_bytes))
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def pending(self) -> list[str]:
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.endswith(self.SUFFIX))
+        except FileNotFoundError:
+            return []
+        return [os.path.join(self.directory, n) for n in names]
+
+    def size_bytes(self) -> int:
+        total = 0
+        for path in self.pending():
+            try:
+                total += os.path.getsize(path)
+            except OSError:
+                pass
+        return total
+
+    def put(self, payload: bytes) -> str:
+        """Atomically persist one payload; evicts the oldest files past ``max_bytes``."""
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            self._seq += 1
+            name = f"{time.time_ns():020d}-{os.getpid()}-{self._seq:06d}{self.SUFFIX}"
+            path = os.path.join(self.directory, name)
+            tmp = path + '.tmp'
+            with open(tmp, 'wb') as fh:
+                fh.write(payload)
+            os.replace(tmp, path)
+            if self.max_bytes:
+                files = self.pending()
+                sizes = [os.path.getsize(p) for p in files]
+                total = sum(sizes)
+                for p, sz in zip(files, sizes, strict=False):
+                    if total <= self.max_bytes or p == path:
+                        break
+                    logger.warning("influx spool over %s bytes; dropping %s", self.max_bytes, os.path.basename(p))
+                    os.remove(p)
+                    total -= sz
+            return path
+
+    def replay(self, send: Callable[[bytes], None], limit: int | None = None) -> int:
+        """Send spooled payloads oldest-first, deleting each once sent or permanently rejected.
+
+        Stops at the first retriable failure (the payload stays spooled);
+        returns the number of payloads sent.
+        """
+        sent = 0
+        with self._lock:
+            for path in self.pending():
+                if limit is not None and sent >= limit:
+                    break
+                with open(path, 'rb') as fh:
+                    payload = fh.read()
+                try:
+                    send(payload)
+                except InfluxWriteError as e:
+                    if e.retriable:
+                        raise
+                    logger.error("influx spool: dropping %s rejected on replay: %s", os.path.basename(path), e)
+                    os.remove(path)
+                    continue
+                os.remove(path)
+                sent += 1
+        return sent
+
+
+class LineProtocolWriter:
+    """Batch, gzip and POST line-protocol lines; spool batches that keep failing."""
+
+    def __init__(
+        self,
+        url: str,
+        token: str,
+        org: str,
+        bucket: str,
+        *,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+        max_queue_size: int = 10_000,
+        max_retries: int = 3,
+        backoff_base: float = 0.25,
+        pool_min_size: int = 0,
+        pool_max_size: int = 2,
+        spool_dir: str | None = None,
+        spool_max_bytes: int = 256 * 1024 * 1024,
+        replay_per_write: int = 8,
+        compresslevel: int = 5,
+        timeout: float = 10.0,
+        on_success: Callable[[int], None] | None = None,
+        on_failure: Callable[[Exception], None] | None = None,
+        metrics_fn: Callable[[], Any] | None = None,
+    ) -> None:
+        parts = urlsplit(url)
+        host = parts.hostname or 'localhost'
+        secure = parts.scheme == 'https'
+        port = parts.port or (443 if secure else 80)
+        conn_cls = http.client.HTTPSConnection if secure else http.client.HTTPConnection
+        query = urlencode({'org': org, 'bucket': bucket, 'precision': 'ns'})
+        self._path = parts.path.rstrip('/') + '/api/v2/write?' + query
+        self._headers = {
+            'Content-Type': 'text/plain; charset=utf-8',
+            'Content-Encoding': 'gzip',
+            'Accept': 'application/json',
+        }
+        if token:
+            self._headers['Authorization'] = f'Token {token}'
+        self._compresslevel = compresslevel
+        self._replay_per_write = max(0, int(replay_per_write))
+        self._on_success = on_success
+        self._metrics_fn = metrics_fn
+        self._pool = InfluxConnectionPool(
+            factory=lambda: conn_cls(host, port, timeout=timeout),
+            min_size=pool_min_size,
+            max_size=pool_max_size,
+        )
+        self.spool = LineProtocolSpool(spool_dir, spool_max_bytes) if spool_dir else None
+        self._buffer = InfluxBufferManager(
+            write_fn=self._write_batch,
+            batch_size=batch_size,
+            flush_interval=flush_interval,
+            max_queue_size=max_queue_size,
+            max_retries=max_retries,
+            backoff_base=backoff_base,
+            on_success=self._batch_written,
+            on_failure=on_failure,
+            on_give_up=self._spool_batch,
+        )
+
+    def add_lines(self, lines: list[bytes]) -> None:
+        if lines:
+            self._buffer.add_many(lines)
+
+    def flush(self) -> None:
+        self._buffer.flush()
+
+    def close(self) -> None:
+        self._buffer.stop()
+        self._pool.close_all()
+
+    def post(self, payload: bytes) -> None:
+        """POST one gzipped payload on a pooled connection; raises on non-2xx."""
+        conn: Any = self._pool.acquire(timeout=30.0)
+        try:
+            conn.request('POST', self._path, body=payload, headers=self._headers)
+            resp = conn.getresponse()
+            body = resp.read()
+            if resp.status >= 300:
+                raise InfluxWriteError(resp.status, body[:200].decode('utf-8', 'replace'))
+        except InfluxWriteError:
+            raise
+        except Exception:
+            # drop the half-used socket; http.client reconnects on next request
+            conn.close()
+            raise
+        finally:
+            self._pool.release(conn)
+
+    def _compress(self, lines: list[bytes]) -> bytes:
+        return gzip.compress(b'\n'.join(lines), compresslevel=self._compresslevel)
+
+    def _write_batch(self, lines: list[bytes]) -> None:
+        self.post(self._compress(lines))
+
+    def _batch_written(self, n: int) -> None:
+        if self._on_success:
+            self._on_success(n)
+        spool = self.spool
+        if spool is None or not self._replay_per_write:
+            return
+        try:
+            replayed = spool.replay(self.post, limit=self._replay_per_write)
+            if replayed:
+                logger.info("influx spool: replayed %s batch(es)", replayed)
+        except Exception as e:  # stays spooled for the next successful write
+            logger.debug("influx spool replay deferred: %s", e)
+        self._publish_spool()
+
+    def _spool_batch(self, lines: list[bytes], exc: Exception) -> None:
+        if self.spool is None or (isinstance(exc, InfluxWriteError) and not exc.retriable):
+            logger.error("influx line-protocol batch dropped (%s lines): %s", len(lines), exc)
+            return
+        self.spool.put(self._compress(lines))
+        logger.warning("influx line-protocol batch spooled (%s lines) after retries: %s", len(lines), exc)
+        metrics = self._metrics_fn() if self._metrics_fn else None
+        try:
+            if metrics is not None and hasattr(metrics, 'influxdb_spooled_batches_total'):
+                metrics.influxdb_spooled_batches_total.inc()
+        except Exception:
+            pass
+        self._publish_spool()
+
+    def _publish_spool(self) -> None:
+        metrics = self._metrics_fn() if self._metrics_fn else None
+        if metrics is None or self.spool is None or not hasattr(metrics, 'influxdb_spool_bytes'):
+            return
+        try:
+            metrics.influxdb_spool_bytes.set(self.spool.size_bytes())
+        except Exception:
+            pass
+
+
+__all__ = [
+    "InfluxWriteError",
+    "LineProtocolSpool",
+    "LineProtocolWriter",
+    "OptionLineEncoder",
+    "escape_tag",
+    "timestamp_ns",
+]
@@ -9,7 +9,7 @@ Refactored to use:
 """
 
 import logging
-import os  # noqa: F401
+import os
 
 # Add this before launching the subprocess
 import sys  # noqa: F401
@@ -27,6 +27,7 @@ from ..utils.circuit_registry import circuit_protected  # optional adaptive CB f
 from .influx_buffer_manager import InfluxBufferManager
 from .influx_circuit_breaker import InfluxCircuitBreaker
 from .influx_connection_pool import InfluxConnectionPool
+from .influx_line_protocol import LineProtocolWriter, OptionLineEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -102,11 +103,44 @@ class InfluxSink:
         self._buffer = None  # type: Optional[InfluxBufferManager]
         self._breaker = InfluxCircuitBreaker(failure_threshold=breaker_fail_threshold, reset_timeout=breaker_reset_timeout)
         self._pool = None  # type: Optional[InfluxConnectionPool]
+        self._lp = None  # type: Optional[LineProtocolWriter]
+        self._lp_encoder = None  # type: Optional[OptionLineEncoder]
         try:
             self._health_enabled = _env_bool('G6_HEALTH_COMPONENTS', False)
         except Exception:
             self._health_enabled = False
 
+        # Direct line-protocol path for option rows (no Point objects, gzip HTTP, disk spool)
+        if _env_bool('G6_INFLUX_LINE_PROTOCOL', False):
+            try:
+                self._lp = LineProtocolWriter(
+                    url, token, org, bucket,
+                    batch_size=_env_int('G6_INFLUX_BATCH_SIZE', batch_size or 500),
+                    flush_interval=_env_float('G6_INFLUX_FLUSH_INTERVAL', float(flush_interval) if flush_interval is not None else 1.0),
+                    max_queue_size=_env_int('G6_INFLUX_MAX_QUEUE_SIZE', max_queue_size or 10000),
+                    max_retries=self.max_retries,
+                    backoff_base=self.backoff_base,
+                    pool_min_size=0,
+                    pool_max_size=_env_int('G6_INFLUX_POOL_MAX_SIZE', pool_max_size),
+                    spool_dir=os.environ.get('G6_INFLUX_SPOOL_DIR') or os.path.join('data', 'influx_spool'),
+                    spool_max_bytes=_env_int('G6_INFLUX_SPOOL_MAX_MB', 256) * 1024 * 1024,
+                    on_success=self._on_write_success,
+                    on_failure=self._on_write_failure,
+                    metrics_fn=lambda: self.metrics,
+                )
+                self._lp_encoder = OptionLineEncoder(symbol_tag=enable_symbol_tag)
+            except Exception as e:
+                self._lp = None
+                get_error_handler().handle_error(
+                    e,
+                    category=ErrorCategory.CONFIGURATION,
+                    severity=ErrorSeverity.MEDIUM,
+                    component="storage.influx_sink",
+                    function_name="__init__",
+                    message="Line-protocol writer init failed; using Point path",
+                    should_log=False,
+                )
+
         try:
             from influxdb_client.client.influxdb_client import InfluxDBClient
             # Initialize base client (will also seed pool)
@@ -133,31 +167,6 @@ class InfluxSink:
                 # points may be Point or str; delegate directly
                 self.write_api.write(bucket=self.bucket, record=points)
 
-            def _on_success(n: int) -> None:
-                try:
-                    self._breaker.record_success()
-                    if self.metrics:
-                        self.metrics.influxdb_points_written.inc(n)
-                        self.metrics.influxdb_write_success_rate.set(100.0)
-                        self.metrics.influxdb_connection_status.set(1)
-                    if self._health_enabled:
-                        health_runtime.set_component('influx_sink', HealthLevel.HEALTHY, HealthState.HEALTHY)
-                except Exception:
-                    pass
-
-            def _on_failure(e: Exception) -> None:
-                try:
-                    self._breaker.record_failure()
-                    if self.metrics:
-                        self.metrics.influxdb_write_success_rate.set(0.0)
-                        self.metrics.influxdb_connection_status.set(0)
-                    if self._health_enabled:
-                        state = HealthState.CRITICAL if self._breaker.state == "OPEN" else HealthState.WARNING
-                        level = HealthLevel.CRITICAL if self._breaker.state == "OPEN" else HealthLevel.WARNING
-                        health_runtime.set_component('influx_sink', level, state)
-                except Exception:
-                    pass
-
             self._buffer = InfluxBufferManager(
                 write_fn=_write_points,
                 batch_size=eff_batch,
@@ -165,8 +174,8 @@ class InfluxSink:
                 max_queue_size=eff_queue,
                 max_retries=self.max_retries,
                 backoff_base=self.backoff_base,
-                on_success=_on_success,
-                on_failure=_on_failure,
+                on_success=self._on_write_success,
+                on_failure=self._on_write_failure,
             )
             logger.info(f"InfluxDB sink initialized with bucket: {bucket}")
         except ImportError as e:
@@ -214,6 +223,19 @@ class InfluxSink:
 
     def close(self) -> None:
         """Close InfluxDB client."""
+        try:
+            if getattr(self, '_lp', None) is not None:
+                self._lp.close()
+        except Exception as e:
+            get_error_handler().handle_error(
+                e,
+                category=ErrorCategory.RESOURCE,
+                severity=ErrorSeverity.LOW,
+                component="storage.influx_sink",
+                function_name="close",
+                message="Line-protocol writer stop failed",
+                should_log=False,
+            )
         try:
             if self._buffer:
                 self._buffer.stop()
@@ -258,6 +280,8 @@ class InfluxSink:
 
     def flush(self) -> None:
         try:
+            if getattr(self, '_lp', None) is not None:
+                self._lp.flush()
             if self._buffer:
                 self._buffer.flush()
         except Exception as e:
@@ -274,6 +298,71 @@ class InfluxSink:
     def attach_metrics(self, metrics_registry: Any) -> None:
         self.metrics = metrics_registry
 
+    def _on_write_success(self, n: int) -> None:
+        try:
+            self._breaker.record_success()
+            if self.metrics:
+                self.metrics.influxdb_points_written.inc(n)
+                self.metrics.influxdb_write_success_rate.set(100.0)
+                self.metrics.influxdb_connection_status.set(1)
+            if self._health_enabled:
+                health_runtime.set_component('influx_sink', HealthLevel.HEALTHY, HealthState.HEALTHY)
+        except Exception:
+            pass
+
+    def _on_write_failure(self, e: Exception) -> None:
+        try:
+            self._breaker.record_failure()
+            if self.metrics:
+                self.metrics.influxdb_write_success_rate.set(0.0)
+                self.metrics.influxdb_connection_status.set(0)
+            if self._health_enabled:
+                state = HealthState.CRITICAL if self._breaker.state == "OPEN" else HealthState.WARNING
+                level = HealthLevel.CRITICAL if self._breaker.state == "OPEN" else HealthLevel.WARNING
+                health_runtime.set_component('influx_sink', level, state)
+        except Exception:
+            pass
+
+    def _validate_rows(self, index_symbol: str, expiry_date: Any, options_data: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+        """Run registered row validators (mirrors csv_sink: drop invalid rows, clamp negatives).
+
+        Rows are copied because validators may mutate them in place.
+        """
+        # local import to avoid hard dependency if validation package absent
+        try:
+            from src import validation as _validation
+            run_validators = getattr(_validation, 'run_validators', None)
+        except Exception:
+            run_validators = None
+        if not options_data or not callable(run_validators):
+            return options_data
+        raw_rows = []
+        for sym, data in list(options_data.items()):
+            if isinstance(data, dict):
+                r = dict(data)
+                r['__symbol'] = sym
+                raw_rows.append(r)
+        ctx = {'index': index_symbol, 'expiry': expiry_date, 'stage': 'influx-pre-write'}
+        try:
+            rv: Any = run_validators(ctx, raw_rows)
+            cleaned: Any
+            reports: Any
+            if isinstance(rv, tuple) and len(rv) >= 2:
+                cleaned, reports = rv[0], rv[1]
+            else:
+                cleaned, reports = rv, []
+            rebuilt = {}
+            for r in cleaned:
+                sym = r.pop('__symbol', None)
+                if sym:
+                    rebuilt[sym] = r
+            if reports:
+                logger.debug('influx_validation_reports', extra={'count': len(reports), 'index': index_symbol})
+            return rebuilt
+        except Exception:  # pragma: no cover
+            logger.debug('influx_validation_failed', exc_info=True)
+            return options_data
+
     def write_options_data(self, index_symbol: str, expiry_date: Any, options_data: dict[str, dict[str, Any]], timestamp: datetime | None = None) -> None:
         """
         Write options data to InfluxDB.
@@ -284,7 +373,7 @@ class InfluxSink:
             options_data: Dictionary of options data
             timestamp: Timestamp for the data (default: current time)
         """
-        if not self.client or not self.write_api:
+        if getattr(self, '_lp', None) is None and (not self.client or not self.write_api):
             return
 
         # Use current time if timestamp not provided
@@ -302,45 +391,21 @@ class InfluxSink:
             expiry_str = str(expiry_date)
 
         try:
-            # Validation integration: mirror csv_sink behavior (drop invalid rows, clamp negatives, etc.)
-            # local import to avoid hard dependency if validation package absent
-            try:
-                from src import validation as _validation
-                run_validators = getattr(_validation, 'run_validators', None)
-            except Exception:
-                run_validators = None
-            if options_data and callable(run_validators):
-                raw_rows = []
-                for sym, data in list(options_data.items()):
-                    if isinstance(data, dict):
-                        r = dict(data)
-                        r['__symbol'] = sym
-                        raw_rows.append(r)
-                ctx = {'index': index_symbol, 'expiry': expiry_date, 'stage': 'influx-pre-write'}
-                try:
-                    rv: Any = run_validators(ctx, raw_rows)
-                    cleaned: Any
-                    reports: Any
-                    if isinstance(rv, tuple) and len(rv) >= 2:
-                        cleaned, reports = rv[0], rv[1]
-                    else:
-                        cleaned, reports = rv, []
-                    rebuilt = {}
-                    for r in cleaned:
-                        sym = r.pop('__symbol', None)
-                        if sym:
-                            rebuilt[sym] = r
-                    options_data = rebuilt
-                    if reports:
-                        logger.debug('influx_validation_reports', extra={'count': len(reports), 'index': index_symbol})
-                except Exception:  # pragma: no cover
-                    logger.debug('influx_validation_failed', exc_info=True)
+            options_data = self._validate_rows(index_symbol, expiry_date, options_data)
 
             # Check if we still have data after validation
             if not options_data:
                 logger.warning(f"No options data to write for {index_symbol} {expiry_date}")
                 return
 
+            lp = getattr(self, '_lp', None)
+            if lp is not None and self._lp_encoder is not None:
+                if getattr(self, "_breaker", None) is None or self._breaker.allow():
+                    lp.add_lines(self._lp_encoder.encode(index_symbol, expiry_str, options_data, timestamp))
+                else:
+                    logger.debug("Influx breaker OPEN/HALF_OPEN: drop enqueue")
+                return
+
             # Import Point from canonical path; fall back to tiny stand-in in test contexts
             try:
                 from influxdb_client.client.write.point import Point as _Point
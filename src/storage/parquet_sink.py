@@ -0,0 +1,299 @@
+"""Columnar Parquet sink for option-chain rows (alongside CSV / Influx).
+
+The CSV tree stores one small file per (index, expiry, offset, day); analysing a
+day means opening hundreds of them. This sink stores the *same* per-offset rows
+CsvSink produces (identical column names) in one Parquet dataset per
+(index, day)::
+
+    <base_dir>/<INDEX>/<YYYY-MM-DD>/part-00000.parquet
+                                    part-00001.parquet ...
+
+Each collection cycle (all expiries of one index sharing a timestamp) becomes
+one row group. Tag columns (timestamp, index, expiry_tag, expiry_date) are
+dictionary encoded; numeric columns are typed float64 / int64 / int32 and keep
+nulls where the CSV cell is empty (a missing greek is null, not 0).
+
+Parquet footers are written on close, so an open file is unreadable. Parts are
+written as ``*.parquet.inprogress`` and renamed when they reach
+``roll_row_groups`` row groups (or on day change / close), so readers only ever
+see complete files; crash loss is bounded to the open part. A part left
+``.inprogress`` by a crash has no footer and cannot be recovered: a new sink
+deletes such orphans under its ``base_dir`` (one writer process per base_dir).
+
+Readers:
+    read_columns(base_dir, index, day, columns=[...])  -> pyarrow.Table (projection)
+    iter_rows(base_dir, index, day, columns=[...])     -> dict rows (CSV-compatible keys)
+
+Consumers: ``scripts/weekday_overlay.py --source parquet`` and
+``scripts/overlay_replay.py --live-source parquet``. The dashboard's
+``/api/live_csv`` stays on the CSV tree: it tails the current day, which only
+becomes visible here as parts are finalized.
+
+pyarrow is optional; ``AVAILABLE`` is False when it is missing and
+``ParquetSink`` refuses to construct (callers gate on it).
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from collections.abc import Iterator, Sequence
+from typing import Any
+
+try:
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+    AVAILABLE = True
+except Exception:  # pragma: no cover - optional dependency
+    pa = None  # type: ignore[assignment]
+    pq = None  # type: ignore[assignment]
+    AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "AVAILABLE",
+    "ParquetSink",
+    "read_columns",
+    "iter_rows",
+    "list_parts",
+    "discard_orphaned_parts",
+    "OPTION_ROW_COLUMNS",
+]
+
+# Column order matches CsvSink._prepare_option_row header
+OPTION_ROW_COLUMNS: tuple[str, ...] = (
+    'timestamp', 'index', 'expiry_tag', 'expiry_date', 'offset', 'index_price', 'atm', 'strike',
+    'ce', 'pe', 'tp', 'avg_ce', 'avg_pe', 'avg_tp',
+    'ce_vol', 'pe_vol', 'ce_oi', 'pe_oi',
+    'ce_iv', 'pe_iv', 'ce_delta', 'pe_delta', 'ce_theta', 'pe_theta',
+    'ce_vega', 'pe_vega', 'ce_gamma', 'pe_gamma', 'ce_rho', 'pe_rho',
+    'tp_net_change', 'tp_day_change',
+)
+_TAG_COLUMNS = frozenset({'timestamp', 'index', 'expiry_tag', 'expiry_date'})
+_INT64_COLUMNS = frozenset({'ce_vol', 'pe_vol', 'ce_oi', 'pe_oi'})
+_INT32_COLUMNS = frozenset({'offset'})
+_PART_SUFFIX = '.parquet'
+_INPROGRESS_SUFFIX = '.parquet.inprogress'
+
+
+def _schema() -> Any:
+    fields = []
+    for name in OPTION_ROW_COLUMNS:
+        if name in _TAG_COLUMNS:
+            t = pa.dictionary(pa.int32(), pa.string())
+        elif name in _INT64_COLUMNS:
+            t = pa.int64()
+        elif name in _INT32_COLUMNS:
+            t = pa.int32()
+        else:
+            t = pa.float64()
+        fields.append(pa.field(name, t))
+    return pa.schema(fields)
+
+
+def _coerce(name: str, v: Any) -> Any:
+    if name in _TAG_COLUMNS:
+        return '' if v is None else str(v)
+    if v is None or v == '':
+        return None
+    try:
+        if name in _INT64_COLUMNS or name in _INT32_COLUMNS:
+            return int(v)
+        return float(v)
+    except (TypeError, ValueError):
+        return None
+
+
+class _DayWriter:
+    __slots__ = ("dir", "seq", "writer", "path", "row_groups")
+
+    def __init__(self, day_dir: str, seq: int) -> None:
+        self.dir = day_dir
+        self.seq = seq
+        self.writer: Any = None
+        self.path: str | None = None
+        self.row_groups = 0
+
+
+class ParquetSink:
+    """Buffers CsvSink option rows per index and writes one row group per cycle."""
+
+    def __init__(self, base_dir: str = "data/g6_parquet", roll_row_groups: int = 15, compression: str = "zstd") -> None:
+        if not AVAILABLE:
+            raise RuntimeError("pyarrow not installed; ParquetSink unavailable")
+        self.base_dir = os.path.abspath(base_dir)
+        self.roll_row_groups = max(1, int(roll_row_groups))
+        self.compression = compression
+        self.schema = _schema()
+        self._lock = threading.RLock()
+        # index -> (cycle timestamp, day, column buffers)
+        self._pending: dict[str, tuple[str, str, dict[str, list[Any]]]] = {}
+        self._writers: dict[tuple[str, str], _DayWriter] = {}
+        self.rows_written = 0
+        self.row_groups_written = 0
+        self.orphans_discarded = discard_orphaned_parts(self.base_dir)
+
+    # ---------------- Write API ----------------
+    def add_row(self, header: Sequence[str], row: Sequence[Any], trade_date: str) -> None:
+        """Queue one CSV-shaped option row. A new timestamp for the same index closes the previous cycle's row group."""
+        rec = dict(zip(header, row, strict=True))
+        index = str(rec.get('index') or '')
+        ts = str(rec.get('timestamp') or '')
+        with self._lock:
+            pend = self._pending.get(index)
+            if pend is not None and (pend[0] != ts or pend[1] != trade_date):
+                self._flush_index(index)
+                pend = None
+            if pend is None:
+                pend = (ts, trade_date, {c: [] for c in OPTION_ROW_COLUMNS})
+                self._pending[index] = pend
+            cols = pend[2]
+            for c in OPTION_ROW_COLUMNS:
+                cols[c].append(_coerce(c, rec.get(c)))
+
+    def flush(self) -> None:
+        """Write all pending cycles as row groups (files stay open for further row groups)."""
+        with self._lock:
+            for index in list(self._pending):
+                self._flush_index(index)
+
+    def close(self) -> None:
+        """Flush pending rows and finalize every open part (safe to call repeatedly)."""
+        with self._lock:
+            try:
+                self.flush()
+            finally:
+                for key in list(self._writers):
+                    self._finalize(self._writers.pop(key))
+
+    # ---------------- Internals ----------------
+    def _flush_index(self, index: str) -> None:
+        pend = self._pending.pop(index, None)
+        if pend is None:
+            return
+        _ts, day, cols = pend
+        if not cols['timestamp']:
+            return
+        arrays = []
+        for c in OPTION_ROW_COLUMNS:
+            if c in _TAG_COLUMNS:
+                arrays.append(pa.array(cols[c], type=pa.string()).dictionary_encode())
+            else:
+                arrays.append(pa.array(cols[c], type=self.schema.field(c).type))
+        table = pa.Table.from_arrays(arrays, schema=self.schema)
+        dw = self._writer_for(index, day)
+        dw.writer.write_table(table, row_group_size=max(1, table.num_rows))
+        dw.row_groups += 1
+        self.rows_written += table.num_rows
+        self.row_groups_written += 1
+        if dw.row_groups >= self.roll_row_groups:
+            self._finalize(self._writers.pop((index, day)))
+
+    def _writer_for(self, index: str, day: str) -> _DayWriter:
+        key = (index, day)
+        dw = self._writers.get(key)
+        if dw is None:
+            # Day changed for this index: finalize the previous day's part
+            for k in [k for k in self._writers if k[0] == index]:
+                self._finalize(self._writers.pop(k))
+            day_dir = os.path.join(self.base_dir, index, day)
+            os.makedirs(day_dir, exist_ok=True)
+            dw = _DayWriter(day_dir, _next_seq(day_dir))
+            self._writers[key] = dw
+        if dw.writer is None:
+            dw.path = os.path.join(dw.dir, f"part-{dw.seq:05d}{_INPROGRESS_SUFFIX}")
+            dw.writer = pq.ParquetWriter(dw.path, self.schema, compression=self.compression, use_dictionary=sorted(_TAG_COLUMNS))
+            dw.row_groups = 0
+        return dw
+
+    def _finalize(self, dw: _DayWriter) -> None:
+        if dw.writer is None:
+            return
+        try:
+            dw.writer.close()
+            if dw.path:
+                os.replace(dw.path, dw.path[:-len(_INPROGRESS_SUFFIX)] + _PART_SUFFIX)
+        except Exception:
+            logger.warning("parquet_part_finalize_failed path=%s", dw.path, exc_info=True)
+        finally:
+            dw.writer = None
+            dw.path = None
+            dw.seq += 1
+
+
+def discard_orphaned_parts(base_dir: str) -> int:
+    """Delete ``*.parquet.inprogress`` parts left by a crashed writer; returns how many were removed."""
+    removed = 0
+    try:
+        indices = os.listdir(base_dir)
+    except FileNotFoundError:
+        return 0
+    for index in indices:
+        index_dir = os.path.join(base_dir, index)
+        try:
+            days = os.listdir(index_dir)
+        except (NotADirectoryError, FileNotFoundError):
+            continue
+        for day in days:
+            day_dir = os.path.join(index_dir, day)
+            try:
+                names = [fn for fn in os.listdir(day_dir) if fn.endswith(_INPROGRESS_SUFFIX)]
+            except (NotADirectoryError, FileNotFoundError):
+                continue
+            for fn in names:
+                path = os.path.join(day_dir, fn)
+                try:
+                    size = os.path.getsize(path)
+                    os.remove(path)
+                except OSError:
+                    continue
+                removed += 1
+                logger.warning("parquet_orphan_part_discarded path=%s bytes=%d (no footer; unrecoverable)", path, size)
+    return removed
+
+
+def _next_seq(day_dir: str) -> int:
+    seq = -1
+    try:
+        for fn in os.listdir(day_dir):
+            if fn.startswith('part-') and (fn.endswith(_PART_SUFFIX) or fn.endswith(_INPROGRESS_SUFFIX)):
+                try:
+                    seq = max(seq, int(fn[5:10]))
+                except ValueError:
+                    continue
+    except FileNotFoundError:
+        pass
+    return seq + 1
+
+
+# ---------------- Read API ----------------
+def list_parts(base_dir: str, index: str, day: str) -> list[str]:
+    """Completed part files for (index, day) in write order."""
+    day_dir = os.path.join(base_dir, index, day)
+    try:
+        names = sorted(fn for fn in os.listdir(day_dir) if fn.startswith('part-') and fn.endswith(_PART_SUFFIX))
+    except FileNotFoundError:
+        return []
+    return [os.path.join(day_dir, fn) for fn in names]
+
+
+def read_columns(base_dir: str, index: str, day: str, columns: Sequence[str] | None = None) -> Any:
+    """Read a column projection of one (index, day) dataset as a pyarrow Table (None if absent)."""
+    if not AVAILABLE:
+        raise RuntimeError("pyarrow not installed")
+    parts = list_parts(base_dir, index, day)
+    if not parts:
+        return None
+    cols = list(columns) if columns else None
+    tables = [pq.read_table(p, columns=cols) for p in parts]
+    return pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+
+
+def iter_rows(base_dir: str, index: str, day: str, columns: Sequence[str] | None = None) -> Iterator[dict[str, Any]]:
+    """Yield CSV-compatible dict rows (projection only) for (index, day)."""
+    table = read_columns(base_dir, index, day, columns)
+    if table is None:
+        return
+    for batch in table.to_batches():
+        yield from batch.to_pylist()
@@ -0,0 +1,412 @@
+"""Asynchronous persistence queue (bounded backlog + dedicated writer thread).
+
+With ``G6_ASYNC_PERSIST=1`` the collectors hand CSV / Influx writes to a
+process-wide ``PersistQueue`` instead of performing them inline, so a slow
+disk or an Influx hiccup no longer extends cycle latency: a cycle can finish
+as soon as its writes are enqueued.
+
+One writer thread executes jobs in submission order, so sinks (which keep
+per-index state and are not thread safe) still see a single writer. When the
+backlog reaches ``max_backlog`` the configured backpressure policy applies:
+
+  * ``block``       – the submitting thread waits for space (default)
+  * ``drop_oldest`` – the oldest queued job is discarded and counted
+  * ``spill``       – jobs are pickled to ``<spill_dir>/persist_spill_<pid>.pkl``
+                      and replayed in order once the in-memory backlog drains
+
+Spilled jobs are replayed by ``kind`` through handlers registered with
+``register`` (the in-memory queue keeps the callable itself). Spilling is an
+overflow mechanism only, not crash durability; the spill file is removed once
+replayed.
+
+``drain`` waits for the backlog (including spilled jobs) to empty;
+``close`` drains with a timeout and stops the thread and is registered with
+``atexit`` for the process queue. A job fails when its handler raises or
+returns a result whose ``failed`` attribute is true (``PersistResult``).
+Backlog depth, persist lag (enqueue to write completion of the latest job)
+and failures are exported when the registry has ``persist_queue_depth`` /
+``persist_lag_seconds`` / ``persist_queue_failed_total``.
+
+Handlers run on the writer thread while the collector may still be using its
+chain, so submitters pass ``copy_rows(...)`` of the option rows (sinks
+annotate and prune rows in place).
+
+Environment:
+  G6_ASYNC_PERSIST           enable queued persistence (collectors fall back to inline writes when off)
+  G6_PERSIST_QUEUE_MAX       in-memory backlog bound (default 256 jobs)
+  G6_PERSIST_BACKPRESSURE    block | drop_oldest | spill (default block)
+  G6_PERSIST_SPILL_DIR       spill directory for the ``spill`` policy (default data/persist_spill)
+  G6_PERSIST_DRAIN_TIMEOUT   seconds to wait for the backlog on shutdown (default 10)
+"""
+from __future__ import annotations
+
+import atexit
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+from src.utils.env_flags import is_truthy_env
+
+logger = logging.getLogger(__name__)
+
+POLICIES = ('block', 'drop_oldest', 'spill')
+
+__all__ = [
+    "POLICIES",
+    "PersistQueue",
+    "copy_rows",
+    "get_persist_queue",
+    "persist_async",
+    "provisional_metrics_payload",
+    "shutdown_persist_queue",
+]
+
+
+def _env_number(name: str, default: float) -> float:
+    try:
+        return float((os.environ.get(name) or str(default)).split('#', 1)[0].strip())
+    except ValueError:
+        return default
+
+
+class PersistQueue:
+    """Bounded FIFO of persistence jobs executed by one writer thread."""
+
+    def __init__(
+        self,
+        *,
+        max_backlog: int = 256,
+        policy: str = 'block',
+        spill_dir: str | None = None,
+        metrics: Any | None = None,
+    ) -> None:
+        if policy not in POLICIES:
+            raise ValueError(f"unknown persist backpressure policy {policy!r} (expected one of {POLICIES})")
+        if policy == 'spill' and not spill_dir:
+            raise ValueError("spill policy requires spill_dir")
+        self.max_backlog = max(1, int(max_backlog))
+        self.policy = policy
+        self.spill_path = os.path.join(spill_dir, f"persist_spill_{os.getpid()}.pkl") if spill_dir else None
+        self.metrics = metrics
+        self._jobs: deque[tuple[str, Callable[..., Any], tuple[Any, ...], float]] = deque()
+        self._handlers: dict[str, Callable[..., Any]] = {}
+        self._cond = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._closed = False
+        self._active = False
+        self._spilled_pending = 0
+        self._replay_left = 0
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self.dropped = 0
+        self.spilled = 0
+        self.last_lag = 0.0
+
+    # ---------------- Producer side ----------------
+    def register(self, kind: str, handler: Callable[..., Any]) -> None:
+        """Handler used to replay spilled jobs of ``kind`` (last registration wins)."""
+        self._handlers[kind] = handler
+
+    def submit(self, kind: str, handler: Callable[..., Any], *args: Any) -> bool:
+        """Queue ``handler(*args)``; returns False when the queue is closed (caller writes inline)."""
+        self.register(kind, handler)
+        job = (kind, handler, args, time.time())
+        with self._cond:
+            if self._closed:
+                return False
+            self._ensure_thread()
+            # Once anything is spilled, newer jobs follow it to disk to keep write order
+            if len(self._jobs) >= self.max_backlog or self._spilled_pending:
+                if self.policy == 'block':
+                    while len(self._jobs) >= self.max_backlog and not self._closed:
+                        self._cond.wait()
+                    if self._closed:
+                        return False
+                elif self.policy == 'drop_oldest':
+                    if self._jobs:
+                        old = self._jobs.popleft()
+                        self.dropped += 1
+                        self._metric_inc('persist_queue_dropped_total')
+                        logger.warning("persist queue full; dropped oldest %s job (age %.2fs)", old[0], time.time() - old[3])
+                elif self._spill(job):
+                    self.submitted += 1
+                    self._cond.notify_all()
+                    self._publish_depth()
+                    return True
+            self._jobs.append(job)
+            self.submitted += 1
+            self._cond.notify_all()
+            self._publish_depth()
+        return True
+
+    def drain(self, timeout: float | None = None) -> bool:
+        """Wait until every submitted job (including spilled ones) has been written."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs or self._spilled_pending or self._active or self._replay_left:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: float | None = 10.0) -> bool:
+        """Drain (bounded by ``timeout``), then stop the writer; returns True when fully drained."""
+        drained = self.drain(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            left = self.depth()
+        t = self._thread
+        if t is not None and t.is_alive():
+            t.join(0.0 if not drained else timeout)
+        if not drained:
+            logger.warning("persist queue closed with %s job(s) unwritten after %.1fs drain timeout", left, timeout or 0.0)
+        return drained
+
+    def depth(self) -> int:
+        return len(self._jobs) + self._spilled_pending + self._replay_left
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'policy': self.policy,
+            'queued': len(self._jobs),
+            'spill_pending': self._spilled_pending + self._replay_left,
+            'submitted': self.submitted,
+            'completed': self.completed,
+            'failed': self.failed,
+            'dropped': self.dropped,
+            'spilled': self.spilled,
+            'last_lag_seconds': self.last_lag,
+        }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None:
+            t = threading.Thread(target=self._run, name="g6-persist-writer", daemon=True)
+            t.start()
+            self._thread = t
+
+    def _spill(self, job: tuple[str, Callable[..., Any], tuple[Any, ...], float]) -> bool:
+        kind, _handler, args, ts = job
+        assert self.spill_path is not None
+        try:
+            os.makedirs(os.path.dirname(self.spill_path) or '.', exist_ok=True)
+            data = pickle.dumps((kind, args, ts), protocol=pickle.HIGHEST_PROTOCOL)
+            with open(self.spill_path, 'ab') as fh:
+                fh.write(data)
+        except Exception:
+            logger.warning("persist queue spill failed for %s job; queueing in memory", kind, exc_info=True)
+            return False
+        self._spilled_pending += 1
+        self.spilled += 1
+        self._metric_inc('persist_queue_spilled_total')
+        return True
+
+    # ---------------- Writer thread ----------------
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._jobs and not self._spilled_pending and not self._closed:
+                    self._cond.wait()
+                if self._jobs:
+                    job = self._jobs.popleft()
+                    self._active = True
+                    self._cond.notify_all()
+                elif self._spilled_pending:
+                    self._replay_spill()
+                    continue
+                else:
+                    return
+            self._execute(job[0], job[1], job[2], job[3])
+
+    def _replay_spill(self) -> None:
+        """Called with the lock held: detach the spill file and replay it outside the lock."""
+        assert self.spill_path is not None
+        replay_path = f"{self.spill_path}.replay"
+        try:
+            os.replace(self.spill_path, replay_path)
+        except OSError:
+            logger.error("persist queue spill file missing; %s spilled job(s) lost", self._spilled_pending)
+            self._spilled_pending = 0
+            self._cond.notify_all()
+            return
+        count = self._replay_left = self._spilled_pending
+        self._spilled_pending = 0
+        self._cond.release()
+        try:
+            replayed = 0
+            with open(replay_path, 'rb') as fh:
+                while True:
+                    try:
+                        kind, args, ts = pickle.load(fh)
+                    except EOFError:
+                        break
+                    handler = self._handlers.get(kind)
+                    replayed += 1
+                    if handler is None:
+                        self._record_failure()
+                        logger.error("persist queue: no handler registered for spilled %s job", kind)
+                    else:
+                        self._execute(kind, handler, args, ts)
+                    with self._cond:
+                        self._replay_left = max(0, self._replay_left - 1)
+            if replayed != count:
+                logger.warning("persist queue spill replay count mismatch expected=%s replayed=%s", count, replayed)
+            os.remove(replay_path)
+        except Exception:
+            logger.error("persist queue spill replay failed (%s kept for inspection)", replay_path, exc_info=True)
+        finally:
+            self._cond.acquire()
+            self._replay_left = 0
+            self._cond.notify_all()
+
+    def _execute(self, kind: str, handler: Callable[..., Any], args: tuple[Any, ...], enqueued_at: float) -> None:
+        try:
+            result = handler(*args)
+        except Exception:
+            self._record_failure()
+            logger.error("persist queue %s job failed", kind, exc_info=True)
+        else:
+            if getattr(result, 'failed', False) is True:
+                self._record_failure()
+                logger.error("persist queue %s job reported a failed write", kind)
+            else:
+                self.completed += 1
+        self.last_lag = max(0.0, time.time() - enqueued_at)
+        with self._cond:
+            self._active = False
+            self._cond.notify_all()
+        self._metric_set('persist_lag_seconds', self.last_lag)
+        self._publish_depth()
+
+    # ---------------- Metrics ----------------
+    def _record_failure(self) -> None:
+        self.failed += 1
+        self._metric_inc('persist_queue_failed_total')
+
+    def _publish_depth(self) -> None:
+        self._metric_set('persist_queue_depth', self.depth())
+
+    def _metric_set(self, attr: str, value: float) -> None:
+        metric = getattr(self.metrics, attr, None) if self.metrics is not None else None
+        if metric is not None:
+            try:
+                metric.set(value)
+            except Exception:
+                logger.debug("persist queue metric %s set failed", attr, exc_info=True)
+
+    def _metric_inc(self, attr: str) -> None:
+        metric = getattr(self.metrics, attr, None) if self.metrics is not None else None
+        if metric is not None:
+            try:
+                metric.inc()
+            except Exception:
+                logger.debug("persist queue metric %s inc failed", attr, exc_info=True)
+
+
+def copy_rows(enriched_data: dict[str, dict[str, Any]]) -> dict[str, dict[str, Any]]:
+    """Copy of a chain mapping and its row dicts, safe to hand to the writer thread."""
+    return {sym: dict(row) if isinstance(row, dict) else row for sym, row in enriched_data.items()}
+
+
+def provisional_metrics_payload(
+    enriched_data: dict[str, dict[str, Any]],
+    expiry_rule: str,
+    timestamp: Any,
+    *,
+    index_price: Any = None,
+    index_ohlc: dict[str, Any] | None = None,
+    csv_sink: Any | None = None,
+    index: str | None = None,
+    expiry: Any = None,
+) -> dict[str, Any]:
+    """Aggregation payload computed up front for queued writes.
+
+    Mirrors the ``return_metrics`` dict of ``CsvSink.write_options_data``
+    (same PCR and day width formulas; the sink also computes PCR before it
+    prunes mixed-expiry rows) so overview aggregation does not wait for the
+    write. When ``csv_sink`` offers ``preview_expiry`` the sink's own
+    ``expiry_code`` is used and an expiry it would reject yields its
+    ``pcr=0`` skip payload; otherwise the collector's tag is the code.
+    """
+    expiry_code, skip = expiry_rule, None
+    preview = getattr(csv_sink, 'preview_expiry', None) if csv_sink is not None else None
+    if callable(preview) and index is not None:
+        try:
+            expiry_code, skip = preview(index, expiry, expiry_rule)
+        except Exception:
+            logger.debug("provisional payload: expiry preview failed", exc_info=True)
+    if skip:
+        return {'expiry_code': expiry_code, 'pcr': 0, 'timestamp': timestamp, 'day_width': 0, skip: True}
+    put_oi = sum(float(d.get('oi', 0)) for d in enriched_data.values() if d.get('instrument_type') == 'PE')
+    call_oi = sum(float(d.get('oi', 0)) for d in enriched_data.values() if d.get('instrument_type') == 'CE')
+    day_width = 0.0
+    if index_ohlc and 'high' in index_ohlc and 'low' in index_ohlc:
+        day_width = float(index_ohlc.get('high', 0)) - float(index_ohlc.get('low', 0))
+    return {
+        'expiry_code': expiry_code,
+        'pcr': put_oi / call_oi if call_oi > 0 else 0,
+        'day_width': day_width,
+        'timestamp': timestamp,
+        'index_price': index_price,
+    }
+
+
+_QUEUE: PersistQueue | None = None
+_QUEUE_LOCK = threading.Lock()
+
+
+def get_persist_queue(metrics: Any | None = None) -> PersistQueue:
+    """Process-wide queue configured from the environment (created on first use)."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        if _QUEUE is None or _QUEUE._closed:
+            policy = (os.environ.get('G6_PERSIST_BACKPRESSURE') or 'block').strip().lower()
+            if policy not in POLICIES:
+                logger.warning("Invalid G6_PERSIST_BACKPRESSURE=%r; using 'block'", policy)
+                policy = 'block'
+            _QUEUE = PersistQueue(
+                max_backlog=int(_env_number('G6_PERSIST_QUEUE_MAX', 256)),
+                policy=policy,
+                spill_dir=os.environ.get('G6_PERSIST_SPILL_DIR') or os.path.join('data', 'persist_spill'),
+                metrics=metrics,
+            )
+            atexit.register(shutdown_persist_queue)
+        elif metrics is not None and _QUEUE.metrics is None:
+            _QUEUE.metrics = metrics
+        return _QUEUE
+
+
+def persist_async(kind: str, handler: Callable[..., Any], *args: Any, metrics: Any | None = None) -> bool:
+    """Enqueue ``handler(*args)`` when ``G6_ASYNC_PERSIST`` is on.
+
+    Returns False when async persistence is disabled or the queue is closed;
+    the caller then performs the write inline.
+    """
+    if not is_truthy_env('G6_ASYNC_PERSIST'):
+        return False
+    try:
+        return get_persist_queue(metrics).submit(kind, handler, *args)
+    except Exception:
+        logger.debug("persist queue submit failed; writing inline", exc_info=True)
+        return False
+
+
+def shutdown_persist_queue(timeout: float | None = None) -> bool:
+    """Drain and stop the process queue (bounded by ``G6_PERSIST_DRAIN_TIMEOUT``)."""
+    global _QUEUE
+    with _QUEUE_LOCK:
+        q, _QUEUE = _QUEUE, None
+    if q is None:
+        return True
+    if timeout is None:
+        timeout = _env_number('G6_PERSIST_DRAIN_TIMEOUT', 10.0)
+    return q.close(timeout)
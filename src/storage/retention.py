@@ -5,16 +5,13 @@ Purpose:
     Periodically (default every 6h) scan the CSV data directory and prune
     files older than the configured retention windows.
 
-Config (JSON / dynamic lookup):
-    storage: {
-        "retention": {
-            "days": 30,                 # General retention for option/overview CSVs (<=0 disables)
-            "overview_days": 60,        # (Optional) Different window for high-level overview files
-            "scan_interval_hours": 6,   # How often to run the retention sweep
-            "archive_mode": "delete",  # future: "gzip" or "move" (not yet implemented)
-            "min_files_to_keep": 3      # safeguard: always keep most recent N files per directory
-        }
-    }
+Parameters (``start_retention_worker`` / ``RetentionEngine`` arguments; the
+platform config does not wire any of these):
+    retention_days        General retention for option/overview CSVs (<=0 disables)
+    overview_days         Optional different window for high-level overview files
+    scan_interval_hours   How often the worker runs the retention sweep (default 6)
+    min_files_to_keep     Safeguard: always keep the most recent N files per directory (default 3)
+    archive_days          Optional: zip day files older than N days into monthly archives
 
 Heuristics:
     - Overview files are detected by filename containing 'overview' or living in a folder named 'overview'.
@@ -25,21 +22,41 @@ Metrics (if provided):
     metrics.retention_files_deleted_total (Counter) with labels type=option|overview
 
 Design Notes:
-    - Intentionally simple; relies on file modified time (mtime) instead of parsing dates from filenames.
+    - Dates come from file names (``YYYY-MM-DD*.csv``, the CsvSink layout); only
+      CSVs without a date in the name fall back to file mtime.
+    - Directories are listed with ``os.scandir`` and remembered in a small JSON
+      manifest (``.retention_manifest.json`` under ``base_dir``) holding each
+      directory's mtime, subdirectories and dated files. A pass stats every
+      directory once and re-lists only directories whose mtime changed (a new
+      day file, or files removed), so unchanged history is never re-read.
+    - Optional compaction (``archive_days``): day files older than that window
+      but still inside retention are moved into per-directory monthly
+      ``<YYYY-MM>.archive.zip`` (deflate) archives; an archive is deleted once
+      its whole month falls outside retention. Readers of plain CSVs do not
+      see archived days.
     - Safe no-op when retention_days <= 0.
     - Runs as a daemon thread; exceptions are logged & swallowed (never crash main loop).
 """
 from __future__ import annotations
 
+import calendar
 import datetime as _dt
+import json
 import logging
 import os
+import re
 import threading
 import time
+import zipfile
+from dataclasses import dataclass, field
 from typing import Any
 
 logger = logging.getLogger(__name__)
 
+MANIFEST_NAME = '.retention_manifest.json'
+_DATED_RE = re.compile(r'^(\d{4}-\d{2}-\d{2}).*\.csv$', re.IGNORECASE)
+_ARCHIVE_RE = re.compile(r'^(\d{4}-\d{2})\.archive\.zip$')
+
 
 def _classify(path: str) -> str:
     """Best-effort classification: 'overview' or 'option'."""
@@ -60,52 +77,214 @@ def _should_delete(mtime: float, cutoff: float) -> bool:
         return False
 
 
-def _scan_and_prune(base_dir: str,
-                    retention_days: int,
-                    overview_days: int | None,
-                    min_keep: int,
-                    metrics: Any) -> tuple[int, int]:
-    now = time.time()
-    general_cutoff = now - retention_days * 86400 if retention_days > 0 else -1
-    overview_cutoff = None
-    if overview_days and overview_days > 0:
-        overview_cutoff = now - overview_days * 86400
-    deleted_option = 0
-    deleted_overview = 0
+@dataclass
+class _DirEntry:
+    mtime_ns: int
+    subdirs: list[str] = field(default_factory=list)
+    dated: dict[str, list[str]] = field(default_factory=dict)  # YYYY-MM-DD -> file names
+    undated: list[str] = field(default_factory=list)           # *.csv without a date prefix
+    archives: list[str] = field(default_factory=list)          # YYYY-MM
 
-    if retention_days <= 0 and not (overview_days and overview_days > 0):
-        return 0, 0  # disabled
-
-    for root, _dirs, files in os.walk(base_dir):
-        csv_files = [f for f in files if f.lower().endswith('.csv')]
-        if not csv_files:
-            continue
-        # Safeguard: sort files by mtime descending; preserve newest N regardless
-        file_mt_pairs: list[tuple[str, float]] = []
-        for f in csv_files:
-            path = os.path.join(root, f)
+    @classmethod
+    def scan(cls, path: str, mtime_ns: int) -> _DirEntry:
+        entry = cls(mtime_ns=mtime_ns)
+        with os.scandir(path) as it:
+            for de in it:
+                name = de.name
+                if de.is_dir(follow_symlinks=False):
+                    entry.subdirs.append(name)
+                    continue
+                m = _DATED_RE.match(name)
+                if m:
+                    entry.dated.setdefault(m.group(1), []).append(name)
+                    continue
+                m = _ARCHIVE_RE.match(name)
+                if m:
+                    entry.archives.append(m.group(1))
+                elif name.lower().endswith('.csv'):
+                    entry.undated.append(name)
+        return entry
+
+    def to_json(self) -> dict[str, Any]:
+        return {'mtime_ns': self.mtime_ns, 'subdirs': self.subdirs, 'dated': self.dated,
+                'undated': self.undated, 'archives': self.archives}
+
+    @classmethod
+    def from_json(cls, obj: dict[str, Any]) -> _DirEntry:
+        return cls(int(obj['mtime_ns']), list(obj.get('subdirs', [])), dict(obj.get('dated', {})),
+                   list(obj.get('undated', [])), list(obj.get('archives', [])))
+
+
+@dataclass
+class RetentionStats:
+    deleted_option: int = 0
+    deleted_overview: int = 0
+    archived: int = 0
+    archives_deleted: int = 0
+    dirs_listed: int = 0
+    dirs_seen: int = 0
+
+
+class RetentionEngine:
+    """Manifest-backed retention / compaction pass over a CsvSink tree."""
+
+    def __init__(self, base_dir: str, retention_days: int, overview_days: int | None = None,
+                 min_files_to_keep: int = 3, archive_days: int | None = None,
+                 manifest_path: str | None = None):
+        self.base_dir = base_dir
+        self.retention_days = retention_days
+        self.overview_days = overview_days
+        self.min_keep = max(min_files_to_keep, 0)
+        self.archive_days = archive_days
+        self.manifest_path = manifest_path or os.path.join(base_dir, MANIFEST_NAME)
+        self._dirs: dict[str, _DirEntry] = self._load_manifest()
+
+    @property
+    def enabled(self) -> bool:
+        return self.retention_days > 0 or bool(self.overview_days and self.overview_days > 0)
+
+    # ---------------- manifest -----------------
+    def _load_manifest(self) -> dict[str, _DirEntry]:
+        try:
+            with open(self.manifest_path, encoding='utf-8') as f:
+                obj = json.load(f)
+            if obj.get('version') != 1:
+                return {}
+            return {rel: _DirEntry.from_json(e) for rel, e in obj.get('dirs', {}).items()}
+        except FileNotFoundError:
+            return {}
+        except Exception:
+            logger.debug("Retention manifest unreadable; rebuilding", exc_info=True)
+            return {}
+
+    def _save_manifest(self) -> None:
+        tmp = self.manifest_path + '.tmp'
+        try:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'version': 1, 'dirs': {r: e.to_json() for r, e in self._dirs.items()}},
+                          f, separators=(',', ':'))
+            os.replace(tmp, self.manifest_path)
+        except Exception:
+            logger.debug("Retention manifest write failed", exc_info=True)
+
+    # ---------------- pass -----------------
+    def _cutoff(self, ftype: str, today: _dt.date) -> str | None:
+        """Oldest date (ISO) kept for ``ftype``; None when retention disabled for it."""
+        use_overview = ftype == 'overview' and self.overview_days and self.overview_days > 0
+        days = self.overview_days if use_overview else self.retention_days
+        if days <= 0:
+            return None
+        return (today - _dt.timedelta(days=days)).isoformat()
+
+    def run_pass(self, today: _dt.date | None = None) -> RetentionStats:
+        stats = RetentionStats()
+        if not self.enabled or not os.path.isdir(self.base_dir):
+            return stats
+        today = today or _dt.date.today()
+        archive_cutoff = None
+        if self.archive_days and self.archive_days > 0:
+            archive_cutoff = (today - _dt.timedelta(days=self.archive_days)).isoformat()
+        seen: dict[str, _DirEntry] = {}
+        stack = ['']
+        while stack:
+            rel = stack.pop()
+            path = os.path.join(self.base_dir, rel) if rel else self.base_dir
             try:
-                mt = os.path.getmtime(path)
-            except Exception:
-                continue
-            file_mt_pairs.append((path, mt))
-        file_mt_pairs.sort(key=lambda x: x[1], reverse=True)
-        protected: set[str] = {p for p, _ in file_mt_pairs[:max(min_keep, 0)]}
-        for path, mt in file_mt_pairs[max(min_keep, 0):]:
-            ftype = _classify(path)
-            cutoff = overview_cutoff if (ftype == 'overview' and overview_cutoff is not None) else general_cutoff
-            if cutoff == -1:  # general retention disabled & not overview override
+                mtime_ns = os.stat(path).st_mtime_ns
+            except OSError:
                 continue
-            if _should_delete(mt, cutoff):
+            entry = self._dirs.get(rel)
+            if entry is None or entry.mtime_ns != mtime_ns:
                 try:
-                    os.remove(path)
-                    if ftype == 'overview':
-                        deleted_overview += 1
-                    else:
-                        deleted_option += 1
-                except Exception as e:
-                    logger.debug(f"Retention delete failed {path}: {e}")
-    # Metrics
+                    entry = _DirEntry.scan(path, mtime_ns)
+                except OSError:
+                    continue
+                stats.dirs_listed += 1
+            seen[rel] = entry
+            stats.dirs_seen += 1
+            stack.extend(os.path.join(rel, d) if rel else d for d in entry.subdirs)
+            self._apply(path, entry, today, archive_cutoff, stats)
+        self._dirs = seen
+        self._save_manifest()
+        return stats
+
+    def _apply(self, path: str, entry: _DirEntry, today: _dt.date, archive_cutoff: str | None,
+               stats: RetentionStats) -> None:
+        ftype = _classify(path + os.sep)
+        cutoff = self._cutoff(ftype, today)
+        if cutoff is None:
+            return
+        dates = sorted(entry.dated, reverse=True)
+        protected = set(dates[:self.min_keep])
+        for day in dates[self.min_keep:]:
+            if day < cutoff:
+                for name in entry.dated[day]:
+                    if self._remove(os.path.join(path, name)):
+                        if ftype == 'overview':
+                            stats.deleted_overview += 1
+                        else:
+                            stats.deleted_option += 1
+            elif archive_cutoff is not None and day < archive_cutoff and day not in protected:
+                stats.archived += self._archive(path, day, entry.dated[day])
+        for month in entry.archives:
+            y, m = int(month[:4]), int(month[5:7])
+            month_end = _dt.date(y, m, calendar.monthrange(y, m)[1]).isoformat()
+            if month_end < cutoff and self._remove(os.path.join(path, f"{month}.archive.zip")):
+                stats.archives_deleted += 1
+        if entry.undated and len(entry.undated) > self.min_keep:
+            self._prune_undated(path, entry, ftype, today, stats)
+
+    def _prune_undated(self, path: str, entry: _DirEntry, ftype: str, today: _dt.date, stats: RetentionStats) -> None:
+        use_overview = ftype == 'overview' and self.overview_days and self.overview_days > 0
+        days = self.overview_days if use_overview else self.retention_days
+        cutoff_ts = time.mktime(today.timetuple()) - days * 86400
+        pairs: list[tuple[str, float]] = []
+        for name in entry.undated:
+            try:
+                pairs.append((name, os.path.getmtime(os.path.join(path, name))))
+            except OSError:
+                continue
+        pairs.sort(key=lambda x: x[1], reverse=True)
+        for name, mt in pairs[self.min_keep:]:
+            if _should_delete(mt, cutoff_ts) and self._remove(os.path.join(path, name)):
+                if ftype == 'overview':
+                    stats.deleted_overview += 1
+                else:
+                    stats.deleted_option += 1
+
+    @staticmethod
+    def _remove(path: str) -> bool:
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.debug(f"Retention delete failed {path}: {e}")
+            return False
+
+    @staticmethod
+    def _archive(path: str, day: str, names: list[str]) -> int:
+        """Move day files into ``<YYYY-MM>.archive.zip``; originals removed only after the write."""
+        archive_path = os.path.join(path, f"{day[:7]}.archive.zip")
+        moved = 0
+        try:
+            with zipfile.ZipFile(archive_path, 'a', compression=zipfile.ZIP_DEFLATED) as zf:
+                present = set(zf.namelist())
+                for name in names:
+                    src = os.path.join(path, name)
+                    if name not in present:
+                        zf.write(src, arcname=name)
+                    moved += 1
+        except Exception as e:
+            logger.debug(f"Retention archive failed {archive_path}: {e}")
+            return 0
+        for name in names:
+            RetentionEngine._remove(os.path.join(path, name))
+        return moved
+
+
+def _emit_metrics(metrics: Any, deleted_option: int, deleted_overview: int) -> None:
     try:
         if metrics and hasattr(metrics, 'retention_files_deleted'):  # new counter
             if deleted_option:
@@ -114,7 +293,22 @@ def _scan_and_prune(base_dir: str,
                 metrics.retention_files_deleted.labels(type='overview').inc(deleted_overview)
     except Exception:
         pass
-    return deleted_option, deleted_overview
+
+
+def _scan_and_prune(base_dir: str,
+                    retention_days: int,
+                    overview_days: int | None,
+                    min_keep: int,
+                    metrics: Any,
+                    *,
+                    archive_days: int | None = None,
+                    manifest_path: str | None = None) -> tuple[int, int]:
+    """One retention pass (engine + manifest); returns (deleted_option, deleted_overview)."""
+    engine = RetentionEngine(base_dir, retention_days, overview_days, min_keep,
+                             archive_days=archive_days, manifest_path=manifest_path)
+    stats = engine.run_pass()
+    _emit_metrics(metrics, stats.deleted_option, stats.deleted_overview)
+    return stats.deleted_option, stats.deleted_overview
 
 
 def start_retention_worker(base_dir: str,
@@ -122,7 +316,8 @@ def start_retention_worker(base_dir: str,
                            overview_days: int | None = None,
                            scan_interval_hours: int = 6,
                            min_files_to_keep: int = 3,
-                           metrics: Any | None = None) -> threading.Thread:
+                           metrics: Any | None = None,
+                           archive_days: int | None = None) -> threading.Thread:
     """Start background retention daemon thread.
 
     Returns the thread object (already started). Safe to call even if disabled.
@@ -132,29 +327,29 @@ def start_retention_worker(base_dir: str,
         dummy = threading.Thread(target=lambda: None, name="retention-disabled")
         return dummy
 
+    engine = RetentionEngine(base_dir, retention_days, overview_days, min_files_to_keep, archive_days=archive_days)
+
     def _loop() -> None:
         logger.info(
-            "Retention worker started (days=%s overview_days=%s interval_h=%s base_dir=%s)",
-            retention_days, overview_days, scan_interval_hours, base_dir,
+            "Retention worker started (days=%s overview_days=%s archive_days=%s interval_h=%s base_dir=%s)",
+            retention_days, overview_days, archive_days, scan_interval_hours, base_dir,
         )
         while True:
             # Use timezone-aware UTC
             started = _dt.datetime.now(_dt.UTC)
             try:
-                opt_del, ov_del = _scan_and_prune(
-                    base_dir,
-                    retention_days,
-                    overview_days,
-                    min_files_to_keep,
-                    metrics,
-                )
-                if opt_del or ov_del:
+                st = engine.run_pass()
+                _emit_metrics(metrics, st.deleted_option, st.deleted_overview)
+                if st.deleted_option or st.deleted_overview or st.archived:
+                    took = (_dt.datetime.now(_dt.UTC) - started).total_seconds()
                     logger.info(
-                        f"Retention pruned option={opt_del} overview={ov_del} files (took {( _dt.datetime.now(_dt.UTC) - started).total_seconds():.2f}s)"
+                        f"Retention pruned option={st.deleted_option} overview={st.deleted_overview} "
+                        f"archived={st.archived} files (dirs listed {st.dirs_listed}/{st.dirs_seen}, took {took:.2f}s)"
                     )
             except Exception:
                 logger.exception("Retention sweep failure (continuing)")
-            # Sleep with coarse granularity; allow quick disable by setting retention_days<=0 externally (not implemented yet)
+            # Sleep with coarse granularity; allow quick disable by setting retention_days<=0 externally
+            # (not implemented yet)
             time.sleep(max(300, scan_interval_hours * 3600))
 
     t = threading.Thread(target=_loop, name="retention-worker", daemon=True)
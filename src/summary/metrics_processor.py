@@ -179,7 +179,19 @@ class MetricsProcessor:
         }
 
     def fetch_prometheus_metrics(self) -> dict[str, Any]:
-        """Fetch raw metrics from Prometheus server."""
+        """Fetch raw metrics from Prometheus server.
+
+        Prefers the structured snapshot (in-process registry or the exporter's
+        ``/metrics/snapshot`` route); the text exposition is parsed only when
+        neither is available.
+        """
+        try:
+            from src.metrics.snapshot import read_snapshot
+            snap = read_snapshot(self.prometheus_url, timeout=5.0, max_age=1.0)
+            if snap is not None:
+                return self._metrics_from_snapshot(snap)
+        except Exception as e:
+            logger.debug(f"Metrics snapshot unavailable, falling back to text exposition: {e}")
         try:
             response = requests.get(self.prometheus_url, timeout=5)
             if response.status_code != 200:
@@ -205,6 +217,17 @@ class MetricsProcessor:
                 pass
             return {}
 
+    @staticmethod
+    def _metrics_from_snapshot(snap: Any) -> dict[str, Any]:
+        """Convert a ``MetricsSnapshot`` into the ``_parse_prometheus_text`` structure."""
+        metrics: dict[str, dict[Any, dict[str, Any]]] = {}
+        for name, series in snap.series.items():
+            entries: dict[Any, dict[str, Any]] = {}
+            for label_key, value in series.items():
+                entries[label_key if label_key else 'default'] = {'value': value, 'labels': dict(label_key)}
+            metrics[name] = entries
+        return metrics
+
     def _parse_prometheus_text(self, metrics_text: str) -> dict[str, Any]:
         """Parse Prometheus text format into structured metrics."""
         # metrics structure: name -> ( 'default' -> {value, labels} ) OR name -> { (label_tuple) -> {value, labels} }
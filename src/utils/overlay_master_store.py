@@ -0,0 +1,162 @@
+"""Binary weekday-master store keyed by time-of-day slot.
+
+Companion to ``scripts/weekday_overlay.py``. One master series
+(index, expiry_tag, offset, weekday) is held as parallel NumPy arrays:
+
+    slots    int32[n]              seconds since midnight, sorted ascending
+    mean     float64[n, n_fields]  cumulative arithmetic mean per field
+    ema      float64[n, n_fields]  EMA per field
+    counter  int64[n]              updates applied per slot (shared by all fields)
+    fields   str[n_fields]
+
+and persisted next to the CSV master as ``<WEEKDAY>.npz`` (temp file, fsync,
+``os.replace``). ``apply_day`` folds one day's per-slot values into the
+arrays with vectorized mean/EMA updates, so an EOD rollup no longer parses,
+upserts and rewrites every historical row per timestamp.
+
+Update rules match the CSV updater: a slot seen for the first time takes the
+day value as both mean and EMA (0.0 for fields with no value that day); an
+existing slot increments its counter and updates only fields observed that
+day (mean uses the shared counter).
+
+NumPy is optional at import time; ``AVAILABLE`` is False when it is missing.
+"""
+from __future__ import annotations
+
+import os
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+try:
+    import numpy as np
+    AVAILABLE = True
+except Exception:  # pragma: no cover - numpy optional
+    np = None  # type: ignore[assignment]
+    AVAILABLE = False
+
+__all__ = [
+    "AVAILABLE",
+    "MasterArrays",
+    "aggregate_day",
+    "hhmmss",
+    "store_path",
+]
+
+
+def store_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix('.npz')
+
+
+def hhmmss(slot: int) -> str:
+    return f"{slot // 3600:02d}:{(slot % 3600) // 60:02d}:{slot % 60:02d}"
+
+
+def aggregate_day(slots: Any, values: Any) -> tuple[Any, Any]:
+    """Average duplicate rows per slot; NaN cells (missing values) are ignored.
+
+    Returns ``(unique_slots, per_slot_values)`` with NaN where a field had no
+    value in any row of that slot.
+    """
+    uniq, inv = np.unique(np.asarray(slots, dtype=np.int32), return_inverse=True)
+    vals = np.asarray(values, dtype=float)
+    present = ~np.isnan(vals)
+    out = np.full((uniq.size, vals.shape[1]), np.nan)
+    for k in range(vals.shape[1]):
+        n = np.bincount(inv, weights=present[:, k], minlength=uniq.size)
+        s = np.bincount(inv, weights=np.where(present[:, k], vals[:, k], 0.0), minlength=uniq.size)
+        np.divide(s, n, out=out[:, k], where=n > 0)
+    return uniq, out
+
+
+@dataclass
+class MasterArrays:
+    fields: tuple[str, ...]
+    slots: Any
+    mean: Any
+    ema: Any
+    counter: Any
+
+    @classmethod
+    def empty(cls, fields: Sequence[str]) -> MasterArrays:
+        n = len(fields)
+        return cls(tuple(fields), np.empty(0, dtype=np.int32), np.empty((0, n)), np.empty((0, n)), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def load(cls, path: Path, fields: Sequence[str]) -> MasterArrays | None:
+        """Load ``path``; None when missing. Stored fields are realigned to ``fields`` (absent -> 0.0)."""
+        if not path.exists():
+            return None
+        with np.load(path, allow_pickle=False) as z:
+            stored = [str(f) for f in z['fields']]
+            slots = z['slots'].astype(np.int32)
+            counter = z['counter'].astype(np.int64)
+            mean_s, ema_s = z['mean'], z['ema']
+        if tuple(stored) == tuple(fields):
+            return cls(tuple(fields), slots, mean_s, ema_s, counter)
+        mean = np.zeros((slots.size, len(fields)))
+        ema = np.zeros((slots.size, len(fields)))
+        pos = {f: i for i, f in enumerate(stored)}
+        for j, f in enumerate(fields):
+            i = pos.get(f)
+            if i is not None:
+                mean[:, j] = mean_s[:, i]
+                ema[:, j] = ema_s[:, i]
+        return cls(tuple(fields), slots, mean, ema, counter)
+
+    @classmethod
+    def from_records(cls, records: Mapping[int, Mapping[str, float]], counters: Mapping[int, int], fields: Sequence[str]) -> MasterArrays:
+        """Build from ``slot -> {'<field>_mean': .., '<field>_ema': ..}`` (CSV bootstrap)."""
+        slots = np.array(sorted(records), dtype=np.int32)
+        mean = np.array([[float(records[s].get(f'{f}_mean', 0.0)) for f in fields] for s in slots.tolist()]).reshape(slots.size, len(fields))
+        ema = np.array([[float(records[s].get(f'{f}_ema', 0.0)) for f in fields] for s in slots.tolist()]).reshape(slots.size, len(fields))
+        counter = np.array([int(counters.get(s, 0)) for s in slots.tolist()], dtype=np.int64)
+        return cls(tuple(fields), slots, mean, ema, counter)
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix('.npz.tmp')
+        with open(tmp, 'wb') as f:
+            np.savez(
+                f,
+                fields=np.array(self.fields),
+                slots=self.slots,
+                mean=self.mean,
+                ema=self.ema,
+                counter=self.counter,
+            )
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def apply_day(self, day_slots: Any, day_values: Any, alpha: float) -> int:
+        """Fold one day's per-slot values (``aggregate_day`` output) in place; returns slots updated."""
+        day_slots = np.asarray(day_slots, dtype=np.int32)
+        if day_slots.size == 0:
+            return 0
+        x = np.asarray(day_values, dtype=float)
+        union = np.union1d(self.slots, day_slots)
+        if union.size != self.slots.size:
+            n = len(self.fields)
+            at = np.searchsorted(union, self.slots)
+            mean = np.zeros((union.size, n))
+            ema = np.zeros((union.size, n))
+            counter = np.zeros(union.size, dtype=np.int64)
+            mean[at] = self.mean
+            ema[at] = self.ema
+            counter[at] = self.counter
+            self.slots, self.mean, self.ema, self.counter = union, mean, ema, counter
+        pos = np.searchsorted(self.slots, day_slots)
+        prev = self.counter[pos]
+        c = (prev + 1).astype(float)[:, None]
+        first = (prev == 0)[:, None]
+        present = ~np.isnan(x)
+        xv = np.where(present, x, 0.0)
+        m_old = self.mean[pos]
+        e_old = self.ema[pos]
+        upd = present & ~first
+        self.mean[pos] = np.where(first, xv, np.where(upd, m_old + (xv - m_old) / c, m_old))
+        self.ema[pos] = np.where(first, xv, np.where(upd, alpha * xv + (1 - alpha) * e_old, e_old))
+        self.counter[pos] = prev + 1
+        return int(day_slots.size)
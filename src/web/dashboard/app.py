@@ -2,13 +2,16 @@ from __future__ import annotations
 
 import asyncio
 import csv
+import io
 import os
 import pathlib
 import time
 import zlib
 from collections.abc import AsyncIterator, Mapping
 from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
 from datetime import date, datetime
+from itertools import pairwise
 from pathlib import Path
 from typing import Any, cast
 
@@ -66,90 +69,122 @@ SECONDARY_REFRESH = int(os.environ.get('G6_DASHBOARD_SECONDARY_REFRESH_SEC', '12
 # Align metrics cache polling with core refresh cadence to reduce staleness/flicker
 cache = MetricsCache(METRICS_ENDPOINT, interval=float(max(1, CORE_REFRESH)), timeout=1.5)
 
-# In-process CSV cache: path -> (mtime_ns, rows_full)
-# rows_full contain parsed fields (ts, tp/avg_tp, ce/pe, index_price, ivs, greeks) so we can slice/trim per request
-_CSV_CACHE: dict[Path, tuple[int, list[dict[str, Any]]]] = {}
+# In-process tail-following CSV cache: path -> _CsvTail
+# rows contain parsed fields (ts, tp/avg_tp, ce/pe, index_price, ivs, greeks) so we can slice/trim per request.
+# Collectors append one row per cycle, so on mtime change only the bytes past `offset` are parsed;
+# a full re-parse happens only when the file shrinks, is replaced (inode) or its head changes.
+_GREEK_COLS = ('ce_delta','pe_delta','ce_theta','pe_theta','ce_vega','pe_vega','ce_gamma','pe_gamma','ce_rho','pe_rho')
+_CSV_HEAD_SAMPLE = 4096
+
+@dataclass
+class _CsvTail:
+    ino: int
+    mtime_ns: int
+    size: int
+    offset: int  # bytes consumed (always ends on a line boundary)
+    head: bytes  # first bytes of file used to detect in-place rewrites
+    fieldnames: list[str]
+    rows: list[dict[str, Any]] = field(default_factory=list)
+    last_ts: int = -1
+
+_CSV_CACHE: dict[Path, _CsvTail] = {}
+
+def _csv_float(v: Any) -> float | None:
+    if v is None or v == '':
+        return None
+    try:
+        return float(str(v))
+    except Exception:
+        return None
+
+def _csv_row_obj(r: Mapping[str, Any], fns: list[str]) -> dict[str, Any]:
+    ts_raw = str(r.get('timestamp', '')).strip()
+    ts_ms = _parse_time_epoch_ms(ts_raw)
+    obj: dict[str, Any] = {'time': ts_ms, 'ts': ts_ms, 'time_str': _parse_time_any(ts_raw)}
+    obj['tp'] = _csv_float(r.get('tp'))
+    obj['avg_tp'] = _csv_float(r.get('avg_tp'))
+    if 'ce' in fns:
+        obj['ce'] = _csv_float(r.get('ce'))
+    if 'pe' in fns:
+        obj['pe'] = _csv_float(r.get('pe'))
+    if 'index_price' in fns:
+        obj['index_price'] = _csv_float(r.get('index_price'))
+    if ('ce_iv' in fns) or ('pe_iv' in fns):
+        for col in ('ce_iv','pe_iv'):
+            obj[col] = _csv_float(r.get(col))
+    if any(c in fns for c in _GREEK_COLS):
+        for col in _GREEK_COLS:
+            obj[col] = _csv_float(r.get(col))
+    return obj
+
+def _ts_sort_key(r: Mapping[str, Any]) -> int:
+    try:
+        rv = r.get('ts')
+        return -1 if rv is None else int(rv)
+    except Exception:
+        return -1
+
+def _parse_csv_chunk(chunk: bytes, fieldnames: list[str] | None) -> tuple[list[str], list[dict[str, Any]]]:
+    """Parse complete CSV lines; reads the header from the chunk when fieldnames is None."""
+    text = chunk.decode('utf-8', errors='replace')
+    reader = csv.DictReader(io.StringIO(text, newline=''), fieldnames=fieldnames)
+    fns = list(reader.fieldnames or [])
+    return fns, [_csv_row_obj(r, fns) for r in reader]
 
 def _load_csv_rows_full(path: Path) -> list[dict[str, Any]]:
     try:
         st = path.stat()
         mtime_ns = int(getattr(st, 'st_mtime_ns', int(st.st_mtime * 1e9)))
+        size = int(st.st_size)
+        ino = int(getattr(st, 'st_ino', 0))
     except Exception:
-        mtime_ns = 0
+        _CSV_CACHE.pop(path, None)
+        return []
     cached = _CSV_CACHE.get(path)
-    if cached and cached[0] == mtime_ns:
-        return cached[1]
-    rows: list[dict[str, Any]] = []
+    if cached and cached.mtime_ns == mtime_ns and cached.size == size and cached.ino == ino:
+        return cached.rows
     try:
-        with path.open('r', newline='', encoding='utf-8') as f:
-            reader = csv.DictReader(f)
-            fns = list(reader.fieldnames or [])
-            have_ce = 'ce' in fns; have_pe = 'pe' in fns
-            have_idx = 'index_price' in fns
-            have_iv = ('ce_iv' in fns) or ('pe_iv' in fns)
-            have_greeks = any(c in fns for c in (
-                'ce_delta','pe_delta','ce_theta','pe_theta','ce_vega','pe_vega','ce_gamma','pe_gamma','ce_rho','pe_rho'
-            ))
-            for r in reader:
-                ts_s = _parse_time_any(str(r.get('timestamp', '')).strip())
-                ts_ms = _parse_time_epoch_ms(str(r.get('timestamp', '')).strip())
-                obj: dict[str, Any] = {'time': ts_ms, 'ts': ts_ms, 'time_str': ts_s}
-                for col in ('tp','avg_tp'):
-                    val = r.get(col)
-                    if val is None or val == '':
-                        obj[col] = None
-                    else:
-                        try:
-                            obj[col] = float(val)
-                        except Exception:
-                            obj[col] = None
-                if have_ce:
-                    try:
-                        obj['ce'] = float(str(r.get('ce')))
-                    except Exception:
-                        obj['ce'] = None
-                if have_pe:
-                    try:
-                        obj['pe'] = float(str(r.get('pe')))
-                    except Exception:
-                        obj['pe'] = None
-                if have_idx:
-                    try:
-                        obj['index_price'] = float(str(r.get('index_price')))
-                    except Exception:
-                        obj['index_price'] = None
-                if have_iv:
-                    for col in ('ce_iv','pe_iv'):
-                        v = r.get(col)
-                        if v is None or v == '': obj[col] = None
-                        else:
-                            try: obj[col] = float(str(v))
-                            except Exception: obj[col] = None
-                if have_greeks:
-                    for col in ('ce_delta','pe_delta','ce_theta','pe_theta','ce_vega','pe_vega','ce_gamma','pe_gamma','ce_rho','pe_rho'):
-                        v = r.get(col)
-                        if v is None or v == '': obj[col] = None
-                        else:
-                            try: obj[col] = float(str(v))
-                            except Exception: obj[col] = None
-                rows.append(obj)
-        # Sort once and cache
-        try:
-            def _ts_key_val(rv: Any) -> int:
-                try:
-                    if rv is None:
-                        return -1
-                    return int(rv)
-                except Exception:
-                    return -1
-            rows.sort(key=lambda r: _ts_key_val(r.get('ts')))
-        except Exception:
-            # Defensive: ignore sort errors
-            pass
+        with path.open('rb') as f:
+            if cached and cached.ino == ino and size >= cached.offset:
+                head = f.read(len(cached.head))
+                if head == cached.head:
+                    # Tail append: parse only complete lines written since last read
+                    f.seek(cached.offset)
+                    chunk = f.read(size - cached.offset)
+                    cut = chunk.rfind(b'\n') + 1
+                    if cut:
+                        _fns, new_rows = _parse_csv_chunk(chunk[:cut], cached.fieldnames)
+                        if new_rows:
+                            in_order = all(_ts_sort_key(r) >= cached.last_ts for r in new_rows)
+                            cached.rows.extend(new_rows)
+                            if not in_order or any(
+                                _ts_sort_key(a) > _ts_sort_key(b) for a, b in pairwise(new_rows)
+                            ):
+                                cached.rows.sort(key=_ts_sort_key)
+                            cached.last_ts = _ts_sort_key(cached.rows[-1])
+                        cached.offset += cut
+                    cached.mtime_ns = mtime_ns
+                    cached.size = size
+                    return cached.rows
+            # Full (re)parse: first read, truncation, replacement or rewrite
+            f.seek(0)
+            data = f.read(size)
+        cut = data.rfind(b'\n') + 1
+        fns, rows = _parse_csv_chunk(data[:cut], None) if cut else ([], [])
+        if not fns:
+            # header line incomplete; retry on next call
+            _CSV_CACHE.pop(path, None)
+            return []
+        rows.sort(key=_ts_sort_key)
+        _CSV_CACHE[path] = _CsvTail(
+            ino=ino, mtime_ns=mtime_ns, size=size, offset=cut,
+            head=data[:min(cut, _CSV_HEAD_SAMPLE)], fieldnames=fns, rows=rows,
+            last_ts=_ts_sort_key(rows[-1]) if rows else -1,
+        )
+        return rows
     except Exception:
-        rows = []
-    _CSV_CACHE[path] = (mtime_ns, rows)
-    return rows
+        _CSV_CACHE.pop(path, None)
+        return []
 
 
 @asynccontextmanager
@@ -84,8 +84,13 @@ class MetricsCache:
     def _fetch(self) -> ParsedMetrics:
         ts = time.time()
         try:
-            with urllib.request.urlopen(self.endpoint, timeout=self.timeout) as resp:
-                text = resp.read().decode('utf-8', errors='replace')
+            from src.metrics.snapshot import read_snapshot  # lazy: avoid metrics package init at import
+            snap = read_snapshot(self.endpoint, timeout=self.timeout)
+            text = None
+            if snap is None:
+                # Exporter without the snapshot route: fall back to text exposition
+                with urllib.request.urlopen(self.endpoint, timeout=self.timeout) as resp:
+                    text = resp.read().decode('utf-8', errors='replace')
         except Exception as e:
             # Route network/endpoint fetch failure; caller will keep old data
             get_error_handler().handle_error(
@@ -101,15 +106,47 @@ class MetricsCache:
             # Raise to let caller's try/except path keep old data
             raise
         parsed: dict[str,list[MetricSample]] = {}
-        # DEBUG_CLEANUP_BEGIN: unknown line counter placeholder (no metrics registry in this process)
-        unknown_lines = 0
+        if snap is not None:
+            for name, series in snap.series.items():
+                parsed[name] = [MetricSample(value=v, labels=dict(k)) for k, v in series.items()]
+        else:
+            parsed = self._parse_text(text or '')
+        pm = ParsedMetrics(ts=ts, raw=parsed)
+        # DEBUG_CLEANUP_BEGIN: compute missing core metrics
+        expected = {
+            'g6_uptime_seconds','g6_collection_cycle_time_seconds','g6_options_processed_per_minute',
+            'g6_collection_success_rate_percent','g6_api_success_rate_percent','g6_cpu_usage_percent',
+            'g6_memory_usage_mb','g6_index_cycle_attempts','g6_index_cycle_success_percent',
+            'g6_index_options_processed','g6_index_options_processed_total'
+        }
+        present = set(parsed.keys())
+        pm.missing_core = sorted(list(expected - present))
+        # DEBUG_CLEANUP_END
+        try:
+            self._augment_stream(pm)
+            self._augment_storage(pm)
+            self._augment_errors(pm)
+        except Exception as e:
+            get_error_handler().handle_error(
+                e,
+                category=ErrorCategory.CALCULATION,
+                severity=ErrorSeverity.LOW,
+                component="web.metrics_cache",
+                function_name="_fetch",
+                message="Augmentation failed",
+                should_log=False,
+            )
+        return pm
+
+    @staticmethod
+    def _parse_text(text: str) -> dict[str, list[MetricSample]]:
+        parsed: dict[str,list[MetricSample]] = {}
         try:
             for line in text.splitlines():
                 if not line or line.startswith('#'):
                     continue
                 m = METRIC_LINE_RE.match(line)
                 if not m:
-                    unknown_lines += 1
                     continue
                 name = m.group('name')
                 labels_raw = m.group('labels')
@@ -132,32 +169,7 @@ class MetricsCache:
                 message="Failed parsing metrics response",
                 should_log=False,
             )
-        pm = ParsedMetrics(ts=ts, raw=parsed)
-        # DEBUG_CLEANUP_BEGIN: compute missing core metrics
-        expected = {
-            'g6_uptime_seconds','g6_collection_cycle_time_seconds','g6_options_processed_per_minute',
-            'g6_collection_success_rate_percent','g6_api_success_rate_percent','g6_cpu_usage_percent',
-            'g6_memory_usage_mb','g6_index_cycle_attempts','g6_index_cycle_success_percent',
-            'g6_index_options_processed','g6_index_options_processed_total'
-        }
-        present = set(parsed.keys())
-        pm.missing_core = sorted(list(expected - present))
-        # DEBUG_CLEANUP_END
-        try:
-            self._augment_stream(pm)
-            self._augment_storage(pm)
-            self._augment_errors(pm)
-        except Exception as e:
-            get_error_handler().handle_error(
-                e,
-                category=ErrorCategory.CALCULATION,
-                severity=ErrorSeverity.LOW,
-                component="web.metrics_cache",
-                function_name="_fetch",
-                message="Augmentation failed",
-                should_log=False,
-            )
-        return pm
+        return parsed
 
     def _augment_stream(self, pm: ParsedMetrics) -> None:
         """Compute rolling stream-style rows similar to terminal dashboard.
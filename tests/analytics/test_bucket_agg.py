@@ -0,0 +1,113 @@
+import random
+
+import pytest
+
+from src.analytics import bucket_agg
+from src.analytics.bucket_agg import BucketAggregator, get_buckets
+
+EDGES = (-20.0, -10.0, -5.0, 0.0, 5.0, 10.0, 20.0)
+
+
+def _legacy_label(buckets, m):
+    for i in range(len(buckets) - 1):
+        if buckets[i] <= m <= buckets[i + 1]:
+            return f"[{buckets[i]},{buckets[i+1]}]"
+    if m < buckets[0]:
+        return f"<-inf,{buckets[0]}]"
+    return f"[{buckets[-1]},+inf)"
+
+
+def _parse(row):
+    m = ((row["strike"] / row["underlying"]) - 1.0) * 100.0
+    return (row["index"], row["expiry"], m, (row["iv"], row["delta"]))
+
+
+def _rows(rng, n=400):
+    out = []
+    for i in range(n):
+        out.append({
+            "index": rng.choice(["NIFTY", "BANKNIFTY"]),
+            "expiry": rng.choice(["2025-01-30", "2025-02-27"]),
+            "strike": 100.0 + (i % 80) * 1.25,
+            "type": "CE" if i % 2 else "PE",
+            "symbol": f"S{i}",
+            "underlying": 125.0,
+            "iv": rng.uniform(0.1, 0.4),
+            "delta": rng.uniform(-1, 1),
+        })
+    return out
+
+
+def _snapshot(agg):
+    return {(i, e, b): (tuple(round(v, 9) for v in s), c) for i, e, b, s, c in agg.groups()}
+
+
+@pytest.mark.parametrize("m", [-25.0, -20.0, -10.0, -7.5, 0.0, 4.99, 20.0, 20.01])
+def test_bucket_lookup_matches_linear_scan(m):
+    b = get_buckets(EDGES)
+    assert b.labels[b.index_of(m)] == _legacy_label(list(EDGES), m)
+
+
+def test_labels_interned_and_shared():
+    assert get_buckets(EDGES) is get_buckets(EDGES)
+    assert get_buckets(EDGES).finite_labels[0] == "[-20.0,-10.0]"
+
+
+def test_incremental_matches_full_rebuild():
+    rng = random.Random(11)
+    rows = _rows(rng)
+    inc = BucketAggregator(get_buckets(EDGES), 2, _parse)
+    inc.update(rows)
+    for _ in range(5):
+        for r in rng.sample(rows, 40):
+            r["iv"] = rng.uniform(0.1, 0.4)
+            r["underlying"] = rng.choice([120.0, 125.0, 130.0])
+        rows = rows[10:]  # some options drop out
+        _, changed = inc.update(rows)
+        assert 0 < changed < len(rows)
+        full = BucketAggregator(get_buckets(EDGES), 2, _parse)
+        full.update(rows)
+        assert _snapshot(inc) == _snapshot(full)
+
+
+def test_unchanged_cycle_touches_nothing_and_cap_applies():
+    rows = _rows(random.Random(3), n=50)
+    agg = BucketAggregator(get_buckets(EDGES), 2, _parse)
+    assert agg.update(rows) == (50, 50)
+    assert agg.update(rows) == (50, 0)
+    processed, changed = agg.update(rows, max_rows=20)
+    assert processed == 20 and changed == 30
+    assert sum(c for *_, c in agg.groups()) == 20
+
+
+def test_scalar_path_without_numpy(monkeypatch):
+    rows = _rows(random.Random(5), n=60)
+    expected = BucketAggregator(get_buckets(EDGES), 2, _parse)
+    expected.update(rows)
+    monkeypatch.setattr(bucket_agg, "AVAILABLE", False)
+    agg = BucketAggregator(get_buckets(EDGES), 2, _parse)
+    agg.update(rows)
+    assert _snapshot(agg) == _snapshot(expected)
+
+
+def test_concurrent_surface_builds_do_not_mix(monkeypatch):
+    import threading
+
+    from src.analytics import vol_surface
+
+    monkeypatch.setenv("G6_VOL_SURFACE", "1")
+    monkeypatch.setattr("src.metrics.get_metrics", lambda: None)  # keep the metrics server out of it
+    snaps = [_rows(random.Random(seed), n=200) for seed in range(4)]
+    expected = [sum(r["count"] for r in vol_surface.build_surface(s)["data"]) for s in snaps]
+    got = [None] * len(snaps)
+
+    def run(i):
+        for _ in range(20):
+            got[i] = sum(r["count"] for r in vol_surface.build_surface(snaps[i])["data"])
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(len(snaps))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert got == expected
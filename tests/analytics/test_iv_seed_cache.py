@@ -0,0 +1,72 @@
+import datetime as dt
+
+import pytest
+
+from src.analytics.iv_seed_cache import IVSeedCache, contract_key
+from src.analytics.option_greeks import OptionGreeks
+from src.collectors.helpers.iv_greeks import iv_estimation_block
+
+
+def test_lru_eviction_and_hit_counts():
+    cache = IVSeedCache(max_entries=2)
+    cache.put_many([("a", 0.1), ("b", 0.2)])
+    assert cache.get("a") == 0.1  # refreshes a
+    cache.put("c", 0.3)  # evicts b (least recent)
+    assert cache.get_many(["a", "b", "c"]) == [0.1, None, 0.3]
+    st = cache.stats()
+    assert st["evictions"] == 1 and st["hits"] == 3 and st["misses"] == 1
+
+
+def test_day_rollover_clears_seeds():
+    day = [dt.date(2025, 1, 6)]
+    cache = IVSeedCache(today=lambda: day[0])
+    cache.put(contract_key("NIFTY", dt.date(2025, 1, 9), 22000, "ce"), 0.15)
+    assert cache.get(("NIFTY", "2025-01-09", 22000.0, "CE")) == 0.15
+    day[0] = dt.date(2025, 1, 7)
+    assert cache.get(("NIFTY", "2025-01-09", 22000.0, "CE")) is None
+    assert len(cache) == 0
+
+
+def test_rational_guess_close_to_true_vol():
+    og = OptionGreeks()
+    S, T = 22000.0, 20 / 365
+    for K in (21500.0, 22000.0, 22500.0):
+        for is_call in (True, False):
+            px = og.black_scholes(is_call, S, K, T, sigma=0.16)["price"]
+            guess = og.rational_initial_guess(is_call, S, K, T, px, og.risk_free_rate)
+            assert guess == pytest.approx(0.16, abs=0.02)
+
+
+def test_warm_start_cuts_iterations(monkeypatch):
+    import src.analytics.iv_seed_cache as mod
+
+    monkeypatch.setattr(mod, "_CACHE", IVSeedCache())
+    og = OptionGreeks()
+    spot, T = 22000.0, 10 / 365
+
+    def chain(sigma):
+        out = {}
+        for K in range(21000, 23050, 50):
+            for typ in ("CE", "PE"):
+                px = og.black_scholes(typ == "CE", spot, float(K), T, sigma=sigma)["price"]
+                out[f"{K}{typ}"] = {"strike": K, "instrument_type": typ, "last_price": px}
+        return out
+
+    class Hist:
+        def __init__(self):
+            self.obs = {}
+
+        def labels(self, index, seed):
+            return type("C", (), {"observe": lambda _s, v: self.obs.setdefault(seed, []).append(v)})()
+
+    class Ctx:
+        metrics = type("M", (), {})()
+
+    ctx = Ctx()
+    ctx.metrics.iv_seed_iterations_histogram = Hist()
+    iv_estimation_block(ctx, chain(0.18), "NIFTY", "this_week", T, spot, og, True, None, 100, 0.01, 5.0, 1e-5)
+    # next cycle: vol moved slightly, every contract now has a seed
+    iv_estimation_block(ctx, chain(0.182), "NIFTY", "this_week", T, spot, og, True, None, 100, 0.01, 5.0, 1e-5)
+    obs = ctx.metrics.iv_seed_iterations_histogram.obs
+    assert obs.get("cold") and obs.get("warm")
+    assert sum(obs["warm"]) / len(obs["warm"]) < sum(obs["cold"]) / len(obs["cold"])
@@ -0,0 +1,87 @@
+import random
+
+import numpy as np
+
+from src.analytics.option_chain import (
+    OptionChainAnalytics,
+    max_pain_from_arrays,
+    prepare_chain_arrays,
+    writer_pain,
+)
+
+
+class _Provider:
+    def __init__(self, atm, oi):
+        self.atm = atm
+        self.oi = oi  # (strike, 'CE'|'PE') -> oi
+        self.fetches = 0
+
+    def get_atm_strike(self, index_symbol):
+        return self.atm
+
+    def option_instruments(self, index_symbol, expiry_date, strikes):
+        self.fetches += 1
+        return [
+            {"tradingsymbol": f"X{int(k)}{t}", "strike": k, "instrument_type": t, "expiry": expiry_date}
+            for (k, t) in self.oi
+        ]
+
+    def get_quote(self, keys):
+        return {
+            f"NFO:X{int(k)}{t}": {"oi": oi, "volume": oi // 10}
+            for (k, t), oi in self.oi.items()
+        }
+
+
+def _brute_force_pain(strikes, call_oi, put_oi):
+    out = []
+    for p in strikes:
+        out.append(
+            sum(c * (p - k) for k, c in zip(strikes, call_oi, strict=True) if p > k)
+            + sum(q * (k - p) for k, q in zip(strikes, put_oi, strict=True) if p < k)
+        )
+    return np.array(out, dtype=float)
+
+
+def _chain(seed=7, n=81):
+    rng = random.Random(seed)
+    strikes = [20000.0 + 50 * i for i in range(n)]
+    oi = {}
+    for k in strikes:
+        oi[(k, "CE")] = rng.randint(0, 100_000)
+        if rng.random() > 0.1:  # some strikes have no put leg
+            oi[(k, "PE")] = rng.randint(0, 100_000)
+    return strikes, oi
+
+
+def test_writer_pain_matches_brute_force():
+    strikes, oi = _chain()
+    provider = _Provider(22000.0, oi)
+    df = OptionChainAnalytics(provider).fetch_option_chain("NIFTY", "2025-01-30", (20000, 24000))
+    arrays = prepare_chain_arrays(df)
+    call_oi = [oi.get((k, "CE"), 0) for k in strikes]
+    put_oi = [oi.get((k, "PE"), 0) for k in strikes]
+    expected = _brute_force_pain(strikes, call_oi, put_oi)
+    assert np.allclose(writer_pain(arrays), expected)
+    assert max_pain_from_arrays(arrays) == strikes[int(np.argmin(expected))]
+
+
+def test_analyze_expiries_single_fetch_per_expiry():
+    _, oi = _chain(seed=3)
+    provider = _Provider(22000.0, oi)
+    analytics = OptionChainAnalytics(provider)
+    res = analytics.analyze_expiries("NIFTY", ["2025-01-30", "2025-02-06"])
+    assert provider.fetches == 2
+    row = res["2025-01-30"]
+    assert row["max_pain"] == analytics.calculate_max_pain("NIFTY", "2025-01-30")
+    assert row["support"] == analytics.calculate_support_resistance("NIFTY", "2025-01-30")["support"]
+    assert all(k < 22000.0 for k in row["support"]) and all(k > 22000.0 for k in row["resistance"])
+    assert row["oi_pcr"] > 0
+
+
+def test_empty_chain_defaults():
+    provider = _Provider(22000.0, {})
+    analytics = OptionChainAnalytics(provider)
+    assert analytics.calculate_max_pain("NIFTY", "2025-01-30") == 22000.0
+    assert analytics.calculate_pcr("NIFTY", "2025-01-30") == {"oi_pcr": 0.0, "volume_pcr": 0.0}
+    assert analytics.calculate_support_resistance("NIFTY", "2025-01-30") == {"support": [], "resistance": []}
@@ -0,0 +1,99 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.analytics import option_greeks_batch as batch
+from src.analytics.option_greeks import OptionGreeks
+from src.collectors.helpers.greeks import compute_greeks_block
+from src.collectors.helpers.iv_greeks import iv_estimation_block
+
+
+def _ladder():
+    spot = 22000.0
+    strikes = np.repeat(np.arange(20000.0, 24050.0, 50.0), 2)
+    calls = np.tile([True, False], strikes.size // 2)
+    sigma = 0.12 + 0.3 * np.abs(np.log(strikes / spot))
+    return spot, strikes, calls, sigma
+
+
+def test_norm_cdf_fallback_matches_erf(monkeypatch):
+    monkeypatch.setattr(batch, "_ndtr", None)
+    xs = np.linspace(-12, 12, 2001)
+    ref = np.array([0.5 * (1.0 + math.erf(x / math.sqrt(2))) for x in xs])
+    assert np.max(np.abs(batch.norm_cdf(xs) - ref)) < 1e-13
+
+
+def test_black_scholes_batch_matches_scalar():
+    og = OptionGreeks()
+    spot, strikes, calls, sigma = _ladder()
+    T = 7 / 365
+    out = og.black_scholes_batch(calls, spot, strikes, T, sigma=sigma)
+    for i in range(0, strikes.size, 7):
+        ref = og.black_scholes(bool(calls[i]), spot, float(strikes[i]), T, sigma=float(sigma[i]))
+        for key, val in ref.items():
+            assert out[key][i] == pytest.approx(val, rel=1e-9, abs=1e-9)
+
+
+def test_black_scholes_batch_expired_is_intrinsic():
+    og = OptionGreeks()
+    out = og.black_scholes_batch([True, False], 100.0, [90.0, 90.0], 0.0, sigma=0.2)
+    assert out["price"].tolist() == [10.0, 0.0]
+    assert out["delta"].tolist() == [1.0, 0.0]
+    assert out["gamma"].tolist() == [0.0, 0.0]
+
+
+def test_implied_volatility_batch_matches_scalar_solver():
+    og = OptionGreeks()
+    spot, strikes, calls, sigma = _ladder()
+    T = 14 / 365
+    prices = og.black_scholes_batch(calls, spot, strikes, T, sigma=sigma)["price"]
+    iv, iters = og.implied_volatility_batch(calls, spot, strikes, T, prices, return_iterations=True)
+    assert iv.shape == strikes.shape and iters.shape == strikes.shape
+    for i in range(strikes.size):
+        ref_iv, ref_iters = og.implied_volatility(bool(calls[i]), spot, float(strikes[i]), T, float(prices[i]), return_iterations=True)
+        if prices[i] > 1.0:
+            assert iv[i] == pytest.approx(ref_iv, abs=1e-6)
+            assert abs(iv[i] - sigma[i]) < 1e-3
+        if ref_iters and prices[i] > 0.01:
+            assert iters[i] <= ref_iters
+
+
+def test_implied_volatility_batch_edge_cases():
+    og = OptionGreeks()
+    iv, iters = og.implied_volatility_batch(
+        [True, True, False], 100.0, [100.0, 100.0, 90.0], [0.0, 0.1, 0.1], [5.0, 0.005, 200.0],
+        min_iv=0.01, max_iv=5.0, return_iterations=True,
+    )
+    assert iv[0] == 0.0 and iters[0] == 0
+    assert iv[1] == 0.01 and iters[1] == 0
+    # unattainable price: bracket collapses onto max_iv without exhausting max_iterations
+    assert iv[2] == pytest.approx(5.0) and 0 < iters[2] < 100
+
+
+def _enriched(og, spot, T):
+    data = {}
+    for strike in (21800.0, 22000.0, 22200.0):
+        for typ in ("CE", "PE"):
+            px = og.black_scholes(typ == "CE", spot, strike, T, sigma=0.18)["price"]
+            data[f"X{int(strike)}{typ}"] = {"strike": strike, "instrument_type": typ, "last_price": px}
+    return data
+
+
+class _Ctx:
+    metrics = None
+
+
+@pytest.mark.parametrize("vectorized", ["1", "0"])
+def test_helpers_fill_iv_and_greeks(monkeypatch, vectorized):
+    monkeypatch.setenv("G6_GREEKS_VECTORIZED", vectorized)
+    og = OptionGreeks()
+    spot, T = 22000.0, 10 / 365
+    enriched = _enriched(og, spot, T)
+    iv_estimation_block(_Ctx(), enriched, "NIFTY", "this_week", T, spot, og, True, 0.05, 100, 0.01, 5.0, 1e-5)
+    compute_greeks_block(_Ctx(), enriched, "NIFTY", "this_week", T, spot, og, 0.05, True, None, {})
+    for row in enriched.values():
+        assert row["iv"] == pytest.approx(0.18, abs=1e-3)
+        ref = og.black_scholes(row["instrument_type"] == "CE", spot, row["strike"], T, sigma=row["iv"])
+        assert row["delta"] == pytest.approx(ref["delta"], rel=1e-9)
+        assert row["vega"] > 0
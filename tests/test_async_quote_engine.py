@@ -0,0 +1,96 @@
+"""AsyncQuoteEngine: chunking at the broker limit, bounded in-flight, token-bucket gating."""
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from src.collectors.async_providers import AsyncProviders
+from src.providers.async_quote_engine import KITE_QUOTE_MAX_INSTRUMENTS, AsyncQuoteEngine
+from src.providers.rate_limiter import TokenBucket
+
+
+def _syms(n, root='NIFTY'):
+    return [('NFO', f'{root}{i}CE') for i in range(n)]
+
+
+class _Broker:
+    def __init__(self, delay=0.02, fail_on=None):
+        self.delay = delay
+        self.calls: list[int] = []
+        self.in_flight = 0
+        self.peak = 0
+        self.fail_on = fail_on
+
+    async def get_quote(self, chunk):
+        self.calls.append(len(chunk))
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if self.fail_on and any(s == self.fail_on for _, s in chunk):
+                raise RuntimeError('boom')
+            return {f'{e}:{s}': {'last_price': 1.0} for e, s in chunk}
+        finally:
+            self.in_flight -= 1
+
+
+def test_chunks_at_broker_limit_and_merges():
+    b = _Broker(delay=0)
+    eng = AsyncQuoteEngine(b.get_quote, chunk_size=10_000, max_in_flight=8)
+    assert eng.chunk_size == KITE_QUOTE_MAX_INSTRUMENTS
+    syms = _syms(1200) + _syms(5)  # duplicates collapse
+    out = asyncio.run(eng.fetch(syms))
+    assert len(out) == 1200
+    assert sorted(b.calls) == [200, 500, 500]
+    assert eng.last_stats['chunks'] == 3 and eng.last_stats['failed_chunks'] == 0
+
+
+def test_in_flight_bound_and_concurrency():
+    b = _Broker(delay=0.05)
+    eng = AsyncQuoteEngine(b.get_quote, chunk_size=10, max_in_flight=3)
+    t0 = time.perf_counter()
+    out = asyncio.run(eng.fetch(_syms(60)))
+    elapsed = time.perf_counter() - t0
+    assert len(out) == 60
+    assert b.peak == 3
+    assert elapsed < 6 * 0.05  # 6 chunks in 2 waves, not serial
+
+
+def test_rate_limiter_paces_requests():
+    b = _Broker(delay=0)
+    eng = AsyncQuoteEngine(b.get_quote, chunk_size=10, max_in_flight=8, limiter=TokenBucket(rate=20, burst=2))
+    t0 = time.perf_counter()
+    asyncio.run(eng.fetch(_syms(60)))
+    # 2 burst tokens, 4 more at 20/s -> ~0.2s
+    assert time.perf_counter() - t0 >= 0.15
+
+
+def test_partial_failure_merges_and_total_failure_raises():
+    b = _Broker(delay=0, fail_on='NIFTY3CE')
+    eng = AsyncQuoteEngine(b.get_quote, chunk_size=2, max_in_flight=4)
+    out = asyncio.run(eng.fetch(_syms(6)))
+    assert len(out) == 4 and eng.last_stats['failed_chunks'] == 1
+    with pytest.raises(RuntimeError):
+        asyncio.run(eng.fetch(_syms(4)[2:]))
+
+
+def test_async_providers_fan_out():
+    b = _Broker(delay=0)
+    ap = AsyncProviders(b)
+    ap.quote_engine.chunk_size = 3
+    inst = [{'tradingsymbol': s, 'exchange': e} for e, s in _syms(7)]
+    enriched = asyncio.run(ap.enrich_with_quotes(inst))
+    assert len(enriched) == 7 and sorted(b.calls) == [1, 3, 3]
+
+
+def test_async_providers_engine_uses_provider_limiter():
+    b = _Broker(delay=0)
+    b.limiter = TokenBucket(rate=20, burst=2)
+    ap = AsyncProviders(b)
+    ap.quote_engine.chunk_size = 10
+    t0 = time.perf_counter()
+    asyncio.run(ap.quote_engine.fetch(_syms(60)))
+    assert ap.quote_engine._limiter is b.limiter
+    assert time.perf_counter() - t0 >= 0.15
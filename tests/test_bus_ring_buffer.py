@@ -0,0 +1,80 @@
+"""Ring-buffer backed buses: bounded retention across wraparound and condition-variable polling."""
+from __future__ import annotations
+
+import threading
+import time
+
+from src.bus.in_memory_bus import InMemoryBus
+from src.events.event_bus import EventBus
+
+
+def test_in_memory_bus_wraparound_and_batches():
+    bus = InMemoryBus('ring', max_retained=4)
+    for i in range(10):
+        bus.publish('t', {'i': i})
+    assert (bus.head_id(), bus.tail_id()) == (6, 9)
+    sub = bus.subscribe(from_id=0)
+    assert [e.id for e in sub.poll(batch_size=3)] == [6, 7, 8]
+    assert [e.id for e in sub.poll()] == [9]
+    assert sub.poll() == []
+
+
+def test_in_memory_bus_filter_advances_past_skipped_events():
+    bus = InMemoryBus('ring_filter')
+    sub = bus.subscribe(filter_fn=lambda t: t == 'keep')
+    bus.publish('drop', {})
+    bus.publish('keep', {})
+    assert [e.type for e in sub.poll()] == ['keep']
+    bus.publish('drop', {})
+    assert sub.poll() == []
+    assert sub._next_id == 3
+
+
+def test_in_memory_bus_poll_wakes_on_publish():
+    bus = InMemoryBus('ring_wait')
+    sub = bus.subscribe()
+    threading.Timer(0.05, lambda: bus.publish('late', {})).start()
+    t0 = time.perf_counter()
+    got = sub.poll(timeout=5.0)
+    assert [e.type for e in got] == ['late']
+    assert time.perf_counter() - t0 < 2.0
+
+
+def test_event_bus_ring_coalesce_and_wraparound():
+    bus = EventBus(max_events=8)
+    for i in range(5):
+        bus.publish('panel_diff', {'i': i})
+    bus.publish('panel_full', {'v': 1}, coalesce_key='full')
+    bus.publish('panel_full', {'v': 2}, coalesce_key='full')
+    assert [e.event_id for e in bus.get_since(0)] == [1, 2, 3, 4, 5, 7]
+    for i in range(4):
+        bus.publish('panel_diff', {'i': i})
+    # Count-based retention: the coalesced id frees room for an older event
+    ids = [e.event_id for e in bus.get_since(0)]
+    assert ids == [3, 4, 5, 7, 8, 9, 10, 11]
+    assert len(bus._events) == bus._max_events
+    assert [e.event_id for e in bus.get_since(7, limit=2)] == [8, 9]
+    assert bus.stats_snapshot()['oldest_id'] == 3 and bus.stats_snapshot()['backlog'] == 8
+    assert bus.latest_full_snapshot()['v'] == 2
+
+
+def test_event_bus_wait_for():
+    bus = EventBus(max_events=16)
+    assert bus.wait_for(0, 0.01) is False
+    threading.Timer(0.05, lambda: bus.publish('panel_diff', {})).start()
+    assert bus.wait_for(0, 5.0) is True
+    assert bus.wait_for(1, 0) is False
+
+
+def test_event_bus_since_limit_from_either_end():
+    bus = EventBus(max_events=64)
+    for i in range(40):
+        bus.publish('panel_diff', {'i': i}, coalesce_key=f'k{i % 3}' if i % 5 == 0 else None)
+    ids = [e.event_id for e in bus.get_since(0)]
+    for last in (0, 3, 10, 20, 30, 38, 40):
+        for limit in (None, 1, 2, 5, 100):
+            want = [i for i in ids if i > last]
+            if limit is not None:
+                want = want[:limit]
+            assert [e.event_id for e in bus.get_since(last, limit=limit)] == want
+    assert bus.stats_snapshot()['oldest_id'] == ids[0]
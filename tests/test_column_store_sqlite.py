@@ -0,0 +1,126 @@
+"""ColumnStorePipeline with the embedded SQLite backend: bulk insert, retry, spill/replay."""
+from __future__ import annotations
+
+import sqlite3
+
+from src.column_store.pipeline import ColumnStorePipeline, PipelineConfig
+from src.column_store.writers import SpillStore, SQLiteWriter
+
+
+def _cfg(tmp_path, **kw) -> PipelineConfig:
+    base = dict(
+        enabled=False, table='t_agg', batch_rows=4, max_latency_ms=60000,
+        path=str(tmp_path / 'cs.sqlite'), spill_dir=str(tmp_path / 'spill'),
+        max_retries=2, retry_backoff_ms=1,
+    )
+    base.update(kw)
+    return PipelineConfig(**base)
+
+
+def _rows(db, table='t_agg'):
+    con = sqlite3.connect(db)
+    try:
+        return con.execute(f'SELECT * FROM {table} ORDER BY ts').fetchall()
+    finally:
+        con.close()
+
+
+def test_writer_schema_evolution_and_bytes(tmp_path):
+    w = SQLiteWriter(str(tmp_path / 'w.sqlite'))
+    total = w.write_batch('x', [{'ts': i, 'v': i * 1.5, 'name': f'n{i}'} for i in range(500)])
+    total += w.write_batch('x', [{'ts': 1000, 'extra': {'a': 1}}])
+    assert total > 0 and total % 512 == 0  # page-granular encoded growth
+    cols = [r[1] for r in w.query('PRAGMA table_info(x)')]
+    assert cols == ['ts', 'v', 'name', 'extra']
+    assert w.query('SELECT count(*), sum(v) FROM x')[0] == (501, sum(i * 1.5 for i in range(500)))
+    assert w.query('SELECT extra FROM x WHERE ts=1000')[0][0] == '{"a":1}'
+    w.close()
+
+
+def test_pipeline_bulk_insert(tmp_path):
+    cfg = _cfg(tmp_path)
+    p = ColumnStorePipeline(cfg)
+    cfg.enabled = True  # enqueue without the background thread
+    for i in range(3):
+        p.enqueue({'ts': i, 'oi': 10 * i})
+    p.flush()  # below batch_rows and latency: not due
+    p.enqueue({'ts': 3, 'oi': 30})
+    p.flush()
+    assert _rows(cfg.path) == [(0, 0), (1, 10), (2, 20), (3, 30)]
+    p.shutdown()
+
+
+def test_failed_batch_retried_then_spilled_and_replayed(tmp_path):
+    cfg = _cfg(tmp_path)
+    p = ColumnStorePipeline(cfg)
+    cfg.enabled = True
+    calls: list[int] = []
+    p.install_failure_hook(lambda batch: calls.append(len(batch)) or 'simulated')
+    for i in range(4):
+        p.enqueue({'ts': i})
+    p.flush()
+    assert calls == [4, 4, 4]  # initial attempt + max_retries
+    assert p.backlog_rows == 4 and len(p._spill.segments()) == 1
+    # Backend recovers: spilled segment is replayed on the next flush
+    p.install_failure_hook(lambda batch: None)
+    p.flush(force=True)
+    assert p.backlog_rows == 0 and p._spill.segments() == []
+    assert [r[0] for r in _rows(cfg.path)] == [0, 1, 2, 3]
+    p.shutdown()
+
+
+def test_high_watermark_spills_to_disk(tmp_path):
+    cfg = _cfg(tmp_path, batch_rows=1000, high_watermark_rows=5, low_watermark_rows=2)
+    p = ColumnStorePipeline(cfg)
+    cfg.enabled = True
+    for i in range(7):
+        p.enqueue({'ts': i})
+    assert len(p._buf.rows) == 2 and p._spilled_rows == 5
+    assert p._backpressure
+    p.flush(force=True)
+    assert p.backlog_rows == 0 and not p._backpressure
+    assert sorted(r[0] for r in _rows(cfg.path)) == list(range(7))
+    p.shutdown()
+    # A restarted pipeline picks up leftover segments (checked on the store: the
+    # restarted pipeline's ingest thread may replay them immediately)
+    p._spill.spill([{'ts': 99}])
+    assert SpillStore(cfg.spill_dir, cfg.table).pending_rows() == 1
+    p2 = ColumnStorePipeline(_cfg(tmp_path, enabled=True))
+    p2.shutdown()
+    assert p2.backlog_rows == 0
+    assert 99 in [r[0] for r in _rows(cfg.path)]
+
+
+def test_failures_counted_once_per_batch(tmp_path, monkeypatch):
+    from src.column_store import pipeline as pl
+
+    failures: list[str] = []
+
+    class _Counter:
+        def __init__(self, reason):
+            self.reason = reason
+
+        def inc(self, *_a):
+            failures.append(self.reason)
+
+    monkeypatch.setattr(pl.m, 'm_cs_ingest_failures_total_labels', lambda table, reason: _Counter(reason), raising=False)
+    cfg = _cfg(tmp_path)
+    p = ColumnStorePipeline(cfg)
+    cfg.enabled = True
+    p.install_failure_hook(lambda batch: 'simulated')
+    for i in range(4):
+        p.enqueue({'ts': i})
+    p.flush()
+    assert failures == ['simulated']
+    p.shutdown()
+
+
+def test_replayed_segment_is_idempotent(tmp_path):
+    w = SQLiteWriter(str(tmp_path / 'w.sqlite'))
+    rows = [{'ts': 1}, {'ts': 2}]
+    assert w.write_batch('x', rows, batch_id='seg-1') > 0
+    # Crash after the insert but before the segment was removed: replay is a no-op
+    assert w.write_batch('x', rows, batch_id='seg-1') == 0
+    w.write_batch('x', [{'ts': 3}], batch_id='seg-2')
+    assert w.query('SELECT ts FROM x ORDER BY ts') == [(1,), (2,), (3,)]
+    w.close()
@@ -0,0 +1,108 @@
+import csv
+import datetime as dt
+import os
+
+import pytest
+
+from src.storage.close_manifest import load_closes, manifest_path, read_last_row
+from src.storage.csv_sink import CsvSink
+
+
+def _opts(strikes, px):
+    out = {}
+    for k in strikes:
+        for t in ('CE', 'PE'):
+            out[f'NIFTY{k}{t}'] = {'strike': k, 'instrument_type': t, 'last_price': px, 'volume': 10, 'oi': 100, 'avg_price': px}
+    return out
+
+
+def _write_day(base, day, prices):
+    sink = CsvSink(base_dir=str(base))
+    for i, px in enumerate(prices):
+        ts = dt.datetime.combine(day, dt.time(10, i, 0))
+        sink.write_options_data('NIFTY', dt.date(2025, 9, 30), _opts([24900, 25000, 25100], px), ts,
+                                index_price=25000.0 + px, expiry_rule_tag='this_week')
+    return sink
+
+
+def _rows(path):
+    with open(path, newline='') as fh:
+        return list(csv.DictReader(fh))
+
+
+@pytest.mark.parametrize('block_size', [7, 64, 8192])
+@pytest.mark.parametrize('body', ['1,2\n3,4\n', '1,2\n3,4', '1,2\n3,4\n\n\n', '5,6\n', '', '"x,y",2\r\n"q",9\r\n'])
+def test_read_last_row_matches_dictreader(tmp_path, body, block_size):
+    p = tmp_path / 'f.csv'
+    p.write_bytes(('a,b\n' + body).encode())
+    rows = _rows(p)
+    expected = dict(rows[-1]) if rows else None
+    assert read_last_row(str(p), block_size=block_size) == expected
+
+
+@pytest.mark.parametrize('use_manifest', [True, False])
+def test_prev_close_from_manifest_or_tail(tmp_path, monkeypatch, use_manifest):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    day1, day2 = dt.date(2025, 9, 25), dt.date(2025, 9, 26)
+    _write_day(tmp_path, day1, [10.0, 11.0, 12.5]).close()
+    closes = load_closes(str(tmp_path), day1.isoformat())
+    assert closes is not None
+    assert closes['series']['NIFTY|this_week|0'] == pytest.approx(25.0)
+    assert closes['overview']['NIFTY']['index_price'] == pytest.approx(25012.5)
+    if not use_manifest:
+        os.remove(manifest_path(str(tmp_path), day1.isoformat()))
+    _write_day(tmp_path, day2, [14.0])
+    row = _rows(tmp_path / 'NIFTY' / 'this_week' / '0' / f'{day2}.csv')[-1]
+    assert float(row['tp_net_change']) == pytest.approx(28.0 - 25.0)
+    ov = _rows(tmp_path / 'overview' / 'NIFTY' / f'{day2}.csv')[-1]
+    assert float(ov['index_net_change']) == pytest.approx(14.0 - 12.5)
+
+
+def test_day_rollover_writes_manifest_before_lookup(tmp_path, monkeypatch):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    sink = _write_day(tmp_path, dt.date(2025, 9, 25), [10.0])
+    assert load_closes(str(tmp_path), '2025-09-25') is None
+    sink.write_options_data('NIFTY', dt.date(2025, 9, 30), _opts([25000], 12.0), dt.datetime(2025, 9, 26, 9, 20),
+                            index_price=25012.0, expiry_rule_tag='this_week')
+    assert load_closes(str(tmp_path), '2025-09-25')['series']['NIFTY|this_week|+100'] == pytest.approx(20.0)
+
+
+def test_stale_manifest_falls_back_to_file_tail(tmp_path, monkeypatch):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    day1, day2 = dt.date(2025, 9, 25), dt.date(2025, 9, 26)
+    _write_day(tmp_path, day1, [10.0]).close()
+    # A later row lands in day1's files after its manifest was written
+    late = CsvSink(base_dir=str(tmp_path))
+    late.write_options_data('NIFTY', dt.date(2025, 9, 30), _opts([24900, 25000, 25100], 12.5),
+                            dt.datetime.combine(day1, dt.time(15, 29)), index_price=25012.5, expiry_rule_tag='this_week')
+    assert load_closes(str(tmp_path), day1.isoformat())['series']['NIFTY|this_week|0'] == pytest.approx(20.0)
+    _write_day(tmp_path, day2, [14.0])
+    row = _rows(tmp_path / 'NIFTY' / 'this_week' / '0' / f'{day2}.csv')[-1]
+    assert float(row['tp_net_change']) == pytest.approx(28.0 - 25.0)
+    ov = _rows(tmp_path / 'overview' / 'NIFTY' / f'{day2}.csv')[-1]
+    assert float(ov['index_net_change']) == pytest.approx(14.0 - 12.5)
+
+
+def test_exit_hook_does_not_keep_sinks_alive(tmp_path, monkeypatch):
+    import gc
+    import weakref
+
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    ref = weakref.ref(CsvSink(base_dir=str(tmp_path)))
+    gc.collect()
+    assert ref() is None
+
+
+def test_pooled_sink_not_pinned_by_exit_hook(tmp_path, monkeypatch):
+    import gc
+    import weakref
+
+    from src.storage import csv_sink as csv_sink_mod
+
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '1')
+    sink = CsvSink(base_dir=str(tmp_path))
+    assert sink in csv_sink_mod._CLOSE_AT_EXIT
+    ref = weakref.ref(sink)
+    del sink
+    gc.collect()
+    assert ref() is None
@@ -0,0 +1,66 @@
+import datetime as dt
+import os
+
+from src.storage.csv_sink import CsvSink
+from src.storage.file_buffer_manager import FileBufferManager
+
+
+def _opts(strikes, px):
+    out = {}
+    for k in strikes:
+        for t in ('CE', 'PE'):
+            out[f'NIFTY{k}{t}'] = {'strike': k, 'instrument_type': t, 'last_price': px, 'volume': 10, 'oi': 100, 'avg_price': px}
+    return out
+
+
+def _run_cycles(base, monkeypatch, pool):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '1' if pool else '0')
+    monkeypatch.setenv('G6_CSV_FSYNC_INTERVAL', '0')
+    sink = CsvSink(base_dir=str(base))
+    expiry = dt.date(2025, 9, 30)
+    for i in range(3):
+        ts = dt.datetime(2025, 9, 26, 10, i, 0)
+        sink.write_options_data('NIFTY', expiry, _opts([24900, 25000, 25100], 10.0 + i), ts,
+                                index_price=25000.0, suppress_overview=True, expiry_rule_tag='this_week')
+    return sink
+
+
+def _tree(base):
+    out = {}
+    for root, _dirs, files in os.walk(base):
+        for fn in files:
+            if fn.endswith('.csv') and 'overview' not in root:
+                with open(os.path.join(root, fn)) as fh:
+                    out[os.path.relpath(os.path.join(root, fn), base)] = fh.read()
+    return out
+
+
+def test_pool_mode_matches_legacy_output(tmp_path, monkeypatch):
+    _run_cycles(tmp_path / 'legacy', monkeypatch, pool=False)
+    sink = _run_cycles(tmp_path / 'pool', monkeypatch, pool=True)
+    pool = sink._writer_pool
+    assert pool is not None
+    # rows are on disk after each call without closing the handles
+    legacy, pooled = _tree(tmp_path / 'legacy'), _tree(tmp_path / 'pool')
+    assert legacy and pooled == legacy
+    assert pool.stats['opens'] == len(pooled)
+    assert not [f for _r, _d, fs in os.walk(tmp_path / 'pool') for f in fs if f.endswith('.lock')]
+    sink.close()
+    assert len(pool) == 0
+
+
+def test_buffer_manager_lru_and_fsync(tmp_path):
+    mgr = FileBufferManager(max_open_files=2, flush_interval_seconds=3600, fsync_interval_seconds=0.1)
+    mgr._last_fsync = 0.0
+    paths = [str(tmp_path / 'd' / f'{i}.csv') for i in range(3)]
+    for p in paths:
+        mgr.write_rows(p, [[1, 2]], header=['a', 'b'])
+    assert len(mgr) == 2 and mgr.stats['evictions'] == 1
+    # evicted file had its pending rows written before close
+    assert open(paths[0]).read().splitlines() == ['a,b', '1,2']
+    mgr.flush_all(force=False)
+    assert mgr.stats['fsyncs'] >= 2
+    # reopening an existing file appends without a second header
+    mgr.write_rows(paths[0], [[3, 4]], header=['a', 'b'])
+    mgr.close_all()
+    assert open(paths[0]).read().splitlines() == ['a,b', '1,2', '3,4']
@@ -0,0 +1,184 @@
+import csv
+import datetime as dt
+import os
+
+import pytest
+
+from src.storage.csv_sink import CsvSink
+from src.storage.cycle_journal import CycleJournal, make_frame, replay_frame
+
+
+def _frame(i):
+    return {'i': i, 'payload': 'x' * 50}
+
+
+def _recover(journal_dir):
+    seen = []
+    stats = CycleJournal(str(journal_dir)).recover(lambda f: seen.append(f['i']))
+    return seen, stats
+
+
+def test_sequence_and_pending(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    seqs = [j.append(_frame(i)) for i in range(4)]
+    assert seqs == [1, 2, 3, 4]
+    j.ack(1)
+    j.ack(3)
+    assert j.pending() == [2, 4]
+    j.ack(2)
+    j.ack(4)
+    j.close()
+    assert _recover(tmp_path)[0] == []
+
+
+def test_watermark_replays_from_oldest_pending(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    for i in range(4):
+        j.append(_frame(i))
+    j.ack(1)
+    j.ack(3)
+    j.close()
+    seen, stats = _recover(tmp_path)
+    # seqs 2 and 4 were never acked; acked seq 3 between them is skipped
+    assert seen == [1, 3]
+    assert stats.replayed == 2 and stats.failed == 0
+    assert _recover(tmp_path)[0] == []
+    j2 = CycleJournal(str(tmp_path))
+    j2.recover(lambda f: None)
+    assert j2.append(_frame(9)) == 5
+
+
+def test_acks_above_failed_frame_not_replayed(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    for i in range(3):
+        j.append(_frame(i))
+    j.ack(2)
+    j.ack(3)  # seq 1 never acked (its sink write failed)
+    j.close()
+    seen, stats = _recover(tmp_path)
+    assert seen == [0] and stats.replayed == 1
+    assert _recover(tmp_path)[0] == []
+
+
+def test_ack_log_survives_partial_replay(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    for i in range(4):
+        j.append(_frame(i))
+    j.ack(4)
+    j.close()
+
+    def flaky(frame):
+        if frame['i'] == 1:
+            raise OSError('disk full')
+
+    stats = CycleJournal(str(tmp_path)).recover(flaky)
+    assert stats.replayed == 2 and stats.failed == 1
+    # seq 2 still pending; seqs 1, 3 (replayed) and 4 (acked live) are not repeated
+    assert _recover(tmp_path)[0] == [1]
+
+
+def test_torn_tail_truncated(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    j.append(_frame(0))
+    j.append(_frame(1))
+    j.close()
+    wal = next(p for p in tmp_path.iterdir() if p.suffix == '.wal')
+    size = wal.stat().st_size
+    with open(wal, 'ab') as fh:
+        fh.write(b'G6WJ\x03\x00\x00')  # crash mid-header
+    seen, stats = _recover(tmp_path)
+    assert seen == [0, 1]
+    assert stats.truncated_bytes == 7 and wal.stat().st_size == size
+
+
+def test_failed_replay_stays_pending(tmp_path):
+    j = CycleJournal(str(tmp_path))
+    for i in range(3):
+        j.append(_frame(i))
+    j.close()
+
+    def flaky(frame):
+        if frame['i'] == 1:
+            raise OSError('disk full')
+
+    stats = CycleJournal(str(tmp_path)).recover(flaky)
+    assert stats.replayed == 2 and stats.failed == 1
+    seen, _ = _recover(tmp_path)
+    assert seen == [1]
+
+
+def test_old_acked_journals_removed(tmp_path):
+    old = (dt.date.today() - dt.timedelta(days=5)).isoformat()
+    today = dt.date.today().isoformat()
+    j = CycleJournal(str(tmp_path), keep_days=2)
+    j.ack(j.append(_frame(0), day=old))
+    j.append(_frame(1), day=today)  # unacked: replayed, kept (within keep_days)
+    j.close()
+    seen, stats = _recover(tmp_path)
+    assert seen == [1] and stats.removed_files == 1
+    assert sorted(p.name for p in tmp_path.iterdir()) == [f'{today}.wal', f'{today}.wal.ack']
+
+
+def _opts(px):
+    out = {}
+    for k in (24900, 25000, 25100):
+        for t in ('CE', 'PE'):
+            out[f'NIFTY{k}{t}'] = {'strike': k, 'instrument_type': t, 'last_price': px, 'volume': 10, 'oi': 100, 'avg_price': px}
+    return out
+
+
+def test_csv_replay_is_idempotent(tmp_path, monkeypatch):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    base = tmp_path / 'data'
+    frame = make_frame('NIFTY', dt.date(2025, 9, 30), 'this_week', dt.datetime(2025, 9, 26, 10, 0), _opts(10.0),
+                       index_price=25000.0)
+    replay_frame(CsvSink(base_dir=str(base)), None, frame)
+    files = sorted((base / 'NIFTY' / 'this_week').glob('*/2025-09-26.csv'))
+    assert len(files) == 3
+    # Crash mid-cycle: one offset missing entirely, another with a torn trailing row
+    os.remove(files[0])
+    with open(files[1], 'a') as fh:
+        fh.write('26-09-2025 10:00:00,NIFTY,this_w')
+    replay_frame(CsvSink(base_dir=str(base)), None, frame)
+    for path in files:
+        with open(path, newline='') as fh:
+            rows = list(csv.reader(fh))
+        assert len(rows) == 2, path
+        assert len(rows[1]) == len(rows[0])
+
+
+def test_csv_replay_of_several_frames_skips_older_rows(tmp_path, monkeypatch):
+    monkeypatch.setenv('G6_CSV_WRITER_POOL', '0')
+    base = tmp_path / 'data'
+    frames = [
+        make_frame('NIFTY', dt.date(2025, 9, 30), 'this_week', dt.datetime(2025, 9, 26, 10, m), _opts(10.0 + m),
+                   index_price=25000.0)
+        for m in (0, 1, 2)
+    ]
+    def _contents():
+        out = {}
+        for path in sorted((base / 'NIFTY' / 'this_week').glob('*/2025-09-26.csv')):
+            with open(path, newline='') as fh:
+                out[path] = list(csv.reader(fh))
+        return out
+
+    sink = CsvSink(base_dir=str(base))
+    for frame in frames:
+        replay_frame(sink, None, frame)
+    before = _contents()
+    assert len(before) == 3 and all(len(rows) == 4 for rows in before.values())
+    # restart replays every frame again (e.g. the oldest was never acknowledged)
+    sink = CsvSink(base_dir=str(base))
+    for frame in frames:
+        replay_frame(sink, None, frame)
+    assert _contents() == before
+
+
+@pytest.mark.parametrize('body,expected', [(b'a\nb\n', b'a\nb\n'), (b'a\nbc', b'a\n'), (b'abc', b''), (b'', b'')])
+def test_trim_partial_line(tmp_path, body, expected):
+    from src.storage.close_manifest import trim_partial_line
+
+    p = tmp_path / 'f.csv'
+    p.write_bytes(body)
+    assert trim_partial_line(str(p), block_size=2) == len(body) - len(expected)
+    assert p.read_bytes() == expected
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+
+from src.web.dashboard import app as dash  # noqa: E402
+
+HEADER = "timestamp,tp,avg_tp,ce,pe,index_price\n"
+
+
+def _row(minute: int, tp: float) -> str:
+    return f"2025-01-06 09:{minute:02d}:00,{tp},{tp / 2},{tp / 3},{tp / 4},22000\n"
+
+
+@pytest.fixture
+def parsed_bytes(monkeypatch):
+    seen: list[int] = []
+    real = dash._parse_csv_chunk
+
+    def _spy(chunk, fieldnames):
+        seen.append(len(chunk))
+        return real(chunk, fieldnames)
+
+    monkeypatch.setattr(dash, "_parse_csv_chunk", _spy)
+    dash._CSV_CACHE.clear()
+    yield seen
+    dash._CSV_CACHE.clear()
+
+
+def _bump_mtime(p, step):
+    st = p.stat()
+    os.utime(p, ns=(st.st_atime_ns, st.st_mtime_ns + step))
+
+
+def test_append_parses_only_new_lines(tmp_path, parsed_bytes):
+    p = tmp_path / "0.csv"
+    p.write_text(HEADER + "".join(_row(m, 100 + m) for m in range(20)))
+    rows = dash._load_csv_rows_full(p)
+    assert len(rows) == 20 and rows[0]["tp"] == 100.0
+    first_size = parsed_bytes[-1]
+
+    with p.open("a") as f:
+        f.write(_row(20, 120) + _row(21, 121))
+    _bump_mtime(p, 1_000_000)
+    rows = dash._load_csv_rows_full(p)
+    assert [r["tp"] for r in rows[-2:]] == [120.0, 121.0]
+    assert parsed_bytes[-1] == len((_row(20, 120) + _row(21, 121)).encode())
+    assert parsed_bytes[-1] < first_size
+
+    # partial trailing line is held back until completed
+    with p.open("a") as f:
+        f.write("2025-01-06 09:22:00,12")
+    _bump_mtime(p, 2_000_000)
+    assert len(dash._load_csv_rows_full(p)) == 22
+    with p.open("a") as f:
+        f.write("2,61,40,30,22000\n")
+    _bump_mtime(p, 3_000_000)
+    rows = dash._load_csv_rows_full(p)
+    assert len(rows) == 23 and rows[-1]["tp"] == 122.0
+
+
+def test_out_of_order_append_keeps_rows_sorted(tmp_path, parsed_bytes):
+    p = tmp_path / "0.csv"
+    p.write_text(HEADER + _row(5, 105) + _row(7, 107))
+    dash._load_csv_rows_full(p)
+    with p.open("a") as f:
+        f.write(_row(6, 106))
+    _bump_mtime(p, 1_000_000)
+    assert [r["tp"] for r in dash._load_csv_rows_full(p)] == [105.0, 106.0, 107.0]
+
+
+def test_shrink_or_rewrite_triggers_full_reparse(tmp_path, parsed_bytes):
+    p = tmp_path / "0.csv"
+    p.write_text(HEADER + "".join(_row(m, 100 + m) for m in range(10)))
+    dash._load_csv_rows_full(p)
+
+    p.write_text(HEADER + _row(0, 500))
+    _bump_mtime(p, 1_000_000)
+    rows = dash._load_csv_rows_full(p)
+    assert [r["tp"] for r in rows] == [500.0]
+
+    # same-length-or-longer rewrite with different content is detected via head sample
+    p.write_text(HEADER + "".join(_row(m, 900 + m) for m in range(12)))
+    _bump_mtime(p, 2_000_000)
+    rows = dash._load_csv_rows_full(p)
+    assert len(rows) == 12 and rows[0]["tp"] == 900.0
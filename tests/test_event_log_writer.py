@@ -0,0 +1,76 @@
+"""Background event-log writer: batching, non-blocking dispatch, rotation and compression."""
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+
+from src.events.event_log_writer import BufferedLineWriter
+
+
+def test_dispatch_async_writes_after_flush(monkeypatch, tmp_path):
+    import importlib
+
+    import src.events.event_log as evt_mod
+    log_file = tmp_path / "nested" / "events.log"
+    monkeypatch.setenv("G6_EVENTS_LOG_PATH", str(log_file))
+    monkeypatch.setenv("G6_EVENTS_LOG_ASYNC", "1")
+    monkeypatch.setenv("G6_EVENTS_LOG_FLUSH_MS", "5000")
+    importlib.reload(evt_mod)
+    try:
+        for i in range(20):
+            evt_mod.dispatch("async_evt", context={"i": i})
+        assert evt_mod.get_recent_events(limit=1)[0]["context"] == {"i": 19}
+        assert evt_mod.flush()
+        lines = log_file.read_text(encoding="utf-8").splitlines()
+        assert [json.loads(ln)["context"]["i"] for ln in lines] == list(range(20))
+        assert evt_mod.writer_stats()["written"] == 20
+    finally:
+        evt_mod.shutdown_writer()
+
+
+def test_size_rotation_with_compression(tmp_path):
+    path = str(tmp_path / "events.log")
+    w = BufferedLineWriter(batch_lines=1, rotate_bytes=200, compress=True)
+    try:
+        for i in range(12):
+            w.submit(path, json.dumps({"i": i, "pad": "x" * 40}))
+        assert w.flush()
+    finally:
+        w.close()
+    segments = sorted(p for p in tmp_path.iterdir() if p.name.endswith(".gz"))
+    assert w.rotations == len(segments) >= 2
+    rotated = [json.loads(ln)["i"] for seg in segments for ln in gzip.open(seg, "rt").read().splitlines()]
+    current = [json.loads(ln)["i"] for ln in (tmp_path / "events.log").read_text().splitlines()]
+    assert sorted(rotated + current) == list(range(12))
+    assert (tmp_path / "events.log").stat().st_size <= 200
+
+
+def test_daily_rotation(tmp_path):
+    import datetime as dt
+    path = str(tmp_path / "events.log")
+    w = BufferedLineWriter(batch_lines=1, rotate_daily=True)
+    try:
+        w.submit(path, "a")
+        assert w.flush()
+        w._days[path] = dt.date.today() - dt.timedelta(days=1)
+        w.submit(path, "b")
+        assert w.flush()
+    finally:
+        w.close()
+    assert w.rotations == 1
+    assert (tmp_path / "events.log").read_text() == "b\n"
+
+
+def test_full_queue_drops_instead_of_blocking(tmp_path):
+    w = BufferedLineWriter(max_queue=2, batch_lines=1)
+    gate = threading.Event()
+    orig = w._write_batch
+    w._write_batch = lambda pending: (gate.wait(5), orig(pending))  # type: ignore[method-assign]
+    path = str(tmp_path / "events.log")
+    try:
+        accepted = sum(w.submit(path, str(i)) for i in range(50))
+        assert accepted < 50 and w.dropped == 50 - accepted
+    finally:
+        gate.set()
+        w.close()
@@ -0,0 +1,166 @@
+import datetime as dt
+import gzip
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+
+from src.storage.influx_line_protocol import (
+    InfluxWriteError,
+    LineProtocolSpool,
+    LineProtocolWriter,
+    OptionLineEncoder,
+    timestamp_ns,
+)
+
+TS = dt.datetime(2025, 1, 2, 3, 4, 5, 123456, tzinfo=dt.UTC)
+
+
+class _Server:
+    """Local write endpoint; ``status`` controls the response code."""
+
+    def __init__(self):
+        self.status = 204
+        self.bodies = []
+        outer = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers['Content-Length']))
+                outer.bodies.append((self.path, self.headers.get('Content-Encoding'), gzip.decompress(raw)))
+                self.send_response(outer.status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = HTTPServer(('127.0.0.1', 0), _Handler)
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.httpd.server_port}'
+
+    def lines(self):
+        return [ln for _, _, body in self.bodies for ln in body.split(b'\n')]
+
+
+@pytest.fixture
+def server():
+    srv = _Server()
+    yield srv
+    srv.httpd.shutdown()
+
+
+def test_encoder_matches_point_series_and_caches_prefixes():
+    enc = OptionLineEncoder()
+    data = {
+        'NIFTY 25000CE': {'strike': 25000, 'instrument_type': 'CE', 'last_price': 101.5, 'oi': 10, 'volume': 3, 'delta': 0.5},
+        'NIFTY 25000PE': {'strike': 25000, 'type': 'PE', 'last_price': float('nan'), 'oi': 4, 'volume': 1, 'iv': 0.2},
+    }
+    lines = enc.encode('NIFTY', '2025-01-30', data, TS)
+    assert lines[0] == (
+        b'option_data,expiry=2025-01-30,index=NIFTY,strike=25000,symbol=NIFTY\\ 25000CE,type=CE '
+        b'price=101.5,oi=10.0,volume=3.0,iv=0.0,delta=0.5 ' + str(timestamp_ns(TS)).encode()
+    )
+    assert b' price=' not in lines[1] and b'iv=0.2' in lines[1]
+    enc.encode('NIFTY', '2025-01-30', data, TS)
+    assert enc.cache_size() == 2
+    assert timestamp_ns(TS.replace(tzinfo=None)) == timestamp_ns(TS) == 1735787045123456000
+
+
+def test_writer_posts_gzip_batches(server, tmp_path):
+    w = LineProtocolWriter(server.url, 'tok', 'org', 'bkt', batch_size=2, flush_interval=60, spool_dir=str(tmp_path))
+    w.add_lines([b'm a=1 1', b'm a=2 2', b'm a=3 3'])
+    w.flush()
+    w.close()
+    assert server.lines() == [b'm a=1 1', b'm a=2 2', b'm a=3 3']
+    path, encoding, _ = server.bodies[0]
+    assert encoding == 'gzip' and path.startswith('/api/v2/write?org=org&bucket=bkt&precision=ns')
+
+
+def test_failed_batch_spooled_then_replayed(server, tmp_path):
+    server.status = 503
+    w = LineProtocolWriter(server.url, '', 'o', 'b', batch_size=10, flush_interval=60, max_retries=1, backoff_base=0.0,
+                           spool_dir=str(tmp_path))
+    w.add_lines([b'm a=1 1'])
+    w.flush()
+    assert len(w.spool.pending()) == 1
+    server.status = 204
+    server.bodies.clear()
+    w.add_lines([b'm a=2 2'])
+    w.flush()
+    w.close()
+    assert server.lines() == [b'm a=2 2', b'm a=1 1']
+    assert w.spool.pending() == []
+
+
+def test_client_errors_are_not_spooled(server, tmp_path):
+    server.status = 400
+    w = LineProtocolWriter(server.url, '', 'o', 'b', batch_size=10, flush_interval=60, max_retries=0, spool_dir=str(tmp_path))
+    w.add_lines([b'bad line'])
+    w.close()
+    assert w.spool.pending() == []
+
+
+def test_spool_evicts_oldest_past_cap(tmp_path):
+    spool = LineProtocolSpool(str(tmp_path), max_bytes=25)
+    first = spool.put(b'x' * 10)
+    spool.put(b'y' * 10)
+    spool.put(b'z' * 10)
+    assert first not in spool.pending() and len(spool.pending()) == 2
+    sent = []
+    assert spool.replay(sent.append) == 2
+    assert sent == [b'y' * 10, b'z' * 10] and spool.pending() == []
+
+
+def test_sink_fast_path_skips_points(server, tmp_path, monkeypatch):
+    from src.storage.influx_sink import InfluxSink
+
+    monkeypatch.setenv('G6_INFLUX_LINE_PROTOCOL', '1')
+    monkeypatch.setenv('G6_INFLUX_SPOOL_DIR', str(tmp_path))
+    sink = InfluxSink(url=server.url, bucket='b', flush_interval=60)
+    data = {
+        'A': {'strike': 100, 'instrument_type': 'CE', 'last_price': 5.0, 'oi': -3, 'volume': 1},
+        'B': {'strike': 100, 'instrument_type': 'PE', 'last_price': 0, 'oi': 1, 'volume': 1},  # dropped by validators
+    }
+    sink.write_options_data('NIFTY', dt.date(2025, 1, 30), data, TS)
+    sink.close()
+    assert server.lines() == [
+        b'option_data,expiry=2025-01-30,index=NIFTY,strike=100,symbol=A,type=CE price=5.0,oi=0.0,volume=1.0,iv=0.0 '
+        + str(timestamp_ns(TS)).encode()
+    ]
+    assert data['A']['oi'] == -3
+
+
+def test_add_lines_does_not_block_on_unreachable_server(tmp_path):
+    w = LineProtocolWriter('http://127.0.0.1:1', '', 'o', 'b', batch_size=1, flush_interval=60, max_retries=2,
+                           backoff_base=0.2, spool_dir=str(tmp_path))
+    start = time.monotonic()
+    for i in range(5):
+        w.add_lines([f'm a={i} {i}'.encode()])
+    assert time.monotonic() - start < 0.2
+    w.close()
+    assert len(w.spool.pending()) == 5
+
+
+def test_rejected_spooled_payload_does_not_block_newer(tmp_path):
+    spool = LineProtocolSpool(str(tmp_path))
+    spool.put(b'old')
+    spool.put(b'new')
+    sent = []
+
+    def send(payload):
+        if payload == b'old':
+            raise InfluxWriteError(422, 'points beyond retention policy')
+        sent.append(payload)
+
+    assert spool.replay(send) == 1
+    assert sent == [b'new'] and spool.pending() == []
+    spool.put(b'later')
+
+    def unavailable(payload):
+        raise InfluxWriteError(503, 'unavailable')
+
+    with pytest.raises(InfluxWriteError):
+        spool.replay(unavailable)
+    assert len(spool.pending()) == 1
@@ -0,0 +1,81 @@
+"""Daily on-disk instrument snapshot (mmap columnar) round-trip + fetch integration."""
+from __future__ import annotations
+
+import datetime as dt
+import os
+
+from src.broker.kite import instrument_snapshot as snap_mod
+from src.broker.kite.instruments import fetch_instruments
+from src.broker.kite.state import ProviderState
+
+
+def _rows(n=50):
+    exp = dt.date(2025, 1, 30)
+    out = []
+    for i in range(n):
+        out.append({
+            'instrument_token': 1000 + i, 'exchange_token': str(5 + i), 'tradingsymbol': f'NIFTY25JAN{22000 + 50 * i}CE',
+            'name': 'NIFTY', 'last_price': 1.5 * i, 'expiry': exp, 'strike': 22000.0 + 50 * i, 'tick_size': 0.05,
+            'lot_size': 75, 'instrument_type': 'CE', 'segment': 'NFO-OPT', 'exchange': 'NFO',
+        })
+    out.append({'instrument_token': 9, 'exchange_token': '1', 'tradingsymbol': 'NIFTY 50', 'name': 'NIFTY', 'last_price': 0.0,
+                'expiry': '', 'strike': 0.0, 'tick_size': 0.0, 'lot_size': 0, 'instrument_type': 'EQ', 'segment': 'INDICES', 'exchange': 'NSE'})
+    return out
+
+
+def test_round_trip_and_staleness(tmp_path):
+    path = snap_mod.snapshot_path('nfo', str(tmp_path))
+    rows = _rows()
+    snap_mod.write_snapshot(path, rows, 'NFO')
+    assert not [p for p in os.listdir(tmp_path) if '.tmp.' in p]
+    snap = snap_mod.load_snapshot('NFO', str(tmp_path))
+    assert snap is not None and len(snap) == len(rows)
+    assert snap.to_rows() == rows
+    assert snap.column('strike')[1] == 22050.0
+    snap.close()
+    # yesterday's snapshot is stale
+    assert snap_mod.load_snapshot('NFO', str(tmp_path), today=dt.date.today() + dt.timedelta(days=1)) is None
+    # truncated/corrupt file is ignored rather than raising
+    with open(path, 'r+b') as fh:
+        fh.truncate(64)
+    assert snap_mod.load_snapshot('NFO', str(tmp_path)) is None
+
+
+def test_fetch_instruments_uses_snapshot_on_restart(tmp_path, monkeypatch):
+    monkeypatch.setenv('G6_INSTRUMENT_SNAPSHOT', '1')
+    monkeypatch.setenv('G6_INSTRUMENT_SNAPSHOT_DIR', str(tmp_path))
+    rows = _rows()
+
+    class Kite:
+        calls = 0
+
+        def instruments(self):
+            Kite.calls += 1
+            return [dict(r) for r in rows]
+
+    class Provider:
+        def __init__(self):
+            self._settings = type('S', (), {'instrument_cache_ttl': 600.0, 'kite_timeout_sec': 5.0})()
+            self._state = ProviderState()
+            self._auth_failed = False
+            self._api_rl = None
+            self._used_fallback = False
+            self.kite = Kite()
+
+        def _ensure_client(self):
+            pass
+
+        def _rl_fallback(self):
+            return False
+
+    first = fetch_instruments(Provider(), 'NFO')
+    assert Kite.calls == 1 and len(first) == len(rows)
+    assert os.path.exists(snap_mod.snapshot_path('NFO'))
+
+    restarted = Provider()
+    again = fetch_instruments(restarted, 'NFO')
+    assert Kite.calls == 1 and again == rows
+    assert restarted._state.instrument_universe['NFO'].raw_total_opts == len(rows) - 1
+    # explicit refresh still hits the API
+    fetch_instruments(restarted, 'NFO', force_refresh=True)
+    assert Kite.calls == 2
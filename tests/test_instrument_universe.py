@@ -0,0 +1,95 @@
+"""InstrumentUniverse: columnar daily index over the raw instrument list."""
+from __future__ import annotations
+
+import datetime as dt
+
+from src.broker.kite.options import StrikeMembership, build_preindex, option_instruments
+from src.broker.kite.state import ProviderState
+from src.broker.kite.universe import InstrumentUniverse, universe_for
+
+EXP = dt.date(2025, 1, 30)
+EXP2 = dt.date(2025, 2, 27)
+
+
+def _inst(root, exp, strike, typ, itype=None):
+    return {
+        'tradingsymbol': f"{root}{exp.strftime('%y%b').upper()}{int(strike)}{typ}",
+        'name': root,
+        'expiry': exp,
+        'strike': strike,
+        'instrument_type': itype or typ,
+        'instrument_token': hash((root, exp, strike, typ)) & 0xFFFFFF,
+        'exchange': 'NFO',
+    }
+
+
+def _universe():
+    rows = [{'tradingsymbol': 'NIFTY25JANFUT', 'name': 'NIFTY', 'expiry': EXP, 'strike': 0, 'instrument_type': 'FUT'}]
+    for root in ('NIFTY', 'BANKNIFTY'):
+        for exp in (EXP, EXP2):
+            for k in range(21000, 23050, 50):
+                for t in ('CE', 'PE'):
+                    rows.append(_inst(root, exp, float(k), t))
+    rows.append(_inst('NIFTY', EXP, 23100.0, 'CE', itype='OPTIDX'))
+    return rows
+
+
+def test_build_counts_and_indexes():
+    raw = _universe()
+    uni = InstrumentUniverse.build(raw)
+    assert uni.raw_total_opts == len(raw) - 1
+    assert uni.ce_count == uni.pe_count + 1
+    assert uni.distinct_expiries == {EXP.isoformat(), EXP2.isoformat()}
+    assert len(uni.expiry_ord) == len(uni.strike_x100) == len(uni.type_code) == uni.raw_total_opts
+    assert sorted(uni.roots) == ['BANKNIFTY', 'NIFTY']
+    assert uni.expiries_for('nifty') == [EXP, EXP2]
+    hit = uni.lookup('NIFTY', EXP, 22000, 'pe')
+    assert [i['tradingsymbol'] for i in hit] == ['NIFTY25JAN22000PE']
+    assert uni.lookup('NIFTY', EXP, 22010, 'PE') == []
+    # OPTIDX row indexed by inferred type but excluded from preindex (explicit CE/PE only)
+    assert uni.lookup('NIFTY', EXP, 23100, 'CE')
+    assert uni.preindex('NIFTY', EXP, [23100.0]) == {}
+
+
+def test_preindex_matches_full_scan_for_root():
+    raw = _universe()
+    uni = InstrumentUniverse.build(raw)
+    strikes = [21900.0, 22000.0, 22100.0]
+    filtered, used, _ = uni.prefilter('NIFTY')
+    assert used and uni.prefilter('NIFTY') is uni.prefilter('NIFTY')
+    legacy = build_preindex(filtered, StrikeMembership(strikes))
+    legacy = {k: v for k, v in legacy.items() if k[0] == EXP}
+    assert uni.preindex('NIFTY', EXP, strikes) == legacy
+
+
+def test_universe_for_rebuilds_on_new_list():
+    class P:
+        _state = ProviderState()
+
+    raw = _universe()
+    u1 = universe_for(P, raw)
+    assert universe_for(P, raw) is u1
+    assert universe_for(P, list(raw)) is not u1
+
+
+def test_option_instruments_uses_universe():
+    raw = _universe()
+
+    class Provider:
+        def __init__(self):
+            self._state = ProviderState()
+            self.calls = 0
+
+        def get_instruments(self, exchange):
+            self.calls += 1
+            return raw
+
+    p = Provider()
+    out = option_instruments(p, 'NIFTY', EXP, [21950.0, 22000.0])
+    assert sorted(i['tradingsymbol'] for i in out) == [
+        'NIFTY25JAN21950CE', 'NIFTY25JAN21950PE', 'NIFTY25JAN22000CE', 'NIFTY25JAN22000PE',
+    ]
+    uni = p._state.instrument_universe['NFO']
+    # second index on the same list reuses the universe built by the first call
+    option_instruments(p, 'BANKNIFTY', EXP2, [22000.0])
+    assert p._state.instrument_universe['NFO'] is uni
@@ -0,0 +1,100 @@
+"""Structured metrics snapshot: collection, versioning, JSON route and consumer parity."""
+from __future__ import annotations
+
+import urllib.request
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, generate_latest
+
+from src.metrics.snapshot import (
+    MetricsSnapshot,
+    collect_snapshot,
+    fetch_snapshot,
+    read_snapshot,
+    snapshot_url,
+    start_metrics_http_server,
+)
+from src.summary.metrics_processor import MetricsProcessor
+
+
+def _registry() -> CollectorRegistry:
+    reg = CollectorRegistry()
+    g = Gauge('g6_test_snap_gauge', 'gauge', ['index'], registry=reg)
+    g.labels(index='NIFTY').set(3.5)
+    g.labels(index='BANKNIFTY').set(1.0)
+    c = Counter('g6_test_snap_events', 'counter', registry=reg)
+    c.inc(4)
+    return reg
+
+
+def test_collect_snapshot_groups_by_name_and_labels():
+    snap = collect_snapshot(_registry())
+    assert snap.value('g6_test_snap_gauge', {'index': 'NIFTY'}) == 3.5
+    assert snap.total('g6_test_snap_gauge') == 4.5
+    assert snap.value('g6_test_snap_events_total') == 4.0
+    assert 'g6_test_snap_events_created' not in snap.series
+
+
+def test_version_is_monotonic_and_max_age_reuses():
+    reg = _registry()
+    a = collect_snapshot(reg)
+    b = collect_snapshot(reg)
+    assert b.version > a.version
+    c = collect_snapshot(reg, max_age=60.0)
+    assert c is b
+
+
+def test_dict_round_trip():
+    snap = collect_snapshot(_registry())
+    back = MetricsSnapshot.from_dict(snap.to_dict())
+    assert back.version == snap.version
+    assert back.series == snap.series
+
+
+def test_snapshot_url_mapping():
+    assert snapshot_url('http://h:9108/metrics') == 'http://h:9108/metrics/snapshot'
+    assert snapshot_url('http://h:9108/') == 'http://h:9108/metrics/snapshot'
+    assert snapshot_url('http://h:9108/metrics/snapshot') == 'http://h:9108/metrics/snapshot'
+
+
+def test_http_server_serves_snapshot_and_text():
+    reg = _registry()
+    httpd = start_metrics_http_server(0, addr='127.0.0.1', registry=reg)
+    try:
+        base = f'http://127.0.0.1:{httpd.server_port}/metrics'
+        snap = fetch_snapshot(base)
+        assert snap is not None
+        assert snap.value('g6_test_snap_gauge', {'index': 'BANKNIFTY'}) == 1.0
+        with urllib.request.urlopen(base, timeout=2) as resp:
+            assert b'g6_test_snap_gauge' in resp.read()
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
+
+
+def test_processor_snapshot_matches_text_parse():
+    reg = _registry()
+    mp = MetricsProcessor()
+    from_text = mp._parse_prometheus_text(generate_latest(reg).decode())
+    from_snap = mp._metrics_from_snapshot(collect_snapshot(reg))
+    for name in ('g6_test_snap_gauge', 'g6_test_snap_events_total'):
+        assert from_snap[name] == from_text[name]
+
+
+def test_read_snapshot_honours_served_registry_and_url(monkeypatch):
+    from src.metrics import snapshot as snapshot_mod
+
+    monkeypatch.setattr(snapshot_mod, '_served', {})
+    monkeypatch.setattr(snapshot_mod, '_in_process_registry_active', lambda: True)
+    reg = _registry()
+    httpd = start_metrics_http_server(0, addr='127.0.0.1', registry=reg)
+    try:
+        local = read_snapshot(f'http://127.0.0.1:{httpd.server_port}/metrics')
+        assert local is not None and local.value('g6_test_snap_gauge', {'index': 'NIFTY'}) == 3.5
+        fetched = []
+        monkeypatch.setattr(snapshot_mod, 'fetch_snapshot', lambda url, timeout=2.0: fetched.append(url))
+        read_snapshot('http://metrics-host:9108/metrics')
+        read_snapshot(f'http://127.0.0.1:{httpd.server_port + 1}/metrics')
+        assert fetched == ['http://metrics-host:9108/metrics', f'http://127.0.0.1:{httpd.server_port + 1}/metrics']
+    finally:
+        httpd.shutdown()
+        httpd.server_close()
@@ -0,0 +1,100 @@
+import datetime as dt
+import os
+
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from scripts.weekday_overlay import update_weekday_master  # noqa: E402
+from src.storage.csv_sink import CsvSink  # noqa: E402
+from src.storage.parquet_sink import OPTION_ROW_COLUMNS, ParquetSink, list_parts, read_columns  # noqa: E402
+
+
+def _opts(px):
+    out = {}
+    for k in (24900, 25000, 25100):
+        for t in ('CE', 'PE'):
+            out[f'NIFTY{k}{t}'] = {'strike': k, 'instrument_type': t, 'last_price': px, 'volume': 10, 'oi': 100,
+                                   'avg_price': px, 'iv': 0.12}
+    return out
+
+
+def _collect(tmp_path, roll=2):
+    sink = CsvSink(base_dir=str(tmp_path / 'csv'))
+    pq_sink = ParquetSink(base_dir=str(tmp_path / 'pq'), roll_row_groups=roll)
+    sink.attach_columnar_sink(pq_sink)
+    for minute in range(3):
+        ts = dt.datetime(2025, 9, 26, 4, 45 + minute, 0, tzinfo=dt.UTC)  # 10:15 IST onwards
+        for expiry, tag in ((dt.date(2025, 9, 30), 'this_week'), (dt.date(2025, 10, 28), 'this_month')):
+            sink.write_options_data('NIFTY', expiry, _opts(10.0 + minute), ts, index_price=25000.0,
+                                    suppress_overview=True, expiry_rule_tag=tag)
+    return sink, pq_sink
+
+
+def test_cycles_become_row_groups_and_parts_roll(tmp_path):
+    sink, pq_sink = _collect(tmp_path)
+    # cycle 3 still pending; first part rolled after 2 row groups
+    parts = list_parts(str(tmp_path / 'pq'), 'NIFTY', '2025-09-26')
+    assert len(parts) == 1
+    sink.close()
+    parts = list_parts(str(tmp_path / 'pq'), 'NIFTY', '2025-09-26')
+    assert len(parts) == 2 and not [f for f in os.listdir(os.path.dirname(parts[0])) if f.endswith('.inprogress')]
+    assert pq_sink.row_groups_written == 3 and pq_sink.rows_written == 18
+    table = read_columns(str(tmp_path / 'pq'), 'NIFTY', '2025-09-26', ['expiry_tag', 'offset', 'tp', 'ce_oi'])
+    assert table.column_names == ['expiry_tag', 'offset', 'tp', 'ce_oi']
+    assert str(table.schema.field('expiry_tag').type).startswith('dictionary')
+    assert sorted(set(table.column('expiry_tag').to_pylist())) == ['this_month', 'this_week']
+    assert table.column('ce_oi').to_pylist()[0] == 100
+
+
+def test_overlay_parquet_source_matches_csv(tmp_path):
+    sink, _ = _collect(tmp_path)
+    sink.close()
+    day = dt.date(2025, 9, 26)
+    n_csv = update_weekday_master(str(tmp_path / 'csv'), str(tmp_path / 'm_csv'), 'NIFTY', day, 0.5)
+    n_pq = update_weekday_master(str(tmp_path / 'pq'), str(tmp_path / 'm_pq'), 'NIFTY', day, 0.5, source='parquet')
+    assert n_csv == n_pq > 0
+
+    def _tree(root):
+        out = {}
+        for r, _d, fs in os.walk(root):
+            for f in fs:
+                if f.endswith('.csv'):
+                    with open(os.path.join(r, f)) as fh:
+                        out[os.path.relpath(os.path.join(r, f), root)] = fh.read()
+        return out
+
+    assert _tree(tmp_path / 'm_pq') == _tree(tmp_path / 'm_csv')
+
+
+def test_missing_values_stay_null(tmp_path):
+    pq_sink = ParquetSink(base_dir=str(tmp_path / 'pq'))
+    header = list(OPTION_ROW_COLUMNS)
+    row = ['26-09-2025 10:15:00', 'NIFTY', 'this_week', '2025-09-30', 0, 25000.0, 25000, 25000,
+           10.0, 11.0, 21.0] + [''] * (len(header) - 11)
+    row[header.index('ce_oi')] = None
+    pq_sink.add_row(header, row, '2025-09-26')
+    pq_sink.close()
+    table = read_columns(str(tmp_path / 'pq'), 'NIFTY', '2025-09-26', ['tp', 'ce_delta', 'ce_oi'])
+    assert table.to_pylist() == [{'tp': 21.0, 'ce_delta': None, 'ce_oi': None}]
+
+
+def test_orphaned_inprogress_parts_discarded(tmp_path):
+    day_dir = tmp_path / 'pq' / 'NIFTY' / '2025-09-26'
+    day_dir.mkdir(parents=True)
+    (day_dir / 'part-00000.parquet.inprogress').write_bytes(b'PAR1 no footer')
+    pq_sink = ParquetSink(base_dir=str(tmp_path / 'pq'))
+    assert pq_sink.orphans_discarded == 1 and os.listdir(day_dir) == []
+
+
+def test_overlay_replay_live_parquet_matches_csv(tmp_path):
+    pytest.importorskip("pandas")
+    pytest.importorskip("prometheus_client")
+    from scripts.overlay_replay import _load_live_csv, _load_live_parquet
+
+    sink, _ = _collect(tmp_path)
+    sink.close()
+    csv_df = _load_live_csv(tmp_path / 'csv', 'NIFTY', 'this_week', '0', '2025-09-26')
+    pq_df = _load_live_parquet(tmp_path / 'pq', 'NIFTY', 'this_week', '0', '2025-09-26')
+    assert list(pq_df['tp']) == list(csv_df['tp']) and list(pq_df['avg_tp']) == list(csv_df['avg_tp'])
+    assert list(pq_df['timestamp']) == list(csv_df['timestamp'])
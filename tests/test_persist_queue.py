@@ -0,0 +1,185 @@
+import threading
+import time
+
+import pytest
+
+from src.storage.persist_queue import (
+    PersistQueue,
+    copy_rows,
+    persist_async,
+    provisional_metrics_payload,
+    shutdown_persist_queue,
+)
+
+
+class _Recorder:
+    def __init__(self, gate=None):
+        self.gate = gate
+        self.rows = []
+
+    def write(self, n):
+        if self.gate is not None:
+            self.gate.wait(2)
+        self.rows.append(n)
+
+
+def test_submit_returns_before_write_and_drain_waits():
+    gate = threading.Event()
+    rec = _Recorder(gate)
+    q = PersistQueue(max_backlog=8)
+    t0 = time.perf_counter()
+    for i in range(3):
+        assert q.submit('rows', rec.write, i)
+    assert time.perf_counter() - t0 < 0.5
+    assert q.drain(timeout=0.05) is False
+    gate.set()
+    assert q.drain(timeout=2)
+    assert rec.rows == [0, 1, 2]
+    assert q.close(timeout=1)
+    assert q.submit('rows', rec.write, 9) is False
+
+
+def test_drop_oldest_policy_counts_drops():
+    gate = threading.Event()
+    rec = _Recorder(gate)
+    q = PersistQueue(max_backlog=2, policy='drop_oldest')
+    q.submit('rows', rec.write, 0)
+    time.sleep(0.05)  # writer picks up job 0 and blocks on the gate
+    for i in range(1, 5):
+        q.submit('rows', rec.write, i)
+    gate.set()
+    assert q.close(timeout=2)
+    assert rec.rows == [0, 3, 4]
+    assert q.stats()['dropped'] == 2
+
+
+def test_block_policy_waits_for_space():
+    gate = threading.Event()
+    rec = _Recorder(gate)
+    q = PersistQueue(max_backlog=1, policy='block')
+    q.submit('rows', rec.write, 0)
+    time.sleep(0.05)
+    q.submit('rows', rec.write, 1)
+    done = threading.Event()
+    threading.Thread(target=lambda: (q.submit('rows', rec.write, 2), done.set()), daemon=True).start()
+    assert not done.wait(0.1)
+    gate.set()
+    assert done.wait(2)
+    assert q.close(timeout=2)
+    assert rec.rows == [0, 1, 2]
+
+
+def test_spill_policy_replays_in_order(tmp_path):
+    gate = threading.Event()
+    rec = _Recorder(gate)
+    q = PersistQueue(max_backlog=2, policy='spill', spill_dir=str(tmp_path))
+    q.submit('rows', rec.write, 0)
+    time.sleep(0.05)
+    for i in range(1, 8):
+        q.submit('rows', rec.write, i)
+    stats = q.stats()
+    assert stats['spilled'] == 5 and q.depth() == 7
+    gate.set()
+    assert q.close(timeout=2)
+    assert rec.rows == list(range(8))
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_metrics_and_failures():
+    from types import SimpleNamespace
+
+    from prometheus_client import CollectorRegistry, Counter, Gauge
+
+    reg = CollectorRegistry()
+    metrics = SimpleNamespace(
+        persist_queue_depth=Gauge('t_pq_depth', 'd', registry=reg),
+        persist_lag_seconds=Gauge('t_pq_lag', 'l', registry=reg),
+        persist_queue_dropped_total=Counter('t_pq_dropped', 'x', registry=reg),
+    )
+
+    def boom(_):
+        raise OSError('disk full')
+
+    q = PersistQueue(max_backlog=4, metrics=metrics)
+    q.submit('rows', lambda _: time.sleep(0.02), 1)
+    q.submit('rows', boom, 2)
+    assert q.close(timeout=2)
+    assert q.stats()['failed'] == 1 and q.stats()['completed'] == 1
+    assert reg.get_sample_value('t_pq_depth') == 0.0
+    assert reg.get_sample_value('t_pq_lag') > 0.0
+
+
+def test_persist_async_env_gate(monkeypatch):
+    rec = _Recorder()
+    monkeypatch.delenv('G6_ASYNC_PERSIST', raising=False)
+    assert persist_async('rows', rec.write, 1) is False
+    monkeypatch.setenv('G6_ASYNC_PERSIST', '1')
+    assert persist_async('rows', rec.write, 2) is True
+    assert shutdown_persist_queue(timeout=2)
+    assert rec.rows == [2]
+
+
+def test_provisional_payload_matches_sink_formula():
+    data = {
+        'a': {'instrument_type': 'CE', 'oi': 200},
+        'b': {'instrument_type': 'PE', 'oi': 300},
+        'c': {'instrument_type': 'PE', 'oi': 100},
+    }
+    p = provisional_metrics_payload(data, 'this_week', 'ts', index_price=1.0, index_ohlc={'high': 110, 'low': 100})
+    assert p['pcr'] == pytest.approx(2.0)
+    assert p['day_width'] == pytest.approx(10.0)
+    assert p['expiry_code'] == 'this_week' and p['timestamp'] == 'ts'
+    with pytest.raises(ValueError):
+        PersistQueue(policy='spill')
+
+
+def test_reported_failure_counted():
+    from types import SimpleNamespace
+
+    q = PersistQueue(max_backlog=4)
+    q.submit('expiry', lambda: SimpleNamespace(failed=True))
+    q.submit('expiry', lambda: SimpleNamespace(failed=False))
+    assert q.close(timeout=2)
+    assert q.stats()['failed'] == 1 and q.stats()['completed'] == 1
+
+
+def test_copy_rows_isolates_row_dicts():
+    data = {'a': {'oi': 1}}
+    snap = copy_rows(data)
+    snap['a']['expiry'] = 'x'
+    snap.pop('a')
+    assert data == {'a': {'oi': 1}}
+
+
+def test_provisional_payload_uses_sink_expiry_preview(tmp_path):
+    import datetime as dt
+
+    from src.storage.csv_sink import CsvSink
+
+    sink = CsvSink(base_dir=str(tmp_path))
+    data = {'a': {'instrument_type': 'CE', 'oi': 100}, 'b': {'instrument_type': 'PE', 'oi': 50}}
+    exp = dt.date(2031, 1, 30)
+    p = provisional_metrics_payload(data, '2031-01-30', 'ts', csv_sink=sink, index='NIFTY', expiry=exp)
+    assert p['expiry_code'] == sink.preview_expiry('NIFTY', exp, '2031-01-30')[0] == 'next_month'
+    assert p['pcr'] == pytest.approx(0.5)
+    sink.allowed_expiry_dates = {dt.date(2031, 2, 27)}
+    p = provisional_metrics_payload(data, 'this_month', 'ts', csv_sink=sink, index='NIFTY', expiry=exp)
+    assert p['pcr'] == 0 and p['skipped_invalid_expiry'] is True
+
+
+def test_disallowed_expiry_skipped_in_verbose_mode(tmp_path):
+    import datetime as dt
+
+    from src.storage.csv_sink import CsvSink
+
+    sink = CsvSink(base_dir=str(tmp_path))
+    sink._concise = False
+    sink.allowed_expiry_dates = {dt.date(2030, 1, 1)}
+    data = {
+        'a': {'instrument_type': 'CE', 'oi': 100, 'strike': 100},
+        'b': {'instrument_type': 'PE', 'oi': 100, 'strike': 100},
+    }
+    ts = dt.datetime(2025, 1, 20, 10, 0)
+    res = sink.write_options_data('NIFTY', dt.date(2025, 1, 20), data, ts, return_metrics=True)
+    assert res['skipped_invalid_expiry'] is True
+    assert not list(tmp_path.rglob('*.csv'))
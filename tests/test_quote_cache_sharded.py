@@ -0,0 +1,55 @@
+"""Sharded quote cache: TTL, LRU bound, bulk get_many/put_many and partial network fetch."""
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+from src.broker.kite import quote_cache, quotes
+from src.broker.kite.quote_cache import ShardedQuoteCache
+
+
+def test_get_many_ttl_and_counters():
+    c = ShardedQuoteCache(shards=5, max_entries=1000)
+    assert len(c._shards) == 8
+    c.put_many({f'NFO:S{i}': {'last_price': i} for i in range(100)} | {'NFO:BAD': 1})
+    assert len(c) == 100
+    got = c.get_many([f'NFO:S{i}' for i in range(90, 110)], ttl=5)
+    assert sorted(got) == sorted(f'NFO:S{i}' for i in range(90, 100))
+    assert c.snapshot_meta()['hits'] == 10 and c.snapshot_meta()['misses'] == 10
+    assert c.get_many(['NFO:S1'], ttl=0) == {}
+    time.sleep(0.02)
+    assert c.get_many(['NFO:S1'], ttl=0.01) == {}
+    assert len(c) == 99  # expired entry dropped on lookup
+
+
+def test_lru_bound_per_shard():
+    c = ShardedQuoteCache(shards=1, max_entries=3)
+    c.put_many({'a': {}, 'b': {}, 'c': {}})
+    c.get_many(['a'], ttl=10)  # refresh a
+    c.put_many({'d': {}})
+    assert set(c.get_many(['a', 'b', 'c', 'd'], ttl=10)) == {'a', 'c', 'd'}
+    assert c.snapshot_meta()['evictions'] == 1
+
+
+class _Kite:
+    def __init__(self):
+        self.calls = []
+
+    def quote(self, symbols):
+        self.calls.append(list(symbols))
+        return {s: {'last_price': 1.0, 'ohlc': {}} for s in symbols}
+
+
+def test_quote_path_fetches_only_missing(monkeypatch):
+    monkeypatch.setenv('G6_KITE_QUOTE_CACHE_SECONDS', '30')
+    quote_cache._CACHE.clear()
+    p = SimpleNamespace(kite=_Kite(), _settings=SimpleNamespace(kite_timeout_sec=2.0), _auth_failed=False,
+                        _api_rl=None, _rl_fallback=None, _rl_quote_fallback=None,
+                        _synthetic_quotes_used=0, _last_quotes_synthetic=False)
+    first = quotes.get_quote(p, ['NFO:X1', 'NFO:X2'])
+    second = quotes.get_quote(p, ['NFO:X1', 'NFO:X2', 'NFO:X3'])
+    third = quotes.get_quote(p, ['NFO:X3', 'NFO:X1'])
+    assert set(first) == {'NFO:X1', 'NFO:X2'} and set(second) == {'NFO:X1', 'NFO:X2', 'NFO:X3'}
+    assert set(third) == {'NFO:X1', 'NFO:X3'}
+    assert [set(c) for c in p.kite.calls] == [{'NFO:X1', 'NFO:X2'}, {'NFO:X3'}]
+    quote_cache._CACHE.clear()
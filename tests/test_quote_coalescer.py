@@ -0,0 +1,90 @@
+"""Cycle-scoped quote coalescing: union fetch, zero-copy views, cross-index de-duplication."""
+from __future__ import annotations
+
+import threading
+from types import SimpleNamespace
+
+from src.broker.kite import quote_coalescer as qc
+from src.broker.kite import quotes
+
+
+class DummyKite:
+    def __init__(self):
+        self.calls: list[list[str]] = []
+        self.lock = threading.Lock()
+
+    def quote(self, symbols):
+        with self.lock:
+            self.calls.append(list(symbols))
+        return {s: {'last_price': 100.0 + i, 'ohlc': {}} for i, s in enumerate(symbols)}
+
+
+class Settings:
+    kite_timeout_sec = 2.0
+
+
+def _provider():
+    return SimpleNamespace(kite=DummyKite(), _settings=Settings(), _auth_failed=False, _api_rl=None,
+                           _rl_fallback=None, _rl_quote_fallback=None, _synthetic_quotes_used=0,
+                           _last_quotes_synthetic=False)
+
+
+def test_planned_union_fetched_once_and_views_share_payloads():
+    kite = DummyKite()
+    co = qc.QuoteCoalescer()
+    co.register(['NSE:NIFTY 50', 'NSE:NIFTY BANK'])
+    v1 = co.get(['NSE:NIFTY 50'], kite.quote)
+    v2 = co.get(['NSE:NIFTY BANK'], kite.quote)
+    assert kite.calls == [['NSE:NIFTY 50', 'NSE:NIFTY BANK']]
+    assert list(v1) == ['NSE:NIFTY 50'] and 'NSE:NIFTY BANK' not in v1
+    assert v2['NSE:NIFTY BANK'] is co.get(['NSE:NIFTY BANK'], kite.quote)['NSE:NIFTY BANK']
+    assert co.stats()['calls_saved'] == 2
+
+
+def test_overlapping_requests_and_chunking():
+    kite = DummyKite()
+    co = qc.QuoteCoalescer()
+    a = [f'NFO:A{i}' for i in range(700)]
+    co.get(a, kite.quote)
+    assert [len(c) for c in kite.calls] == [500, 200]
+    view = co.get(a[650:] + ['NFO:B1'], kite.quote)
+    assert kite.calls[-1] == ['NFO:B1'] and len(view) == 51
+
+
+def test_concurrent_consumers_no_duplicate_fetch_no_threads():
+    kite = DummyKite()
+    co = qc.QuoteCoalescer()
+    sets = [['NSE:X', 'NSE:Y'], ['NSE:Y', 'NSE:Z'], ['NSE:X']] * 4
+    before = threading.active_count()
+    out = []
+    barrier = threading.Barrier(len(sets))
+
+    def _w(s):
+        barrier.wait()
+        out.append(dict(co.get(s, kite.quote)))
+
+    ts = [threading.Thread(target=_w, args=(s,)) for s in sets]
+    for t in ts:
+        t.start()
+    for t in ts:
+        t.join()
+    fetched = [s for c in kite.calls for s in c]
+    assert sorted(fetched) == ['NSE:X', 'NSE:Y', 'NSE:Z']
+    assert sorted(len(o) for o in out) == sorted(len(s) for s in sets)
+    assert threading.active_count() == before
+
+
+def test_get_quote_routes_through_cycle_scope(monkeypatch):
+    monkeypatch.setenv('G6_KITE_QUOTE_CACHE_SECONDS', '0')
+    p = _provider()
+    qc.begin_cycle(p, ['NSE:NIFTY 50', 'NSE:NIFTY BANK'])
+    try:
+        r1 = quotes.get_quote(p, [('NSE', 'NIFTY 50')])
+        r2 = quotes.get_quote(p, [('NSE', 'NIFTY BANK'), ('NSE', 'NIFTY 50')])
+        assert set(r1) == {'NSE:NIFTY 50'} and set(r2) == {'NSE:NIFTY BANK', 'NSE:NIFTY 50'}
+        assert len(p.kite.calls) == 1
+        assert qc.current_coalescer(_provider()) is None  # bound to its own provider
+    finally:
+        qc.end_cycle()
+    quotes.get_quote(p, [('NSE', 'NIFTY 50')])
+    assert len(p.kite.calls) == 2  # scope closed: direct fetch again
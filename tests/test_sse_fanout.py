@@ -0,0 +1,114 @@
+"""Event-loop SSE fan-out: shared frames, backlog replay, auth parity and slow-consumer eviction."""
+from __future__ import annotations
+
+import socket
+import time
+
+import pytest
+
+from scripts.summary.sse_fanout import SSEFanoutServer, encode_frame
+
+
+class _Pub:
+    def __init__(self):
+        self._events = []
+        self._listeners = []
+
+    def add_listener(self, fn):
+        self._listeners.append(fn)
+
+    def remove_listener(self, fn):
+        self._listeners.remove(fn)
+
+    def emit(self, evt):
+        self._events.append(evt)
+        for fn in self._listeners:
+            fn(evt)
+
+
+def _connect(port, headers=''):
+    s = socket.create_connection(('127.0.0.1', port), timeout=3)
+    s.sendall(f'GET /summary/events HTTP/1.1\r\nHost: x\r\n{headers}\r\n'.encode())
+    return s
+
+
+def _read_until(s, needle: bytes, timeout=3.0) -> bytes:
+    buf = b''
+    deadline = time.time() + timeout
+    while needle not in buf and time.time() < deadline:
+        try:
+            chunk = s.recv(65536)
+        except TimeoutError:
+            break
+        if not chunk:
+            break
+        buf += chunk
+    return buf
+
+
+@pytest.fixture
+def server(monkeypatch):
+    for k in ('G6_SSE_API_TOKEN', 'G6_SSE_IP_ALLOW', 'G6_SSE_UA_ALLOW', 'G6_SSE_IP_CONNECT_RATE'):
+        monkeypatch.delenv(k, raising=False)
+    monkeypatch.setenv('G6_SSE_EVENTS_PER_SEC', '0')
+    monkeypatch.setenv('G6_SSE_SECURITY_DIRECT', '1')  # read security env directly (no cached SummaryEnv)
+    pub = _Pub()
+    pub.emit({'event': 'hello', 'data': {'v': 1}})
+    srv = SSEFanoutServer('127.0.0.1', 0, publisher=pub, queue_max=4, write_timeout=0.5).start()
+    yield srv, pub
+    srv.shutdown()
+
+
+def test_encode_frame_truncates(monkeypatch):
+    assert encode_frame({'event': 'x y', 'data': {'a': 1}}) == b'event: xy\ndata: {"a":1}\n\n'
+    monkeypatch.setenv('G6_SSE_MAX_EVENT_BYTES', '4')
+    assert encode_frame({'event': 'big', 'data': {'a': 'long'}}).startswith(b'event: truncated\n')
+
+
+def test_backlog_and_broadcast_encoded_once(server):
+    srv, pub = server
+    clients = [_connect(srv.port) for _ in range(5)]
+    for c in clients:
+        assert b'event: hello' in _read_until(c, b'event: hello')
+    pub.emit({'event': 'panel_update', 'data': {'n': 7}})
+    for c in clients:
+        out = _read_until(c, b'"n":7')
+        assert out.count(b'event: panel_update') == 1
+    assert srv.frames_encoded == 1
+    for c in clients:
+        c.close()
+
+
+def test_auth_and_404_rejections(server, monkeypatch):
+    srv, _ = server
+    monkeypatch.setenv('G6_SSE_API_TOKEN', 'secret')
+    c = _connect(srv.port)
+    assert _read_until(c, b'unauthorized').startswith(b'HTTP/1.1 401')
+    c.close()
+    c = _connect(srv.port, 'X-API-Token: secret\r\n')
+    assert _read_until(c, b':ok').startswith(b'HTTP/1.1 200')
+    c.close()
+    s = socket.create_connection(('127.0.0.1', srv.port), timeout=3)
+    s.sendall(b'GET /other HTTP/1.1\r\n\r\n')
+    assert _read_until(s, b'\r\n\r\n').startswith(b'HTTP/1.1 404')
+    s.close()
+
+
+def test_slow_consumer_evicted(server):
+    srv, pub = server
+    slow = socket.socket()
+    slow.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+    slow.connect(('127.0.0.1', srv.port))
+    slow.sendall(b'GET /summary/events HTTP/1.1\r\n\r\n')
+    fast = _connect(srv.port)
+    _read_until(fast, b'event: hello')
+    blob = 'x' * 32768
+    deadline = time.time() + 10
+    i = 0
+    while srv.evictions == 0 and time.time() < deadline:
+        pub.emit({'event': 'bulk', 'data': {'i': i, 'blob': blob}})
+        _read_until(fast, f'"i":{i},'.encode(), timeout=1.0)
+        i += 1
+    assert srv.evictions == 1 and srv.stats()['clients'] == 1
+    slow.close()
+    fast.close()
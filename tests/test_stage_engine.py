@@ -0,0 +1,135 @@
+import threading
+import time
+from types import SimpleNamespace
+
+from src.orchestrator.stage_engine import StageEngine
+
+
+class _Pipe:
+    """Fake CollectorPipeline stage methods with fixed per-stage latency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.active = {'fetch': 0, 'analytics': 0, 'persist': 0}
+        self.peak = dict(self.active)
+        self.persisted = []
+
+    def _enter(self, stage):
+        with self.lock:
+            self.active[stage] += 1
+            self.peak[stage] = max(self.peak[stage], self.active[stage])
+
+    def _leave(self, stage):
+        with self.lock:
+            self.active[stage] -= 1
+
+    def _timed(self, stage, value):
+        self._enter(stage)
+        try:
+            time.sleep(self.delay)
+            return value
+        finally:
+            self._leave(stage)
+
+    def fetch_stage(self, wi):
+        if wi.expiry_rule == 'empty':
+            return self._timed('fetch', None)
+        if wi.expiry_rule == 'boom':
+            raise RuntimeError('provider down')
+        return self._timed('fetch', SimpleNamespace(work=wi, enriched={'x': {}}))
+
+    def analytics_stage(self, ee):
+        return self._timed('analytics', ee)
+
+    def persist_stage(self, ee):
+        out = self._timed('persist', SimpleNamespace(failed=False, index=ee.work.index))
+        self.persisted.append(ee.work.index)
+        return out
+
+
+def _items(n):
+    return [SimpleNamespace(index=f'I{i}', expiry_rule='this_week') for i in range(n)]
+
+
+def test_stages_overlap_and_preserve_order():
+    engine = StageEngine(fetch_workers=4, analytics_workers=2, persist_workers=1)
+    pipe = _Pipe(delay=0.05)
+    items = _items(6)
+    t0 = time.perf_counter()
+    results = engine.run_expiries(pipe, items)
+    wall = time.perf_counter() - t0
+    engine.shutdown()
+    # Sequential would be 6 * 3 * 0.05 = 0.9s; pipelined is bounded by the single persist worker.
+    assert wall < 0.6
+    assert [r[0] for r in results] == items
+    assert all(r[2] is not None and r[2].index == r[0].index for r in results)
+    assert pipe.peak['persist'] == 1 and pipe.peak['fetch'] > 1
+    assert sorted(pipe.persisted) == sorted(i.index for i in items)
+
+
+def test_failed_and_empty_items_and_deadline():
+    engine = StageEngine(fetch_workers=2, analytics_workers=1, persist_workers=1)
+    pipe = _Pipe(delay=0.0)
+    items = _items(2) + [SimpleNamespace(index='E', expiry_rule='empty'), SimpleNamespace(index='B', expiry_rule='boom')]
+    results = engine.run_expiries(pipe, items)
+    assert [r[2] is not None for r in results] == [True, True, False, False]
+    skipped = engine.run_expiries(pipe, _items(3), deadline=time.time() - 1)
+    assert all(r[1] is None and r[2] is None for r in skipped)
+    engine.shutdown()
+
+
+def test_index_pool_is_persistent_and_skips_inflight():
+    engine = StageEngine()
+    release = threading.Event()
+    threads = []
+
+    def collect(name):
+        threads.append(threading.current_thread().name)
+        if name == 'SLOW':
+            release.wait(2)
+
+    slow = engine.submit_index('SLOW', 2, collect, 'SLOW')
+    assert engine.submit_index('SLOW', 2, collect, 'SLOW') is None
+    for _ in range(3):
+        engine.submit_index('FAST', 2, collect, 'FAST').result(1)
+    release.set()
+    slow.result(1)
+    assert engine.submit_index('SLOW', 2, collect, 'SLOW').result(1) is None
+    # Same pool threads reused across "cycles" (no executor per cycle)
+    assert len(set(threads)) <= 2
+    engine.shutdown()
+
+
+def test_publish_metrics_sets_gauges():
+    from prometheus_client import CollectorRegistry, Gauge
+
+    reg = CollectorRegistry()
+    metrics = SimpleNamespace(
+        cycle_stage_queue_depth=Gauge('t_stage_depth', 'd', ['stage'], registry=reg),
+        cycle_stage_utilization=Gauge('t_stage_util', 'u', ['stage'], registry=reg),
+    )
+    engine = StageEngine(fetch_workers=1, analytics_workers=1, persist_workers=1)
+    engine.publish_metrics(metrics)
+    engine.run_expiries(_Pipe(delay=0.02), _items(3))
+    util = engine.publish_metrics(metrics)
+    engine.shutdown()
+    assert set(util) == {'fetch', 'analytics', 'persist'}
+    assert 0.0 < util['persist'] <= 1.0
+    assert reg.get_sample_value('t_stage_util', {'stage': 'persist'}) == util['persist']
+    assert reg.get_sample_value('t_stage_depth', {'stage': 'fetch'}) == 0.0
+
+
+def test_index_pool_rebuild_releases_cancelled_indices():
+    engine = StageEngine()
+    gate = threading.Event()
+    fa = engine.submit_index('A', 1, gate.wait, 2)
+    fb = engine.submit_index('B', 1, lambda: 'b')  # queued behind A
+    fc = engine.submit_index('C', 2, lambda: 'c')  # workers change -> old pool replaced, B cancelled
+    assert fb.cancelled() and fc.result(timeout=2) == 'c'
+    gate.set()
+    fa.result(timeout=2)
+    fb2 = engine.submit_index('B', 2, lambda: 'b')
+    assert fb2 is not None and fb2.result(timeout=2) == 'b'
+    assert engine.stats()['index']['queued'] == 0
+    engine.shutdown()
@@ -0,0 +1,83 @@
+import datetime as dt
+import json
+import os
+import zipfile
+from pathlib import Path
+
+from src.storage.retention import MANIFEST_NAME, RetentionEngine, _scan_and_prune
+
+TODAY = dt.date(2025, 3, 20)
+
+
+def _touch(path: Path, text: str = "timestamp,ce\n") -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def _days(n: int, end: dt.date = TODAY):
+    return [(end - dt.timedelta(days=i)).isoformat() for i in range(n)]
+
+
+def test_deletes_by_filename_date_not_mtime(tmp_path):
+    opt = tmp_path / "NIFTY" / "this_week" / "ATM"
+    ov = tmp_path / "overview" / "NIFTY"
+    for d in _days(40):
+        _touch(opt / f"{d}.csv")
+        _touch(ov / f"{d}.csv")
+    eng = RetentionEngine(str(tmp_path), retention_days=10, overview_days=30, min_files_to_keep=3)
+    st = eng.run_pass(today=TODAY)
+    # Days strictly before today - N go; the cutoff day itself is kept.
+    assert st.deleted_option == 29 and st.deleted_overview == 9
+    assert sorted(p.stem for p in opt.glob("*.csv")) == sorted(_days(11))
+    assert len(list(ov.glob("*.csv"))) == 31
+
+
+def test_min_keep_protects_newest_dates(tmp_path):
+    d = tmp_path / "BANKNIFTY" / "next_week" / "ATM"
+    for day in ("2024-01-01", "2024-01-02", "2024-01-03", "2024-01-04"):
+        _touch(d / f"{day}.csv")
+    RetentionEngine(str(tmp_path), retention_days=5, min_files_to_keep=2).run_pass(today=TODAY)
+    assert sorted(p.stem for p in d.glob("*.csv")) == ["2024-01-03", "2024-01-04"]
+
+
+def test_manifest_skips_unchanged_directories(tmp_path):
+    for d in _days(5):
+        _touch(tmp_path / "NIFTY" / "this_week" / "ATM" / f"{d}.csv")
+    eng = RetentionEngine(str(tmp_path), retention_days=30)
+    first = eng.run_pass(today=TODAY)
+    assert first.dirs_listed == first.dirs_seen == 4
+    manifest = json.loads((tmp_path / MANIFEST_NAME).read_text(encoding="utf-8"))
+    assert "NIFTY/this_week/ATM" in {k.replace("\\", "/") for k in manifest["dirs"]}
+    # A fresh engine picks the manifest up; only the root (manifest rewrite) is re-listed.
+    second = RetentionEngine(str(tmp_path), retention_days=30).run_pass(today=TODAY)
+    assert second.dirs_seen == 4 and second.dirs_listed <= 1
+
+
+def test_compaction_archives_then_expires_months(tmp_path):
+    d = tmp_path / "NIFTY" / "this_week" / "ATM"
+    for day in _days(60):
+        _touch(d / f"{day}.csv", f"timestamp,ce\n{day}T09:15:00,1\n")
+    eng = RetentionEngine(str(tmp_path), retention_days=45, min_files_to_keep=1, archive_days=7)
+    st = eng.run_pass(today=TODAY)
+    assert st.deleted_option == 14
+    assert st.archived == 46 - 8
+    assert sorted(p.stem for p in d.glob("*.csv")) == sorted(_days(8))
+    with zipfile.ZipFile(d / "2025-02.archive.zip") as zf:
+        assert "2025-02-10.csv" in zf.namelist()
+        assert "09:15" in zf.read("2025-02-10.csv").decode()
+    # Five months later every archived month is past retention and removed.
+    later = RetentionEngine(str(tmp_path), retention_days=45, min_files_to_keep=1, archive_days=7)
+    st2 = later.run_pass(today=dt.date(2025, 8, 1))
+    assert st2.archives_deleted == len({day[:7] for day in _days(46)[8:]})
+    assert not list(d.glob("*.archive.zip"))
+
+
+def test_scan_and_prune_disabled_and_undated(tmp_path):
+    undated = [_touch(tmp_path / "misc" / f"f{i}.csv") for i in range(5)]
+    assert _scan_and_prune(str(tmp_path), 0, None, 3, None) == (0, 0)
+    assert not (tmp_path / MANIFEST_NAME).exists()
+    for i, p in enumerate(undated):
+        ts = dt.datetime(2024, 1, 1 + i).timestamp()
+        os.utime(p, (ts, ts))
+    assert _scan_and_prune(str(tmp_path), 10, None, 3, None) == (2, 0)
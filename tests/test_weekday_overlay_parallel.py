@@ -0,0 +1,82 @@
+import csv
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("numpy")
+
+from scripts.weekday_overlay import (  # noqa: E402
+    WEEKDAY_NAMES_UPPER,
+    build_weekday_masters,
+    load_master_file,
+    update_weekday_master,
+)
+
+
+def _write_daily(base: Path, index: str, tag: str, offset: str, day: str, rows):
+    path = base / index / tag / offset / f"{day}.csv"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.DictWriter(f, fieldnames=["timestamp", "ce", "pe", "avg_ce", "avg_pe", "ce_iv"])
+        w.writeheader()
+        w.writerows(rows)
+
+
+def _day_rows(day: str, scale: float, with_iv: bool):
+    rows = []
+    for i, hm in enumerate(["09:20:00", "09:21:00", "09:21:00", "15:31:00"]):
+        rows.append({
+            "timestamp": f"{day}T{hm}",
+            "ce": 100 * scale + i, "pe": 90 * scale, "avg_ce": 50, "avg_pe": 40 * scale,
+            "ce_iv": (0.1 * scale + i / 100) if with_iv else "",
+        })
+    return rows
+
+
+def _populate(base: Path, day: str, scale: float, with_iv: bool):
+    for index in ("NIFTY", "BANKNIFTY"):
+        for tag in ("this_week", "next_week"):
+            for offset in ("0", "+50", "-50"):
+                _write_daily(base, index, tag, offset, day, _day_rows(day, scale, with_iv))
+
+
+def test_parallel_builder_matches_serial(tmp_path):
+    base = tmp_path / "in"
+    serial_out = tmp_path / "serial"
+    parallel_out = tmp_path / "parallel"
+    days = [("2025-01-02", 1.0, True), ("2025-01-09", 1.5, False), ("2025-01-16", 0.8, True)]
+    for day, scale, with_iv in days:
+        _populate(base, day, scale, with_iv)
+        td = date.fromisoformat(day)
+        n_serial = sum(
+            update_weekday_master(str(base), str(serial_out), idx, td, 0.3) for idx in ("NIFTY", "BANKNIFTY")
+        )
+        issues = []
+        n_parallel = build_weekday_masters(
+            str(base), str(parallel_out), ["NIFTY", "BANKNIFTY"], td, 0.3, workers=2, issues=issues,
+        )
+        assert n_parallel == n_serial == 2 * 2 * 3 * 2
+    weekday = WEEKDAY_NAMES_UPPER[date(2025, 1, 2).weekday()]
+    for index in ("NIFTY", "BANKNIFTY"):
+        for tag in ("this_week", "next_week"):
+            for offset in ("0", "+50", "-50"):
+                rel = Path(index) / tag / offset / f"{weekday}.csv"
+                a = load_master_file(serial_out / rel)
+                b = load_master_file(parallel_out / rel)
+                assert a.keys() == b.keys() == {"09:20:00", "09:21:00"}
+                for ts in a:
+                    for k, v in a[ts].items():
+                        assert b[ts][k] == pytest.approx(v, abs=1e-5), (rel, ts, k)
+                assert (parallel_out / rel).with_suffix(".npz").exists()
+
+
+def test_parallel_builder_imports_existing_csv_master(tmp_path):
+    base = tmp_path / "in"
+    out = tmp_path / "out"
+    _populate(base, "2025-01-02", 1.0, True)
+    td = date(2025, 1, 2)
+    update_weekday_master(str(base), str(out), "NIFTY", td, 0.5)
+    build_weekday_masters(str(base), str(out), ["NIFTY"], td, 0.5, workers=1)
+    rec = load_master_file(out / "NIFTY" / "this_week" / "0" / f"{WEEKDAY_NAMES_UPPER[td.weekday()]}.csv")
+    assert rec["09:20:00"]["counter"] == 2